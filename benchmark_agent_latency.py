@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-decision CPU time of the heuristic agents.
+Plays seeded headless games with persistent plans on and off and reports
+the average time each agent spends per decision.
+"""
+
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bomber_game.game_state import GameState
+from bomber_game.heuristics import HeuristicAgent
+from bomber_game.heuristics_improved import ImprovedHeuristicAgent
+from bomber_game.heuristics_intermediate import IntermediateSmartHeuristic
+from bomber_game.heuristics_advanced import AdvancedSmartHeuristic
+from bomber_game.decision_cache import DecisionCache
+from bomber_game import GRID_SIZE, GREEN, RED, TILE_SIZE
+
+
+AGENTS = {
+    'improved': ImprovedHeuristicAgent,
+    'intermediate': IntermediateSmartHeuristic,
+    'advanced': AdvancedSmartHeuristic,
+}
+
+
+# Agents that accept a decision_cache argument
+CACHEABLE_AGENTS = {'improved'}
+
+
+def run_latency_game(agent_class, seed, persistent_plans, max_steps=1500,
+                     decision_cache=None):
+    """
+    Run one seeded game and time the agent under test.
+
+    Returns:
+        (decisions, seconds_spent, plan_reuse_rate) tuple
+    """
+    random.seed(seed)
+    game_state = GameState(GRID_SIZE)
+    player1 = game_state.add_player(1, 1, GREEN, "Tested")
+    player2 = game_state.add_player(GRID_SIZE - 2, GRID_SIZE - 2, RED, "Opponent")
+
+    if decision_cache is not None:
+        agent = agent_class(player1, persistent_plans=persistent_plans,
+                            decision_cache=decision_cache)
+    else:
+        agent = agent_class(player1, persistent_plans=persistent_plans)
+    opponent = HeuristicAgent(player2)
+
+    dt = 1.0 / 30  # Game runs at 30 FPS
+    decisions = 0
+    spent = 0.0
+    steps = 0
+
+    while not game_state.game_over and steps < max_steps:
+        if player1.alive:
+            start = time.perf_counter()
+            action = agent.update(dt, game_state)
+            spent += time.perf_counter() - start
+            if agent.think_timer == 0:
+                decisions += 1
+            if action:
+                dx, dy, place_bomb = action
+                player1.move(dx, dy, game_state.grid, TILE_SIZE, game_state)
+                if place_bomb:
+                    game_state.place_bomb(player1)
+
+        if player2.alive:
+            action = opponent.update(dt, game_state)
+            if action:
+                dx, dy, place_bomb = action
+                player2.move(dx, dy, game_state.grid, TILE_SIZE, game_state)
+                if place_bomb:
+                    game_state.place_bomb(player2)
+
+        game_state.update(dt)
+        steps += 1
+
+    return decisions, spent, agent.planner.get_reuse_rate()
+
+
+def benchmark_agent(name, num_games=10, seed=0, cache_size=0):
+    """
+    Benchmark one agent type with and without persistent plans, and with
+    a decision cache shared across the games when cache_size > 0.
+    """
+    agent_class = AGENTS[name]
+    results = {}
+
+    modes = [('replan_every_tick', False, None), ('persistent', True, None)]
+    if cache_size > 0 and name in CACHEABLE_AGENTS:
+        modes.append(('persistent+cache', True, DecisionCache(max_size=cache_size)))
+
+    for mode, persistent, cache in modes:
+        total_decisions = 0
+        total_time = 0.0
+        reuse_rates = []
+        for game in range(num_games):
+            decisions, spent, reuse = run_latency_game(
+                agent_class, seed + game, persistent, decision_cache=cache
+            )
+            total_decisions += decisions
+            total_time += spent
+            reuse_rates.append(reuse)
+
+        per_decision_ms = (total_time / max(1, total_decisions)) * 1000
+        results[mode] = {
+            'decisions': total_decisions,
+            'ms_per_decision': per_decision_ms,
+            'plan_reuse_rate': sum(reuse_rates) / len(reuse_rates),
+        }
+        if cache is not None:
+            results[mode]['cache'] = cache.get_stats()
+
+    return results
+
+
+def main():
+    """Main benchmark script."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark heuristic agent latency')
+    parser.add_argument('--games', type=int, default=10,
+                       help='Games per agent and mode (default: 10)')
+    parser.add_argument('--agent', choices=list(AGENTS) + ['all'], default='all',
+                       help='Agent to benchmark (default: all)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='First map seed (default: 0)')
+    parser.add_argument('--cache-size', type=int, default=0,
+                       help='Also run with a decision cache of this size (default: off)')
+
+    args = parser.parse_args()
+    names = list(AGENTS) if args.agent == 'all' else [args.agent]
+
+    print("=" * 70)
+    print("⏱️  HEURISTIC AGENT LATENCY BENCHMARK")
+    print("=" * 70)
+    print(f"{'Agent':<14} {'Mode':<18} {'Decisions':>10} {'ms/decision':>12} {'Reuse':>8}")
+    print("-" * 70)
+
+    for name in names:
+        results = benchmark_agent(name, num_games=args.games, seed=args.seed,
+                                  cache_size=args.cache_size)
+        for mode, data in results.items():
+            print(f"{name:<14} {mode:<18} {data['decisions']:>10} "
+                  f"{data['ms_per_decision']:>12.3f} {data['plan_reuse_rate'] * 100:>7.1f}%")
+            if 'cache' in data:
+                cache = data['cache']
+                print(f"{'':<14} cache: {cache['hits']} hits / {cache['misses']} misses "
+                      f"({cache['hit_rate'] * 100:.1f}%), {cache['size']} entries")
+
+        before = results['replan_every_tick']['ms_per_decision']
+        after = results['persistent']['ms_per_decision']
+        if after > 0:
+            print(f"{'':<14} speedup: {before / after:.1f}x")
+        print("-" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import numpy as np
 import random
 from collections import deque
 from .agent_base import Agent
+from ..checkpoint_writer import write_atomic
 
 try:
     import torch
@@ -82,7 +83,17 @@ class PPOAgent(Agent):
     - Inspired by Bomberland competition agents
     """
     
-    def __init__(self, player, model_path=None, training=False):
+    def __init__(self, player, model_path=None, training=False, policy=None):
+        """
+        Initialize PPO agent.
+        
+        Args:
+            player: Player entity controlled by the agent
+            model_path: Checkpoint to load
+            training: Sample actions and record them for updates
+            policy: Existing ActorCritic to act with instead of building one
+                    (frozen league opponents share one network)
+        """
         super().__init__(player)
         self.training = training
         self.think_delay = 0.05  # Very fast decision making
@@ -119,7 +130,11 @@ class PPOAgent(Agent):
         self.memory = PPOMemory()
         
         # Initialize model
-        if TORCH_AVAILABLE:
+        if TORCH_AVAILABLE and policy is not None:
+            self.device = next(policy.parameters()).device
+            self.policy = policy
+            self.optimizer = None
+        elif TORCH_AVAILABLE:
             self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
             self.policy = ActorCritic(self.state_size, self.action_size).to(self.device)
             self.optimizer = optim.Adam(self.policy.parameters(), lr=self.learning_rate)
@@ -407,13 +422,131 @@ class PPOAgent(Agent):
         
         return returns, advantages
     
+    def update_policy_vtrace(self, segments, rho_clip=1.0, c_clip=1.0):
+        """
+        Update policy on trajectories played by older copies of the policy.
+        
+        Used by asynchronous actors, whose weights lag behind the learner.
+        Value targets and advantages come from V-trace. The PPO ratio is
+        taken against the policy at the start of this update and weighted
+        by the truncated importance weight min(rho_clip, pi / mu) of the
+        policy mu that played the steps, so stale steps are corrected
+        instead of being clipped away.
+        
+        Args:
+            segments: Dictionaries of states, actions, log_probs (of mu),
+                      rewards, is_terminals and bootstrap_state (state after
+                      the last step, None when the segment ends its episode)
+            rho_clip: Truncation of the importance weights
+            c_clip: Truncation of the trace coefficients
+        """
+        if not self.training or not TORCH_AVAILABLE or not segments:
+            return
+        
+        # Convert to tensors
+        old_states = torch.FloatTensor(np.concatenate([s['states'] for s in segments])).to(self.device)
+        old_actions = torch.LongTensor(np.concatenate([s['actions'] for s in segments])).to(self.device)
+        behaviour_log_probs = torch.FloatTensor(np.concatenate([s['log_probs'] for s in segments])).to(self.device)
+        
+        with torch.no_grad():
+            old_log_probs, values, _ = self.policy.evaluate(old_states, old_actions)
+            values = values.squeeze(-1)
+            rhos = torch.exp(old_log_probs - behaviour_log_probs).cpu().numpy()
+            
+            # Values after each segment (0 where the episode ended)
+            bootstrap_values = np.zeros(len(segments), dtype=np.float32)
+            cut = [i for i, s in enumerate(segments) if s['bootstrap_state'] is not None]
+            if cut:
+                bootstrap_states = np.array([segments[i]['bootstrap_state'] for i in cut])
+                _, cut_values = self.policy(torch.FloatTensor(bootstrap_states).to(self.device))
+                bootstrap_values[cut] = cut_values.squeeze(-1).cpu().numpy()
+        
+        returns, advantages = self._calculate_vtrace(segments, values.cpu().numpy(), bootstrap_values,
+                                                     rhos, rho_clip, c_clip)
+        weights = torch.FloatTensor(np.minimum(rho_clip, rhos)).to(self.device)
+        
+        # PPO update for multiple epochs
+        for _ in range(self.epochs):
+            log_probs, state_values, dist_entropy = self.policy.evaluate(old_states, old_actions)
+            
+            # Ratios against the policy at the start of the update
+            ratios = torch.exp(log_probs - old_log_probs)
+            surr1 = ratios * advantages
+            surr2 = torch.clamp(ratios, 1 - self.clip_epsilon, 1 + self.clip_epsilon) * advantages
+            
+            actor_loss = -(weights * torch.min(surr1, surr2)).mean()
+            critic_loss = 0.5 * (returns - state_values.squeeze(-1)).pow(2).mean()
+            entropy_loss = -dist_entropy.mean()
+            loss = actor_loss + self.c1 * critic_loss + self.c2 * entropy_loss
+            
+            self.optimizer.zero_grad()
+            loss.backward()
+            torch.nn.utils.clip_grad_norm_(self.policy.parameters(), 0.5)
+            self.optimizer.step()
+    
+    def _calculate_vtrace(self, segments, values, bootstrap_values, rhos, rho_clip, c_clip):
+        """
+        Calculate V-trace value targets and policy-gradient advantages.
+        
+        Args:
+            segments: Segments as passed to update_policy_vtrace
+            values: Values of all their states (concatenated)
+            bootstrap_values: Value after the last step of each segment
+            rhos: pi / mu of every step
+            rho_clip: Truncation of the importance weights
+            c_clip: Truncation of the trace coefficients
+        
+        Returns:
+            (value targets, normalized advantages) as tensors
+        """
+        vs = np.zeros_like(values)
+        advantages = np.zeros_like(values)
+        clipped_rhos = np.minimum(rho_clip, rhos)
+        cs = self.gae_lambda * np.minimum(c_clip, rhos)
+        
+        end = 0
+        for segment, next_value in zip(segments, bootstrap_values):
+            start, end = end, end + len(segment['rewards'])
+            rewards = segment['rewards']
+            dones = segment['is_terminals']
+            next_vs = next_value
+            correction = 0.0  # vs[t + 1] - values[t + 1]
+            
+            for t in reversed(range(start, end)):
+                discount = 0.0 if dones[t - start] else self.gamma
+                reward = rewards[t - start]
+                delta = clipped_rhos[t] * (reward + discount * next_value - values[t])
+                correction = delta + discount * cs[t] * correction
+                vs[t] = values[t] + correction
+                advantages[t] = reward + discount * next_vs - values[t]
+                next_value = values[t]
+                next_vs = vs[t]
+        
+        # Normalize advantages
+        advantages = torch.FloatTensor(advantages).to(self.device)
+        advantages = (advantages - advantages.mean()) / (advantages.std() + 1e-8)
+        returns = torch.FloatTensor(vs).to(self.device)
+        
+        return returns, advantages
+    
+    def set_learning_rate(self, lr):
+        """Change the optimizer's learning rate (learning rate schedules)."""
+        self.learning_rate = lr
+        if getattr(self, 'optimizer', None) is not None:
+            for group in self.optimizer.param_groups:
+                group['lr'] = lr
+    
+    def checkpoint_state(self):
+        """Get the state written by save_model (live tensors, not copies)."""
+        return {
+            'model_state_dict': self.policy.state_dict(),
+            'optimizer_state_dict': self.optimizer.state_dict(),
+        }
+    
     def save_model(self, path):
         """Save model with optimizer state."""
         if TORCH_AVAILABLE:
-            torch.save({
-                'model_state_dict': self.policy.state_dict(),
-                'optimizer_state_dict': self.optimizer.state_dict(),
-            }, path)
+            write_atomic(path, self.checkpoint_state())
             print(f"✅ PPO model saved to {path}")
     
     def load_model(self, path):
@@ -13,6 +13,7 @@ import numpy as np
 import random
 from collections import deque
 from .agent_base import Agent
+from ..checkpoint_writer import write_atomic
 
 try:
     import torch
@@ -543,15 +544,19 @@ class OptimizedPPOAgent(Agent):
         
         return returns, advantages
     
+    def checkpoint_state(self):
+        """Get the state written by save_model (live tensors, not copies)."""
+        return {
+            'model_state_dict': self.policy.state_dict(),
+            'optimizer_state_dict': self.optimizer.state_dict(),
+            'update_count': self.update_count,
+            'scheduler_state_dict': self.scheduler.state_dict(),
+        }
+    
     def save_model(self, path):
         """Save model with optimizer state and training progress."""
         if TORCH_AVAILABLE:
-            torch.save({
-                'model_state_dict': self.policy.state_dict(),
-                'optimizer_state_dict': self.optimizer.state_dict(),
-                'update_count': self.update_count,
-                'scheduler_state_dict': self.scheduler.state_dict(),
-            }, path)
+            write_atomic(path, self.checkpoint_state())
             print(f"✅ Optimized PPO model saved to {path}")
     
     def load_model(self, path):
@@ -5,7 +5,6 @@ Inspired by modern RL approaches for Bomberman.
 
 import numpy as np
 import random
-from collections import deque
 from .agent_base import Agent
 
 try:
@@ -75,8 +74,8 @@ class RLAgent(Agent):
         self.gamma = 0.95  # Discount factor
         self.learning_rate = 0.001
         
-        # Experience replay
-        self.memory = deque(maxlen=2000)
+        # Prioritized experience replay
+        self.memory = PrioritizedReplayMemory(2000, self.state_size)
         self.batch_size = 32
         
         # Initialize model
@@ -85,7 +84,6 @@ class RLAgent(Agent):
             self.model = DQN(self.state_size, self.action_size).to(self.device)
             self.target_model = DQN(self.state_size, self.action_size).to(self.device)
             self.optimizer = optim.Adam(self.model.parameters(), lr=self.learning_rate)
-            self.criterion = nn.MSELoss()
             
             # Load pre-trained weights if available
             if model_path:
@@ -304,30 +302,43 @@ class RLAgent(Agent):
     def remember(self, state, action, reward, next_state, done):
         """Store experience in replay memory."""
         if self.training:
-            self.memory.append((state, action, reward, next_state, done))
+            self.memory.add(state, action, reward, next_state, done)
     
     def replay(self):
-        """Train on batch of experiences."""
+        """
+        Train on a prioritized batch of experiences.
+        
+        One batched Double-DQN update: the online network picks the next
+        action, the target network values it. Losses are weighted by the
+        importance-sampling weights and the new TD errors become the
+        sampled transitions' priorities.
+        """
         if not TORCH_AVAILABLE or not self.training or len(self.memory) < self.batch_size:
             return
         
-        batch = random.sample(self.memory, self.batch_size)
+        indices, states, actions, rewards, next_states, dones, weights = \
+            self.memory.sample(self.batch_size)
+        states = torch.from_numpy(states).to(self.device)
+        actions = torch.from_numpy(actions).to(self.device)
+        rewards = torch.from_numpy(rewards).to(self.device)
+        next_states = torch.from_numpy(next_states).to(self.device)
+        dones = torch.from_numpy(dones).to(self.device)
+        weights = torch.from_numpy(weights).to(self.device)
         
-        for state, action, reward, next_state, done in batch:
-            state_tensor = torch.FloatTensor(state).unsqueeze(0).to(self.device)
-            next_state_tensor = torch.FloatTensor(next_state).unsqueeze(0).to(self.device)
-            
-            target = reward
-            if not done:
-                target = reward + self.gamma * self.target_model(next_state_tensor).max().item()
-            
-            target_f = self.model(state_tensor)
-            target_f[0][action] = target
-            
-            self.optimizer.zero_grad()
-            loss = self.criterion(self.model(state_tensor), target_f)
-            loss.backward()
-            self.optimizer.step()
+        with torch.no_grad():
+            next_actions = self.model(next_states).argmax(dim=1, keepdim=True)
+            next_q = self.target_model(next_states).gather(1, next_actions).squeeze(1)
+            targets = rewards + self.gamma * next_q * (1.0 - dones)
+        
+        q_values = self.model(states).gather(1, actions.unsqueeze(1)).squeeze(1)
+        td_errors = targets - q_values
+        loss = (weights * td_errors.pow(2)).mean()
+        
+        self.optimizer.zero_grad()
+        loss.backward()
+        self.optimizer.step()
+        
+        self.memory.update_priorities(indices, td_errors.detach().abs().cpu().numpy())
         
         # Decay epsilon
         if self.epsilon > self.epsilon_min:
@@ -353,3 +364,111 @@ class RLAgent(Agent):
                 print(f"✅ Model loaded from {path}")
             except Exception as e:
                 print(f"⚠️  Could not load model: {e}")
+
+
+class SumTree:
+    """Binary tree of priorities where every node holds the sum of its children."""
+    
+    def __init__(self, capacity):
+        self.depth = max(capacity - 1, 1).bit_length()
+        self.leaves = 1 << self.depth
+        self.tree = np.zeros(2 * self.leaves, dtype=np.float64)  # Root at 1, leaves at self.leaves + i
+    
+    def total(self):
+        """Sum of all priorities."""
+        return self.tree[1]
+    
+    def update(self, indices, priorities):
+        """Set the priorities of some slots and refresh their ancestors."""
+        nodes = np.asarray(indices, dtype=np.int64) + self.leaves
+        self.tree[nodes] = priorities
+        # Siblings sharing a parent just write the same sum twice
+        nodes //= 2
+        while nodes[0] > 0:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            nodes //= 2
+    
+    def set(self, index, priority):
+        """Set one slot's priority (scalar walk up, cheaper than update for one slot)."""
+        node = index + self.leaves
+        tree = self.tree
+        tree[node] = priority
+        node //= 2
+        while node > 0:
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+            node //= 2
+    
+    def find(self, values):
+        """Slot of each value, descending all values one level at a time."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            nodes *= 2
+            left_sum = self.tree[nodes]
+            go_right = values >= left_sum
+            values -= left_sum * go_right
+            nodes += go_right
+        return nodes - self.leaves
+
+
+class PrioritizedReplayMemory:
+    """Replay memory in preallocated arrays, sampled in proportion to TD error."""
+    
+    def __init__(self, capacity, state_size, alpha=0.6, beta=0.4, beta_increment=1e-4, eps=1e-3):
+        self.capacity = capacity
+        self.alpha = alpha  # How strongly priorities skew sampling (0: uniform)
+        self.beta = beta  # Importance-sampling correction, annealed to 1
+        self.beta_increment = beta_increment
+        self.eps = eps  # Keeps every transition sampleable
+        
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+        
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+        self.position = 0
+        self.size = 0
+    
+    def __len__(self):
+        return self.size
+    
+    def add(self, state, action, reward, next_state, done):
+        """Store a transition with the highest priority seen so far."""
+        i = self.position
+        self.states[i] = state
+        self.next_states[i] = next_state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.dones[i] = float(done)
+        self.tree.set(i, self.max_priority ** self.alpha)
+        
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+    
+    def sample(self, batch_size):
+        """
+        Sample a batch, one transition from each equal slice of the priority mass.
+        
+        Returns:
+            (indices, states, actions, rewards, next_states, dones, weights)
+        """
+        segment = self.tree.total() / batch_size
+        values = (np.arange(batch_size) + np.random.random(batch_size)) * segment
+        indices = np.minimum(self.tree.find(values), self.size - 1)
+        
+        probs = self.tree.tree[indices + self.tree.leaves] / self.tree.total()
+        weights = (self.size * probs) ** -self.beta
+        weights = (weights / weights.max()).astype(np.float32)
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        
+        return (indices, self.states[indices], self.actions[indices], self.rewards[indices],
+                self.next_states[indices], self.dones[indices], weights)
+    
+    def update_priorities(self, indices, td_errors):
+        """Set sampled transitions' priorities from their new TD errors."""
+        priorities = np.abs(td_errors) + self.eps
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
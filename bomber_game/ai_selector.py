@@ -7,6 +7,8 @@ import json
 import os
 from pathlib import Path
 
+from .metrics_store import load_summary
+
 
 class AISelector:
     """
@@ -53,8 +55,7 @@ class AISelector:
         training_stats = {}
         if stats_file.exists():
             try:
-                with open(stats_file, 'r') as f:
-                    training_stats = json.load(f)
+                training_stats = load_summary(stats_file)
             except:
                 pass
         
@@ -104,8 +105,7 @@ class AISelector:
         ppo_model = models_dir / "ppo_agent.pth"
         if ppo_model.exists():
             # Use recent win rate (last 100 episodes) if available
-            win_rates = training_stats.get('win_rates', [])
-            recent_win_rate = win_rates[-1] if win_rates else training_stats.get('win_rate', 0.3)
+            recent_win_rate = training_stats.get('recent_win_rate', training_stats.get('win_rate', 0.3))
             episodes = training_stats.get('total_episodes', 0)
             
             options.append({
@@ -12,6 +12,7 @@ class AssetManager:
     def __init__(self):
         """Initialize asset manager."""
         self.images = {}
+        self.frames = {}  # Precomputed animation frames
         self.base_path = os.path.join(os.path.dirname(__file__), 'assets')
         self.images_path = os.path.join(self.base_path, 'images')
         
@@ -79,6 +80,33 @@ class AssetManager:
         """Get bomb sprite."""
         return self.load_image("bomb.png", size)
     
+    def get_bomb_pulse_frames(self, size=(28, 28), steps=8, max_scale=1.2):
+        """
+        Get bomb sprites pre-scaled for the pulse of the last second.
+        
+        Args:
+            size: Tuple (width, height) of the resting sprite
+            steps: Number of frames from resting size to max_scale
+            max_scale: Scale of the last frame
+            
+        Returns:
+            List of pygame.Surface, smallest first
+        """
+        cache_key = f"bomb_pulse_{size}_{steps}_{max_scale}"
+        if cache_key in self.frames:
+            return self.frames[cache_key]
+        
+        sprite = self.get_bomb_sprite(size)
+        frames = []
+        for i in range(steps):
+            scale = 1.0 + (max_scale - 1.0) * i / max(1, steps - 1)
+            frames.append(pygame.transform.scale(
+                sprite, (int(size[0] * scale), int(size[1] * scale))
+            ))
+        
+        self.frames[cache_key] = frames
+        return frames
+    
     def get_wall_sprite(self, size=(64, 64)):
         """Get wall sprite."""
         return self.load_image("wallhard.png", size)
@@ -38,6 +38,7 @@ class BrowserModelLoader:
                 'max_search_depth': 5,
                 'beam_width': 20,
                 'think_time': 0.1,
+                'decision_cache_size': 0,  # 0 = no decision cache
             },
             'medium_performance': {
                 'name': 'Medium Performance',
@@ -46,6 +47,7 @@ class BrowserModelLoader:
                 'max_search_depth': 3,
                 'beam_width': 10,
                 'think_time': 0.15,
+                'decision_cache_size': 512,
             },
             'low_performance': {
                 'name': 'Low Performance',
@@ -54,6 +56,7 @@ class BrowserModelLoader:
                 'max_search_depth': 1,
                 'beam_width': 5,
                 'think_time': 0.2,
+                'decision_cache_size': 2048,
             },
             'auto': {
                 'name': 'Auto-Detect',
@@ -62,6 +65,7 @@ class BrowserModelLoader:
                 'max_search_depth': 'auto',
                 'beam_width': 'auto',
                 'think_time': 'auto',
+                'decision_cache_size': 'auto',
             }
         }
     
@@ -139,6 +143,7 @@ class BrowserModelLoader:
             'search_depth': profile['max_search_depth'],
             'beam_width': profile['beam_width'],
             'think_time': profile['think_time'],
+            'decision_cache_size': profile['decision_cache_size'],
             'timestamp': datetime.now().isoformat(),
         }
         
@@ -147,6 +152,23 @@ class BrowserModelLoader:
         
         return config
     
+    def create_decision_cache(self, config):
+        """
+        Create the decision cache a configuration asks for.
+        
+        Args:
+            config: Configuration from get_model_config() or load_config()
+            
+        Returns:
+            DecisionCache, or None if the profile does not use one
+        """
+        size = config.get('decision_cache_size', 0)
+        if not isinstance(size, int) or size <= 0:
+            return None
+        
+        from .decision_cache import DecisionCache
+        return DecisionCache(max_size=size)
+    
     def _save_config(self, config):
         """Save browser configuration."""
         try:
@@ -185,6 +207,7 @@ class BrowserModelLoader:
                 'search_depth': profile['max_search_depth'],
                 'beam_width': profile['beam_width'],
                 'think_time': profile['think_time'],
+                'decision_cache_size': profile['decision_cache_size'],
             }
         }
     
@@ -210,6 +233,7 @@ class BrowserModelLoader:
         report.append(f"   Search Depth: {profile['max_search_depth']}")
         report.append(f"   Beam Width: {profile['beam_width']}")
         report.append(f"   Think Time: {profile['think_time']}s")
+        report.append(f"   Decision Cache: {profile['decision_cache_size']} entries")
         
         report.append("\n" + "=" * 70)
         
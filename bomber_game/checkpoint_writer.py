@@ -0,0 +1,285 @@
+"""
+Checkpoint writer - background, atomic checkpoint saving with retention.
+
+The training thread only takes an in-memory snapshot of the state dicts
+(tensors are cloned to CPU, so training can keep updating the live ones);
+a background thread does the torch.save. Every file is written to a
+temporary name and renamed into place, so a crash never leaves a
+half-written checkpoint behind.
+
+Checkpoints requested for the same episode (e.g. a new best on a periodic
+save episode) are merged into one file tagged with all its kinds. After
+each write, only the last keep_last checkpoints and the keep_best best
+scoring ones are kept; the rest are deleted. The kept checkpoints are
+listed in checkpoints.json in the checkpoint folder.
+"""
+
+import copy
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+
+INDEX_NAME = "checkpoints.json"
+LATEST_NAME = "latest_checkpoint.pth"
+PROTECTED_KINDS = ('best', 'final')  # Never dropped from a backed-up queue
+
+
+def snapshot_state(state):
+    """
+    Copy a (nested) state dict so later training steps don't change it.
+
+    Args:
+        state: Dictionary/list of tensors and plain values
+
+    Returns:
+        Copy with every tensor detached, cloned and moved to CPU
+    """
+    if TORCH_AVAILABLE and isinstance(state, torch.Tensor):
+        return state.detach().to('cpu', copy=True)
+    if isinstance(state, dict):
+        return type(state)((key, snapshot_state(value)) for key, value in state.items())
+    if isinstance(state, (list, tuple)):
+        return type(state)(snapshot_state(value) for value in state)
+    return copy.deepcopy(state)
+
+
+def write_atomic(path, state):
+    """
+    torch.save a state to path through a temporary file.
+
+    Args:
+        path: Destination file
+        state: Object to save
+    """
+    tmp_path = path + ".tmp"
+    torch.save(state, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_json_atomic(path, data):
+    """json.dump to path through a temporary file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _merge_job(job, kinds, score, metadata):
+    """
+    Fold an earlier save of the same episode into a checkpoint job.
+
+    Args:
+        job: Checkpoint job (updated in place)
+        kinds: Tags of the earlier save, listed first
+        score: Score of the earlier save; the higher one is kept
+        metadata: Metadata of the earlier save; the job's values win
+    """
+    job['kinds'] = kinds + [kind for kind in job['kinds'] if kind not in kinds]
+    if score is not None and (job['score'] is None or score > job['score']):
+        job['score'] = score
+    job['metadata'] = {**metadata, **job['metadata']}
+
+
+class CheckpointWriter:
+    """Saves checkpoints on a background thread."""
+
+    def __init__(self, directory, keep_last=5, keep_best=3, max_pending=4):
+        """
+        Initialize checkpoint writer and start its thread.
+
+        Args:
+            directory: Checkpoint folder
+            keep_last: Number of most recent checkpoints kept
+            keep_best: Number of best scoring 'best' checkpoints kept
+            max_pending: Snapshots held in memory while the disk catches
+                         up; beyond that the oldest checkpoint that is not
+                         'best' or 'final' is dropped (files never are)
+        """
+        self.directory = directory
+        self.keep_last = keep_last
+        self.keep_best = keep_best
+        self.max_pending = max_pending
+        self.index_file = os.path.join(directory, INDEX_NAME)
+        self.latest_file = os.path.join(directory, LATEST_NAME)
+        os.makedirs(directory, exist_ok=True)
+
+        self.entries = self._load_index()
+        self.pending = OrderedDict()  # key -> job
+        self.condition = threading.Condition()
+        self.busy = False
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="CheckpointWriter", daemon=True)
+        self.thread.start()
+
+    def save_checkpoint(self, state, episode, kind="auto", score=None, metadata=None):
+        """
+        Queue a checkpoint (returns once the state is snapshotted).
+
+        Args:
+            state: State dict to save (e.g. PPOAgent.checkpoint_state())
+            episode: Training episode the checkpoint belongs to
+            kind: 'best', 'periodic', 'autosave', 'final', ...
+            score: Value ranked by keep-best (higher is better)
+            metadata: JSON-serializable dictionary saved next to it
+        """
+        self._submit(('checkpoint', episode), {
+            'state': snapshot_state(state),
+            'episode': episode,
+            'kinds': [kind],
+            'score': score,
+            'metadata': copy.deepcopy(metadata or {}),
+        })
+
+    def save_file(self, state, path):
+        """
+        Queue an atomic save of a standalone file (not subject to retention).
+
+        Args:
+            state: State dict to save
+            path: Destination file
+        """
+        self._submit(('file', path), {'state': snapshot_state(state), 'path': path})
+
+    def flush(self):
+        """Wait until every queued checkpoint is on disk."""
+        with self.condition:
+            while self.pending or self.busy:
+                self.condition.wait()
+
+    def close(self):
+        """Write the remaining checkpoints and stop the thread."""
+        self.flush()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+
+    def _submit(self, key, job):
+        """Add a job, merging it with a queued one for the same target."""
+        with self.condition:
+            queued = self.pending.pop(key, None)
+            if queued is not None and 'kinds' in job:
+                # Same episode saved by several schedules: write once, keep every tag
+                _merge_job(job, queued['kinds'], queued['score'], queued['metadata'])
+            self.pending[key] = job
+
+            if len(self.pending) > self.max_pending:
+                for old_key, old_job in self.pending.items():
+                    if (old_key != key and 'kinds' in old_job
+                            and not set(old_job['kinds']) & set(PROTECTED_KINDS)):
+                        del self.pending[old_key]
+                        print(f"⚠️  Checkpoint writer behind, skipped {old_key[0]} {old_key[1]}")
+                        break
+            self.condition.notify_all()
+
+    def _run(self):
+        """Background loop: write queued jobs one at a time."""
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                key, job = self.pending.popitem(last=False)
+                self.busy = True
+
+            try:
+                if key[0] == 'file':
+                    write_atomic(job['path'], job['state'])
+                else:
+                    self._write_checkpoint(job)
+            except Exception as e:
+                print(f"⚠️  Could not save checkpoint {key[1]}: {e}")
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+    def _write_checkpoint(self, job):
+        """Write a checkpoint, update latest and the index, apply retention."""
+        # An earlier save of this episode already reached the disk: this one
+        # replaces its file and inherits its tags and score
+        previous = [entry for entry in self.entries if entry['episode'] == job['episode']]
+        for entry in previous:
+            _merge_job(job, entry['kinds'], entry['score'],
+                       self._read_metadata(entry['metadata_file']))
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        name = f"checkpoint_ep{job['episode']}_{'-'.join(job['kinds'])}_{timestamp}"
+        path = os.path.join(self.directory, name + ".pth")
+        metadata_path = os.path.join(self.directory, name + "_metadata.json")
+
+        write_atomic(path, job['state'])
+        tmp_latest = self.latest_file + ".tmp"
+        shutil.copyfile(path, tmp_latest)
+        os.replace(tmp_latest, self.latest_file)
+
+        metadata = dict(job['metadata'])
+        metadata.update({'episode': job['episode'], 'timestamp': timestamp,
+                         'checkpoint_type': '-'.join(job['kinds'])})
+        _write_json_atomic(metadata_path, metadata)
+
+        for entry in previous:
+            for file in (entry['file'], entry['metadata_file']):
+                if file not in (name + ".pth", name + "_metadata.json"):
+                    self._remove(file)
+        self.entries = [entry for entry in self.entries if entry['episode'] != job['episode']]
+        self.entries.append({'file': name + ".pth", 'metadata_file': name + "_metadata.json",
+                             'episode': job['episode'], 'kinds': job['kinds'],
+                             'score': job['score']})
+        self._apply_retention()
+        _write_json_atomic(self.index_file, self.entries)
+        print(f"💾 Checkpoint saved: {name}.pth")
+
+    def _apply_retention(self):
+        """Delete checkpoints that are neither recent nor among the best."""
+        by_episode = sorted(self.entries, key=lambda entry: entry['episode'])
+        keep = {id(entry) for entry in by_episode[-self.keep_last:]} if self.keep_last > 0 else set()
+        best = [entry for entry in self.entries
+                if 'best' in entry['kinds'] and entry['score'] is not None]
+        best.sort(key=lambda entry: entry['score'], reverse=True)
+        keep.update(id(entry) for entry in best[:self.keep_best])
+
+        kept = []
+        for entry in by_episode:
+            if id(entry) in keep:
+                kept.append(entry)
+                continue
+            for file in (entry['file'], entry['metadata_file']):
+                self._remove(file)
+        self.entries = kept
+
+    def _remove(self, file):
+        """Delete a file of the checkpoint folder (if it is still there)."""
+        try:
+            os.remove(os.path.join(self.directory, file))
+        except OSError:
+            pass
+
+    def _read_metadata(self, file):
+        """Read a checkpoint's metadata file (empty if missing or unreadable)."""
+        try:
+            with open(os.path.join(self.directory, file), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load_index(self):
+        """Read the list of kept checkpoints (empty if missing)."""
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"⚠️  Could not read {self.index_file}: {e}")
+        return []
@@ -52,15 +52,20 @@ RL_CONFIG = {
     'target_update_frequency': 1000,  # steps
 }
 
-# Reward function parameters
+# Reward function parameters (used by bomber_game/rewards.py for all training scripts)
 REWARD_CONFIG = {
-    'survival': 1,
-    'wall_destroyed': 10,
-    'enemy_hit': 100,
-    'powerup_collected': 50,
-    'death': -100,
-    'danger_penalty': -5,
-    'move_toward_enemy': 2,
+    'survival': -0.5,  # Every step (negative: encourage finishing games)
+    'wall_destroyed': 20,  # Soft wall destroyed by the agent's bomb
+    'enemy_hit': 200,  # Enemy dead, agent alive (win)
+    'powerup_collected': 10,
+    'death': -200,
+    'danger_penalty': 0,  # Each step ending in the blast line of a bomb about to explode
+    'escaped_danger': 30,  # Out of danger after a step in danger
+    'move_toward_enemy': 5,
+    'move_away_from_enemy': -5,
+    'bomb_near_enemy': 15,  # Bomb placed within bomb_near_distance tiles of the enemy
+    'bomb_near_distance': 3,
+    'unsafe_bomb': -20,  # Bomb placed with fewer than 2 walkable neighbours
 }
 
 # Training settings
@@ -0,0 +1,165 @@
+"""
+Memoized decisions for heuristic agents.
+
+Heuristic agents keep running into the same local situation: the same
+tiles around them, bombs at the same relative spots with similar timers,
+the enemy in the same general direction. A DecisionCache remembers the
+action chosen for such a situation so the full heuristic only runs once
+per distinct neighbourhood.
+
+The key only describes the agent's surroundings, so a cached action is an
+approximation of what the full heuristic would pick; keep the cache off
+when exact behaviour matters (e.g. training data).
+"""
+
+from collections import OrderedDict
+
+
+class DecisionCache:
+    """Bounded LRU cache of actions keyed by the agent's neighbourhood."""
+
+    def __init__(self, max_size=1024, radius=2, timer_bucket=0.5,
+                 enemy_distance_buckets=(2, 5, 9)):
+        """
+        Initialize decision cache.
+
+        Args:
+            max_size: Maximum number of remembered situations
+            radius: Half-width of the tile window around the agent
+            timer_bucket: Bomb timers are rounded down to this many seconds
+            enemy_distance_buckets: Upper bounds of enemy distance classes
+        """
+        self.max_size = max_size
+        self.radius = radius
+        self.timer_bucket = timer_bucket
+        self.enemy_distance_buckets = enemy_distance_buckets
+        self.entries = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def local_state_key(self, player, game_state):
+        """
+        Build a canonical key for the player's neighbourhood.
+
+        Everything is expressed relative to the player so the same
+        situation anywhere on the map maps to the same key.
+
+        Returns:
+            Hashable tuple
+        """
+        px, py = int(player.x), int(player.y)
+        radius = self.radius
+
+        tiles = tuple(
+            game_state.get_tile(px + dx, py + dy)
+            for dy in range(-radius, radius + 1)
+            for dx in range(-radius, radius + 1)
+        )
+
+        # Bombs whose blast can reach the window, with bucketed timers
+        bombs = []
+        for bomb in game_state.bombs:
+            dx, dy = bomb.grid_x - px, bomb.grid_y - py
+            if max(abs(dx), abs(dy)) <= radius + bomb.bomb_range:
+                bucket = int(max(0.0, bomb.timer) / self.timer_bucket)
+                bombs.append((dx, dy, bucket, bomb.bomb_range))
+
+        explosions = [
+            (e.grid_x - px, e.grid_y - py) for e in game_state.explosions
+            if abs(e.grid_x - px) <= radius and abs(e.grid_y - py) <= radius
+        ]
+        cacas = [
+            (c.grid_x - px, c.grid_y - py) for c in game_state.cacas
+            if abs(c.grid_x - px) <= radius and abs(c.grid_y - py) <= radius
+        ]
+        powerups = [
+            (x - px, y - py) for (x, y) in game_state.powerups
+            if abs(x - px) <= radius and abs(y - py) <= radius
+        ]
+
+        # Enemies only by direction and distance class
+        enemies = []
+        for other in game_state.players:
+            if other is player or not other.alive:
+                continue
+            dx, dy = int(other.x) - px, int(other.y) - py
+            distance = abs(dx) + abs(dy)
+            bucket = len(self.enemy_distance_buckets)
+            for i, bound in enumerate(self.enemy_distance_buckets):
+                if distance <= bound:
+                    bucket = i
+                    break
+            enemies.append(((dx > 0) - (dx < 0), (dy > 0) - (dy < 0), bucket))
+
+        return (
+            tiles,
+            tuple(sorted(bombs)),
+            tuple(sorted(explosions)),
+            tuple(sorted(cacas)),
+            tuple(sorted(powerups)),
+            tuple(sorted(enemies)),
+            player.active_bombs < player.max_bombs,
+            player.bomb_range,
+        )
+
+    def get(self, key):
+        """Get cached action for key, or None (counts a hit or a miss)."""
+        action = self.entries.get(key)
+        if action is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return action
+
+    def put(self, key, action):
+        """Remember the action chosen for key."""
+        self.entries[key] = action
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def lookup(self, player, game_state, compute):
+        """
+        Get the action for the player's situation, computing it on a miss.
+
+        Args:
+            player: Player entity
+            game_state: Current game state
+            compute: Callable (player, game_state) -> action
+
+        Returns:
+            Action as returned by compute
+        """
+        key = self.local_state_key(player, game_state)
+        action = self.get(key)
+        if action is None:
+            action = compute(player, game_state)
+            self.put(key, action)
+        return action
+
+    def clear(self):
+        """Forget all entries (statistics are kept)."""
+        self.entries.clear()
+
+    def get_hit_rate(self):
+        """Get fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def get_stats(self):
+        """Get cache statistics."""
+        return {
+            'size': len(self.entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.get_hit_rate(),
+        }
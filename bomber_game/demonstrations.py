@@ -0,0 +1,280 @@
+"""
+Demonstrations - heuristic decisions recorded for behavioral cloning.
+
+collect_demonstrations() plays heuristic games in a process pool. Every
+task writes its games to its own shard file as fixed-width records (a
+float32 state followed by a one-byte action index), so workers never
+share a file and nothing is held in memory beyond one episode.
+dataset.json in the dataset folder lists the shards and their record
+counts; later collections append new shards to the same dataset.
+
+DemoDataset memory-maps the shards and streams shuffled minibatches as
+NumPy arrays, so the dataset can be far larger than RAM.
+"""
+
+import json
+import multiprocessing
+import os
+
+import numpy as np
+
+from . import GRID_SIZE
+from .game_state import GameState
+from .heuristics_improved import ImprovedHeuristicAgent
+from .trainer import apply_action
+
+
+INDEX_NAME = "dataset.json"
+ACTION_SIZE = 6  # 4 directions + bomb + no action
+EPISODES_PER_SHARD = 25
+
+
+def action_index(action):
+    """
+    Convert a (dx, dy, place_bomb) action to its class index.
+
+    Returns:
+        0: left, 1: right, 2: up, 3: down, 4: place bomb, 5: no action
+    """
+    dx, dy, place_bomb = action
+    if place_bomb:
+        return 4
+    if dx == -1:
+        return 0
+    if dx == 1:
+        return 1
+    if dy == -1:
+        return 2
+    if dy == 1:
+        return 3
+    return 5
+
+
+def compact_state(player, enemy, game_state):
+    """
+    Small state vector for behavioral cloning.
+
+    Args:
+        player: Player whose decision is recorded
+        enemy: Opponent player
+        game_state: Current game state
+
+    Returns:
+        List of 6 normalized features
+    """
+    size = game_state.grid_size
+    return [
+        player.grid_x / size,
+        player.grid_y / size,
+        enemy.grid_x / size,
+        enemy.grid_y / size,
+        len(game_state.bombs) / 10.0,
+        len(game_state.powerups) / 10.0,
+    ]
+
+
+def record_dtype(state_size):
+    """NumPy dtype of one dataset record."""
+    return np.dtype([('state', '<f4', (state_size,)), ('action', 'u1')])
+
+
+def count_episodes(path):
+    """Number of games recorded in a dataset folder (0 if there is none)."""
+    index = _load_index(path)
+    return sum(shard['episodes'] for shard in index['shards']) if index else 0
+
+
+def _collect_shard(task):
+    """
+    Play heuristic games and write their decisions to one shard file.
+
+    Args:
+        task: (shard_path, seeds, state_fn, state_size, max_steps, dt, grid_size)
+
+    Returns:
+        (shard_path, records_written, episodes_played)
+    """
+    shard_path, seeds, state_fn, state_size, max_steps, dt, grid_size = task
+    dtype = record_dtype(state_size)
+    written = 0
+
+    with open(shard_path, 'wb') as f:
+        for seed in seeds:
+            game_state = GameState(grid_size, seed=seed)
+            enemy = game_state.add_player(1, 1, (0, 255, 0), "Player")
+            player = game_state.add_player(grid_size - 2, grid_size - 2, (255, 0, 0), "Heuristic")
+            heuristic_agent = ImprovedHeuristicAgent(player)
+
+            records = []
+            steps = 0
+            while not game_state.game_over and steps < max_steps:
+                if player.alive:
+                    action = heuristic_agent.choose_action(game_state)
+                    if action:
+                        records.append((state_fn(player, enemy, game_state), action_index(action)))
+                        apply_action(game_state, player, action)
+                game_state.update(dt)
+                steps += 1
+
+            if records:
+                f.write(np.array(records, dtype=dtype).tobytes())
+                written += len(records)
+
+    return shard_path, written, len(seeds)
+
+
+def collect_demonstrations(path, num_episodes, state_fn=compact_state, state_size=6,
+                           num_workers=None, max_steps=500, dt=1/60, grid_size=GRID_SIZE,
+                           seed=None, log=print):
+    """
+    Record heuristic games into a memory-mapped dataset.
+
+    Args:
+        path: Dataset folder (created if missing, appended to if it exists)
+        num_episodes: Games to play
+        state_fn: state_fn(player, enemy, game_state) -> state_size floats;
+                  must be a module-level function (it is sent to workers)
+        state_size: Length of the state vectors
+        num_workers: Worker processes (default: CPU count; 0 plays in-process)
+        max_steps: Step limit per game
+        dt: Seconds per game tick
+        grid_size: Board size
+        seed: Seed of the first game (games get consecutive seeds), or None
+        log: Function used for progress messages
+
+    Returns:
+        DemoDataset over the whole folder
+    """
+    os.makedirs(path, exist_ok=True)
+    index = _load_index(path)
+    if index is None:
+        index = {'state_size': state_size, 'action_size': ACTION_SIZE, 'shards': []}
+    elif index['state_size'] != state_size:
+        raise ValueError(f"{path} holds states of size {index['state_size']}, not {state_size}")
+
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % (2 ** 31))
+    first_shard = len(index['shards'])
+    tasks = []
+    for start in range(0, num_episodes, EPISODES_PER_SHARD):
+        shard_path = os.path.join(path, f"shard_{first_shard + len(tasks):05d}.bin")
+        seeds = [seed + i for i in range(start, min(start + EPISODES_PER_SHARD, num_episodes))]
+        tasks.append((shard_path, seeds, state_fn, state_size, max_steps, dt, grid_size))
+
+    if num_workers is None:
+        num_workers = multiprocessing.cpu_count()
+    if num_workers > 0 and len(tasks) > 1:
+        pool = multiprocessing.get_context('spawn').Pool(min(num_workers, len(tasks)))
+        results = pool.imap_unordered(_collect_shard, tasks)
+    else:
+        pool = None
+        results = map(_collect_shard, tasks)
+
+    episodes = 0
+    try:
+        for shard_path, written, played in results:
+            episodes += played
+            index['shards'].append({'file': os.path.basename(shard_path), 'records': written,
+                                    'episodes': played})
+            index['shards'].sort(key=lambda shard: shard['file'])
+            _write_index(path, index)
+            total = sum(shard['records'] for shard in index['shards'])
+            log(f"  Collected {episodes}/{num_episodes} episodes ({total} samples in dataset)")
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    return DemoDataset(path)
+
+
+class DemoDataset:
+    """Memory-mapped (state, action) records."""
+
+    def __init__(self, path):
+        """
+        Open a dataset folder.
+
+        Args:
+            path: Folder written by collect_demonstrations
+        """
+        index = _load_index(path)
+        if index is None:
+            raise FileNotFoundError(f"No demonstration dataset in {path}")
+        self.path = path
+        self.state_size = index['state_size']
+        self.action_size = index['action_size']
+        self.episodes = sum(shard['episodes'] for shard in index['shards'])
+        dtype = record_dtype(self.state_size)
+
+        self.shards = []
+        for shard in index['shards']:
+            if shard['records'] > 0:
+                self.shards.append(np.memmap(os.path.join(path, shard['file']), dtype=dtype,
+                                             mode='r', shape=(shard['records'],)))
+        sizes = [len(shard) for shard in self.shards]
+        self.offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def take(self, indices):
+        """
+        Read records by global index.
+
+        Args:
+            indices: 1-D integer array
+
+        Returns:
+            (states float32 [n, state_size], actions int64 [n])
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        states = np.empty((len(indices), self.state_size), dtype=np.float32)
+        actions = np.empty(len(indices), dtype=np.int64)
+        shard_ids = np.searchsorted(self.offsets, indices, side='right') - 1
+        for shard_id in np.unique(shard_ids):
+            rows = np.flatnonzero(shard_ids == shard_id)
+            local = indices[rows] - self.offsets[shard_id]
+            order = np.argsort(local)  # Read the file front to back
+            records = self.shards[shard_id][local[order]]
+            states[rows[order]] = records['state']
+            actions[rows[order]] = records['action']
+        return states, actions
+
+    def batches(self, batch_size, shuffle=True, rng=None):
+        """
+        Stream one epoch of minibatches.
+
+        Args:
+            batch_size: Records per batch (the last one may be smaller)
+            shuffle: Visit records in random order
+            rng: numpy Generator (default: a fresh one)
+
+        Yields:
+            (states, actions) as returned by take()
+        """
+        n = len(self)
+        if shuffle:
+            order = (rng or np.random.default_rng()).permutation(n)
+        else:
+            order = np.arange(n)
+        for start in range(0, n, batch_size):
+            yield self.take(order[start:start + batch_size])
+
+
+def _load_index(path):
+    """Read dataset.json (None if the dataset does not exist yet)."""
+    index_file = os.path.join(path, INDEX_NAME)
+    if not os.path.exists(index_file):
+        return None
+    with open(index_file, 'r') as f:
+        return json.load(f)
+
+
+def _write_index(path, index):
+    """Write dataset.json through a temporary file."""
+    index_file = os.path.join(path, INDEX_NAME)
+    tmp_file = index_file + ".tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_file, index_file)
@@ -6,6 +6,7 @@ Shows educational information about reinforcement learning progress.
 import pygame
 import json
 from pathlib import Path
+from .text_cache import get_font
 
 
 class EducationalStatsScreen:
@@ -20,10 +21,10 @@ class EducationalStatsScreen:
         self.height = screen.get_height()
         
         # Fonts
-        self.title_font = pygame.font.Font(None, 56)
-        self.header_font = pygame.font.Font(None, 36)
-        self.text_font = pygame.font.Font(None, 24)
-        self.small_font = pygame.font.Font(None, 20)
+        self.title_font = get_font(56)
+        self.header_font = get_font(36)
+        self.text_font = get_font(24)
+        self.small_font = get_font(20)
         
         # Colors
         self.bg_color = (15, 15, 25)
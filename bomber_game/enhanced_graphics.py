@@ -5,9 +5,120 @@ Provides improved visual rendering for all game entities.
 
 import pygame
 import math
+from collections import OrderedDict
 from typing import Tuple
 
 
+# Animations are sampled this many times per second of their timer
+ANIMATION_STEPS_PER_SECOND = 30
+
+# Explosion fade is sampled in this many steps
+EXPLOSION_STEPS = 32
+
+# Power-up rotation is sampled every this many degrees
+POWERUP_ANGLE_STEP = 3
+
+
+class SpriteCache:
+    """
+    Bounded LRU cache of pre-rasterized effect sprites.
+    
+    Each sprite is drawn once with pygame.draw onto a transparent surface,
+    cropped to the pixels it uses, and stored with the offset from the
+    effect's anchor point (center or top-left, as the draw call expects).
+    """
+    
+    def __init__(self, max_size=2048):
+        """
+        Initialize sprite cache.
+        
+        Args:
+            max_size: Maximum number of sprites to keep
+        """
+        self.max_size = max_size
+        self.sprites = OrderedDict()
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def blit(self, screen, key, pixel_x, pixel_y, tile_size, draw):
+        """
+        Blit the sprite for key, rasterizing it on first use.
+        
+        Args:
+            screen: Pygame surface
+            key: Hashable description of the frame (effect, phase, tile_size, ...)
+            pixel_x, pixel_y: Anchor position on screen
+            tile_size: Size of tile
+            draw: Callable (surface, anchor_x, anchor_y) drawing the frame
+        """
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            self.misses += 1
+            sprite = self._rasterize(tile_size, draw)
+            self.sprites[key] = sprite
+            if len(self.sprites) > self.max_size:
+                self.sprites.popitem(last=False)
+                self.evictions += 1
+        else:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+        
+        image, (offset_x, offset_y) = sprite
+        screen.blit(image, (int(pixel_x) + offset_x, int(pixel_y) + offset_y))
+    
+    def _rasterize(self, tile_size, draw):
+        """Draw a frame on a padded transparent surface and crop it."""
+        # Effects spill past their tile (stink lines, heads, particles)
+        pad = max(tile_size, 48)
+        size = tile_size + 2 * pad
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        draw(surface, pad, pad)
+        
+        bounds = surface.get_bounding_rect()
+        if bounds.width == 0 or bounds.height == 0:
+            bounds = pygame.Rect(pad, pad, 1, 1)
+        image = surface.subsurface(bounds).copy()
+        
+        # Convert for faster blits (only if display is initialized)
+        try:
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+        except pygame.error:
+            pass
+        
+        return image, (bounds.x - pad, bounds.y - pad)
+    
+    def clear(self):
+        """Forget all sprites (statistics are kept)."""
+        self.sprites.clear()
+    
+    def get_hit_rate(self):
+        """Get fraction of draws served from the cache."""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+    
+    def get_stats(self):
+        """Get cache statistics."""
+        return {
+            'size': len(self.sprites),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.get_hit_rate(),
+        }
+
+
+def _animation_step(timer):
+    """Quantize an animation timer to the sprite cache sampling rate."""
+    return int(round(timer * ANIMATION_STEPS_PER_SECOND))
+
+
 class ProutManGraphics:
     """Enhanced graphics system for PROUTMAN theme."""
     
@@ -20,6 +131,9 @@ class ProutManGraphics:
     PLAYER_GREEN = (0, 255, 0)        # Player green
     PLAYER_RED = (255, 0, 0)          # AI player red
     
+    # Shared cache of rasterized effect frames
+    sprite_cache = SpriteCache()
+    
     @staticmethod
     def draw_enhanced_player(screen, pixel_x, pixel_y, color, direction='down', 
                             animation_frame=0, tile_size=56):
@@ -35,6 +149,137 @@ class ProutManGraphics:
             animation_frame: Current animation frame
             tile_size: Size of tile
         """
+        # Only the leg bob changes between animation frames
+        bob_offset = int(math.sin(animation_frame * math.pi) * 2)
+        key = ('player', tile_size, tuple(color), direction, bob_offset)
+        ProutManGraphics.sprite_cache.blit(
+            screen, key, pixel_x, pixel_y, tile_size,
+            lambda surf, x, y: ProutManGraphics._draw_player(
+                surf, x, y, color, direction, bob_offset, tile_size)
+        )
+    
+    @staticmethod
+    def draw_enhanced_prout(screen, pixel_x, pixel_y, timer, tile_size=56):
+        """
+        Draw enhanced prout (bomb) with smelly cloud effect.
+        
+        Args:
+            screen: Pygame surface
+            pixel_x: Pixel X position (center)
+            pixel_y: Pixel Y position (center)
+            timer: Remaining time before explosion
+            tile_size: Size of tile
+        """
+        step = _animation_step(timer)
+        key = ('prout', tile_size, step)
+        ProutManGraphics.sprite_cache.blit(
+            screen, key, pixel_x, pixel_y, tile_size,
+            lambda surf, x, y: ProutManGraphics._draw_prout(
+                surf, x, y, step / ANIMATION_STEPS_PER_SECOND, tile_size)
+        )
+    
+    @staticmethod
+    def draw_enhanced_caca(screen, pixel_x, pixel_y, duration, tile_size=56):
+        """
+        Draw enhanced caca (poop) with more detail.
+        
+        Args:
+            screen: Pygame surface
+            pixel_x: Pixel X position (top-left)
+            pixel_y: Pixel Y position (top-left)
+            duration: Remaining duration
+            tile_size: Size of tile
+        """
+        step = _animation_step(duration)
+        key = ('caca', tile_size, step)
+        ProutManGraphics.sprite_cache.blit(
+            screen, key, pixel_x, pixel_y, tile_size,
+            lambda surf, x, y: ProutManGraphics._draw_caca(
+                surf, x, y, step / ANIMATION_STEPS_PER_SECOND, tile_size)
+        )
+    
+    @staticmethod
+    def draw_enhanced_explosion(screen, pixel_x, pixel_y, timer, max_timer, tile_size=56):
+        """
+        Draw enhanced explosion with dramatic smelly cloud effect.
+        
+        Args:
+            screen: Pygame surface
+            pixel_x: Pixel X position (top-left)
+            pixel_y: Pixel Y position (top-left)
+            timer: Remaining time
+            max_timer: Maximum timer
+            tile_size: Size of tile
+        """
+        step = int(round(max(0.0, min(1.0, timer / max_timer)) * EXPLOSION_STEPS))
+        key = ('explosion', tile_size, step)
+        ProutManGraphics.sprite_cache.blit(
+            screen, key, pixel_x, pixel_y, tile_size,
+            lambda surf, x, y: ProutManGraphics._draw_explosion(
+                surf, x, y, step, EXPLOSION_STEPS, tile_size)
+        )
+    
+    @staticmethod
+    def draw_enhanced_wall(screen, pixel_x, pixel_y, tile_size=56, wall_type=1):
+        """
+        Draw enhanced walls with better visuals.
+        
+        Args:
+            screen: Pygame surface
+            pixel_x: Pixel X position (top-left)
+            pixel_y: Pixel Y position (top-left)
+            tile_size: Size of tile
+            wall_type: 1 for hard wall, 2 for soft wall
+        """
+        key = ('wall', tile_size, wall_type)
+        ProutManGraphics.sprite_cache.blit(
+            screen, key, pixel_x, pixel_y, tile_size,
+            lambda surf, x, y: ProutManGraphics._draw_wall(
+                surf, x, y, tile_size, wall_type)
+        )
+    
+    @staticmethod
+    def draw_enhanced_powerup(screen, pixel_x, pixel_y, powerup_type, tile_size=56):
+        """
+        Draw enhanced power-up with visual distinction.
+        
+        Args:
+            screen: Pygame surface
+            pixel_x: Pixel X position (center)
+            pixel_y: Pixel Y position (center)
+            powerup_type: Type of power-up (0-5)
+            tile_size: Size of tile
+        """
+        ticks = pygame.time.get_ticks()
+        size = int(tile_size * 0.4)
+        
+        # The square looks the same every 90 degrees
+        angle = int((ticks / 10) % 90) // POWERUP_ANGLE_STEP * POWERUP_ANGLE_STEP
+        glow_radius = int(size * 0.6 * (1 + 0.3 * math.sin(ticks / 200)))
+        key = ('powerup', tile_size, powerup_type, angle, glow_radius)
+        ProutManGraphics.sprite_cache.blit(
+            screen, key, pixel_x, pixel_y, tile_size,
+            lambda surf, x, y: ProutManGraphics._draw_powerup(
+                surf, x, y, powerup_type, tile_size, angle, glow_radius)
+        )
+    
+    # Primitive drawing, rasterized once per sprite cache key
+    
+    @staticmethod
+    def _draw_player(screen, pixel_x, pixel_y, color, direction='down', 
+                     bob_offset=0, tile_size=56):
+        """
+        Draw enhanced player character with more details.
+        
+        Args:
+            screen: Pygame surface
+            pixel_x: Pixel X position (center)
+            pixel_y: Pixel Y position (center)
+            color: Player color (RGB tuple)
+            direction: Direction player is facing
+            bob_offset: Leg offset of the walking animation (pixels)
+            tile_size: Size of tile
+        """
         # Player body (rounded rectangle)
         body_width = int(tile_size * 0.6)
         body_height = int(tile_size * 0.7)
@@ -91,9 +336,6 @@ class ProutManGraphics:
                         (pixel_x - 4, mouth_y), 
                         (pixel_x + 4, mouth_y), 2)
         
-        # Animation: bobbing effect
-        bob_offset = int(math.sin(animation_frame * math.pi) * 2)
-        
         # Legs (simple rectangles)
         leg_width = int(tile_size * 0.15)
         leg_height = int(tile_size * 0.25)
@@ -112,7 +354,7 @@ class ProutManGraphics:
                           (pixel_x - body_width // 4, pixel_y - body_height // 4), 4)
     
     @staticmethod
-    def draw_enhanced_prout(screen, pixel_x, pixel_y, timer, tile_size=56):
+    def _draw_prout(screen, pixel_x, pixel_y, timer, tile_size=56):
         """
         Draw enhanced prout (bomb) with smelly cloud effect.
         
@@ -166,7 +408,7 @@ class ProutManGraphics:
                              (pixel_x + 6, pixel_y + 10), 2)
     
     @staticmethod
-    def draw_enhanced_caca(screen, pixel_x, pixel_y, duration, tile_size=56):
+    def _draw_caca(screen, pixel_x, pixel_y, duration, tile_size=56):
         """
         Draw enhanced caca (poop) with more detail.
         
@@ -226,7 +468,7 @@ class ProutManGraphics:
                           (pixel_x + tile_size // 2 - 8, pixel_y + tile_size - 32), 5)
     
     @staticmethod
-    def draw_enhanced_explosion(screen, pixel_x, pixel_y, timer, max_timer, tile_size=56):
+    def _draw_explosion(screen, pixel_x, pixel_y, timer, max_timer, tile_size=56):
         """
         Draw enhanced explosion with dramatic smelly cloud effect.
         
@@ -260,8 +502,8 @@ class ProutManGraphics:
         
         screen.blit(surf, (pixel_x, pixel_y))
         
-        # Draw stink particles
-        stink_color = (*ProutManGraphics.STINK_GREEN, alpha)
+        # Draw stink particles (opaque, like when drawn straight on the screen)
+        stink_color = ProutManGraphics.STINK_GREEN
         num_particles = 6
         for i in range(num_particles):
             angle = (i / num_particles) * 2 * math.pi
@@ -275,7 +517,7 @@ class ProutManGraphics:
                 pygame.draw.circle(screen, stink_color, (x, y), particle_radius)
     
     @staticmethod
-    def draw_enhanced_wall(screen, pixel_x, pixel_y, tile_size=56, wall_type=1):
+    def _draw_wall(screen, pixel_x, pixel_y, tile_size=56, wall_type=1):
         """
         Draw enhanced walls with better visuals.
         
@@ -317,7 +559,8 @@ class ProutManGraphics:
                            (pixel_x + tile_size - 5, pixel_y + 5), 1)
     
     @staticmethod
-    def draw_enhanced_powerup(screen, pixel_x, pixel_y, powerup_type, tile_size=56):
+    def _draw_powerup(screen, pixel_x, pixel_y, powerup_type, tile_size=56,
+                       angle=0, glow_radius=None):
         """
         Draw enhanced power-up with visual distinction.
         
@@ -327,6 +570,8 @@ class ProutManGraphics:
             pixel_y: Pixel Y position (center)
             powerup_type: Type of power-up (0-5)
             tile_size: Size of tile
+            angle: Rotation of the square in degrees
+            glow_radius: Radius of the glow ring (None for the resting size)
         """
         # Power-up colors and symbols
         powerup_info = {
@@ -342,7 +587,6 @@ class ProutManGraphics:
         
         # Draw rotating square
         size = int(tile_size * 0.4)
-        angle = (pygame.time.get_ticks() / 10) % 360
         
         # Create rotated square
         corners = [
@@ -365,5 +609,6 @@ class ProutManGraphics:
         pygame.draw.polygon(screen, tuple(max(0, c - 100) for c in color), rotated, 2)
         
         # Add pulsing glow
-        glow_radius = int(size * 0.6 * (1 + 0.3 * math.sin(pygame.time.get_ticks() / 200)))
+        if glow_radius is None:
+            glow_radius = int(size * 0.6)
         pygame.draw.circle(screen, color, (pixel_x, pixel_y), glow_radius, 1)
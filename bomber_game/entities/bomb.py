@@ -3,7 +3,6 @@ Trump (Prout) entity for Trump Man game.
 A smelly trump instead of a bomb!
 """
 
-import pygame
 from .entity import Entity
 from ..assets import get_asset_manager
 from ..enhanced_graphics import ProutManGraphics
@@ -28,21 +27,25 @@ class Bomb(Entity):
         self.bomb_range = bomb_range
         self.owner = owner
         self.timer = 3.0  # 3 seconds until explosion
+        self.max_timer = 3.0
         self.exploded = False
         
         # Load sprite
         self.sprite = None
+        self.pulse_frames = []
         self._load_sprite()
     
     def _load_sprite(self):
-        """Load bomb sprite."""
+        """Load bomb sprite and its pulse frames."""
         try:
             assets = get_asset_manager()
             # Match player sprite size: 28x28
             self.sprite = assets.get_bomb_sprite((28, 28))
+            self.pulse_frames = assets.get_bomb_pulse_frames((28, 28))
         except Exception as e:
             print(f"Could not load bomb sprite: {e}")
             self.sprite = None
+            self.pulse_frames = []
         
     def update(self, dt):
         """Update bomb timer."""
@@ -67,13 +70,11 @@ class Bomb(Entity):
             sprite_rect.centerx = pixel_x
             sprite_rect.centery = pixel_y
             
-            # Pulsing effect - scale based on timer
-            if self.timer < 1.0:
-                pulse_scale = 1.0 + 0.2 * (1.0 - self.timer)  # Grow as timer runs out
-                scaled_sprite = pygame.transform.scale(
-                    self.sprite,
-                    (int(28 * pulse_scale), int(28 * pulse_scale))
-                )
+            # Pulsing effect - grow as timer runs out (nearest precomputed frame)
+            if self.timer < 1.0 and self.pulse_frames:
+                progress = min(1.0, max(0.0, 1.0 - self.timer))
+                index = int(round(progress * (len(self.pulse_frames) - 1)))
+                scaled_sprite = self.pulse_frames[index]
                 scaled_rect = scaled_sprite.get_rect()
                 scaled_rect.centerx = pixel_x
                 scaled_rect.centery = pixel_y
@@ -8,6 +8,7 @@ import pygame
 import random
 from .entity import Entity
 from .bomb import Bomb
+from ..text_cache import get_text_cache
 
 
 class BombMachine(Entity):
@@ -100,6 +101,7 @@ class BombMachine(Entity):
                 # Create bomb with no owner (machine-dropped)
                 bomb = Bomb(bomb_pos[0], bomb_pos[1], self.bomb_range, None)
                 bomb.timer = self.bomb_timer  # Set custom timer (10 seconds)
+                bomb.max_timer = self.bomb_timer
                 return bomb
                 
         return None
@@ -139,7 +141,8 @@ class BombMachine(Entity):
                                 positions.append((x, y))
             
             if positions:
-                return random.choice(positions)
+                rng = getattr(game_state, 'rng', random)
+                return rng.choice(positions)
                 
         return None
         
@@ -201,8 +204,7 @@ class BombMachine(Entity):
             
         # Draw timer text
         time_until_drop = self.interval - self.timer
-        font = pygame.font.Font(None, 16)
-        timer_text = font.render(f"{time_until_drop:.1f}s", True, (255, 255, 255))
+        timer_text = get_text_cache().render(f"{time_until_drop:.1f}s", 16, (255, 255, 255))
         timer_rect = timer_text.get_rect(center=(center_x, y + tile_size + 10))
         
         # Draw background for text
@@ -11,17 +11,19 @@ from ..enhanced_graphics import ProutManGraphics
 class Explosion(Entity):
     """Smelly explosion from a trump (prout)!"""
     
-    def __init__(self, x, y):
+    def __init__(self, x, y, owner=None):
         """
         Initialize explosion.
         
         Args:
             x: Grid x position
             y: Grid y position
+            owner: Player whose bomb caused it (None for bomb machine bombs)
         """
         super().__init__(x, y, 32, 32)
         self.grid_x = x
         self.grid_y = y
+        self.owner = owner
         self.timer = 0.5  # Duration in seconds
         self.max_timer = 0.5
         
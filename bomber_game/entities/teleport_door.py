@@ -5,6 +5,7 @@ Allows players to teleport between door pairs on the map borders.
 
 import pygame
 from .entity import Entity
+from ..text_cache import get_text_cache
 
 
 class TeleportDoor(Entity):
@@ -123,8 +124,7 @@ class TeleportDoor(Entity):
         pygame.draw.circle(screen, (200, 200, 255), (center_x, center_y), inner_radius, 1)
         
         # Draw door ID
-        font = pygame.font.Font(None, 20)
-        text = font.render(str(self.door_id), True, (255, 255, 255))
+        text = get_text_cache().render(str(self.door_id), 20, (255, 255, 255))
         text_rect = text.get_rect(center=(center_x, center_y))
         screen.blit(text, text_rect)
 
@@ -143,15 +143,17 @@ class TeleportDoorManager:
         self.doors = []
         self.door_pairs = []
         
-    def create_door_pairs(self, num_pairs):
+    def create_door_pairs(self, num_pairs, rng=None):
         """
         Create pairs of linked teleport doors next to borders (walkable positions).
         Doors are placed one tile inside the border walls so players can walk on them.
         
         Args:
             num_pairs: Number of door pairs to create
+            rng: Random number generator (defaults to the random module)
         """
         import random
+        rng = rng or random
         
         # Define border positions - ONE TILE INSIDE the border walls (walkable)
         border_positions = []
@@ -173,7 +175,7 @@ class TeleportDoorManager:
             border_positions.append((self.grid_size - 2, y))
             
         # Shuffle and select positions
-        random.shuffle(border_positions)
+        rng.shuffle(border_positions)
         
         # Create door pairs
         colors = [
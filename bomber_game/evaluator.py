@@ -0,0 +1,285 @@
+"""
+Evaluator - checkpoint evaluation in a background process.
+
+The learner never plays evaluation games. It saves 'eval' checkpoints
+with its CheckpointWriter and carries on collecting samples. A
+BackgroundEvaluator process watches the writer's checkpoints.json and
+evaluates each new checkpoint. When it falls behind it skips straight
+to the newest one. An evaluation is a seeded suite: games against every
+suite opponent in turn on fixed map seeds, so every checkpoint plays
+the same maps. The games run on the trainer's backends (ProcessBackend
+worker processes by default) with the agent playing greedily.
+
+Results go to a TrainingMetricsStore next to the training stats. The
+columns hold one row per evaluation (training episode, overall and
+per-opponent win rates and rewards); the summary holds the latest
+results and the best checkpoint, which is also copied to
+best_model_path. The learner reads the small summary file
+(BackgroundEvaluator.poll) for progress output and early stopping.
+"""
+
+import itertools
+import json
+import multiprocessing
+import os
+import shutil
+import time
+
+import numpy as np
+
+from .checkpoint_writer import INDEX_NAME
+from .metrics_store import TrainingMetricsStore, load_summary
+from .trainer import Learner, Trainer, make_backend
+
+
+class EvalLearner(Learner):
+    """Plays the agent greedily and learns nothing (evaluation games)."""
+
+    def __init__(self, agent, update_interval=None):
+        super().__init__(agent, update_interval)
+        agent.training = False
+        if getattr(agent, 'policy', None) is not None:
+            agent.policy.eval()
+
+    def act(self, env, game_state, player):
+        self.agent.player = player
+        return self.agent.choose_action(game_state)
+
+    def observe(self, env, reward, done, game_state, player):
+        pass
+
+    def take_episode(self, env):
+        return None
+
+    def add_episode(self, episode):
+        pass
+
+
+class SuiteOpponents:
+    """Opponent factory of an evaluation suite (picklable, sent to worker processes)."""
+
+    def __init__(self, suite):
+        """
+        Initialize suite opponents.
+
+        Args:
+            suite: Sequence of (name, opponent factory) pairs
+        """
+        self.factories = dict(suite)
+
+    def __call__(self, player, name):
+        return self.factories[name](player)
+
+
+class SuiteSchedule:
+    """Trainer matchmaker playing the suite opponents in turn."""
+
+    def __init__(self, names):
+        self.names = itertools.cycle(names)
+
+    def next_opponent(self):
+        return next(self.names)
+
+
+def metric_columns(suite):
+    """Metric columns written for an evaluation suite."""
+    columns = ['episode', 'win_rate', 'avg_reward']
+    for name, _ in suite:
+        columns += [f"win_rate_{name}", f"avg_reward_{name}"]
+    return columns
+
+
+def evaluate_checkpoint(path, agent_cls, suite, episodes, backend, max_steps=300, seed=0):
+    """
+    Play the evaluation suite with a checkpoint.
+
+    Args:
+        path: Checkpoint file (loaded with agent_cls(None, model_path=path))
+        agent_cls: Agent class of the checkpoint
+        suite: Sequence of (name, opponent factory) pairs
+        episodes: Games against each opponent
+        backend: Trainer backend the games run on (reused between calls)
+        max_steps: Step limit per game
+        seed: Map seed of the first game (then +1 per game)
+
+    Returns:
+        Dictionary with overall win_rate, avg_reward and avg_length, and
+        the same per opponent under 'opponents'
+    """
+    names = [name for name, _ in suite]
+    trainer = Trainer(EvalLearner(agent_cls(None, model_path=path, training=False)),
+                      SuiteOpponents(suite), backend=backend, max_steps=max_steps,
+                      names=("Agent", "Opponent"), seed=seed, learn=False,
+                      matchmaker=SuiteSchedule(names))
+    results = trainer.run(episodes * len(names))
+
+    def summarize(played):
+        return {
+            'games': len(played),
+            'win_rate': sum(result.won for result in played) / max(len(played), 1) * 100,
+            'avg_reward': float(np.mean([result.reward for result in played])) if played else 0.0,
+            'avg_length': float(np.mean([result.steps for result in played])) if played else 0.0,
+        }
+
+    evaluation = summarize(results)
+    evaluation['opponents'] = {name: summarize([result for result in results if result.opponent == name])
+                               for name in names}
+    return evaluation
+
+
+def _read_index(index_file):
+    """Read the checkpoint writer's index (empty if there is none yet)."""
+    if not os.path.exists(index_file):
+        return []
+    with open(index_file, 'r') as f:
+        return json.load(f)
+
+
+def _evaluator_main(options, stop):
+    """Evaluator process: evaluate new checkpoints until told to stop."""
+    checkpoint_dir = options['checkpoint_dir']
+    index_file = os.path.join(checkpoint_dir, INDEX_NAME)
+    suite = options['suite']
+    store = TrainingMetricsStore(options['metrics_file'], columns=metric_columns(suite))
+    summary = store.load({'evaluations': 0, 'last_episode': -1, 'best_win_rate': -1.0})
+    backend = make_backend(options['num_envs'], options['num_workers'])
+    candidate_base = os.path.splitext(options['metrics_file'])[0] + "_candidate"
+
+    try:
+        while True:
+            stopping = stop.is_set()  # Read first: checkpoints written before the stop still count
+            entries = [entry for entry in _read_index(index_file)
+                       if 'eval' in entry['kinds'] and entry['episode'] > summary['last_episode']]
+            if not entries:
+                if stopping:
+                    break
+                stop.wait(options['poll_seconds'])
+                continue
+
+            entry = max(entries, key=lambda entry: entry['episode'])
+            # Evaluate a private copy: retention may delete the original while the games run
+            candidate = candidate_base + os.path.splitext(entry['file'])[1]
+            try:
+                shutil.copyfile(os.path.join(checkpoint_dir, entry['file']), candidate)
+            except OSError:
+                # Already deleted by retention: a newer checkpoint replaced it
+                summary['last_episode'] = entry['episode']
+                continue
+            start = time.perf_counter()
+            evaluation = evaluate_checkpoint(candidate, options['agent_cls'], suite, options['episodes'],
+                                             backend, options['max_steps'], options['seed'])
+
+            store.append('episode', entry['episode'])
+            store.append('win_rate', evaluation['win_rate'])
+            store.append('avg_reward', evaluation['avg_reward'])
+            for name, _ in suite:
+                store.append(f"win_rate_{name}", evaluation['opponents'][name]['win_rate'])
+                store.append(f"avg_reward_{name}", evaluation['opponents'][name]['avg_reward'])
+
+            evaluation['episode'] = entry['episode']
+            evaluation['checkpoint'] = entry['file']
+            evaluation['seconds'] = time.perf_counter() - start
+            summary['evaluations'] += 1
+            summary['last_episode'] = entry['episode']
+            summary['latest'] = evaluation
+            if evaluation['win_rate'] > summary['best_win_rate']:
+                summary['best_win_rate'] = evaluation['win_rate']
+                summary['best_episode'] = entry['episode']
+                best_path = options['best_model_path']
+                if best_path:
+                    shutil.copyfile(candidate, best_path + ".tmp")
+                    os.replace(best_path + ".tmp", best_path)
+            store.save(summary)
+    finally:
+        backend.close()
+
+
+class BackgroundEvaluator:
+    """Runs checkpoint evaluations in a separate process."""
+
+    def __init__(self, checkpoint_dir, metrics_file, agent_cls, suite, episodes=20,
+                 num_workers=2, num_envs=1, max_steps=300, seed=0, best_model_path=None,
+                 poll_seconds=5.0):
+        """
+        Initialize background evaluator (the process starts with start()).
+
+        Args:
+            checkpoint_dir: Folder of the learner's CheckpointWriter; every
+                            checkpoint tagged 'eval' is evaluated
+            metrics_file: Summary file of the evaluation metrics store
+            agent_cls: Agent class the checkpoints are loaded with
+            suite: Sequence of (name, opponent factory) pairs; factories
+                   must be picklable (classes or module-level functions)
+            episodes: Games against each opponent per evaluation
+            num_workers: Worker processes playing the games (0: play in
+                         the evaluator process)
+            num_envs: Games stepped together per process
+            max_steps: Step limit per game
+            seed: Map seed of the first game of every evaluation
+            best_model_path: Where the best evaluated checkpoint is copied
+            poll_seconds: Wait between looks for new checkpoints
+        """
+        self.metrics_file = metrics_file
+        self.options = {
+            'checkpoint_dir': checkpoint_dir, 'metrics_file': metrics_file,
+            'agent_cls': agent_cls, 'suite': list(suite), 'episodes': episodes,
+            'num_workers': num_workers, 'num_envs': num_envs, 'max_steps': max_steps,
+            'seed': seed, 'best_model_path': best_model_path, 'poll_seconds': poll_seconds,
+        }
+        self.process = None
+        self.stop_event = None
+        self.seen = None
+
+    def start(self):
+        """Start the evaluator process."""
+        # Results from an earlier run are not reported as new
+        summary = load_summary(self.metrics_file) if os.path.exists(self.metrics_file) else None
+        self.seen = summary.get('evaluations', 0) if summary else 0
+
+        context = multiprocessing.get_context('spawn')
+        self.stop_event = context.Event()
+        # Not a daemon: it starts its own game worker processes
+        self.process = context.Process(target=_evaluator_main, args=(self.options, self.stop_event),
+                                       name="BackgroundEvaluator")
+        self.process.start()
+
+    def poll(self):
+        """
+        Get the evaluation summary if an evaluation finished since the last call.
+
+        Returns:
+            Summary dictionary (results under 'latest'), or None
+
+        Raises:
+            RuntimeError: If the evaluator process died
+        """
+        if self.process is not None and not self.process.is_alive():
+            exitcode = self.process.exitcode
+            self.process = None
+            raise RuntimeError(f"Background evaluator exited unexpectedly (exit code {exitcode})")
+        try:
+            summary = load_summary(self.metrics_file)
+        except (OSError, ValueError):
+            return None
+        if not summary or summary.get('evaluations', 0) <= self.seen:
+            return None
+        self.seen = summary['evaluations']
+        return summary
+
+    def stop(self, finish=True, timeout=None):
+        """
+        Stop the evaluator process.
+
+        Args:
+            finish: Evaluate the newest unevaluated checkpoint first
+                    (flush the checkpoint writer before calling)
+            timeout: Seconds to wait before terminating it
+        """
+        if self.process is None:
+            return
+        self.stop_event.set()
+        self.process.join(timeout if finish else 0)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.process = None
@@ -6,6 +6,7 @@ import pygame
 import sys
 import os
 import time
+import random
 from datetime import datetime
 from pathlib import Path
 from . import (GRID_SIZE, TILE_SIZE, FPS, SCREEN_WIDTH, SCREEN_HEIGHT,
@@ -24,7 +25,9 @@ from .game_statistics import GameStatistics
 from .stats_panel import StatsPanel
 from .educational_stats import EducationalStatsScreen
 from .video_recorder import VideoRecorder
-from .enhanced_graphics import ProutManGraphics
+from .game_recorder import GameRecorder
+from .scene_renderer import SceneRenderer
+from .text_cache import get_font, get_text_cache
 
 
 class BombermanGame:
@@ -47,9 +50,10 @@ class BombermanGame:
         self.stats_panel = StatsPanel(SCREEN_WIDTH, 0, self.stats_panel_width, SCREEN_HEIGHT)
         self.educational_stats = EducationalStatsScreen(self.screen)
         
-        # Font
-        self.font = pygame.font.Font(None, 24)
-        self.big_font = pygame.font.Font(None, 48)
+        # Font (text surfaces are cached across frames)
+        get_text_cache().preload()
+        self.font = get_font(24)
+        self.big_font = get_font(48)
         
         # Menu system
         self.menu = MenuScreen(self.screen)
@@ -59,14 +63,8 @@ class BombermanGame:
         self.video_recorder = VideoRecorder(output_dir="recordings", fps=FPS)
         self.show_recording_hint = True  # Show hint on first run
         
-        # Game state
-        self.game_state = GameState(GRID_SIZE)
-        
-        # Create players
-        self.human_player = self.game_state.add_player(1, 1, GREEN, "Player")
-        self.ai_player = self.game_state.add_player(
-            GRID_SIZE - 2, GRID_SIZE - 2, RED, "AI"
-        )
+        # Game state and players (seeded so the game can be replayed)
+        self._new_game_state()
         
         # Use intelligent model selector
         models_dir = os.path.join(os.path.dirname(__file__), "models")
@@ -185,31 +183,62 @@ class BombermanGame:
         self.assets = get_asset_manager()
         self.wall_sprite = None
         self._load_sprites()
+        
+        # Rendering: static map baked once per game, dirty rects per frame
+        self.scene = SceneRenderer(self.game_state, TILE_SIZE, self.wall_sprite)
+        self.ui_rect = pygame.Rect(0, GRID_SIZE * TILE_SIZE, SCREEN_WIDTH,
+                                   SCREEN_HEIGHT - GRID_SIZE * TILE_SIZE)
+        self.panel_rect = pygame.Rect(SCREEN_WIDTH, 0, self.stats_panel_width, SCREEN_HEIGHT)
+        self.full_redraw = True
+    
+    def _new_game_state(self):
+        """Create a new seeded game with both players and start its input log."""
+        self.seed = random.randrange(2 ** 31)
+        self.game_state = GameState(GRID_SIZE, seed=self.seed)
+        self.human_player = self.game_state.add_player(1, 1, GREEN, "Player")
+        self.ai_player = self.game_state.add_player(
+            GRID_SIZE - 2, GRID_SIZE - 2, RED, "AI"
+        )
+        
+        # Seed + initial state + per-tick inputs are enough to re-render the game
+        self.replay = GameRecorder(seed=self.seed)
+        self.replay.set_initial_state(self.game_state)
+    
+    def _save_replay(self):
+        """Close the input log and export it if BOMBERMAN_SAVE_REPLAYS is set."""
+        winner = self.game_state.winner.name if self.game_state.winner else None
+        self.replay.finish_recording(winner)
+        
+        if os.environ.get('BOMBERMAN_SAVE_REPLAYS', '').lower() in ['true', '1', 'yes']:
+            path = self.replay.export_binary()
+            self.replay.export_summary()
+            print(f"🎞️  Replay saved: {path}")
+            print(f"   Render it with: python render_replays.py {path}")
     
     def _load_sprites(self):
         """Load game sprites."""
         try:
             self.wall_sprite = self.assets.get_wall_sprite((TILE_SIZE, TILE_SIZE))
+            self.assets.get_bomb_pulse_frames((28, 28))  # Precompute pulse animation
         except Exception as e:
             print(f"Could not load wall sprite: {e}")
             self.wall_sprite = None
     
     def _load_ai_stats(self):
-        """Load AI training statistics."""
-        import json
+        """Load AI training statistics (summary only, not the metric columns)."""
+        from .metrics_store import load_summary
         stats_file = os.path.join(os.path.dirname(__file__), "models", "training_stats.json")
-        if os.path.exists(stats_file):
-            try:
-                with open(stats_file, 'r') as f:
-                    data = json.load(f)
-                    # Calculate win rate
-                    total_episodes = data.get('total_episodes', 0)
-                    total_wins = data.get('total_wins', 0)
-                    win_rate = (total_wins / total_episodes * 100) if total_episodes > 0 else 0
-                    data['win_rate'] = win_rate
-                    return data
-            except Exception as e:
-                print(f"Could not load AI stats: {e}")
+        try:
+            data = load_summary(stats_file)
+            if data is not None:
+                # Calculate win rate
+                total_episodes = data.get('total_episodes', 0)
+                total_wins = data.get('total_wins', 0)
+                win_rate = (total_wins / total_episodes * 100) if total_episodes > 0 else 0
+                data['win_rate'] = win_rate
+            return data
+        except Exception as e:
+            print(f"Could not load AI stats: {e}")
         return None
     
     def _format_time(self, seconds):
@@ -233,6 +262,7 @@ class BombermanGame:
                 if event.key == pygame.K_ESCAPE:
                     # Show educational statistics screen
                     action = self.educational_stats.show(self.stats, self.ai_agent, self.game_state)
+                    self.full_redraw = True
                     if action == 'quit':
                         self.running = False
                     elif action == 'restart':
@@ -241,6 +271,7 @@ class BombermanGame:
                 elif event.key == pygame.K_e:
                     # Also show educational stats with E key
                     action = self.educational_stats.show(self.stats, self.ai_agent, self.game_state)
+                    self.full_redraw = True
                     if action == 'quit':
                         self.running = False
                     elif action == 'restart':
@@ -257,12 +288,13 @@ class BombermanGame:
                         if is_recording:
                             self.show_recording_hint = False
                 elif event.key == pygame.K_SPACE:
-                    if self.human_player.alive:
-                        self.game_state.place_bomb(self.human_player)
-                        self.stats.record_bomb(True)
+                    # Only placed bombs are logged (the catalog counts them)
+                    if self.human_player.alive and self.game_state.place_bomb(self.human_player):
+                        self.replay.log_bomb(0)
                 elif event.key == pygame.K_c:
                     if self.human_player.alive:
                         self.game_state.place_caca(self.human_player)
+                        self.replay.log_caca(0)
                 elif event.key == pygame.K_s:
                     # Save recording with game statistics
                     if self.video_recorder.is_recording:
@@ -293,6 +325,7 @@ class BombermanGame:
         if self.human_player.alive:
             old_pos = (self.human_player.grid_x, self.human_player.grid_y)
             self.human_player.move(dx, dy, self.game_state.grid, TILE_SIZE, self.game_state)
+            self.replay.log_move(0, dx, dy)
             new_pos = (self.human_player.grid_x, self.human_player.grid_y)
             
             # Track movement
@@ -308,102 +341,57 @@ class BombermanGame:
             if action:
                 ai_dx, ai_dy, place_bomb = action
                 self.ai_player.move(ai_dx, ai_dy, self.game_state.grid, TILE_SIZE, self.game_state)
+                self.replay.log_move(1, ai_dx, ai_dy)
                 new_pos = (self.ai_player.grid_x, self.ai_player.grid_y)
                 
                 # Track movement
                 if old_pos != new_pos:
                     self.stats.record_move(False, new_pos, self.game_state)
                 
-                if place_bomb:
-                    self.game_state.place_bomb(self.ai_player)
-                    self.stats.record_bomb(False)
+                if place_bomb and self.game_state.place_bomb(self.ai_player):
+                    self.replay.log_bomb(1)
             self.ai_player.update(dt)  # Update animation
         
         # Update game state
         self.game_state.update(dt)
+        self.stats.record_events(self.game_state.tick_events, self.human_player)
+        self.replay.log_tick(dt, self.game_state)
+        
+        if self.game_state.game_over:
+            self._save_replay()
     
     def render(self):
         """Render the game."""
-        self.screen.fill(BLACK)
-        
-        # Capture frame if recording
-        if self.video_recorder.is_recording:
-            self.video_recorder.capture_frame(self.screen)
-        
-        # Draw grid
-        self._draw_grid()
-        
-        # Draw teleport doors
-        if self.game_state.teleport_doors:
-            self.game_state.teleport_doors.draw(self.screen, TILE_SIZE)
-        
-        # Draw bomb machine
-        if self.game_state.bomb_machine:
-            self.game_state.bomb_machine.draw(self.screen, TILE_SIZE)
-        
-        # Draw power-ups
-        for powerup in self.game_state.powerups.values():
-            powerup.render(self.screen, TILE_SIZE)
-        
-        # Draw cacas (poop blocks)
-        for caca in self.game_state.cacas:
-            caca.render(self.screen, TILE_SIZE)
-        
-        # Draw bombs
-        for bomb in self.game_state.bombs:
-            bomb.render(self.screen, TILE_SIZE)
-        
-        # Draw explosions
-        for explosion in self.game_state.explosions:
-            explosion.render(self.screen, TILE_SIZE)
-        
-        # Draw players
-        for player in self.game_state.players:
-            if player.alive:
-                player.render(self.screen, TILE_SIZE)
+        # Game over overlay is translucent, so redraw everything under it
+        full_redraw = self.full_redraw or self.game_state.game_over
+        if full_redraw:
+            self.screen.fill(BLACK)
+        scene_redrawn, scene_rects = self.scene.render(self.screen, full_redraw)
+        full_redraw = full_redraw or scene_redrawn
         
         # Draw UI
+        self.screen.fill(BLACK, self.ui_rect)
         self._draw_ui()
         
-        # Draw statistics panel
-        self.stats_panel.draw(self.screen, self.stats, self.game_state)
+        # Draw statistics panel (only pushed to the display when it changed)
+        panel_changed = self.stats_panel.draw(self.screen, self.stats, self.game_state)
         
         # Draw game over screen
         if self.game_state.game_over:
             self._draw_game_over()
         
-        pygame.display.flip()
-    
-    def _draw_grid(self):
-        """Draw the game grid."""
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                pixel_x = x * TILE_SIZE
-                pixel_y = y * TILE_SIZE
-                
-                tile = self.game_state.grid[y][x]
-                
-                # Draw tile background with alternating pattern
-                if (x + y) % 2 == 0:
-                    color = (34, 139, 34)  # Forest green
-                else:
-                    color = (50, 205, 50)  # Lime green
-                
-                pygame.draw.rect(self.screen, color,
-                               (pixel_x, pixel_y, TILE_SIZE, TILE_SIZE))
-                
-                # Draw walls using enhanced graphics
-                if tile == 1:  # Indestructible wall
-                    if self.wall_sprite:
-                        self.screen.blit(self.wall_sprite, (pixel_x, pixel_y))
-                    else:
-                        ProutManGraphics.draw_enhanced_wall(
-                            self.screen, pixel_x, pixel_y, TILE_SIZE, wall_type=1
-                        )
-                elif tile == 2:  # Soft wall (destructible)
-                    ProutManGraphics.draw_enhanced_wall(
-                        self.screen, pixel_x, pixel_y, TILE_SIZE, wall_type=2
-                    )
+        # Capture frame if recording
+        if self.video_recorder.is_recording:
+            self.video_recorder.capture_frame(self.screen)
+        
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            updated = scene_rects + [self.ui_rect]
+            if panel_changed:
+                updated.append(self.panel_rect)
+            pygame.display.update(updated)
+        self.full_redraw = False
     
     def _draw_ui(self):
         """Draw user interface."""
@@ -507,7 +495,7 @@ class BombermanGame:
             games = self.ai_agent.total_games
             
             stats_y = SCREEN_HEIGHT // 2 - 20
-            stats_font = pygame.font.Font(None, 20)
+            stats_font = get_font(20)
             
             stats_lines = [
                 f"AI Performance:",
@@ -699,11 +687,7 @@ class BombermanGame:
             self.stats.finish_game(self.game_state.winner.name)
         
         # Reset game state
-        self.game_state = GameState(GRID_SIZE)
-        self.human_player = self.game_state.add_player(1, 1, GREEN, "Player")
-        self.ai_player = self.game_state.add_player(
-            GRID_SIZE - 2, GRID_SIZE - 2, RED, "AI"
-        )
+        self._new_game_state()
         
         # Reload AI with same type
         models_dir = os.path.join(os.path.dirname(__file__), "models")
@@ -722,10 +706,10 @@ class BombermanGame:
         # Reset statistics for new game
         self.stats = GameStatistics()
         self.stats.set_ai_info(self.ai_type, selection.get('model_path'))
-        self.stats_panel.human_perf_history = []
-        self.stats_panel.ai_perf_history = []
+        self.stats_panel.reset()
         
         self._load_sprites()  # Reload sprites
+        self.scene = SceneRenderer(self.game_state, TILE_SIZE, self.wall_sprite)
     
     def run(self):
         """Main game loop."""
@@ -5,6 +5,7 @@ Game Recap Screen - Detailed end-game statistics and analysis.
 import pygame
 import json
 from pathlib import Path
+from .text_cache import get_font
 
 
 class GameRecap:
@@ -21,10 +22,10 @@ class GameRecap:
         self.ai_info = ai_info
         
         # Fonts
-        self.title_font = pygame.font.Font(None, 56)
-        self.header_font = pygame.font.Font(None, 36)
-        self.text_font = pygame.font.Font(None, 24)
-        self.small_font = pygame.font.Font(None, 20)
+        self.title_font = get_font(56)
+        self.header_font = get_font(36)
+        self.text_font = get_font(24)
+        self.small_font = get_font(20)
         
         # Colors
         self.bg_color = (20, 20, 40)
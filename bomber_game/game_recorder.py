@@ -8,6 +8,39 @@ from datetime import datetime
 from pathlib import Path
 import gzip
 
+from .game_state import EVENT_PLAYER_KILLED
+from .replay_format import StateTrack, ReplayReader, write_replay
+
+
+# Input log encoding: every tick is stored as [dt, op, op, ...] where
+# op = player_index * OPS_PER_PLAYER + code. Codes 0-8 are moves
+# ((dx + 1) * 3 + (dy + 1)), followed by bomb and caca placement.
+OPS_PER_PLAYER = 16
+OP_BOMB = 9
+OP_CACA = 10
+
+
+def encode_move(dx, dy):
+    """Get the op code for a move in direction (dx, dy)."""
+    return (dx + 1) * 3 + (dy + 1)
+
+
+def decode_move(code):
+    """Get the (dx, dy) direction of a move op code."""
+    return code // 3 - 1, code % 3 - 1
+
+
+def load_replay_file(path):
+    """Load a full replay from a .replay, .json or .json.gz file."""
+    path = Path(path)
+    if path.suffix == '.replay':
+        return ReplayReader(path).to_replay()
+    if path.suffix == '.gz':
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    with open(path, 'r') as f:
+        return json.load(f)
+
 
 class GameRecorder:
     """
@@ -15,10 +48,11 @@ class GameRecorder:
     Exports data at end of game for review and training.
     """
     
-    def __init__(self, game_id=None):
+    def __init__(self, game_id=None, seed=None):
         self.game_id = game_id or datetime.now().strftime("%Y%m%d_%H%M%S")
         self.recording = {
             'game_id': self.game_id,
+            'seed': seed,
             'start_time': datetime.now().isoformat(),
             'end_time': None,
             'duration': 0,
@@ -29,14 +63,19 @@ class GameRecorder:
             'events': [],
             'frames': [],
             'statistics': {},
+            'ticks': [],
         }
         
         self.start_time = time.time()
         self.frame_count = 0
         self.recording_enabled = True
+        self.pending_ops = []
+        self.track = None
         
     def set_initial_state(self, game_state):
         """Record initial game state."""
+        if game_state.seed is not None:
+            self.recording['seed'] = game_state.seed
         self.recording['initial_state'] = {
             'grid_size': len(game_state.grid),
             'wall_layout': self._serialize_grid(game_state.grid),
@@ -61,6 +100,7 @@ class GameRecorder:
                 for p in game_state.powerups.values()
             ]
         }
+        self.track = StateTrack(game_state)
     
     def record_action(self, player_name, action_type, details=None):
         """Record a player action."""
@@ -133,6 +173,43 @@ class GameRecorder:
         
         self.recording['frames'].append(frame)
     
+    def log_move(self, player_index, dx, dy):
+        """Log a move input for the current tick."""
+        if self.recording_enabled:
+            self.pending_ops.append(player_index * OPS_PER_PLAYER + encode_move(dx, dy))
+    
+    def log_bomb(self, player_index):
+        """Log a bomb placement input for the current tick."""
+        if self.recording_enabled:
+            self.pending_ops.append(player_index * OPS_PER_PLAYER + OP_BOMB)
+    
+    def log_caca(self, player_index):
+        """Log a caca placement input for the current tick."""
+        if self.recording_enabled:
+            self.pending_ops.append(player_index * OPS_PER_PLAYER + OP_CACA)
+    
+    def log_tick(self, dt, game_state=None):
+        """
+        Close the current tick: store its inputs and time step.
+        
+        Together with the seed and initial state this input log is enough
+        to re-simulate the whole game (see replay_renderer). Passing the
+        game state after the tick also records player positions and map
+        changes for the binary replay (seeking without re-simulating),
+        and player deaths from the tick's events.
+        """
+        if not self.recording_enabled:
+            return
+        self.recording['ticks'].append([dt] + self.pending_ops)
+        self.pending_ops = []
+        if game_state is not None:
+            if self.track is not None:
+                self.track.capture(game_state)
+            for event in game_state.tick_events:
+                if event.kind == EVENT_PLAYER_KILLED:
+                    killer = event.detail.name if event.detail else 'bomb_machine'
+                    self.record_player_death(event.player.name, killer)
+    
     def record_move(self, player_name, from_pos, to_pos):
         """Record player movement."""
         self.record_action(player_name, 'move', {
@@ -179,6 +256,9 @@ class GameRecorder:
         self.recording['duration'] = time.time() - self.start_time
         self.recording['winner'] = winner_name
         self.recording['total_frames'] = self.frame_count
+        self.recording['total_ticks'] = len(self.recording['ticks'])
+        if self.track is not None:
+            self.recording['map_changes'] = self.track.delta_counts()
         self.recording['statistics'] = statistics or {}
         
         self.recording_enabled = False
@@ -192,6 +272,7 @@ class GameRecorder:
         with open(filename, 'w') as f:
             json.dump(self.recording, f, indent=2)
         
+        self._update_catalog(directory, filename)
         return filename
     
     def export_compressed(self, directory="bomber_game/replays"):
@@ -205,6 +286,17 @@ class GameRecorder:
         with gzip.open(filename, 'wt', encoding='utf-8') as f:
             f.write(json_data)
         
+        self._update_catalog(directory, filename)
+        return filename
+    
+    def export_binary(self, directory="bomber_game/replays"):
+        """Export recording as a compact binary replay (see replay_format)."""
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        
+        filename = f"{directory}/game_{self.game_id}.replay"
+        write_replay(filename, self.recording, self.track)
+        
+        self._update_catalog(directory, filename)
         return filename
     
     def export_summary(self, directory="bomber_game/replays"):
@@ -218,6 +310,8 @@ class GameRecorder:
             'duration': self.recording['duration'],
             'winner': self.recording['winner'],
             'total_frames': self.frame_count,
+            'total_ticks': len(self.recording['ticks']),
+            'seed': self.recording['seed'],
             'total_actions': len(self.recording['actions']),
             'total_events': len(self.recording['events']),
             'statistics': self.recording['statistics'],
@@ -228,8 +322,19 @@ class GameRecorder:
         with open(filename, 'w') as f:
             json.dump(summary, f, indent=2)
         
+        self._update_catalog(directory)
         return filename
     
+    def _update_catalog(self, directory, replay_file=None):
+        """Add this game to the replay catalog of directory."""
+        from .replay_catalog import ReplayCatalog, CATALOG_NAME
+        
+        try:
+            with ReplayCatalog(Path(directory) / CATALOG_NAME) as catalog:
+                catalog.add_recording(self.recording, replay_file)
+        except Exception as e:
+            print(f"⚠️  Could not update replay catalog: {e}")
+    
     def _serialize_grid(self, grid):
         """Serialize grid to list format."""
         return [[cell for cell in row] for row in grid]
@@ -266,26 +371,50 @@ class ReplayManager:
     """Manages game replays and provides analysis."""
     
     def __init__(self, replay_dir="bomber_game/replays"):
+        from .replay_catalog import ReplayCatalog, CATALOG_NAME
+        
         self.replay_dir = Path(replay_dir)
         self.replay_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Queries run against the SQLite catalog; index existing folders once
+        catalog_path = self.replay_dir / CATALOG_NAME
+        is_new = not catalog_path.exists()
+        self.catalog = ReplayCatalog(catalog_path)
+        if is_new and (any(self.replay_dir.glob("game_*")) or
+                       any(self.replay_dir.glob("summary_*.json"))):
+            self.rebuild_catalog()
     
-    def list_replays(self):
-        """List all available replays."""
-        replays = []
-        
-        for file in self.replay_dir.glob("summary_*.json"):
-            try:
-                with open(file, 'r') as f:
-                    summary = json.load(f)
-                    replays.append(summary)
-            except:
-                continue
-        
-        return sorted(replays, key=lambda x: x['start_time'], reverse=True)
+    def rebuild_catalog(self):
+        """Re-index every replay file in the folder; returns the number of games."""
+        return self.catalog.rebuild(self.replay_dir)
+    
+    def list_replays(self, limit=None, winner=None, player=None, since=None):
+        """
+        List replays, newest first.
+        
+        Args:
+            limit: Maximum number of replays
+            winner: Only games won by this player name
+            player: Only games this player name took part in
+            since: Only games started at or after this ISO timestamp
+        """
+        return self.catalog.list_games(limit=limit, winner=winner, player=player, since=since)
+    
+    def open_replay(self, game_id):
+        """Open a binary replay without loading it (None if there is none)."""
+        binary_file = self.replay_dir / f"game_{game_id}.replay"
+        if binary_file.exists():
+            return ReplayReader(binary_file)
+        return None
     
     def load_replay(self, game_id):
         """Load a full replay."""
-        # Try compressed first
+        # Try binary first
+        reader = self.open_replay(game_id)
+        if reader is not None:
+            return reader.to_replay()
+        
+        # Then compressed JSON
         compressed_file = self.replay_dir / f"game_{game_id}.json.gz"
         if compressed_file.exists():
             with gzip.open(compressed_file, 'rt', encoding='utf-8') as f:
@@ -301,37 +430,8 @@ class ReplayManager:
     
     def get_player_statistics(self, player_name, num_games=10):
         """Get statistics for a player across multiple games."""
-        replays = self.list_replays()[:num_games]
-        
-        stats = {
-            'total_games': 0,
-            'wins': 0,
-            'losses': 0,
-            'total_actions': 0,
-            'avg_game_duration': 0,
-            'win_rate': 0,
-        }
-        
-        total_duration = 0
-        
-        for replay in replays:
-            stats['total_games'] += 1
-            
-            if replay['winner'] == player_name:
-                stats['wins'] += 1
-            else:
-                stats['losses'] += 1
-            
-            total_duration += replay.get('duration', 0)
-            
-            # Load full replay for detailed stats
-            full_replay = self.load_replay(replay['game_id'])
-            if full_replay:
-                player_actions = [a for a in full_replay['actions'] if a['player'] == player_name]
-                stats['total_actions'] += len(player_actions)
-        
-        if stats['total_games'] > 0:
-            stats['win_rate'] = (stats['wins'] / stats['total_games']) * 100
-            stats['avg_game_duration'] = total_duration / stats['total_games']
-        
-        return stats
+        return self.catalog.player_statistics(player_name, num_games)
+    
+    def get_event_counts(self, game_id=None):
+        """Get event counts by type for one game or all games."""
+        return self.catalog.event_counts(game_id)
@@ -3,23 +3,46 @@ Game state management for Bomberman.
 """
 
 import random
+from collections import deque, namedtuple
 from .entities import Player, Bomb, Explosion, PowerUp, Caca
 from .entities.teleport_door import TeleportDoorManager
 from .entities.bomb_machine import BombMachine
 from .config import MAP_CONFIG
 
 
+# Kinds of entries recorded in GameState.change_log
+CHANGE_BOMB_PLACED = 'bomb_placed'
+CHANGE_BOMB_EXPLODED = 'bomb_exploded'
+CHANGE_WALL_DESTROYED = 'wall_destroyed'
+CHANGE_POWERUP_REVEALED = 'powerup_revealed'
+CHANGE_POWERUP_COLLECTED = 'powerup_collected'
+
+# Event kinds that are not map changes
+EVENT_PLAYER_KILLED = 'player_killed'
+
+# One entry of GameState.tick_events. kind is a CHANGE_* or EVENT_* name;
+# player is who the event is credited to (bomb owner for bombs, walls and
+# revealed power-ups, collector for collected ones, victim for kills, None
+# for bomb machine bombs); detail is the bomb range, power-up type, or the
+# killer (bomb owner) of a killed player.
+GameEvent = namedtuple('GameEvent', ['kind', 'x', 'y', 'player', 'detail'])
+
+
 class GameState:
     """Manages the game state including grid, entities, and game logic."""
     
-    def __init__(self, grid_size=13):
+    def __init__(self, grid_size=13, seed=None):
         """
         Initialize game state.
         
         Args:
             grid_size: Size of the grid (grid_size x grid_size)
+            seed: Optional seed for map generation and bomb machine drops.
+                  Without it the global random module is used.
         """
         self.grid_size = grid_size
+        self.seed = seed
+        self.rng = random.Random(seed) if seed is not None else random
         self.powerups = {}  # {(x, y): PowerUp} - Initialize before _generate_grid
         self.grid = self._generate_grid()
         
@@ -31,7 +54,7 @@ class GameState:
         
         # New features
         self.teleport_doors = TeleportDoorManager(grid_size)
-        self.teleport_doors.create_door_pairs(MAP_CONFIG.get('num_teleport_doors', 4))
+        self.teleport_doors.create_door_pairs(MAP_CONFIG.get('num_teleport_doors', 4), self.rng)
         
         # Clear grid tiles where doors are placed so players can walk on them
         for door in self.teleport_doors.doors:
@@ -48,6 +71,16 @@ class GameState:
         self.winner = None
         self.game_time = 0.0  # Track total game time for cooldowns
         
+        # Change log read by heuristic planners to decide when to replan.
+        # Entries are (seq, kind, x, y, radius); old entries fall off the end.
+        self.change_seq = 0
+        self.change_log = deque(maxlen=256)
+        
+        # Typed events: 'events' collects the current tick (including bombs
+        # placed before update()), update() moves them to 'tick_events'
+        self.events = []
+        self.tick_events = []
+        
     def _generate_grid(self):
         """Generate game grid with walls and soft walls."""
         grid = [[0 for _ in range(self.grid_size)] for _ in range(self.grid_size)]
@@ -77,11 +110,11 @@ class GameState:
         for y in range(1, self.grid_size - 1):
             for x in range(1, self.grid_size - 1):
                 if grid[y][x] == 0 and (x, y) not in safe_zones:
-                    if random.random() < wall_density:  # Use config density
+                    if self.rng.random() < wall_density:  # Use config density
                         grid[y][x] = 2
                         # Chance of power-up under soft wall
-                        if random.random() < powerup_chance:
-                            powerup_type = random.randint(0, 5)  # 0-5 for 6 types
+                        if self.rng.random() < powerup_chance:
+                            powerup_type = self.rng.randint(0, 5)  # 0-5 for 6 types
                             self.powerups[(x, y)] = PowerUp(x, y, powerup_type)
         
         return grid
@@ -108,6 +141,8 @@ class GameState:
         bomb = Bomb(x, y, player.bomb_range, player)
         player.active_bombs += 1
         self.bombs.append(bomb)
+        self._log_change(CHANGE_BOMB_PLACED, x, y, bomb.bomb_range)
+        self.events.append(GameEvent(CHANGE_BOMB_PLACED, x, y, player, bomb.bomb_range))
         return bomb
     
     def place_caca(self, player):
@@ -177,20 +212,32 @@ class GameState:
             dropped_bomb = self.bomb_machine.update(dt, self)
             if dropped_bomb:
                 self.bombs.append(dropped_bomb)
+                self._log_change(CHANGE_BOMB_PLACED, dropped_bomb.grid_x,
+                                 dropped_bomb.grid_y, dropped_bomb.bomb_range)
+                self.events.append(GameEvent(CHANGE_BOMB_PLACED, dropped_bomb.grid_x,
+                                             dropped_bomb.grid_y, None, dropped_bomb.bomb_range))
         
         # Check collisions
         self._check_collisions()
         
         # Check win condition
         self._check_win_condition()
+        
+        # Publish this tick's events
+        self.tick_events = self.events
+        self.events = []
     
     def _create_explosion(self, bomb):
         """Create explosion from bomb."""
         x, y = bomb.grid_x, bomb.grid_y
         bomb_range = bomb.bomb_range
         
+        owner = bomb.owner
+        
         # Center explosion
-        self.explosions.append(Explosion(x, y))
+        self.explosions.append(Explosion(x, y, owner))
+        self._log_change(CHANGE_BOMB_EXPLODED, x, y, bomb_range)
+        self.events.append(GameEvent(CHANGE_BOMB_EXPLODED, x, y, owner, bomb_range))
         
         # Spread in 4 directions
         directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]  # up, down, left, right
@@ -208,11 +255,17 @@ class GameState:
                     break
                 
                 # Add explosion
-                self.explosions.append(Explosion(ex, ey))
+                self.explosions.append(Explosion(ex, ey, owner))
                 
                 # Destroy soft wall
                 if self.grid[ey][ex] == 2:
                     self.grid[ey][ex] = 0
+                    self._log_change(CHANGE_WALL_DESTROYED, ex, ey)
+                    self.events.append(GameEvent(CHANGE_WALL_DESTROYED, ex, ey, owner, None))
+                    if (ex, ey) in self.powerups:
+                        self._log_change(CHANGE_POWERUP_REVEALED, ex, ey)
+                        self.events.append(GameEvent(CHANGE_POWERUP_REVEALED, ex, ey, owner,
+                                                     self.powerups[(ex, ey)].powerup_type))
                     break
     
     def _check_collisions(self):
@@ -226,6 +279,9 @@ class GameState:
             for explosion in self.explosions:
                 if explosion.grid_x == px and explosion.grid_y == py:
                     player.alive = False
+                    self.events.append(GameEvent(EVENT_PLAYER_KILLED, px, py, player,
+                                                 explosion.owner))
+                    break
         
         # Check player-powerup collisions
         for player in self.players:
@@ -237,6 +293,31 @@ class GameState:
                 powerup = self.powerups[(px, py)]
                 player.add_powerup(powerup.powerup_type)
                 del self.powerups[(px, py)]
+                self._log_change(CHANGE_POWERUP_COLLECTED, px, py)
+                self.events.append(GameEvent(CHANGE_POWERUP_COLLECTED, px, py, player,
+                                             powerup.powerup_type))
+    
+    def _log_change(self, kind, x, y, radius=0):
+        """Record a map change that may invalidate agent plans."""
+        self.change_seq += 1
+        self.change_log.append((self.change_seq, kind, x, y, radius))
+    
+    def changes_since(self, seq):
+        """
+        Get map changes recorded after a sequence number.
+        
+        Args:
+            seq: Last sequence number the caller has seen
+            
+        Returns:
+            List of (seq, kind, x, y, radius) tuples, or None if some of
+            the requested changes have already dropped out of the log
+        """
+        if seq >= self.change_seq:
+            return []
+        if not self.change_log or self.change_log[0][0] > seq + 1:
+            return None
+        return [change for change in self.change_log if change[0] > seq]
     
     def _check_win_condition(self):
         """Check if game is over."""
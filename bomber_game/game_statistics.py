@@ -3,13 +3,14 @@ Game Statistics Tracker - Comprehensive analytics for Human vs AI gameplay.
 Tracks performance, strategy, risk levels, and provides recommendations.
 """
 
-import json
-import os
 import time
 from datetime import datetime
 from collections import deque
 import math
 
+from .history_store import GameHistoryStore
+from .game_state import CHANGE_BOMB_PLACED, CHANGE_WALL_DESTROYED, CHANGE_POWERUP_COLLECTED
+
 
 class GameStatistics:
     """
@@ -48,55 +49,15 @@ class GameStatistics:
         # Performance history (last 10 games)
         self.recent_games = deque(maxlen=10)
         
-        # Load historical data
-        self.history = self._load_history()
+        # Load historical data (aggregates + last games)
+        self.store = GameHistoryStore(stats_file)
+        self.history = self.store.load()
+        self.finished = False
         
         # AI info
         self.ai_type = "Unknown"
         self.ai_model_path = None
         
-    def _load_history(self):
-        """Load game history from file."""
-        if os.path.exists(self.stats_file):
-            try:
-                with open(self.stats_file, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
-        
-        return {
-            'total_games': 0,
-            'human_wins': 0,
-            'ai_wins': 0,
-            'draws': 0,
-            'games': [],
-            'human_stats': {
-                'total_moves': 0,
-                'total_bombs': 0,
-                'total_kills': 0,
-                'avg_game_time': 0,
-                'best_win_streak': 0,
-                'current_win_streak': 0,
-            },
-            'ai_stats': {
-                'total_moves': 0,
-                'total_bombs': 0,
-                'total_kills': 0,
-                'avg_game_time': 0,
-                'best_win_streak': 0,
-                'current_win_streak': 0,
-            }
-        }
-    
-    def _save_history(self):
-        """Save game history to file."""
-        try:
-            os.makedirs(os.path.dirname(self.stats_file), exist_ok=True)
-            with open(self.stats_file, 'w') as f:
-                json.dump(self.history, f, indent=2)
-        except Exception as e:
-            print(f"Could not save game history: {e}")
-    
     def set_ai_info(self, ai_type, model_path=None):
         """Set AI information."""
         self.ai_type = ai_type
@@ -159,6 +120,25 @@ class GameStatistics:
         else:
             self.walls_destroyed_ai += 1
     
+    def record_events(self, events, human_player):
+        """
+        Count bombs, walls and power-ups from one tick of game events.
+        
+        Args:
+            events: GameState.tick_events
+            human_player: The human's Player (events of others count as AI)
+        """
+        for event in events:
+            if event.player is None:
+                continue  # Bomb machine
+            is_human = event.player is human_player
+            if event.kind == CHANGE_BOMB_PLACED:
+                self.record_bomb(is_human)
+            elif event.kind == CHANGE_WALL_DESTROYED:
+                self.record_wall_destroyed(is_human)
+            elif event.kind == CHANGE_POWERUP_COLLECTED:
+                self.record_powerup(is_human)
+    
     def _calculate_risk(self, position, game_state):
         """Calculate risk level at position (0-100)."""
         risk = 0
@@ -263,42 +243,12 @@ class GameStatistics:
         return max(0, min(100, score))
     
     def finish_game(self, winner_name):
-        """Finish game and save statistics."""
+        """Finish game and save statistics (once per game)."""
+        if self.finished:
+            return
+        self.finished = True
         game_time = time.time() - self.game_start_time
         
-        # Determine winner
-        human_won = (winner_name == "Player")
-        ai_won = (winner_name == "AI")
-        draw = (winner_name is None or winner_name == "Draw")
-        
-        # Update history
-        self.history['total_games'] += 1
-        
-        if human_won:
-            self.history['human_wins'] += 1
-            self.history['human_stats']['current_win_streak'] += 1
-            self.history['ai_stats']['current_win_streak'] = 0
-            
-            if self.history['human_stats']['current_win_streak'] > self.history['human_stats']['best_win_streak']:
-                self.history['human_stats']['best_win_streak'] = self.history['human_stats']['current_win_streak']
-        elif ai_won:
-            self.history['ai_wins'] += 1
-            self.history['ai_stats']['current_win_streak'] += 1
-            self.history['human_stats']['current_win_streak'] = 0
-            
-            if self.history['ai_stats']['current_win_streak'] > self.history['ai_stats']['best_win_streak']:
-                self.history['ai_stats']['best_win_streak'] = self.history['ai_stats']['current_win_streak']
-        else:
-            self.history['draws'] += 1
-            self.history['human_stats']['current_win_streak'] = 0
-            self.history['ai_stats']['current_win_streak'] = 0
-        
-        # Update cumulative stats
-        self.history['human_stats']['total_moves'] += self.human_moves
-        self.history['human_stats']['total_bombs'] += self.human_bombs_placed
-        self.history['ai_stats']['total_moves'] += self.ai_moves
-        self.history['ai_stats']['total_bombs'] += self.ai_bombs_placed
-        
         # Save game record
         game_record = {
             'timestamp': datetime.now().isoformat(),
@@ -327,15 +277,10 @@ class GameStatistics:
             }
         }
         
-        self.history['games'].append(game_record)
         self.recent_games.append(game_record)
         
-        # Keep only last 50 games in history
-        if len(self.history['games']) > 50:
-            self.history['games'] = self.history['games'][-50:]
-        
-        # Save to file
-        self._save_history()
+        # Append to the game log and update win counts, streaks and totals
+        self.store.append(self.history, game_record)
     
     def get_recommendations(self):
         """Get gameplay recommendations based on statistics."""
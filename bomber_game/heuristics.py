@@ -240,7 +240,7 @@ class GameHeuristics:
         return unblocked[0] if unblocked else (0, 0)
     
     @staticmethod
-    def get_heuristic_action(player, game_state):
+    def get_heuristic_action(player, game_state, cache=None):
         """
         Get a complete heuristic action based on game state.
         
@@ -252,10 +252,15 @@ class GameHeuristics:
         Args:
             player: Player entity
             game_state: Current game state
+            cache: Optional DecisionCache to reuse decisions for
+                   previously seen neighbourhoods
             
         Returns:
             (dx, dy, place_bomb) action tuple
         """
+        if cache is not None:
+            return cache.lookup(player, game_state, GameHeuristics.get_heuristic_action)
+        
         px, py = int(player.x), int(player.y)
         
         # Priority 1: Escape from danger
@@ -334,16 +339,24 @@ class GameHeuristics:
 class HeuristicAgent:
     """Agent that uses pure heuristics (for bootstrapping)."""
     
-    def __init__(self, player):
-        """Initialize heuristic agent."""
+    def __init__(self, player, decision_cache=None):
+        """
+        Initialize heuristic agent.
+        
+        Args:
+            player: Player entity
+            decision_cache: Optional DecisionCache shared by agents
+        """
         self.player = player
         self.think_timer = 0
         self.think_delay = 0.2
         self.current_action = None
+        self.decision_cache = decision_cache
     
     def choose_action(self, game_state):
         """Choose action using heuristics."""
-        return GameHeuristics.get_heuristic_action(self.player, game_state)
+        return GameHeuristics.get_heuristic_action(self.player, game_state,
+                                                   cache=self.decision_cache)
     
     def update(self, dt, game_state):
         """Update agent."""
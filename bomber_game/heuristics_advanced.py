@@ -17,6 +17,7 @@ import math
 from collections import deque
 from typing import Tuple, List, Dict, Optional
 from . import GRID_SIZE
+from .heuristics_planning import PlanTracker
 
 
 class GameTreeNode:
@@ -434,7 +435,13 @@ class DynamicStrategySelection:
 class AdvancedSmartHeuristic:
     """Advanced smart heuristic AI with predictive planning."""
     
-    def __init__(self, player):
+    # Chance of dropping a bomb on each new tile, per strategy
+    BOMB_CHANCE = {
+        'defensive': 0.3,
+        'balanced': 0.4,
+    }
+    
+    def __init__(self, player, persistent_plans=True):
         """Initialize advanced smart heuristic."""
         self.player = player
         self.predictive_analysis = PredictiveAnalysis()
@@ -443,6 +450,10 @@ class AdvancedSmartHeuristic:
         self.opponent_model = OpponentModeling()
         self.strategy_selector = DynamicStrategySelection()
         
+        # Defensive targets and balanced moves are kept until invalidated
+        self.planner = PlanTracker(enabled=persistent_plans)
+        self.planned_strategy = None
+        
         # Performance tracking
         self.total_games = 0
         self.wins = 0
@@ -469,6 +480,21 @@ class AdvancedSmartHeuristic:
         strategy = self.strategy_selector.select_strategy(player, opponent, game_state)
         self.strategy_history.append(strategy)
         
+        # Keep following the current plan while the strategy holds
+        if strategy == self.planned_strategy:
+            planned = self.planner.next_action(player, game_state)
+            if planned is not None:
+                dx, dy, should_bomb = planned
+                if not should_bomb and self.planner.entered_new_tile:
+                    should_bomb = self._roll_bomb(player, strategy)
+                self.actions_taken += 1
+                if should_bomb:
+                    self.bombs_placed += 1
+                return (dx, dy, should_bomb)
+        else:
+            self.planner.invalidate()
+        self.planned_strategy = strategy
+        
         # Execute strategy
         if strategy == 'aggressive':
             return self._aggressive_strategy(player, opponent, game_state)
@@ -546,7 +572,9 @@ class AdvancedSmartHeuristic:
             dy = 1 if target_y > py else (-1 if target_y < py else 0)
             
             # Place bomb if strategic
-            should_bomb = player.active_bombs < player.max_bombs and random.random() < 0.3
+            should_bomb = self._roll_bomb(player, 'defensive')
+            self.planner.commit(player, game_state, (target_x, target_y),
+                                place_bomb=should_bomb)
             self.actions_taken += 1
             if should_bomb:
                 self.bombs_placed += 1
@@ -587,25 +615,41 @@ class AdvancedSmartHeuristic:
         # Use game tree evaluation
         best_move = (0, 0, False)
         best_score = -float('inf')
+        score = None
         
         for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0), (0, 0)]:
             nx, ny = px + dx, py + dy
             
             if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
                 if game_state.grid[ny][nx] == 0:
-                    # Evaluate this move
-                    score = self.game_tree.minimax(player, opponent, game_state)
+                    # Evaluate this move (the search starts from the current
+                    # state for every move, so one evaluation serves them all)
+                    if score is None:
+                        score = self.game_tree.minimax(player, opponent, game_state)
                     
                     if score > best_score:
                         best_score = score
-                        should_bomb = player.active_bombs < player.max_bombs and random.random() < 0.4
+                        should_bomb = self._roll_bomb(player, 'balanced')
                         best_move = (dx, dy, should_bomb)
         
+        # Keep the chosen step until it is completed
+        dx, dy, should_bomb = best_move
+        if dx != 0 or dy != 0:
+            self.planner.commit(player, game_state, (px + dx, py + dy),
+                                path=[(px, py), (px + dx, py + dy)],
+                                place_bomb=should_bomb)
+        
         self.actions_taken += 1
         if best_move[2]:
             self.bombs_placed += 1
         return best_move
     
+    def _roll_bomb(self, player, strategy) -> bool:
+        """Randomly decide on a bomb drop for the given strategy."""
+        if player.active_bombs >= player.max_bombs:
+            return False
+        return random.random() < self.BOMB_CHANCE.get(strategy, 0.0)
+    
     def record_game_result(self, won, reward):
         """Record game result."""
         self.total_games += 1
@@ -12,6 +12,7 @@ import random
 import heapq
 from collections import deque
 from . import GRID_SIZE
+from .heuristics_planning import PlanTracker
 
 
 class PathNode:
@@ -337,13 +338,32 @@ class ImprovedHeuristics:
         return should_place, confidence
     
     @staticmethod
-    def get_best_action(player, game_state):
+    def get_best_action(player, game_state, cache=None):
         """
         Get best action using improved heuristics and A* pathfinding.
         
+        Args:
+            player: Player entity
+            game_state: Current game state
+            cache: Optional DecisionCache to reuse decisions for
+                   previously seen neighbourhoods
+        
         Returns:
             (dx, dy, place_bomb, confidence) tuple
         """
+        if cache is not None:
+            return cache.lookup(player, game_state, ImprovedHeuristics.get_best_action)
+        return ImprovedHeuristics.get_best_plan(player, game_state)['action']
+    
+    @staticmethod
+    def get_best_plan(player, game_state):
+        """
+        Get best action together with the target and A* path behind it.
+        
+        Returns:
+            Dictionary with 'action' ((dx, dy, place_bomb, confidence)),
+            'target' ((x, y) or None) and 'path' (list of (x, y) or None)
+        """
         px, py = int(player.x), int(player.y)
         danger_map = ImprovedHeuristics.get_danger_map(game_state)
         
@@ -362,7 +382,9 @@ class ImprovedHeuristics:
                             best_dir = (dx, dy)
             
             if best_dir:
-                return (best_dir[0], best_dir[1], False, 1.0)  # High confidence escape
+                # High confidence escape
+                return {'action': (best_dir[0], best_dir[1], False, 1.0),
+                        'target': None, 'path': None}
         
         # Priority 2: Strategic bomb placement
         should_bomb, bomb_confidence = ImprovedHeuristics.should_place_bomb_improved(player, game_state)
@@ -390,7 +412,8 @@ class ImprovedHeuristics:
                 dx = next_pos[0] - px
                 dy = next_pos[1] - py
                 confidence = min(1.0, best_score / 50.0)
-                return (dx, dy, should_bomb, confidence)
+                return {'action': (dx, dy, should_bomb, confidence),
+                        'target': best_target, 'path': path}
         
         # Fallback: safe random move
         safe_moves = []
@@ -402,20 +425,28 @@ class ImprovedHeuristics:
         
         if safe_moves:
             move = random.choice(safe_moves)
-            return (move[0], move[1], should_bomb, 0.3)
+            return {'action': (move[0], move[1], should_bomb, 0.3),
+                    'target': None, 'path': None}
         
-        return (0, 0, False, 0.1)
+        return {'action': (0, 0, False, 0.1), 'target': None, 'path': None}
 
 
 class ImprovedHeuristicAgent:
     """Agent using improved heuristics with performance tracking."""
     
-    def __init__(self, player):
+    def __init__(self, player, persistent_plans=True, decision_cache=None):
         self.player = player
         self.think_timer = 0
         self.think_delay = 0.15  # Faster thinking
         self.current_action = None
         
+        # Keep the A* target/path between think ticks until the game
+        # reports something that invalidates it
+        self.planner = PlanTracker(enabled=persistent_plans)
+        
+        # Optional memo of decisions for already seen neighbourhoods
+        self.decision_cache = decision_cache
+        
         # Performance tracking
         self.total_games = 0
         self.wins = 0
@@ -427,7 +458,30 @@ class ImprovedHeuristicAgent:
     
     def choose_action(self, game_state):
         """Choose action using improved heuristics."""
-        dx, dy, place_bomb, confidence = ImprovedHeuristics.get_best_action(self.player, game_state)
+        action = self.planner.next_action(self.player, game_state)
+        if action is not None:
+            dx, dy, place_bomb = action
+            # Bomb placement still depends on the tile we are standing on
+            if not place_bomb and self.planner.entered_new_tile:
+                place_bomb, _ = ImprovedHeuristics.should_place_bomb_improved(
+                    self.player, game_state
+                )
+        else:
+            cache_key = None
+            cached = None
+            if self.decision_cache is not None:
+                cache_key = self.decision_cache.local_state_key(self.player, game_state)
+                cached = self.decision_cache.get(cache_key)
+            
+            if cached is not None:
+                dx, dy, place_bomb, confidence = cached
+            else:
+                plan = ImprovedHeuristics.get_best_plan(self.player, game_state)
+                dx, dy, place_bomb, confidence = plan['action']
+                self.planner.commit(self.player, game_state, plan['target'],
+                                    plan['path'], place_bomb)
+                if cache_key is not None:
+                    self.decision_cache.put(cache_key, plan['action'])
         
         # Track statistics
         self.actions_taken += 1
@@ -16,6 +16,7 @@ import heapq
 import math
 from collections import deque
 from . import GRID_SIZE
+from .heuristics_planning import PlanTracker
 
 
 class ThreatAssessment:
@@ -67,6 +68,12 @@ class ThreatAssessment:
         
         # Check all bombs
         for bomb in game_state.bombs:
+            # A blast only travels along the bomb's row and column
+            if bomb.grid_x != x and bomb.grid_y != y:
+                continue
+            if abs(bomb.grid_x - x) + abs(bomb.grid_y - y) > bomb.bomb_range:
+                continue
+            
             blast_zone = ThreatAssessment.calculate_blast_zone(
                 bomb.grid_x, bomb.grid_y, bomb.bomb_range, game_state.grid
             )
@@ -308,12 +315,19 @@ class AdaptiveBehavior:
 class IntermediateSmartHeuristic:
     """Intermediate smart heuristic AI."""
     
-    def __init__(self, player):
+    def __init__(self, player, persistent_plans=True):
         """Initialize intermediate smart heuristic."""
         self.player = player
         self.threat_assessment = ThreatAssessment()
         self.strategic_planning = StrategicPlanning()
         self.adaptive_behavior = AdaptiveBehavior()
+        self.planner = PlanTracker(enabled=persistent_plans)
+        self.safe_tile = None  # (tile, change_seq) of the last step found safe
+        
+        # Timing
+        self.think_timer = 0
+        self.think_delay = 0.15  # Thinking delay in seconds
+        self.current_action = None
         
         # Performance tracking
         self.total_games = 0
@@ -332,6 +346,31 @@ class IntermediateSmartHeuristic:
         """
         px, py = int(player.x), int(player.y)
         
+        # Keep following the current target unless the game invalidated it
+        planned = self.planner.next_action(player, game_state)
+        if planned is not None:
+            dx, dy, should_bomb = planned
+            next_tile = (px + dx, py + dy)
+            if self.safe_tile != (next_tile, game_state.change_seq):
+                # Bombs or explosions appeared since the tile was last found safe
+                threat_level, _ = ThreatAssessment.assess_position_threat(
+                    next_tile[0], next_tile[1], game_state
+                )
+                if threat_level == 'safe':
+                    self.safe_tile = (next_tile, game_state.change_seq)
+            else:
+                threat_level = 'safe'
+            if threat_level != 'critical':
+                if not should_bomb and self.planner.entered_new_tile:
+                    should_bomb, _, _ = StrategicPlanning.evaluate_bomb_placement(
+                        px, py, player, game_state
+                    )
+                self.actions_taken += 1
+                if should_bomb:
+                    self.bombs_placed += 1
+                return (dx, dy, should_bomb)
+            self.planner.invalidate()
+        
         # Update adaptive behavior
         self.adaptive_behavior.update_aggression(player, opponent, game_state)
         
@@ -385,6 +424,8 @@ class IntermediateSmartHeuristic:
             )
             
             if threat_level != 'critical':
+                self.planner.commit(player, game_state, target,
+                                    place_bomb=should_bomb)
                 self.actions_taken += 1
                 if should_bomb:
                     self.bombs_placed += 1
@@ -412,6 +453,35 @@ class IntermediateSmartHeuristic:
         self.actions_taken += 1
         return (0, 0, False)
     
+    def update(self, dt, game_state):
+        """
+        Update agent with timing control.
+        
+        Args:
+            dt: Delta time in seconds
+            game_state: Current game state
+            
+        Returns:
+            Current action tuple (dx, dy, place_bomb)
+        """
+        self.think_timer += dt
+        
+        if self.think_timer >= self.think_delay:
+            self.think_timer = 0
+            # Get opponent from game state
+            opponent = None
+            for player in game_state.players:
+                if player != self.player:
+                    opponent = player
+                    break
+            
+            if opponent:
+                self.current_action = self.choose_action(self.player, opponent, game_state)
+            else:
+                self.current_action = (0, 0, False)
+        
+        return self.current_action if self.current_action else (0, 0, False)
+    
     def record_game_result(self, won, reward):
         """Record game result."""
         self.total_games += 1
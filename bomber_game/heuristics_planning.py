@@ -0,0 +1,207 @@
+"""
+Plan persistence for heuristic agents.
+
+Heuristic agents used to rebuild their whole plan (position scans, A*)
+on every think tick. A PlanTracker keeps the current goal and path and
+only asks for a new plan when the game state reports a change that
+matters to it:
+
+- a bomb placed (or exploding) with the plan in its blast cross
+- a wall destroyed on or next to the remaining path
+- an enemy that moved more than a few tiles since the plan was made
+- a power-up revealed anywhere, or the goal power-up being taken
+"""
+
+from .game_state import (CHANGE_BOMB_PLACED, CHANGE_BOMB_EXPLODED,
+                         CHANGE_WALL_DESTROYED, CHANGE_POWERUP_REVEALED,
+                         CHANGE_POWERUP_COLLECTED)
+
+
+class HeuristicPlan:
+    """A goal, an optional path to it, and the context it was built in."""
+
+    def __init__(self, origin, goal, path, place_bomb, enemy_positions,
+                 change_seq, created_at):
+        self.origin = origin
+        self.goal = goal
+        self.path = path  # List of (x, y) tiles, or None for greedy steps
+        self.place_bomb = place_bomb  # Only applied on the first step
+        self.enemy_positions = enemy_positions
+        self.change_seq = change_seq
+        self.created_at = created_at
+
+    def remaining_tiles(self, px, py):
+        """Get the tiles the agent still has to cross (including the goal)."""
+        if self.path:
+            if (px, py) in self.path:
+                return self.path[self.path.index((px, py)):]
+            return self.path
+        return [(px, py), self.goal] if self.goal else [(px, py)]
+
+
+class PlanTracker:
+    """
+    Keeps a heuristic agent's plan alive until the game invalidates it.
+
+    Usage from an agent's choose_action:
+
+        action = self.planner.next_action(self.player, game_state)
+        if action is None:
+            ...build goal/path the expensive way...
+            self.planner.commit(self.player, game_state, goal, path, bomb)
+    """
+
+    def __init__(self, enemy_move_threshold=2, max_plan_age=2.0, enabled=True):
+        """
+        Initialize plan tracker.
+
+        Args:
+            enemy_move_threshold: Replan when an enemy moved more tiles than this
+            max_plan_age: Replan at least this often (game seconds)
+            enabled: When False every call replans (old behaviour)
+        """
+        self.enemy_move_threshold = enemy_move_threshold
+        self.max_plan_age = max_plan_age
+        self.enabled = enabled
+        self.plan = None
+        self.last_tile = None
+        self.entered_new_tile = False  # Set by next_action for per-tile checks
+
+        # Statistics
+        self.plans_built = 0
+        self.plans_reused = 0
+
+    def invalidate(self):
+        """Drop the current plan."""
+        self.plan = None
+
+    def commit(self, player, game_state, goal, path=None, place_bomb=False,
+               persistent=True):
+        """
+        Store a freshly built plan.
+
+        Args:
+            player: Player the plan belongs to
+            game_state: Game state the plan was built from
+            goal: Target (x, y) tile
+            path: Optional list of (x, y) tiles from the player to the goal
+            place_bomb: Whether the plan starts with a bomb drop
+            persistent: False for one-shot decisions (e.g. escaping danger)
+        """
+        self.plans_built += 1
+        self.last_tile = (int(player.x), int(player.y))
+        if not (self.enabled and persistent and goal is not None):
+            self.plan = None
+            return
+
+        enemy_positions = {
+            id(other): (other.grid_x, other.grid_y)
+            for other in game_state.players
+            if other is not player and other.alive
+        }
+        self.plan = HeuristicPlan(
+            origin=(int(player.x), int(player.y)),
+            goal=goal,
+            path=path,
+            place_bomb=place_bomb,
+            enemy_positions=enemy_positions,
+            change_seq=game_state.change_seq,
+            created_at=game_state.game_time,
+        )
+
+    def next_action(self, player, game_state):
+        """
+        Get the next step of the current plan.
+
+        Returns:
+            (dx, dy, place_bomb) tuple, or None when the agent must replan
+        """
+        plan = self.plan
+        if plan is None:
+            return None
+
+        px, py = int(player.x), int(player.y)
+        if self._is_invalid(plan, px, py, game_state):
+            self.plan = None
+            return None
+
+        if plan.path:
+            index = plan.path.index((px, py))
+            next_x, next_y = plan.path[index + 1]
+        else:
+            next_x, next_y = plan.goal
+
+        dx = 1 if next_x > px else (-1 if next_x < px else 0)
+        dy = 1 if next_y > py else (-1 if next_y < py else 0)
+
+        # Path steps must still be walkable (cacas and bombs come and go)
+        if plan.path and not game_state.is_walkable(px + dx, py + dy):
+            self.plan = None
+            return None
+
+        place_bomb = plan.place_bomb and (px, py) == plan.origin
+        plan.place_bomb = False
+        self.entered_new_tile = (px, py) != self.last_tile
+        self.last_tile = (px, py)
+        self.plans_reused += 1
+        return (dx, dy, place_bomb)
+
+    def _is_invalid(self, plan, px, py, game_state):
+        """Check whether anything happened that the plan did not account for."""
+        # Reached the goal (greedy plans stop next to it, e.g. at a wall),
+        # or left the path (teleport doors, blocked moves)
+        goal_distance = abs(px - plan.goal[0]) + abs(py - plan.goal[1])
+        if goal_distance <= (0 if plan.path else 1):
+            return True
+        if plan.path and ((px, py) not in plan.path or (px, py) == plan.path[-1]):
+            return True
+
+        if game_state.game_time - plan.created_at > self.max_plan_age:
+            return True
+
+        # Enemies that moved too far
+        for other in game_state.players:
+            key = id(other)
+            if key not in plan.enemy_positions:
+                continue
+            if not other.alive:
+                return True
+            ox, oy = plan.enemy_positions[key]
+            moved = abs(other.grid_x - ox) + abs(other.grid_y - oy)
+            if moved > self.enemy_move_threshold:
+                return True
+
+        # Map changes since the plan was built
+        changes = game_state.changes_since(plan.change_seq)
+        if changes is None:
+            return True
+        if not changes:
+            return False
+
+        tiles = plan.remaining_tiles(px, py)
+        for _, kind, x, y, radius in changes:
+            if kind in (CHANGE_BOMB_PLACED, CHANGE_BOMB_EXPLODED):
+                for tx, ty in tiles:
+                    if (tx == x and abs(ty - y) <= radius) or \
+                       (ty == y and abs(tx - x) <= radius):
+                        return True
+            elif kind == CHANGE_WALL_DESTROYED:
+                for tx, ty in tiles:
+                    if abs(tx - x) + abs(ty - y) <= 1:
+                        return True
+            elif kind == CHANGE_POWERUP_REVEALED:
+                return True
+            elif kind == CHANGE_POWERUP_COLLECTED:
+                if (x, y) == plan.goal:
+                    return True
+
+        # Nothing relevant: skip these changes next time
+        plan.change_seq = changes[-1][0]
+        return False
+
+    def get_reuse_rate(self):
+        """Get fraction of decisions served from a kept plan."""
+        total = self.plans_built + self.plans_reused
+        if total == 0:
+            return 0.0
+        return self.plans_reused / total
@@ -0,0 +1,233 @@
+"""
+Game history store - append-only game log plus running aggregates.
+
+Each finished game is appended as one JSON line to <name>.jsonl; win
+counts, streaks, totals and averages live in the small <name>.json file,
+which is rewritten (atomically) after every game together with the log
+size it covers. Loading reads the aggregates and the tail of the log, so
+startup time does not grow with the number of games played.
+"""
+
+import json
+import os
+
+
+TAIL_BLOCK = 64 * 1024  # Bytes read per step when scanning the log backwards
+
+
+def empty_history():
+    """Get the aggregates of a fresh install."""
+    return {
+        'total_games': 0,
+        'human_wins': 0,
+        'ai_wins': 0,
+        'draws': 0,
+        'total_game_time': 0.0,
+        'log_bytes': 0,
+        'human_stats': {
+            'total_moves': 0,
+            'total_bombs': 0,
+            'total_kills': 0,
+            'avg_game_time': 0,
+            'best_win_streak': 0,
+            'current_win_streak': 0,
+        },
+        'ai_stats': {
+            'total_moves': 0,
+            'total_bombs': 0,
+            'total_kills': 0,
+            'avg_game_time': 0,
+            'best_win_streak': 0,
+            'current_win_streak': 0,
+        }
+    }
+
+
+def apply_game(history, record):
+    """
+    Update aggregates with one finished game.
+
+    Args:
+        history: Aggregates dictionary (modified in place)
+        record: Game record as written by GameStatistics.finish_game
+    """
+    human = history['human_stats']
+    ai = history['ai_stats']
+    winner = record.get('winner')
+
+    history['total_games'] += 1
+    if winner == "Player":
+        history['human_wins'] += 1
+        human['current_win_streak'] += 1
+        ai['current_win_streak'] = 0
+        human['best_win_streak'] = max(human['best_win_streak'], human['current_win_streak'])
+    elif winner == "AI":
+        history['ai_wins'] += 1
+        ai['current_win_streak'] += 1
+        human['current_win_streak'] = 0
+        ai['best_win_streak'] = max(ai['best_win_streak'], ai['current_win_streak'])
+    else:
+        history['draws'] += 1
+        human['current_win_streak'] = 0
+        ai['current_win_streak'] = 0
+
+    # Cumulative stats
+    human['total_moves'] += record.get('human', {}).get('moves', 0)
+    human['total_bombs'] += record.get('human', {}).get('bombs', 0)
+    ai['total_moves'] += record.get('ai', {}).get('moves', 0)
+    ai['total_bombs'] += record.get('ai', {}).get('bombs', 0)
+
+    history['total_game_time'] = history.get('total_game_time', 0.0) + record.get('duration', 0)
+    avg_game_time = history['total_game_time'] / history['total_games']
+    human['avg_game_time'] = avg_game_time
+    ai['avg_game_time'] = avg_game_time
+
+
+class GameHistoryStore:
+    """Persists GameStatistics history as a game log plus aggregates."""
+
+    def __init__(self, stats_file="bomber_game/models/game_history.json", recent_games=50):
+        """
+        Initialize history store.
+
+        Args:
+            stats_file: Aggregates file; the game log is stored next to it
+                        with a .jsonl extension
+            recent_games: Number of games loaded into history['games']
+        """
+        self.stats_file = stats_file
+        self.log_file = os.path.splitext(stats_file)[0] + ".jsonl"
+        self.recent_games = recent_games
+
+    def load(self):
+        """
+        Load aggregates and the most recent games.
+
+        Returns:
+            History dictionary (aggregates plus 'games', oldest first)
+        """
+        history = self._read_aggregates()
+        if history is None:
+            history = empty_history()  # Rebuilt from the log, if there is one
+        elif 'log_bytes' not in history:
+            # Older files kept the game list inline: move it into the log once
+            games = history.pop('games', [])
+            if not os.path.exists(self.log_file):
+                self._append_lines(games)
+            if 'total_game_time' not in history:
+                # Older files only kept the average, or just the last games: the
+                # averages continue from that window's average
+                avg_game_time = history.get('human_stats', {}).get('avg_game_time')
+                if not avg_game_time and games:
+                    avg_game_time = sum(game.get('duration', 0) for game in games) / len(games)
+                history['total_game_time'] = float((avg_game_time or 0) * history.get('total_games', 0))
+            for key, value in empty_history().items():
+                history.setdefault(key, value)
+            history['log_bytes'] = os.path.getsize(self.log_file)
+            self._write_aggregates(history)
+
+        # Games logged after the aggregates were last written (crash)
+        missed = self._read_from(history['log_bytes'])
+        if missed:
+            for record in missed:
+                apply_game(history, record)
+            history['log_bytes'] = os.path.getsize(self.log_file)
+            self._write_aggregates(history)
+
+        history['games'] = self._read_tail(self.recent_games)
+        return history
+
+    def append(self, history, record):
+        """
+        Log a finished game and update the aggregates.
+
+        Args:
+            history: History dictionary from load() (updated in place)
+            record: Game record to append
+        """
+        apply_game(history, record)
+        history['games'].append(record)
+        if len(history['games']) > self.recent_games:
+            del history['games'][:-self.recent_games]
+
+        try:
+            history['log_bytes'] = self._append_lines([record])
+            self._write_aggregates(history)
+        except Exception as e:
+            print(f"Could not save game history: {e}")
+
+    def _read_aggregates(self):
+        """Read the aggregates file (None if missing or unreadable)."""
+        if os.path.exists(self.stats_file):
+            try:
+                with open(self.stats_file, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return None
+
+    def _write_aggregates(self, history):
+        """Atomically replace the aggregates file."""
+        os.makedirs(os.path.dirname(self.stats_file) or '.', exist_ok=True)
+        aggregates = {key: value for key, value in history.items() if key != 'games'}
+        tmp_file = self.stats_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(aggregates, f, indent=2)
+        os.replace(tmp_file, self.stats_file)
+
+    def _append_lines(self, records):
+        """
+        Append records to the game log.
+
+        Returns:
+            Size of the log afterwards
+        """
+        os.makedirs(os.path.dirname(self.log_file) or '.', exist_ok=True)
+        data = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+        with open(self.log_file, 'a+b') as f:
+            # Don't glue the record onto a line cut short by a crash
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    data = '\n' + data
+            f.write(data.encode('utf-8'))
+            return f.tell()
+
+    def _read_from(self, offset):
+        """Read the records logged after a byte offset."""
+        if not os.path.exists(self.log_file) or os.path.getsize(self.log_file) <= offset:
+            return []
+        with open(self.log_file, 'rb') as f:
+            f.seek(offset)
+            return self._parse(f.read().splitlines())
+
+    def _read_tail(self, count):
+        """Read the last count records without scanning the whole log."""
+        if count <= 0 or not os.path.exists(self.log_file):
+            return []
+        with open(self.log_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = b''
+            while position > 0 and data.count(b'\n') <= count:
+                step = min(TAIL_BLOCK, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+
+        lines = data.splitlines()
+        if position > 0:
+            lines = lines[1:]  # First line may be cut off
+        return self._parse(lines[-count:])
+
+    def _parse(self, lines):
+        """Decode log lines, skipping blank or damaged ones."""
+        records = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records
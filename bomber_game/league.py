@@ -0,0 +1,341 @@
+"""
+League - self-play against frozen past policies and the heuristic agents.
+
+The league keeps a pool of opponents: the heuristic families and frozen
+snapshots of the trained ActorCritic, taken every snapshot_interval
+episodes (only the newest max_snapshots stay in the pool). Every new
+game gets its opponent by prioritized fictitious self-play (PFSP): an
+opponent is drawn with probability proportional to f(p), where p is the
+learner's score against it, so training concentrates on the opponents
+it still loses to ('hard': f = (1 - p) ** power) or on the ones it is
+evenly matched with ('even': f = p * (1 - p)).
+
+A League is both the Trainer's matchmaker and a TrainerSink: it picks
+opponents in the trainer process, so worker processes only receive the
+opponent's name with each seed, and it records every result. Workers
+build the opponents with LeagueOpponents, which loads each snapshot
+once; all games against the same snapshot share its network and the
+game loop decides them with one forward pass per network and tick
+(FrozenPolicy.choose_actions), so self-play does not add a network call
+per game.
+
+The pool and its results are kept in league.json in the league folder,
+so a resumed run continues with the same opponents.
+"""
+
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from .heuristics import HeuristicAgent
+from .heuristics_improved import ImprovedHeuristicAgent
+from .heuristics_intermediate import IntermediateSmartHeuristic
+from .heuristics_advanced import AdvancedSmartHeuristic
+from .checkpoint_writer import write_atomic
+from .trainer import TrainerSink
+
+try:
+    import torch
+    from torch.distributions import Categorical
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+if TORCH_AVAILABLE:
+    from .agents.ppo_agent import ActorCritic, PPOAgent
+
+
+INDEX_NAME = "league.json"
+SNAPSHOT_PREFIX = "snapshot_"
+
+# Heuristic opponents by league name
+HEURISTIC_OPPONENTS = OrderedDict([
+    ('heuristic', HeuristicAgent),
+    ('improved', ImprovedHeuristicAgent),
+    ('intermediate', IntermediateSmartHeuristic),
+    ('advanced', AdvancedSmartHeuristic),
+])
+
+# Heuristics whose choose_action takes (player, opponent, game_state)
+TWO_PLAYER_HEURISTICS = ('intermediate', 'advanced')
+
+WEIGHTINGS = ('hard', 'even')
+
+
+class TwoPlayerHeuristic:
+    """Gives a (player, opponent, game_state) heuristic the usual choose_action(game_state)."""
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.player = agent.player
+
+    def choose_action(self, game_state):
+        opponent = next((p for p in game_state.players if p is not self.player), None)
+        if opponent is None:
+            return None
+        return self.agent.choose_action(self.player, opponent, game_state)
+
+
+def make_heuristic(name, player):
+    """
+    Build a heuristic opponent.
+
+    Args:
+        name: Key of HEURISTIC_OPPONENTS
+        player: Player it controls
+
+    Returns:
+        Agent with choose_action(game_state)
+    """
+    agent = HEURISTIC_OPPONENTS[name](player)
+    if name in TWO_PLAYER_HEURISTICS:
+        return TwoPlayerHeuristic(agent)
+    return agent
+
+
+class FrozenPolicy:
+    """A snapshot network shared by every game played against it."""
+
+    def __init__(self, path, greedy=False):
+        """
+        Load a snapshot.
+
+        Args:
+            path: File written by League.add_snapshot (or any PPOAgent
+                  checkpoint with a model_state_dict)
+            greedy: Play the most likely action instead of sampling
+        """
+        state = torch.load(path, map_location='cpu')['model_state_dict']
+        hidden_size, state_size = state['shared.0.weight'].shape
+        action_size = state['actor.2.weight'].shape[0]
+        self.network = ActorCritic(state_size, action_size, hidden_size)
+        self.network.load_state_dict(state)
+        self.network.eval()
+        self.greedy = greedy
+
+    def choose_actions(self, opponents, game_states):
+        """
+        Decide a batch of games with one forward pass.
+
+        Args:
+            opponents: PPOAgents acting with this network
+            game_states: Their games
+
+        Returns:
+            List of (dx, dy, place_bomb) actions
+        """
+        states = np.stack([opponent._get_state(game_state)
+                           for opponent, game_state in zip(opponents, game_states)])
+        with torch.no_grad():
+            action_probs, _ = self.network(torch.from_numpy(states))
+            if self.greedy:
+                indices = action_probs.argmax(dim=-1)
+            else:
+                indices = Categorical(action_probs).sample()
+        return [opponent.actions[i] for opponent, i in zip(opponents, indices.tolist())]
+
+
+class LeagueOpponents:
+    """
+    Opponent factory for league games.
+
+    Called with the enemy Player and the opponent name picked by the
+    League. It is sent to worker processes, so loaded snapshots are not
+    pickled; each process keeps the last cache_size it used.
+    """
+
+    def __init__(self, directory, cache_size=11, greedy=False):
+        """
+        Initialize opponent factory.
+
+        Args:
+            directory: League folder holding the snapshots
+            cache_size: Snapshots kept loaded
+            greedy: Frozen policies play their most likely action
+        """
+        self.directory = directory
+        self.cache_size = cache_size
+        self.greedy = greedy
+        self.policies = OrderedDict()  # name -> FrozenPolicy
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['policies'] = OrderedDict()
+        return state
+
+    def __call__(self, player, name='improved'):
+        if name in HEURISTIC_OPPONENTS:
+            return make_heuristic(name, player)
+
+        policy = self.policies.get(name)
+        if policy is None:
+            policy = FrozenPolicy(os.path.join(self.directory, name + ".pth"), self.greedy)
+            self.policies[name] = policy
+            while len(self.policies) > self.cache_size:
+                self.policies.popitem(last=False)
+        else:
+            self.policies.move_to_end(name)
+        opponent = PPOAgent(player, training=False, policy=policy.network)
+        opponent.batch_policy = policy
+        return opponent
+
+
+class League(TrainerSink):
+    """Opponent pool with PFSP matchmaking (Trainer matchmaker and sink)."""
+
+    def __init__(self, directory, heuristics=tuple(HEURISTIC_OPPONENTS), snapshot_interval=500,
+                 max_snapshots=10, weighting='hard', power=2.0, seed=None):
+        """
+        Open or create a league.
+
+        Args:
+            directory: League folder (snapshots and league.json)
+            heuristics: Names of the heuristic opponents in the pool
+            snapshot_interval: Freeze the learner's policy every this many
+                               episodes (0: never, heuristics only)
+            max_snapshots: Frozen policies kept in the pool
+            weighting: 'hard' (favour opponents the learner loses to) or
+                       'even' (favour opponents it is evenly matched with)
+            power: Exponent of the 'hard' weighting
+            seed: Seed of the matchmaking random generator
+        """
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f"Unknown PFSP weighting {weighting!r} (use one of {WEIGHTINGS})")
+        unknown = [name for name in heuristics if name not in HEURISTIC_OPPONENTS]
+        if unknown:
+            raise ValueError(f"Unknown heuristic opponents: {', '.join(unknown)}")
+        self.directory = directory
+        self.index_file = os.path.join(directory, INDEX_NAME)
+        self.snapshot_interval = snapshot_interval
+        self.max_snapshots = max_snapshots
+        self.weighting = weighting
+        self.power = power
+        self.rng = np.random.default_rng(seed)
+        os.makedirs(directory, exist_ok=True)
+
+        # name -> {'games', 'score'} of the learner against it
+        self.opponents = OrderedDict()
+        self.retired = []  # Snapshots dropped from the pool, files not deleted yet
+        self._load_index()
+        for name in heuristics:
+            self.opponents.setdefault(name, {'games': 0, 'score': 0.0})
+
+    def _load_index(self):
+        """Restore the pool and its results from league.json."""
+        if not os.path.exists(self.index_file):
+            return
+        with open(self.index_file, 'r') as f:
+            index = json.load(f)
+        for name, record in index['opponents'].items():
+            if name in HEURISTIC_OPPONENTS or os.path.exists(self._snapshot_path(name)):
+                self.opponents[name] = record
+        self.retired = index.get('retired', [])
+
+    def save(self):
+        """Write league.json through a temporary file."""
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({'opponents': self.opponents, 'retired': self.retired}, f, indent=2)
+        os.replace(tmp_file, self.index_file)
+
+    def _snapshot_path(self, name):
+        return os.path.join(self.directory, name + ".pth")
+
+    def snapshots(self):
+        """Get the names of the frozen policies in the pool, oldest first."""
+        return [name for name in self.opponents if name.startswith(SNAPSHOT_PREFIX)]
+
+    def opponent_factory(self, greedy=False):
+        """Get the LeagueOpponents factory to pass to the Trainer as its opponent."""
+        return LeagueOpponents(self.directory, cache_size=self.max_snapshots + 1, greedy=greedy)
+
+    def win_rate(self, name):
+        """Get the learner's score against an opponent (draws count half, 0.5 before any game)."""
+        record = self.opponents[name]
+        return (record['score'] + 1.0) / (record['games'] + 2.0)
+
+    def probabilities(self):
+        """
+        Get the PFSP matchmaking distribution.
+
+        Returns:
+            (names, probabilities) arrays
+        """
+        names = list(self.opponents)
+        p = np.array([self.win_rate(name) for name in names])
+        if self.weighting == 'hard':
+            weights = (1.0 - p) ** self.power
+        else:
+            weights = p * (1.0 - p)
+        return names, weights / weights.sum()
+
+    def next_opponent(self):
+        """Pick the opponent of the next game (Trainer matchmaker hook)."""
+        names, probabilities = self.probabilities()
+        return names[self.rng.choice(len(names), p=probabilities)]
+
+    def record(self, name, won, lost):
+        """
+        Record a finished game.
+
+        Args:
+            name: Opponent played
+            won: The learner won
+            lost: The learner died (neither: a draw)
+        """
+        record = self.opponents.get(name)
+        if record is None:
+            return  # Retired while the game was played
+        record['games'] += 1
+        record['score'] += 1.0 if won else 0.0 if lost else 0.5
+
+    def add_snapshot(self, state, episode):
+        """
+        Freeze a policy and add it to the pool.
+
+        Args:
+            state: ActorCritic state_dict
+            episode: Training episode it was taken at (names the snapshot)
+
+        Returns:
+            Name of the new opponent
+        """
+        name = f"{SNAPSHOT_PREFIX}{episode:07d}"
+        write_atomic(self._snapshot_path(name), {'model_state_dict': state, 'episode': episode})
+        self.opponents[name] = {'games': 0, 'score': 0.0}
+
+        snapshots = self.snapshots()
+        if len(snapshots) > self.max_snapshots:
+            # Games already scheduled against the files retired last time
+            # have finished by now; the ones retired now may still be queued
+            for old in self.retired:
+                if os.path.exists(self._snapshot_path(old)):
+                    os.remove(self._snapshot_path(old))
+            self.retired = snapshots[:len(snapshots) - self.max_snapshots]
+            for old in self.retired:
+                del self.opponents[old]
+        self.save()
+        return name
+
+    def summary(self):
+        """
+        Get the pool for progress output.
+
+        Returns:
+            List of (name, games, win_rate, probability), most played first
+        """
+        names, probabilities = self.probabilities()
+        rows = [(name, self.opponents[name]['games'], self.win_rate(name), probability)
+                for name, probability in zip(names, probabilities)]
+        return sorted(rows, key=lambda row: -row[1])
+
+    def on_episode(self, trainer, result):
+        if result.opponent is not None:
+            self.record(result.opponent, result.won, result.lost)
+        if self.snapshot_interval and result.episode % self.snapshot_interval == 0:
+            self.add_snapshot(trainer.learner.policy_state(), result.episode)
+
+    def on_finish(self, trainer):
+        self.save()
@@ -4,9 +4,9 @@ Menu and splash screen for Proutman game with multiplayer support.
 
 import pygame
 import os
-import json
 from pathlib import Path
 from . import SCREEN_WIDTH, SCREEN_HEIGHT, BLACK, WHITE, GREEN, BROWN
+from .metrics_store import load_summary
 
 
 class MenuScreen:
@@ -59,8 +59,7 @@ class MenuScreen:
         training_stats = {}
         if stats_file.exists():
             try:
-                with open(stats_file, 'r') as f:
-                    training_stats = json.load(f)
+                training_stats = load_summary(stats_file)
             except:
                 pass
         
@@ -98,8 +97,7 @@ class MenuScreen:
         ppo_model = models_dir / "ppo_agent.pth"
         if ppo_model.exists():
             # Use recent win rate (last 100 episodes) if available
-            win_rates = training_stats.get('win_rates', [])
-            recent_win_rate = win_rates[-1] if win_rates else training_stats.get('win_rate', 0.3)
+            recent_win_rate = training_stats.get('recent_win_rate', training_stats.get('win_rate', 0.3))
             episodes = training_stats.get('total_episodes', 0)
             
             options.append({
@@ -131,8 +129,7 @@ class MenuScreen:
         best_model = models_dir / "best_model.pth"
         if best_model.exists():
             # Use recent win rate for best model too
-            win_rates = training_stats.get('win_rates', [])
-            best_win_rate = win_rates[-1] if win_rates else training_stats.get('win_rate', 0.3)
+            best_win_rate = training_stats.get('recent_win_rate', training_stats.get('win_rate', 0.3))
             
             options.append({
                 'name': 'Expert Bot (Best)',
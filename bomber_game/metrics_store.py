@@ -0,0 +1,194 @@
+"""
+Training metrics store - append-only metric columns plus a small summary.
+
+Per-episode series (episode rewards, windowed win rates, ...) are appended
+as raw float64 values to one file per column in <name>_metrics/, so a save
+only writes the values added since the last one and a reader can load just
+the rows it has not seen yet (np.fromfile with an offset). Totals and the
+latest values live in the summary file (training_stats.json), which stays
+a few hundred bytes no matter how long training runs.
+
+Older training_stats.json files that keep the series as JSON lists are
+still readable; the first TrainingMetricsStore.load() moves the lists into
+column files.
+"""
+
+import json
+import os
+
+import numpy as np
+
+
+COLUMNS = ('episode_rewards', 'win_rates', 'avg_rewards')
+DTYPE = np.dtype('<f8')
+
+
+def load_summary(stats_file):
+    """
+    Read a training summary without loading any metric column.
+
+    Latest/best values are filled in from JSON lists when the file still
+    has them (older format), so readers can rely on 'recent_win_rate',
+    'recent_avg_reward' and 'best_win_rate' either way.
+
+    Args:
+        stats_file: Path to training_stats.json
+
+    Returns:
+        Summary dictionary, or None if there is no file
+
+    Raises:
+        OSError, ValueError: If the file cannot be read or parsed
+    """
+    if not os.path.exists(stats_file):
+        return None
+    with open(stats_file, 'r') as f:
+        summary = json.load(f)
+
+    win_rates = summary.pop('win_rates', None)
+    avg_rewards = summary.pop('avg_rewards', None)
+    summary.pop('episode_rewards', None)
+    if win_rates:
+        summary.setdefault('recent_win_rate', win_rates[-1])
+        summary.setdefault('best_win_rate', max(win_rates))
+    if avg_rewards:
+        summary.setdefault('recent_avg_reward', avg_rewards[-1])
+    return summary
+
+
+class TrainingMetricsStore:
+    """Training summary plus append-only metric columns."""
+
+    def __init__(self, stats_file="bomber_game/models/training_stats.json", columns=COLUMNS):
+        """
+        Initialize metrics store.
+
+        Args:
+            stats_file: Summary file; columns are stored in a folder next
+                        to it named <name>_metrics
+            columns: Names of the metric columns (default: the training
+                     series in COLUMNS)
+        """
+        self.stats_file = stats_file
+        self.metrics_dir = os.path.splitext(stats_file)[0] + "_metrics"
+        self.columns = tuple(columns)
+        self.pending = {column: [] for column in self.columns}
+
+    def column_file(self, column):
+        """Get the path of a metric column file."""
+        return os.path.join(self.metrics_dir, f"{column}.f64")
+
+    def load(self, defaults=None):
+        """
+        Load the summary for a training run to continue.
+
+        Columns are cut back to the row counts of the summary (values saved
+        after it belong to episodes that will be played again). JSON lists
+        left by older versions are moved into the column files (only into
+        columns that are still empty) and the summary is rewritten without
+        them.
+
+        Args:
+            defaults: Keys to add when missing from the summary
+
+        Returns:
+            Summary dictionary (defaults only if there is no summary yet)
+        """
+        summary = None
+        if os.path.exists(self.stats_file):
+            try:
+                with open(self.stats_file, 'r') as f:
+                    summary = json.load(f)
+            except Exception:
+                summary = None
+        if summary is None:
+            return dict(defaults or {})
+
+        for column, rows in summary.get('metrics_rows', {}).items():
+            if self.row_count(column) > rows:
+                with open(self.column_file(column), 'r+b') as f:
+                    f.truncate(rows * DTYPE.itemsize)
+
+        legacy = {column: summary.pop(column) for column in self.columns
+                  if isinstance(summary.get(column), list)}
+        if legacy.get('win_rates'):
+            summary.setdefault('recent_win_rate', legacy['win_rates'][-1])
+            summary.setdefault('best_win_rate', max(legacy['win_rates']))
+        if legacy.get('avg_rewards'):
+            summary.setdefault('recent_avg_reward', legacy['avg_rewards'][-1])
+        for key, value in (defaults or {}).items():
+            summary.setdefault(key, value)
+
+        if legacy:
+            for column, values in legacy.items():
+                if self.row_count(column) == 0:
+                    self.append(column, values)
+            self.save(summary)
+        return summary
+
+    def append(self, column, values):
+        """
+        Queue values for a metric column (written by save()).
+
+        Args:
+            column: Column name (one of the store's columns)
+            values: Number or list of numbers
+        """
+        if np.isscalar(values):
+            self.pending[column].append(values)
+        else:
+            self.pending[column].extend(values)
+
+    def save(self, summary):
+        """
+        Write queued column values, then the summary.
+
+        Columns are written first, so the row counts recorded in the
+        summary never exceed what is on disk.
+
+        Args:
+            summary: Summary dictionary (updated with 'metrics_rows')
+        """
+        os.makedirs(self.metrics_dir, exist_ok=True)
+        for column, values in self.pending.items():
+            if values:
+                rows = self.row_count(column)
+                with open(self.column_file(column), 'ab') as f:
+                    if f.tell() != rows * DTYPE.itemsize:
+                        f.truncate(rows * DTYPE.itemsize)  # Drop a value cut short by a crash
+                    np.asarray(values, dtype=DTYPE).tofile(f)
+                values.clear()
+
+        summary['metrics_rows'] = {column: self.row_count(column) for column in self.columns}
+        tmp_file = self.stats_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(summary, f, indent=2)
+        os.replace(tmp_file, self.stats_file)
+
+    def row_count(self, column):
+        """Get the number of values saved in a column."""
+        try:
+            return os.path.getsize(self.column_file(column)) // DTYPE.itemsize
+        except OSError:
+            return 0
+
+    def read(self, column, start=0):
+        """
+        Read saved values of a column from a row onwards.
+
+        Args:
+            column: Column name
+            start: First row to read (rows before it are not touched)
+
+        Returns:
+            float64 array (empty if there are no new rows)
+        """
+        count = self.row_count(column) - start
+        if count <= 0:
+            return np.empty(0, dtype=DTYPE)
+        return np.fromfile(self.column_file(column), dtype=DTYPE,
+                           count=count, offset=start * DTYPE.itemsize)
+
+    def tail(self, column, count):
+        """Read the last count saved values of a column."""
+        return self.read(column, max(0, self.row_count(column) - count))
@@ -9,6 +9,8 @@ from pathlib import Path
 from datetime import datetime
 import torch
 
+from .ratings import RatingService, RATINGS_NAME
+
 
 class ModelHistory:
     """
@@ -23,6 +25,9 @@ class ModelHistory:
         self.history_file = self.models_dir / "model_history.json"
         self.history = self._load_history()
         
+        # Versions are rated by evaluation matches (rate_models.py), not training win rates
+        self.ratings_file = self.models_dir / RATINGS_NAME
+        
         # Game modes
         self.game_modes = {
             'vs_simple': 'Against Simple AI',
@@ -81,6 +86,13 @@ class ModelHistory:
         except Exception as e:
             print(f"Warning: Could not copy model: {e}")
         
+        # Register for rating matches (played later by the rating service)
+        try:
+            with RatingService(self.ratings_file) as ratings:
+                ratings.register_model(f"v{version_id}", versioned_path)
+        except Exception as e:
+            print(f"Warning: Could not register model for rating: {e}")
+        
         # Add to history
         self.history['versions'].append(version)
         self.history['current_version'] = version_id
@@ -123,6 +135,27 @@ class ModelHistory:
             return self._get_version(version_id)
         return None
     
+    def get_version_rating(self, version_id):
+        """
+        Get a version's rating from the rating cache.
+        
+        Returns:
+            {'rating', 'games'} or None if it has not been rated yet
+        """
+        if not self.ratings_file.exists():
+            return None
+        with RatingService(self.ratings_file) as ratings:
+            return ratings.rating(f"v{version_id}")
+    
+    def get_top_rated_version(self):
+        """Get the version with the highest rating (None if none is rated)."""
+        best, best_rating = None, None
+        for version in self.history['versions']:
+            rating = self.get_version_rating(version['version_id'])
+            if rating and (best_rating is None or rating['rating'] > best_rating):
+                best, best_rating = version, rating['rating']
+        return best
+    
     def get_all_versions(self):
         """Get all model versions."""
         return self.history['versions']
@@ -187,6 +220,7 @@ class ModelHistory:
                 report.append(f"     Avg Reward: {best['performance'].get('avg_reward', 0):.2f}")
                 report.append(f"     Episodes: {best['performance'].get('episodes', 0):,}")
                 report.append(f"     Date: {best['timestamp'][:10]}")
+                report.extend(self._rating_lines(best))
             
             # Latest version
             latest = versions[-1]
@@ -194,15 +228,28 @@ class ModelHistory:
             report.append(f"     Win Rate: {latest['performance'].get('win_rate', 0):.1f}%")
             report.append(f"     Avg Reward: {latest['performance'].get('avg_reward', 0):.2f}")
             report.append(f"     Episodes: {latest['performance'].get('episodes', 0):,}")
+            report.extend(self._rating_lines(latest))
             
             # Trend
             trend = self.get_performance_trend(mode_key)
             if trend and trend['improvement'] != 0:
                 report.append(f"\n  📈 Trend: {trend['improvement']:+.1f}% ({trend['improvement_pct']:+.1f}% change)")
         
+        top = self.get_top_rated_version()
+        if top:
+            rating = self.get_version_rating(top['version_id'])
+            report.append(f"\n⭐ Top Rated: v{top['version_id']} ({rating['rating']:.0f} Elo, {rating['games']} games)")
+        
         report.append("\n" + "=" * 70)
         return "\n".join(report)
     
+    def _rating_lines(self, version):
+        """Report line with a version's rating, if it has one."""
+        rating = self.get_version_rating(version['version_id'])
+        if rating is None:
+            return []
+        return [f"     Rating: {rating['rating']:.0f} Elo ({rating['games']} games)"]
+    
     def export_to_csv(self, output_file="model_performance.csv"):
         """Export history to CSV for analysis."""
         import csv
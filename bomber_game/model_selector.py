@@ -8,6 +8,9 @@ import json
 import shutil
 from datetime import datetime
 
+from .metrics_store import load_summary
+from .ratings import RatingService, RATINGS_NAME, ANCHOR_HEURISTIC, expected_score
+
 
 class ModelSelector:
     """Selects the best performing AI model based on win rate statistics."""
@@ -28,12 +31,14 @@ class ModelSelector:
         self.best_model_file = os.path.join(models_dir, "best_model.pth")
         self.ppo_model_file = os.path.join(models_dir, "ppo_agent.pth")
         self.pretrained_file = os.path.join(models_dir, "ppo_pretrained.pth")
+        self.ratings_file = os.path.join(models_dir, RATINGS_NAME)
         
         # Performance thresholds
         self.min_episodes_for_comparison = 50  # Minimum games before comparing
         self.heuristic_baseline_win_rate = 30.0  # Improved heuristic baseline
         self.enhanced_heuristic_win_rate = 66.0  # Enhanced heuristic (from benchmarks)
         self.bootstrap_win_rate = 25.0  # Bootstrap pretrained model
+        self.min_rated_games = 20  # Rating games before a rating is trusted
         
     def get_model_stats(self, stats_file):
         """
@@ -49,8 +54,8 @@ class ModelSelector:
             return None
             
         try:
-            with open(stats_file, 'r') as f:
-                stats = json.load(f)
+            # Training stats keep their series in metric columns: only the summary is read
+            stats = load_summary(stats_file)
                 
             # Calculate win rate if not present
             total_episodes = stats.get('total_episodes', 0)
@@ -130,6 +135,12 @@ class ModelSelector:
         print("🎯 INTELLIGENT MODEL SELECTION")
         print("=" * 70)
         
+        # Ratings from evaluation matches take precedence over training win rates
+        rated = self.select_by_rating()
+        if rated:
+            print("=" * 70 + "\n")
+            return rated
+        
         # Get statistics for all models
         ppo_stats = self.get_model_stats(self.stats_file)
         heuristic_stats = self.initialize_heuristic_stats()
@@ -181,8 +192,7 @@ class ModelSelector:
             ppo_win_rate = ppo_stats.get('win_rate', 0.0)
             
             # Get recent performance (last 100 episodes)
-            win_rates = ppo_stats.get('win_rates', [])
-            recent_win_rate = win_rates[-1] if win_rates else ppo_win_rate
+            recent_win_rate = ppo_stats.get('recent_win_rate', ppo_win_rate)
             
             # Calculate improvement
             training_sessions = ppo_stats.get('training_sessions', [])
@@ -269,6 +279,64 @@ class ModelSelector:
         print("=" * 70 + "\n")
         return result
     
+    def select_by_rating(self):
+        """
+        Select between the trained models and the heuristic by their ratings.
+        
+        Ratings are read from the rating cache filled by evaluation matches
+        (rate_models.py); no game is played here. Models are looked up by
+        the content of their file, so a retrained ppo_agent.pth is never
+        judged by its predecessor's rating.
+        
+        Returns:
+            Selection dictionary like select_best_model(), or None if the
+            heuristic or every model is unrated (or rated on too few games)
+        """
+        if not os.path.exists(self.ratings_file):
+            return None
+        
+        with RatingService(self.ratings_file) as ratings:
+            heuristic = ratings.rating(ANCHOR_HEURISTIC)
+            candidates = []
+            for model_type, path in (('ppo', self.ppo_model_file), ('ppo_pretrained', self.pretrained_file)):
+                rating = ratings.rating_for_file(path)
+                if rating and rating['games'] >= self.min_rated_games:
+                    candidates.append((rating['rating'], model_type, path))
+        if heuristic is None or not candidates:
+            return None
+        
+        model_rating, model_type, model_path = max(candidates, key=lambda candidate: candidate[0])
+        heuristic_rating = heuristic['rating']
+        print(f"\n⭐ Rated Models (evaluation matches):")
+        for rating, candidate_type, path in candidates:
+            print(f"   {os.path.basename(path)}: {rating:.0f} Elo")
+        print(f"   Heuristic: {heuristic_rating:.0f} Elo")
+        
+        if model_rating >= heuristic_rating:
+            result = {
+                'model_path': model_path,
+                'model_type': model_type,
+                'win_rate': expected_score(model_rating, heuristic_rating) * 100,
+                'rating': model_rating,
+                'reason': f'Rated {model_rating - heuristic_rating:.0f} Elo above the heuristic',
+            }
+            if model_type == 'ppo':
+                self._save_as_best_model(model_path)
+            print(f"\n🏆 Decision: Use {model_type.upper()} Model")
+        else:
+            result = {
+                'model_path': 'heuristic',
+                'model_type': 'heuristic',
+                'win_rate': expected_score(heuristic_rating, model_rating) * 100,
+                'rating': heuristic_rating,
+                'reason': f'Heuristic rated {heuristic_rating - model_rating:.0f} Elo above the best model',
+            }
+            print(f"\n🌱 Decision: Use Heuristic Agent")
+        print(f"   Reason: {result['reason']}")
+        opponent = 'heuristic' if result['model_type'] != 'heuristic' else 'best model'
+        print(f"   Expected Win Rate vs {opponent}: {result['win_rate']:.1f}%")
+        return result
+    
     def _save_as_best_model(self, model_path):
         """
         Save a model as the best performing model.
@@ -0,0 +1,390 @@
+"""
+Ratings - Elo / Bradley-Terry ratings from evaluation matches.
+
+RatingService keeps a SQLite cache (ratings.sqlite in the models folder)
+of registered players: model checkpoints (ModelHistory versions,
+ppo_agent.pth, ...) and the heuristic agents. Every player is identified
+by a content hash: the SHA-256 of the checkpoint file, or of the
+heuristic's source file for heuristics. Results are stored per pair of
+hashes, so a pairing is played once; a model registered under another
+name, or a file copied elsewhere, keeps its results, while a retrained
+file or an edited heuristic gets a new hash and is rated again.
+
+run() plays the missing pairings on a process pool (seeded games, sides
+swapped every other game) and refits the ratings after each pairing that
+comes back, warm-started from the current ones. Ratings are a
+Bradley-Terry fit on the Elo scale (400 points: 10 to 1 odds); draws
+count half a win for each side and every pairing gets one extra drawn
+game, so unbeaten players still get a finite rating. The 'improved'
+heuristic is pinned at 1000 when it is rated.
+
+Readers (ModelSelector) only look ratings up by name or content hash, so
+they never play a game.
+"""
+
+import hashlib
+import inspect
+import multiprocessing
+import random
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from . import GRID_SIZE
+from .game_state import GameState
+from .league import HEURISTIC_OPPONENTS, make_heuristic
+from .trainer import apply_action
+
+
+RATINGS_NAME = "ratings.sqlite"
+ELO_BASE = 1000.0
+ELO_SCALE = 400.0
+ANCHOR_HEURISTIC = 'improved'  # Rated ELO_BASE when present
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    path TEXT,
+    registered TEXT
+);
+CREATE TABLE IF NOT EXISTS pairings (
+    hash_a TEXT NOT NULL,
+    hash_b TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    wins_a INTEGER NOT NULL,
+    wins_b INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    played TEXT,
+    PRIMARY KEY (hash_a, hash_b)
+);
+CREATE TABLE IF NOT EXISTS ratings (
+    content_hash TEXT PRIMARY KEY,
+    rating REAL NOT NULL,
+    games INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_players_hash ON players (content_hash);
+"""
+
+
+def file_hash(path):
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def heuristic_hash(name):
+    """Content hash of a heuristic: its name and the source file of its class."""
+    digest = hashlib.sha256(f"heuristic:{name}:".encode())
+    with open(inspect.getsourcefile(HEURISTIC_OPPONENTS[name]), 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def expected_score(rating, opponent_rating):
+    """Expected score (win probability, draws counting half) of rating against opponent_rating."""
+    return 1.0 / (1.0 + 10 ** ((opponent_rating - rating) / ELO_SCALE))
+
+
+def fit_bradley_terry(wins, initial=None, iterations=200, tolerance=1e-6):
+    """
+    Fit Bradley-Terry strengths with minorization-maximization.
+
+    Args:
+        wins: [n, n] array, wins[i, j] = games i won against j (draws as 0.5)
+        initial: Starting strengths (warm start), or None
+        iterations: Most MM steps
+        tolerance: Stop when no log-strength moves more than this
+
+    Returns:
+        float64 array of n strengths with geometric mean 1
+    """
+    games = wins + wins.T
+    total_wins = wins.sum(axis=1)
+    strengths = np.ones(len(wins)) if initial is None else np.asarray(initial, dtype=np.float64)
+    for _ in range(iterations):
+        denominator = (games / (strengths[:, None] + strengths[None, :])).sum(axis=1)
+        updated = np.where(denominator > 0, total_wins / np.maximum(denominator, 1e-300), strengths)
+        updated /= np.exp(np.log(updated).mean())
+        converged = np.max(np.abs(np.log(updated) - np.log(strengths))) < tolerance
+        strengths = updated
+        if converged:
+            break
+    return strengths
+
+
+def _build_agent(spec, player, policies):
+    """Create a player's agent from its (kind, name, path) spec."""
+    kind, name, path = spec
+    if kind == 'heuristic':
+        return make_heuristic(name, player)
+    from .agents.ppo_agent import PPOAgent
+    from .league import FrozenPolicy
+    if path not in policies:
+        policies[path] = FrozenPolicy(path, greedy=True)
+    return PPOAgent(player, training=False, policy=policies[path].network)
+
+
+def _play_pairing(task):
+    """
+    Play the games of one pairing (runs in a worker process).
+
+    Args:
+        task: (hash_a, spec_a, hash_b, spec_b, seeds, max_steps, dt, grid_size)
+
+    Returns:
+        (hash_a, hash_b, wins_a, wins_b, draws)
+    """
+    hash_a, spec_a, hash_b, spec_b, seeds, max_steps, dt, grid_size = task
+    policies = {}
+    wins_a = wins_b = draws = 0
+    for game, seed in enumerate(seeds):
+        random.seed(seed)  # The heuristics draw from the global generator
+        game_state = GameState(grid_size, seed=seed)
+        corners = [(1, 1), (grid_size - 2, grid_size - 2)]
+        if game % 2:
+            corners.reverse()  # Swap sides every other game
+        player_a = game_state.add_player(*corners[0], (255, 0, 0), spec_a[1])
+        player_b = game_state.add_player(*corners[1], (0, 255, 0), spec_b[1])
+        agents = [(player_a, _build_agent(spec_a, player_a, policies)),
+                  (player_b, _build_agent(spec_b, player_b, policies))]
+
+        steps = 0
+        while not game_state.game_over and steps < max_steps:
+            for player, agent in agents:
+                if player.alive:
+                    apply_action(game_state, player, agent.choose_action(game_state))
+            game_state.update(dt)
+            steps += 1
+
+        if player_a.alive and not player_b.alive:
+            wins_a += 1
+        elif player_b.alive and not player_a.alive:
+            wins_b += 1
+        else:
+            draws += 1
+    return hash_a, hash_b, wins_a, wins_b, draws
+
+
+class RatingService:
+    """Registers players, plays the missing pairings and keeps their ratings."""
+
+    def __init__(self, db_path, games_per_pairing=20, max_steps=1500, dt=1/30,
+                 grid_size=GRID_SIZE, num_workers=None, seed=0):
+        """
+        Open (creating if needed) a rating cache.
+
+        Args:
+            db_path: Path of the SQLite database file
+            games_per_pairing: Games played between two players
+            max_steps: Step limit per game (a draw when reached)
+            dt: Seconds per game tick
+            grid_size: Board size
+            num_workers: Processes playing pairings (default: CPU count;
+                         0 plays in this process)
+            seed: Seed of the first game of every pairing (games get
+                  consecutive seeds, so every pairing sees the same maps)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.games_per_pairing = games_per_pairing
+        self.max_steps = max_steps
+        self.dt = dt
+        self.grid_size = grid_size
+        self.num_workers = num_workers
+        self.seed = seed
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Players
+    # ------------------------------------------------------------------
+
+    def _register(self, name, kind, content_hash, path):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO players (name, kind, content_hash, path, registered) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET kind = excluded.kind, content_hash = excluded.content_hash, "
+                "path = excluded.path, registered = excluded.registered "
+                "WHERE content_hash != excluded.content_hash OR path IS NOT excluded.path",
+                (name, kind, content_hash, path, datetime.now().isoformat()))
+        return content_hash
+
+    def register_model(self, name, path):
+        """
+        Register (or re-register) a model checkpoint.
+
+        Args:
+            name: Player name, e.g. 'v3' or 'ppo_agent'
+            path: PPOAgent checkpoint file
+
+        Returns:
+            Content hash of the checkpoint
+        """
+        return self._register(name, 'model', file_hash(path), str(path))
+
+    def register_heuristics(self, names=tuple(HEURISTIC_OPPONENTS)):
+        """Register heuristic agents under their league names."""
+        for name in names:
+            self._register(name, 'heuristic', heuristic_hash(name), None)
+
+    def players(self):
+        """Get all registered players as dictionaries."""
+        return [dict(row) for row in self.conn.execute("SELECT * FROM players ORDER BY name")]
+
+    # ------------------------------------------------------------------
+    # Matches
+    # ------------------------------------------------------------------
+
+    def pending_pairings(self):
+        """
+        Get the pairings of registered players that have not been played.
+
+        Returns:
+            List of ((hash_a, spec_a), (hash_b, spec_b)), hash_a < hash_b
+        """
+        players = {}
+        for row in self.conn.execute("SELECT * FROM players ORDER BY registered, name"):
+            # A hash registered under several names is one player
+            players.setdefault(row['content_hash'], (row['kind'], row['name'], row['path']))
+        played = {(row['hash_a'], row['hash_b'])
+                  for row in self.conn.execute("SELECT hash_a, hash_b FROM pairings")}
+        hashes = sorted(players)
+        return [((a, players[a]), (b, players[b]))
+                for i, a in enumerate(hashes) for b in hashes[i + 1:] if (a, b) not in played]
+
+    def run(self, log=print):
+        """
+        Play every pending pairing, refitting the ratings as results arrive.
+
+        Args:
+            log: Function used for progress messages
+
+        Returns:
+            Number of pairings played
+        """
+        seeds = list(range(self.seed, self.seed + self.games_per_pairing))
+        tasks = [(a, spec_a, b, spec_b, seeds, self.max_steps, self.dt, self.grid_size)
+                 for (a, spec_a), (b, spec_b) in self.pending_pairings()]
+        if not tasks:
+            return 0
+
+        num_workers = multiprocessing.cpu_count() if self.num_workers is None else self.num_workers
+        if num_workers > 0 and len(tasks) > 1:
+            pool = multiprocessing.get_context('spawn').Pool(min(num_workers, len(tasks)))
+            results = pool.imap_unordered(_play_pairing, tasks)
+        else:
+            pool = None
+            results = map(_play_pairing, tasks)
+
+        names = {task[0]: task[1][1] for task in tasks}
+        names.update({task[2]: task[3][1] for task in tasks})
+        played = 0
+        try:
+            for hash_a, hash_b, wins_a, wins_b, draws in results:
+                self._add_pairing(hash_a, hash_b, wins_a, wins_b, draws)
+                played += 1
+                log(f"  [{played}/{len(tasks)}] {names[hash_a]} vs {names[hash_b]}: "
+                    f"{wins_a}-{wins_b} ({draws} draws)")
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+        return played
+
+    def _add_pairing(self, hash_a, hash_b, wins_a, wins_b, draws):
+        """Store a pairing's result and refit the ratings."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pairings VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (hash_a, hash_b, wins_a + wins_b + draws, wins_a, wins_b, draws,
+                 datetime.now().isoformat()))
+            self._refit()
+
+    def _refit(self):
+        """Refit every rating from the stored pairings (inside a transaction)."""
+        rows = self.conn.execute("SELECT * FROM pairings").fetchall()
+        hashes = sorted({row['hash_a'] for row in rows} | {row['hash_b'] for row in rows})
+        position = {content_hash: i for i, content_hash in enumerate(hashes)}
+        wins = np.zeros((len(hashes), len(hashes)))
+        games = np.zeros(len(hashes), dtype=np.int64)
+        for row in rows:
+            a, b = position[row['hash_a']], position[row['hash_b']]
+            # One extra drawn game per pairing keeps unbeaten players finite
+            wins[a, b] += row['wins_a'] + 0.5 * row['draws'] + 0.5
+            wins[b, a] += row['wins_b'] + 0.5 * row['draws'] + 0.5
+            games[a] += row['games']
+            games[b] += row['games']
+
+        # Warm start from the current ratings
+        previous = dict(self.conn.execute("SELECT content_hash, rating FROM ratings").fetchall())
+        initial = np.array([10 ** ((previous.get(h, ELO_BASE) - ELO_BASE) / ELO_SCALE) for h in hashes])
+        ratings = ELO_SCALE * np.log10(fit_bradley_terry(wins, initial))
+
+        anchor = self.conn.execute("SELECT content_hash FROM players WHERE name = ?",
+                                   (ANCHOR_HEURISTIC,)).fetchone()
+        if anchor is not None and anchor['content_hash'] in position:
+            ratings += ELO_BASE - ratings[position[anchor['content_hash']]]
+        else:
+            ratings += ELO_BASE - ratings.mean()
+
+        self.conn.execute("DELETE FROM ratings")
+        self.conn.executemany("INSERT INTO ratings VALUES (?, ?, ?)",
+                              [(h, float(r), int(g)) for h, r, g in zip(hashes, ratings, games)])
+
+    # ------------------------------------------------------------------
+    # Lookups (no games played)
+    # ------------------------------------------------------------------
+
+    def rating_for_hash(self, content_hash):
+        """
+        Get the rating of a content hash.
+
+        Returns:
+            {'rating', 'games'} or None if it has not been rated
+        """
+        row = self.conn.execute("SELECT rating, games FROM ratings WHERE content_hash = ?",
+                                (content_hash,)).fetchone()
+        return dict(row) if row else None
+
+    def rating_for_file(self, path):
+        """Get the rating of a checkpoint file by its content (None if unrated or missing)."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        return self.rating_for_hash(file_hash(path))
+
+    def rating(self, name):
+        """Get the rating of a registered player by name (None if unrated)."""
+        row = self.conn.execute("SELECT content_hash FROM players WHERE name = ?", (name,)).fetchone()
+        return self.rating_for_hash(row['content_hash']) if row else None
+
+    def leaderboard(self):
+        """
+        Get the rated registered players, best first.
+
+        Returns:
+            List of dictionaries with name, kind, path, rating and games
+        """
+        rows = self.conn.execute(
+            "SELECT players.name, players.kind, players.path, ratings.rating, ratings.games "
+            "FROM players JOIN ratings ON ratings.content_hash = players.content_hash "
+            "ORDER BY ratings.rating DESC, players.name")
+        return [dict(row) for row in rows]
@@ -0,0 +1,304 @@
+"""
+Replay catalog - SQLite index of the games in a replay folder.
+
+GameRecorder adds every exported game, so listing and statistics queries
+read a few indexed rows instead of parsing every summary and replay file.
+Tables:
+
+    games          one row per game (times, winner, seed, counts, file)
+    game_players   per-player outcome (won, bombs placed, actions)
+    game_events    per-game event counts by type
+
+rebuild() re-creates the catalog from the files of an existing folder
+(see rebuild_replay_catalog.py).
+"""
+
+import gzip
+import json
+import sqlite3
+from pathlib import Path
+
+from .game_recorder import OPS_PER_PLAYER, OP_BOMB
+from .replay_format import ReplayReader
+
+
+CATALOG_NAME = "catalog.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    start_time TEXT,
+    end_time TEXT,
+    duration REAL,
+    winner TEXT,
+    seed INTEGER,
+    total_ticks INTEGER,
+    total_frames INTEGER,
+    total_actions INTEGER,
+    total_events INTEGER,
+    statistics TEXT,
+    file TEXT
+);
+CREATE TABLE IF NOT EXISTS game_players (
+    game_id TEXT NOT NULL,
+    player_index INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    won INTEGER NOT NULL,
+    bombs_placed INTEGER NOT NULL,
+    actions INTEGER NOT NULL,
+    PRIMARY KEY (game_id, player_index)
+);
+CREATE TABLE IF NOT EXISTS game_events (
+    game_id TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (game_id, event_type)
+);
+CREATE INDEX IF NOT EXISTS idx_games_start_time ON games (start_time);
+CREATE INDEX IF NOT EXISTS idx_games_winner ON games (winner);
+CREATE INDEX IF NOT EXISTS idx_players_name ON game_players (name, game_id);
+CREATE INDEX IF NOT EXISTS idx_events_type ON game_events (event_type);
+"""
+
+
+def _bombs_by_player(ticks, num_players):
+    """Count bomb placements per player in an input log."""
+    counts = [0] * num_players
+    for tick in ticks:
+        for op in tick[1:]:
+            index, code = divmod(op, OPS_PER_PLAYER)
+            if code == OP_BOMB and index < num_players:
+                counts[index] += 1
+    return counts
+
+
+class ReplayCatalog:
+    """SQLite catalog of the games in one replay folder."""
+
+    def __init__(self, db_path):
+        """
+        Open (creating if needed) a catalog.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_recording(self, recording, file=None, delta_counts=None):
+        """
+        Add or update a game from a GameRecorder recording.
+
+        Args:
+            recording: Recording dictionary (ticks are optional)
+            file: Replay file the game is stored in, if any
+            delta_counts: {map change kind: count} of the game, if not
+                          already in the recording's 'map_changes'
+        """
+        with self.conn:
+            self._insert(recording, file, delta_counts)
+
+    def add_summary(self, summary, file=None):
+        """Add or update a game known only from its summary_*.json."""
+        with self.conn:
+            self._insert_game(summary, file)
+
+    def _insert(self, recording, file, delta_counts):
+        """Insert a recording's rows (inside a transaction)."""
+        game_id = recording['game_id']
+        initial_players = recording.get('initial_state', {}).get('players', [])
+        actions = recording.get('actions', [])
+        events = recording.get('events', [])
+        ticks = recording.get('ticks')
+
+        summary = dict(recording)
+        summary.setdefault('total_ticks', len(ticks) if ticks is not None else None)
+        summary['total_actions'] = len(actions)
+        summary['total_events'] = len(events)
+        self._insert_game(summary, file)
+
+        bombs = _bombs_by_player(ticks or [], len(initial_players))
+        player_rows = []
+        for index, player in enumerate(initial_players):
+            name = player['name']
+            player_actions = [a for a in actions if a['player'] == name]
+            if not ticks:
+                bombs[index] = sum(1 for a in player_actions if a['action'] == 'place_bomb')
+            player_rows.append((game_id, index, name, int(recording.get('winner') == name),
+                                bombs[index], len(player_actions)))
+
+        event_counts = dict(delta_counts or recording.get('map_changes') or {})
+        for event in events:
+            event_counts[event['type']] = event_counts.get(event['type'], 0) + 1
+
+        self.conn.execute("DELETE FROM game_players WHERE game_id = ?", (game_id,))
+        self.conn.execute("DELETE FROM game_events WHERE game_id = ?", (game_id,))
+        self.conn.executemany("INSERT INTO game_players VALUES (?, ?, ?, ?, ?, ?)", player_rows)
+        self.conn.executemany("INSERT INTO game_events VALUES (?, ?, ?)",
+                              [(game_id, kind, count) for kind, count in event_counts.items()])
+
+    def _insert_game(self, summary, file):
+        """Upsert the games row (keeps the known file if none is given)."""
+        self.conn.execute(
+            """
+            INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (game_id) DO UPDATE SET
+                start_time = excluded.start_time, end_time = excluded.end_time,
+                duration = excluded.duration, winner = excluded.winner,
+                seed = COALESCE(excluded.seed, seed),
+                total_ticks = COALESCE(excluded.total_ticks, total_ticks),
+                total_frames = excluded.total_frames,
+                total_actions = excluded.total_actions,
+                total_events = excluded.total_events,
+                statistics = excluded.statistics,
+                file = COALESCE(excluded.file, file)
+            """,
+            (summary['game_id'], summary.get('start_time'), summary.get('end_time'),
+             summary.get('duration'), summary.get('winner'), summary.get('seed'),
+             summary.get('total_ticks'), summary.get('total_frames'),
+             summary.get('total_actions'), summary.get('total_events'),
+             json.dumps(summary.get('statistics') or {}), str(file) if file else None)
+        )
+
+    def list_games(self, limit=None, winner=None, player=None, since=None):
+        """
+        List games, newest first.
+
+        Args:
+            limit: Maximum number of games
+            winner: Only games won by this player name
+            player: Only games this player name took part in
+            since: Only games started at or after this ISO timestamp
+
+        Returns:
+            List of summary dictionaries (like summary_*.json)
+        """
+        query = "SELECT * FROM games"
+        conditions = []
+        params = []
+        if winner is not None:
+            conditions.append("winner = ?")
+            params.append(winner)
+        if player is not None:
+            conditions.append("game_id IN (SELECT game_id FROM game_players WHERE name = ?)")
+            params.append(player)
+        if since is not None:
+            conditions.append("start_time >= ?")
+            params.append(since)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY start_time DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        games = []
+        for row in self.conn.execute(query, params):
+            game = dict(row)
+            game['statistics'] = json.loads(game['statistics'] or '{}')
+            games.append(game)
+        return games
+
+    def player_statistics(self, player_name, num_games=10):
+        """
+        Aggregate a player's results over the most recent games.
+
+        Returns:
+            Dictionary like ReplayManager.get_player_statistics
+        """
+        row = self.conn.execute(
+            """
+            SELECT COUNT(*) AS total_games,
+                   COALESCE(SUM(g.winner = ?), 0) AS wins,
+                   COALESCE(SUM(g.duration), 0) AS total_duration,
+                   COALESCE(SUM(p.actions), 0) AS total_actions,
+                   COALESCE(SUM(p.bombs_placed), 0) AS bombs_placed
+            FROM (SELECT game_id, winner, duration FROM games
+                  ORDER BY start_time DESC LIMIT ?) AS g
+            LEFT JOIN game_players AS p ON p.game_id = g.game_id AND p.name = ?
+            """,
+            (player_name, num_games, player_name)
+        ).fetchone()
+
+        total_games = row['total_games']
+        return {
+            'total_games': total_games,
+            'wins': row['wins'],
+            'losses': total_games - row['wins'],
+            'total_actions': row['total_actions'],
+            'bombs_placed': row['bombs_placed'],
+            'avg_game_duration': row['total_duration'] / total_games if total_games else 0,
+            'win_rate': row['wins'] / total_games * 100 if total_games else 0,
+        }
+
+    def event_counts(self, game_id=None):
+        """Get event counts by type for one game or all games."""
+        if game_id is None:
+            rows = self.conn.execute(
+                "SELECT event_type, SUM(count) FROM game_events GROUP BY event_type")
+        else:
+            rows = self.conn.execute(
+                "SELECT event_type, count FROM game_events WHERE game_id = ?", (game_id,))
+        return {event_type: count for event_type, count in rows}
+
+    def count(self):
+        """Get the number of catalogued games."""
+        return self.conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def rebuild(self, replay_dir):
+        """
+        Re-create the catalog from the files in a replay folder.
+
+        Each game is read from the best file available: binary replay,
+        then full JSON replay, then its summary.
+
+        Returns:
+            Number of games catalogued
+        """
+        replay_dir = Path(replay_dir)
+        sources = {}
+        for pattern, prefix, kind in (("summary_*.json", "summary_", 'summary'),
+                                      ("game_*.json", "game_", 'json'),
+                                      ("game_*.json.gz", "game_", 'json'),
+                                      ("game_*.replay", "game_", 'replay')):
+            for path in replay_dir.glob(pattern):
+                game_id = path.name[len(prefix):].split('.', 1)[0]
+                sources[game_id] = (kind, path)  # Later patterns win
+
+        with self.conn:
+            self.conn.execute("DELETE FROM games")
+            self.conn.execute("DELETE FROM game_players")
+            self.conn.execute("DELETE FROM game_events")
+            for game_id, (kind, path) in sources.items():
+                try:
+                    if kind == 'replay':
+                        reader = ReplayReader(path)
+                        recording = dict(reader.metadata)
+                        recording['seed'] = reader.seed
+                        recording['ticks'] = list(reader.iter_ticks())
+                        self._insert(recording, path, None if 'map_changes' in recording
+                                     else reader.delta_counts())
+                    elif kind == 'json':
+                        opener = gzip.open if path.suffix == '.gz' else open
+                        with opener(path, 'rt', encoding='utf-8') as f:
+                            self._insert(json.load(f), path, None)
+                    else:
+                        with open(path, 'r') as f:
+                            self._insert_game(json.load(f), None)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"⚠️  Skipping {path.name}: {e}")
+
+        return self.count()
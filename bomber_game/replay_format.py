@@ -0,0 +1,340 @@
+"""
+Compact binary replay format.
+
+A .replay file stores everything GameRecorder knows about a game, packed
+with struct/NumPy instead of JSON:
+
+    header      magic, version, grid size, players, seed, tick counts
+    sections    table of (name, offset, stored size, raw size), then the
+                zlib-compressed sections themselves:
+        meta      JSON of the small per-game fields (players, statistics...)
+        dt        float64 time step of every tick
+        opcount   uint8 number of input ops of every tick
+        ops       uint8 input ops (see game_recorder for the encoding)
+        players   int16 [tick, player, (x, y, alive)], positions in
+                  1/POSITION_SCALE tiles, state after the tick
+        deltas    map changes of every tick (from GameState.change_log)
+        keyframes full grid every keyframe_interval ticks
+        kbombs    bombs alive at each keyframe
+        index     per keyframe: tick and first delta/bomb row, for seeking
+
+Sections are only read and decompressed when first used, so opening a
+replay to look at its metadata or seek to one tick is cheap.
+"""
+
+import json
+import struct
+import zlib
+
+import numpy as np
+from .game_state import (CHANGE_BOMB_PLACED, CHANGE_BOMB_EXPLODED, CHANGE_WALL_DESTROYED,
+                         CHANGE_POWERUP_REVEALED, CHANGE_POWERUP_COLLECTED)
+
+
+MAGIC = b'BMRP'
+VERSION = 1
+KEYFRAME_INTERVAL = 150  # Ticks between full grid snapshots (5 s at 30 FPS)
+POSITION_SCALE = 1024  # Player positions are stored in 1/1024 tiles
+
+HEADER = struct.Struct('<4sHBBHqIII')
+SECTION = struct.Struct('<8sQII')
+
+# Map change kinds, in the order of their delta codes
+DELTA_KINDS = (CHANGE_BOMB_PLACED, CHANGE_BOMB_EXPLODED, CHANGE_WALL_DESTROYED,
+               CHANGE_POWERUP_REVEALED, CHANGE_POWERUP_COLLECTED)
+DELTA_CODES = {kind: code for code, kind in enumerate(DELTA_KINDS)}
+
+DELTA_DTYPE = np.dtype([('tick', '<u4'), ('kind', 'u1'), ('x', 'u1'), ('y', 'u1'),
+                        ('value', 'u1')])
+BOMB_DTYPE = np.dtype([('keyframe', '<u4'), ('x', 'u1'), ('y', 'u1'), ('range', 'u1'),
+                       ('owner', 'i1'), ('timer', '<f4')])
+INDEX_DTYPE = np.dtype([('tick', '<u4'), ('delta_start', '<u4'), ('bomb_start', '<u4')])
+
+
+class StateTrack:
+    """Per-tick game state captured while recording (positions, deltas, keyframes)."""
+
+    def __init__(self, game_state, keyframe_interval=KEYFRAME_INTERVAL):
+        """
+        Initialize state track.
+
+        Args:
+            game_state: Game state being recorded (in its initial state)
+            keyframe_interval: Ticks between full grid snapshots
+        """
+        self.keyframe_interval = keyframe_interval
+        self.grid_size = len(game_state.grid)
+        self.num_players = len(game_state.players)
+        self.change_seq = game_state.change_seq
+        self.num_ticks = 0
+
+        self.players = []
+        self.deltas = []
+        self.keyframes = []
+        self.bombs = []
+
+    def capture(self, game_state):
+        """Record the state after one tick."""
+        tick = self.num_ticks
+        changes = game_state.changes_since(self.change_seq)
+        self.change_seq = game_state.change_seq
+
+        for _, kind, x, y, value in changes or ():
+            self.deltas.append((tick, DELTA_CODES[kind], x, y, value))
+
+        for player in game_state.players:
+            self.players.append((round(player.x * POSITION_SCALE),
+                                 round(player.y * POSITION_SCALE), int(player.alive)))
+
+        # Missed changes (log overflow) are covered by an extra keyframe
+        if changes is None or tick % self.keyframe_interval == 0:
+            self._capture_keyframe(tick, game_state)
+
+        self.num_ticks += 1
+
+    def delta_counts(self):
+        """Get the number of recorded map changes by kind."""
+        counts = {}
+        for delta in self.deltas:
+            kind = DELTA_KINDS[delta[1]]
+            counts[kind] = counts.get(kind, 0) + 1
+        return counts
+
+    def _capture_keyframe(self, tick, game_state):
+        """Snapshot the full grid and the bombs."""
+        # Deltas of this tick are already in the snapshot
+        keyframe = len(self.keyframes)
+        self.keyframes.append((tick, len(self.deltas), len(self.bombs),
+                               bytes(cell for row in game_state.grid for cell in row)))
+        players = game_state.players
+        for bomb in game_state.bombs:
+            owner = players.index(bomb.owner) if bomb.owner in players else -1
+            self.bombs.append((keyframe, bomb.grid_x, bomb.grid_y, bomb.bomb_range,
+                               owner, bomb.timer))
+
+
+def write_replay(path, recording, track=None):
+    """
+    Write a GameRecorder recording as a binary replay.
+
+    Args:
+        path: Output file path
+        recording: GameRecorder.recording dictionary (with 'seed' and 'ticks')
+        track: Optional StateTrack captured alongside the ticks
+
+    Returns:
+        Number of bytes written
+    """
+    ticks = recording['ticks']
+    initial = recording['initial_state']
+    grid_size = initial['grid_size']
+    num_players = len(initial['players'])
+
+    meta = {key: value for key, value in recording.items() if key not in ('ticks', 'frames')}
+    dt = np.array([tick[0] for tick in ticks], dtype='<f8')
+    opcount = np.array([len(tick) - 1 for tick in ticks], dtype='u1')
+    ops = np.array([op for tick in ticks for op in tick[1:]], dtype='u1')
+
+    if track is not None and track.num_ticks:
+        players = np.array(track.players, dtype='<i2').reshape(-1, num_players, 3)
+        deltas = np.array(track.deltas, dtype=DELTA_DTYPE)
+        keyframes = np.frombuffer(b''.join(k[3] for k in track.keyframes), dtype='u1')
+        bombs = np.array(track.bombs, dtype=BOMB_DTYPE)
+        index = np.array([k[:3] for k in track.keyframes], dtype=INDEX_DTYPE)
+        keyframe_interval = track.keyframe_interval
+    else:
+        players = np.zeros((0, num_players, 3), dtype='<i2')
+        deltas = np.zeros(0, dtype=DELTA_DTYPE)
+        keyframes = np.zeros(0, dtype='u1')
+        bombs = np.zeros(0, dtype=BOMB_DTYPE)
+        index = np.zeros(0, dtype=INDEX_DTYPE)
+        keyframe_interval = 0
+
+    sections = [
+        (b'meta', json.dumps(meta, separators=(',', ':')).encode('utf-8')),
+        (b'dt', dt.tobytes()),
+        (b'opcount', opcount.tobytes()),
+        (b'ops', ops.tobytes()),
+        (b'players', players.tobytes()),
+        (b'deltas', deltas.tobytes()),
+        (b'keyfrms', keyframes.tobytes()),
+        (b'kbombs', bombs.tobytes()),
+        (b'index', index.tobytes()),
+    ]
+
+    seed = recording.get('seed')
+    header = HEADER.pack(MAGIC, VERSION, grid_size, num_players, keyframe_interval,
+                         seed if seed is not None else -1, len(ticks), len(players),
+                         len(sections))
+
+    offset = HEADER.size + SECTION.size * len(sections)
+    table = []
+    payloads = []
+    for name, raw in sections:
+        stored = zlib.compress(raw, 6)
+        if len(stored) >= len(raw):
+            stored = raw  # Not worth compressing
+        table.append(SECTION.pack(name, offset, len(stored), len(raw)))
+        payloads.append(stored)
+        offset += len(stored)
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.writelines(table)
+        f.writelines(payloads)
+    return offset
+
+
+class ReplayReader:
+    """Lazy reader for binary replays."""
+
+    def __init__(self, path):
+        """
+        Open a replay and read its header (sections are loaded on demand).
+
+        Args:
+            path: Replay file path
+
+        Raises:
+            ValueError: If the file is not a supported binary replay
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size or header[:4] != MAGIC:
+                raise ValueError(f"{path} is not a binary replay")
+            (_, self.version, self.grid_size, self.num_players, self.keyframe_interval,
+             seed, self.num_ticks, self.num_state_ticks, num_sections) = HEADER.unpack(header)
+            if self.version > VERSION:
+                raise ValueError(f"{path} uses replay format v{self.version} "
+                                 f"(supported: v{VERSION})")
+            table = f.read(SECTION.size * num_sections)
+
+        self.seed = seed if seed >= 0 else None
+        self.sections = {}
+        for i in range(num_sections):
+            name, offset, stored, raw = SECTION.unpack_from(table, i * SECTION.size)
+            self.sections[name.rstrip(b'\0').decode('ascii')] = (offset, stored, raw)
+        self._cache = {}
+
+    def _read(self, name):
+        """Get the raw bytes of a section (read and decompressed once)."""
+        data = self._cache.get(name)
+        if data is None:
+            offset, stored, raw = self.sections[name]
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                data = f.read(stored)
+            if stored != raw:
+                data = zlib.decompress(data)
+            self._cache[name] = data
+        return data
+
+    def _array(self, name, dtype):
+        """Get a section as a read-only NumPy array."""
+        return np.frombuffer(self._read(name), dtype=dtype)
+
+    @property
+    def metadata(self):
+        """Get the per-game metadata (game_id, winner, initial_state, ...)."""
+        if 'metadata' not in self._cache:
+            self._cache['metadata'] = json.loads(self._read('meta'))
+        return self._cache['metadata']
+
+    @property
+    def op_offsets(self):
+        """Get the start of every tick's ops in the ops section (plus the end)."""
+        if 'op_offsets' not in self._cache:
+            counts = self._array('opcount', 'u1')
+            offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+            np.cumsum(counts, out=offsets[1:])
+            self._cache['op_offsets'] = offsets
+        return self._cache['op_offsets']
+
+    def tick(self, i):
+        """
+        Get one tick of the input log.
+
+        Returns:
+            [dt, op, op, ...] as stored by GameRecorder.log_tick
+        """
+        dt = self._array('dt', '<f8')
+        offsets = self.op_offsets
+        ops = self._array('ops', 'u1')[offsets[i]:offsets[i + 1]]
+        return [float(dt[i])] + ops.tolist()
+
+    def iter_ticks(self, start=0):
+        """Iterate over the input log from a tick on."""
+        dt = self._array('dt', '<f8').tolist()
+        offsets = self.op_offsets.tolist()
+        ops = self._array('ops', 'u1').tolist()
+        for i in range(start, self.num_ticks):
+            yield [dt[i]] + ops[offsets[i]:offsets[i + 1]]
+
+    def player_states(self, i):
+        """
+        Get the players' state after tick i.
+
+        Returns:
+            List of {'x', 'y', 'alive'} dictionaries, in player order
+        """
+        players = self._array('players', '<i2').reshape(-1, self.num_players, 3)
+        return [
+            {'x': x / POSITION_SCALE, 'y': y / POSITION_SCALE, 'alive': bool(alive)}
+            for x, y, alive in players[i].tolist()
+        ]
+
+    def delta_counts(self):
+        """Get the number of recorded map changes by kind."""
+        counts = np.bincount(self._array('deltas', DELTA_DTYPE)['kind'],
+                             minlength=len(DELTA_KINDS))
+        return {kind: int(count) for kind, count in zip(DELTA_KINDS, counts) if count}
+
+    def seek(self, i):
+        """
+        Get the map state after tick i from the nearest keyframe and deltas.
+
+        Returns:
+            Dictionary with 'tick', 'grid', 'players' and 'bombs'
+            ((x, y, range) of every bomb on the map)
+        """
+        if not 0 <= i < self.num_state_ticks:
+            raise IndexError(f"tick {i} out of range (0-{self.num_state_ticks - 1})")
+
+        index = self._array('index', INDEX_DTYPE)
+        keyframe = int(np.searchsorted(index['tick'], i, side='right')) - 1
+        entry = index[keyframe]
+
+        cells = self.grid_size * self.grid_size
+        grid = self._array('keyfrms', 'u1')[keyframe * cells:(keyframe + 1) * cells]
+        grid = grid.reshape(self.grid_size, self.grid_size).tolist()
+
+        bombs = {}
+        bomb_rows = self._array('kbombs', BOMB_DTYPE)[entry['bomb_start']:]
+        for row in bomb_rows[bomb_rows['keyframe'] == keyframe]:
+            bombs[(int(row['x']), int(row['y']))] = int(row['range'])
+
+        deltas = self._array('deltas', DELTA_DTYPE)
+        end = int(np.searchsorted(deltas['tick'], i, side='right'))
+        for _, kind, x, y, value in deltas[entry['delta_start']:end].tolist():
+            kind = DELTA_KINDS[kind]
+            if kind == CHANGE_WALL_DESTROYED:
+                grid[y][x] = 0
+            elif kind == CHANGE_BOMB_PLACED:
+                bombs[(x, y)] = value
+            elif kind == CHANGE_BOMB_EXPLODED:
+                bombs.pop((x, y), None)
+
+        return {
+            'tick': i,
+            'grid': grid,
+            'players': self.player_states(i),
+            'bombs': [(x, y, bomb_range) for (x, y), bomb_range in bombs.items()],
+        }
+
+    def to_replay(self):
+        """Get the replay as the dictionary GameRecorder records."""
+        replay = dict(self.metadata)
+        replay['seed'] = self.seed
+        replay['ticks'] = list(self.iter_ticks())
+        return replay
@@ -0,0 +1,198 @@
+"""
+Replay renderer - turns recorded games into videos offline.
+
+A replay saved by GameRecorder holds the map seed, the initial state and
+the per-tick input log. The renderer rebuilds the GameState from the seed,
+re-applies the inputs tick by tick and draws every tick with the same
+SceneRenderer as the live game into an offscreen surface that feeds the
+streaming video encoder. No window and no real-time clock are involved,
+so replays render faster than real time and several can run in parallel.
+"""
+
+import multiprocessing
+import time
+from pathlib import Path
+
+import pygame
+from . import FPS, TILE_SIZE
+from .game_state import GameState
+from .game_recorder import load_replay_file, decode_move, OPS_PER_PLAYER, OP_BOMB, OP_CACA
+from .scene_renderer import SceneRenderer
+from .video_recorder import VideoRecorder, SUPPORTED_FORMATS
+from .assets import get_asset_manager
+
+
+def build_game_state(replay):
+    """
+    Recreate the initial GameState of a replay.
+
+    Args:
+        replay: Replay dictionary from GameRecorder
+
+    Returns:
+        GameState with the recorded map and players
+
+    Raises:
+        ValueError: If the replay has no input log or its map can't be rebuilt
+    """
+    seed = replay.get('seed')
+    if seed is None or 'ticks' not in replay:
+        raise ValueError(f"Replay {replay.get('game_id')} has no seed/input log")
+
+    initial = replay['initial_state']
+    game_state = GameState(initial['grid_size'], seed=seed)
+    for player in initial['players']:
+        x, y = player['position']
+        game_state.add_player(x, y, tuple(player['color']), player['name'])
+
+    # Map generation depends on MAP_CONFIG as well as the seed
+    if game_state.grid != initial['wall_layout']:
+        raise ValueError(f"Replay {replay.get('game_id')} map does not match its seed "
+                         f"(map settings changed since it was recorded?)")
+    return game_state
+
+
+def apply_tick(game_state, tick, tile_size=TILE_SIZE):
+    """
+    Re-simulate one recorded tick.
+
+    Args:
+        game_state: Game state to advance
+        tick: [dt, op, op, ...] entry of the replay input log
+        tile_size: Size of each tile in pixels
+    """
+    dt = tick[0]
+    players = game_state.players
+
+    for op in tick[1:]:
+        index, code = divmod(op, OPS_PER_PLAYER)
+        player = players[index]
+        if code == OP_BOMB:
+            game_state.place_bomb(player)
+        elif code == OP_CACA:
+            game_state.place_caca(player)
+        else:
+            dx, dy = decode_move(code)
+            player.move(dx, dy, game_state.grid, tile_size, game_state)
+
+    for player in players:
+        if player.alive:
+            player.update(dt)  # Update animation
+
+    game_state.update(dt)
+
+
+class ReplayRenderer:
+    """Renders replays to video without a window."""
+
+    def __init__(self, output_dir="recordings", fps=FPS, formats=SUPPORTED_FORMATS,
+                 encoder_factory=None, tile_size=TILE_SIZE):
+        """
+        Initialize replay renderer.
+
+        Args:
+            output_dir: Directory to save videos
+            fps: Frames per second of the output video
+            formats: Output formats to export ('webm', 'mp4', 'gif')
+            encoder_factory: Optional encoder factory passed to VideoRecorder
+            tile_size: Size of each tile in pixels
+        """
+        if not pygame.get_init():
+            pygame.init()
+
+        self.tile_size = tile_size
+        self.recorder = VideoRecorder(output_dir=output_dir, fps=fps,
+                                      encoder_factory=encoder_factory, formats=formats)
+        try:
+            self.wall_sprite = get_asset_manager().get_wall_sprite((tile_size, tile_size))
+        except Exception as e:
+            print(f"Could not load wall sprite: {e}")
+            self.wall_sprite = None
+
+    def render(self, replay, name=None):
+        """
+        Re-simulate a replay and encode one frame per recorded tick.
+
+        Args:
+            replay: Replay dictionary from GameRecorder
+            name: Optional recording name (default: replay_<game_id>)
+
+        Returns:
+            Render summary dictionary, or None if recording could not start
+        """
+        game_state = build_game_state(replay)
+        scene = SceneRenderer(game_state, self.tile_size, self.wall_sprite)
+        surface = pygame.Surface(scene.map_rect.size)
+
+        self.recorder.start_recording(name or f"replay_{replay['game_id']}")
+        if not self.recorder.is_recording:
+            return None
+
+        started = time.perf_counter()
+        game_seconds = 0.0
+        for tick in replay['ticks']:
+            apply_tick(game_state, tick, self.tile_size)
+            scene.render(surface)
+            self.recorder.capture_frame(surface, block=True)
+            game_seconds += tick[0]
+        metadata = self.recorder.stop_recording(wait=True)
+        render_seconds = time.perf_counter() - started
+
+        # A different winner means the simulation diverged from the live game
+        winner = game_state.winner.name if game_state.winner else None
+        in_sync = winner == replay.get('winner')
+        if not in_sync:
+            print(f"⚠️  Replay {replay['game_id']} desynced: recorded winner "
+                  f"{replay.get('winner')}, re-simulated {winner}")
+
+        return {
+            'game_id': replay['game_id'],
+            'ticks': len(replay['ticks']),
+            'game_seconds': game_seconds,
+            'render_seconds': render_seconds,
+            'realtime_factor': game_seconds / render_seconds if render_seconds > 0 else 0.0,
+            'in_sync': in_sync,
+            'metadata': metadata,
+        }
+
+    def render_file(self, path, name=None):
+        """Render a replay stored as .json or .json.gz."""
+        return self.render(load_replay_file(path), name)
+
+
+def _render_job(job):
+    """Worker entry point: render one replay file, reporting errors instead of raising."""
+    path, output_dir, fps, formats = job
+    try:
+        renderer = ReplayRenderer(output_dir=output_dir, fps=fps, formats=formats)
+        result = renderer.render_file(path)
+        if result is None:
+            return {'path': path, 'error': 'video recording unavailable (ffmpeg missing?)'}
+        result['path'] = path
+        return result
+    except Exception as e:
+        return {'path': path, 'error': str(e)}
+
+
+def render_replays(paths, output_dir="recordings", workers=None, fps=FPS,
+                   formats=SUPPORTED_FORMATS):
+    """
+    Render several replay files, one process per replay.
+
+    Args:
+        paths: Replay files (.json or .json.gz)
+        output_dir: Directory to save videos
+        workers: Number of worker processes (default: CPU count)
+        fps: Frames per second of the output videos
+        formats: Output formats to export
+
+    Returns:
+        List of render summaries (with 'error' for failed replays), in input order
+    """
+    jobs = [(str(Path(path)), output_dir, fps, tuple(formats)) for path in paths]
+    workers = min(workers or multiprocessing.cpu_count(), len(jobs))
+    if workers <= 1:
+        return [_render_job(job) for job in jobs]
+
+    with multiprocessing.Pool(workers) as pool:
+        return pool.map(_render_job, jobs, chunksize=1)
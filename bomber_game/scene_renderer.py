@@ -0,0 +1,209 @@
+"""
+Scene renderer - draws the play area of a GameState.
+
+Shared by the interactive game and the headless replay renderer. The
+static map (floor, hard walls, soft walls) is baked once per game into a
+map layer; destroyed soft walls are patched from the GameState change log
+and each frame only the areas touched by moving entities are restored.
+"""
+
+import pygame
+from . import GRID_SIZE, TILE_SIZE
+from .game_state import CHANGE_WALL_DESTROYED
+from .enhanced_graphics import ProutManGraphics
+
+
+class SceneRenderer:
+    """Draws the map and entities of one game onto a surface."""
+
+    def __init__(self, game_state, tile_size=TILE_SIZE, wall_sprite=None):
+        """
+        Initialize scene renderer.
+
+        Args:
+            game_state: Game state to draw
+            tile_size: Size of each tile in pixels
+            wall_sprite: Optional sprite for indestructible walls
+        """
+        self.game_state = game_state
+        self.tile_size = tile_size
+        self.wall_sprite = wall_sprite
+
+        grid_size = len(game_state.grid) if game_state.grid else GRID_SIZE
+        self.map_rect = pygame.Rect(0, 0, grid_size * tile_size, grid_size * tile_size)
+        self.map_layer = None
+        self.map_layer_seq = 0
+        self.dirty_rects = []
+
+    def render(self, surface, full_redraw=False):
+        """
+        Draw the play area (top-left at 0, 0).
+
+        Args:
+            surface: Target surface
+            full_redraw: Redraw the whole map instead of last frame's rects
+
+        Returns:
+            (full_redraw, rects) - whether the whole map was drawn, and the
+            rects that changed on surface otherwise
+        """
+        if self.map_layer is None:
+            self._build_map_layer()
+            full_redraw = True
+        patched = self._sync_map_layer()
+        if patched is None:
+            full_redraw = True
+            patched = []
+
+        if full_redraw:
+            surface.blit(self.map_layer, self.map_rect)
+        else:
+            # Restore the map where dynamic things were drawn last frame
+            for rect in self.dirty_rects + patched:
+                surface.blit(self.map_layer, rect, rect)
+
+        dirty = self.draw_entities(surface)
+        rects = self.dirty_rects + patched + dirty
+        self.dirty_rects = dirty
+        return full_redraw, rects
+
+    def draw_entities(self, surface):
+        """
+        Draw everything that moves or animates on top of the map.
+
+        Returns:
+            List of rects the entities may have touched
+        """
+        tile_size = self.tile_size
+        game_state = self.game_state
+        dirty = []
+
+        # Draw teleport doors
+        if game_state.teleport_doors:
+            game_state.teleport_doors.draw(surface, tile_size)
+            for door in game_state.teleport_doors.doors:
+                dirty.append(pygame.Rect(door.grid_x * tile_size, door.grid_y * tile_size,
+                                         tile_size, tile_size))
+
+        # Draw bomb machine
+        if game_state.bomb_machine:
+            game_state.bomb_machine.draw(surface, tile_size)
+            dirty.append(self._bomb_machine_rect(game_state.bomb_machine))
+
+        # Draw power-ups
+        for powerup in game_state.powerups.values():
+            powerup.render(surface, tile_size)
+            dirty.append(self._tile_dirty_rect(powerup.grid_x, powerup.grid_y,
+                                               tile_size // 2 + 4))
+
+        # Draw cacas (poop blocks)
+        for caca in game_state.cacas:
+            caca.render(surface, tile_size)
+            dirty.append(self._tile_dirty_rect(caca.grid_x, caca.grid_y, tile_size // 2))
+
+        # Draw bombs
+        for bomb in game_state.bombs:
+            bomb.render(surface, tile_size)
+            dirty.append(self._tile_dirty_rect(bomb.grid_x, bomb.grid_y, tile_size * 3 // 4))
+
+        # Draw explosions
+        for explosion in game_state.explosions:
+            explosion.render(surface, tile_size)
+            dirty.append(self._tile_dirty_rect(explosion.grid_x, explosion.grid_y, tile_size))
+
+        # Draw players
+        for player in game_state.players:
+            if player.alive:
+                player.render(surface, tile_size)
+                dirty.append(self._dirty_rect(player.x * tile_size, player.y * tile_size,
+                                              tile_size * 3 // 4))
+
+        return dirty
+
+    def _dirty_rect(self, center_x, center_y, half_size):
+        """Get the screen area an entity drawn around a pixel center may touch."""
+        return pygame.Rect(int(center_x) - half_size, int(center_y) - half_size,
+                           half_size * 2, half_size * 2)
+
+    def _tile_dirty_rect(self, grid_x, grid_y, half_size):
+        """Get the screen area an entity drawn on a tile may touch."""
+        return self._dirty_rect((grid_x + 0.5) * self.tile_size,
+                                (grid_y + 0.5) * self.tile_size, half_size)
+
+    def _bomb_machine_rect(self, machine):
+        """Get the screen area the bomb machine (timer text, warning zone) may touch."""
+        tile_size = self.tile_size
+        x = machine.grid_x * tile_size
+        y = machine.grid_y * tile_size
+        rect = pygame.Rect(x - tile_size // 2, y, tile_size * 2, tile_size + 20)
+        if machine.is_warning:
+            danger_radius = (machine.bomb_range + 1) * tile_size
+            rect.union_ip(self._dirty_rect(x + tile_size // 2, y + tile_size // 2,
+                                           danger_radius))
+        return rect
+
+    def _build_map_layer(self):
+        """Bake floor, hard walls and soft walls into a cached surface."""
+        self.map_layer = pygame.Surface(self.map_rect.size)
+        if pygame.display.get_surface() is not None:
+            self.map_layer = self.map_layer.convert()
+        self._draw_grid(self.map_layer)
+        self.map_layer_seq = self.game_state.change_seq
+
+    def _sync_map_layer(self):
+        """
+        Patch soft walls destroyed since the map layer was baked.
+
+        Returns:
+            List of rects that changed on the map layer, or None if the
+            layer had to be rebuilt
+        """
+        changes = self.game_state.changes_since(self.map_layer_seq)
+        if changes is None:
+            self._build_map_layer()
+            return None
+
+        tile_size = self.tile_size
+        patched = []
+        for _, kind, x, y, _ in changes:
+            if kind == CHANGE_WALL_DESTROYED:
+                self._draw_tile(self.map_layer, x, y)
+                patched.append(pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size))
+        self.map_layer_seq = self.game_state.change_seq
+        return patched
+
+    def _draw_grid(self, surface):
+        """Draw the game grid."""
+        for y in range(len(self.game_state.grid)):
+            for x in range(len(self.game_state.grid[y])):
+                self._draw_tile(surface, x, y)
+
+    def _draw_tile(self, surface, x, y):
+        """Draw one grid tile (floor and wall)."""
+        tile_size = self.tile_size
+        pixel_x = x * tile_size
+        pixel_y = y * tile_size
+
+        tile = self.game_state.grid[y][x]
+
+        # Draw tile background with alternating pattern
+        if (x + y) % 2 == 0:
+            color = (34, 139, 34)  # Forest green
+        else:
+            color = (50, 205, 50)  # Lime green
+
+        pygame.draw.rect(surface, color,
+                       (pixel_x, pixel_y, tile_size, tile_size))
+
+        # Draw walls using enhanced graphics
+        if tile == 1:  # Indestructible wall
+            if self.wall_sprite:
+                surface.blit(self.wall_sprite, (pixel_x, pixel_y))
+            else:
+                ProutManGraphics.draw_enhanced_wall(
+                    surface, pixel_x, pixel_y, tile_size, wall_type=1
+                )
+        elif tile == 2:  # Soft wall (destructible)
+            ProutManGraphics.draw_enhanced_wall(
+                surface, pixel_x, pixel_y, tile_size, wall_type=2
+            )
@@ -4,6 +4,7 @@ Statistics Panel - Right-side panel showing comprehensive game analytics.
 
 import pygame
 import math
+from .text_cache import get_font
 
 
 class StatsPanel:
@@ -12,17 +13,25 @@ class StatsPanel:
     Shows AI info, risk levels, strategy, recommendations, and performance graphs.
     """
     
-    def __init__(self, x, y, width, height):
+    def __init__(self, x, y, width, height, refresh_interval=0.25):
+        """
+        Initialize statistics panel.
+        
+        Args:
+            x, y: Top-left screen position
+            width, height: Panel size in pixels
+            refresh_interval: Seconds between polls of the statistics
+        """
         self.x = x
         self.y = y
         self.width = width
         self.height = height
         
         # Fonts
-        self.title_font = pygame.font.Font(None, 28)
-        self.header_font = pygame.font.Font(None, 22)
-        self.text_font = pygame.font.Font(None, 18)
-        self.small_font = pygame.font.Font(None, 16)
+        self.title_font = get_font(28)
+        self.header_font = get_font(22)
+        self.text_font = get_font(18)
+        self.small_font = get_font(16)
         
         # Colors
         self.bg_color = (20, 20, 30)
@@ -37,66 +46,164 @@ class StatsPanel:
         self.human_perf_history = []
         self.ai_perf_history = []
         
+        # Offscreen rendering: the panel is composed from cached section
+        # images, each rebuilt only when its inputs change
+        self.refresh_interval = refresh_interval
+        self.surface = pygame.Surface((width, height))
+        self.scratch = pygame.Surface((width, height))
+        self.sections = {}  # name -> (inputs, surface)
+        self.layout = ()
+        self.last_refresh = None
+    
+    def reset(self):
+        """Forget the performance graph and cached sections (new game)."""
+        self.human_perf_history = []
+        self.ai_perf_history = []
+        self.invalidate()
+    
+    def invalidate(self):
+        """Rebuild every section on the next draw."""
+        self.sections = {}
+        self.layout = ()
+        self.last_refresh = None
+        
     def draw(self, screen, stats, game_state):
-        """Draw the statistics panel."""
-        # Background
-        pygame.draw.rect(screen, self.bg_color, (self.x, self.y, self.width, self.height))
-        pygame.draw.rect(screen, self.border_color, (self.x, self.y, self.width, self.height), 2)
+        """
+        Draw the statistics panel.
+        
+        Statistics are polled at most every refresh_interval seconds;
+        in between the cached panel image is blitted as is.
+        
+        Returns:
+            True if the panel image changed since the previous draw
+        """
+        now = pygame.time.get_ticks() / 1000
+        changed = False
+        if self.last_refresh is None or now - self.last_refresh >= self.refresh_interval:
+            self.last_refresh = now
+            changed = self._refresh(stats, game_state)
+        
+        screen.blit(self.surface, (self.x, self.y))
+        return changed
+    
+    def _refresh(self, stats, game_state):
+        """Rebuild sections whose inputs changed and recompose the panel."""
+        sections = self._collect_sections(stats, game_state)
+        
+        changed = False
+        for name, draw_section, inputs in sections:
+            cached = self.sections.get(name)
+            if cached is None or cached[0] != inputs:
+                self.sections[name] = (inputs, self._render_section(draw_section, inputs))
+                changed = True
+        
+        layout = tuple(name for name, _, _ in sections)
+        if changed or layout != self.layout:
+            self.layout = layout
+            self._compose()
+            changed = True
+        return changed
+    
+    def _collect_sections(self, stats, game_state):
+        """
+        Gather the inputs of every section.
         
-        current_y = self.y + 10
+        Returns:
+            List of (name, draw method, inputs tuple) in display order
+        """
+        human_perf = stats.get_performance_score(True)
+        ai_perf = stats.get_performance_score(False)
+        self._record_performance(human_perf, ai_perf)
         
-        # Title
+        # Game time
+        game_time = int(pygame.time.get_ticks() / 1000 - stats.game_start_time + pygame.time.get_ticks() / 1000)
+        
+        sections = [
+            ('title', self._draw_title, ()),
+            ('ai_info', self._draw_ai_info,
+             (stats.ai_type, round(stats.get_win_rate(False), 1))),
+            ('current', self._draw_current_stats,
+             (game_time,
+              (stats.human_moves, stats.human_bombs_placed,
+               stats.powerups_collected_human, stats.walls_destroyed_human),
+              (stats.ai_moves, stats.ai_bombs_placed,
+               stats.powerups_collected_ai, stats.walls_destroyed_ai))),
+            ('risk', self._draw_risk_levels,
+             (round(stats.get_current_risk(True), 1), round(stats.get_current_risk(False), 1))),
+            ('strategy', self._draw_strategy,
+             (stats.get_strategy(True), stats.get_strategy(False))),
+            ('performance', self._draw_performance,
+             (round(human_perf, 1), round(ai_perf, 1))),
+            ('history', self._draw_history,
+             (stats.history['total_games'],
+              round(stats.get_win_rate(True), 1), round(stats.get_win_rate(False), 1),
+              stats.history['human_stats']['current_win_streak'],
+              stats.history['ai_stats']['current_win_streak'],
+              stats.get_recent_trend(True))),
+        ]
+        if len(self.human_perf_history) >= 2:
+            sections.append(('graph', self._draw_performance_graph,
+                             (tuple(self.human_perf_history), tuple(self.ai_perf_history))))
+        sections.append(('tips', self._draw_recommendations,
+                         (tuple(stats.get_recommendations()[:3]),)))
+        return sections
+    
+    def _record_performance(self, human_perf, ai_perf):
+        """Update history for graph."""
+        if len(self.human_perf_history) == 0 or self.human_perf_history[-1] != human_perf:
+            self.human_perf_history.append(human_perf)
+            self.ai_perf_history.append(ai_perf)
+            
+            # Keep last 20 points
+            if len(self.human_perf_history) > 20:
+                self.human_perf_history.pop(0)
+                self.ai_perf_history.pop(0)
+    
+    def _render_section(self, draw_section, inputs):
+        """Draw one section offscreen and crop it to the height it used."""
+        self.scratch.fill(self.bg_color)
+        height = draw_section(self.scratch, 0, *inputs)
+        height = max(1, min(height, self.height))
+        return self.scratch.subsurface((0, 0, self.width, height)).copy()
+    
+    def _compose(self):
+        """Stack the cached sections into the panel image."""
+        self.surface.fill(self.bg_color)
+        
+        current_y = 10
+        for name in self.layout:
+            section = self.sections[name][1]
+            if current_y >= self.height:
+                break
+            self.surface.blit(section, (0, current_y))
+            current_y += section.get_height()
+            if name != 'title':
+                current_y += 10
+        
+        pygame.draw.rect(self.surface, self.border_color, (0, 0, self.width, self.height), 2)
+    
+    def _draw_title(self, screen, y):
+        """Draw panel title and separator."""
         title = self.title_font.render("📊 GAME ANALYTICS", True, self.title_color)
-        screen.blit(title, (self.x + 10, current_y))
-        current_y += 35
+        screen.blit(title, (10, y))
+        y += 35
         
         # Separator
         pygame.draw.line(screen, self.border_color, 
-                        (self.x + 10, current_y), 
-                        (self.x + self.width - 10, current_y), 2)
-        current_y += 10
-        
-        # AI Information
-        current_y = self._draw_ai_info(screen, stats, current_y)
-        current_y += 10
-        
-        # Current Game Stats
-        current_y = self._draw_current_stats(screen, stats, current_y)
-        current_y += 10
-        
-        # Risk Levels
-        current_y = self._draw_risk_levels(screen, stats, game_state, current_y)
-        current_y += 10
-        
-        # Strategy Analysis
-        current_y = self._draw_strategy(screen, stats, current_y)
-        current_y += 10
-        
-        # Performance Scores
-        current_y = self._draw_performance(screen, stats, current_y)
-        current_y += 10
-        
-        # Historical Stats
-        current_y = self._draw_history(screen, stats, current_y)
-        current_y += 10
-        
-        # Performance Graph
-        current_y = self._draw_performance_graph(screen, stats, current_y)
-        current_y += 10
-        
-        # Recommendations
-        current_y = self._draw_recommendations(screen, stats, current_y)
+                        (10, y), 
+                        (self.width - 10, y), 2)
+        y += 10
+        return y
     
-    def _draw_ai_info(self, screen, stats, y):
+    def _draw_ai_info(self, screen, y, ai_type, ai_win_rate):
         """Draw AI information section."""
         header = self.header_font.render("🤖 AI OPPONENT", True, self.highlight_color)
-        screen.blit(header, (self.x + 10, y))
+        screen.blit(header, (10, y))
         y += 25
         
         # AI Type
-        ai_type = stats.ai_type
         type_text = self.text_font.render(f"Type: {ai_type}", True, self.ai_color)
-        screen.blit(type_text, (self.x + 15, y))
+        screen.blit(type_text, (15, y))
         y += 20
         
         # AI Description
@@ -108,81 +215,79 @@ class StatsPanel:
         }
         desc = descriptions.get(ai_type, "Unknown")
         desc_text = self.small_font.render(desc, True, self.text_color)
-        screen.blit(desc_text, (self.x + 15, y))
+        screen.blit(desc_text, (15, y))
         y += 20
         
         # AI Win Rate
-        ai_win_rate = stats.get_win_rate(False)
         wr_text = self.text_font.render(f"Win Rate: {ai_win_rate:.1f}%", True, self.ai_color)
-        screen.blit(wr_text, (self.x + 15, y))
+        screen.blit(wr_text, (15, y))
         y += 25
         
         return y
     
-    def _draw_current_stats(self, screen, stats, y):
+    def _draw_current_stats(self, screen, y, game_time, human_counts, ai_counts):
         """Draw current game statistics."""
         header = self.header_font.render("📈 CURRENT GAME", True, self.highlight_color)
-        screen.blit(header, (self.x + 10, y))
+        screen.blit(header, (10, y))
         y += 25
         
         # Game time
-        game_time = int(pygame.time.get_ticks() / 1000 - stats.game_start_time + pygame.time.get_ticks() / 1000)
         time_text = self.text_font.render(f"Time: {game_time}s", True, self.text_color)
-        screen.blit(time_text, (self.x + 15, y))
+        screen.blit(time_text, (15, y))
         y += 20
         
         # Human stats
         human_text = self.text_font.render(f"👤 Human:", True, self.human_color)
-        screen.blit(human_text, (self.x + 15, y))
+        screen.blit(human_text, (15, y))
         y += 18
         
+        moves, bombs, powerups, walls = human_counts
         stats_lines = [
-            f"  Moves: {stats.human_moves}",
-            f"  Bombs: {stats.human_bombs_placed}",
-            f"  Power-ups: {stats.powerups_collected_human}",
-            f"  Walls: {stats.walls_destroyed_human}",
+            f"  Moves: {moves}",
+            f"  Bombs: {bombs}",
+            f"  Power-ups: {powerups}",
+            f"  Walls: {walls}",
         ]
         
         for line in stats_lines:
             text = self.small_font.render(line, True, self.text_color)
-            screen.blit(text, (self.x + 15, y))
+            screen.blit(text, (15, y))
             y += 16
         
         y += 5
         
         # AI stats
         ai_text = self.text_font.render(f"🤖 AI:", True, self.ai_color)
-        screen.blit(ai_text, (self.x + 15, y))
+        screen.blit(ai_text, (15, y))
         y += 18
         
+        moves, bombs, powerups, walls = ai_counts
         stats_lines = [
-            f"  Moves: {stats.ai_moves}",
-            f"  Bombs: {stats.ai_bombs_placed}",
-            f"  Power-ups: {stats.powerups_collected_ai}",
-            f"  Walls: {stats.walls_destroyed_ai}",
+            f"  Moves: {moves}",
+            f"  Bombs: {bombs}",
+            f"  Power-ups: {powerups}",
+            f"  Walls: {walls}",
         ]
         
         for line in stats_lines:
             text = self.small_font.render(line, True, self.text_color)
-            screen.blit(text, (self.x + 15, y))
+            screen.blit(text, (15, y))
             y += 16
         
         y += 10
         return y
     
-    def _draw_risk_levels(self, screen, stats, game_state, y):
+    def _draw_risk_levels(self, screen, y, human_risk, ai_risk):
         """Draw real-time risk levels."""
         header = self.header_font.render("⚠️ RISK LEVELS", True, self.highlight_color)
-        screen.blit(header, (self.x + 10, y))
+        screen.blit(header, (10, y))
         y += 25
         
         # Human risk
-        human_risk = stats.get_current_risk(True)
         self._draw_risk_bar(screen, "Human", human_risk, self.human_color, y)
         y += 30
         
         # AI risk
-        ai_risk = stats.get_current_risk(False)
         self._draw_risk_bar(screen, "AI", ai_risk, self.ai_color, y)
         y += 35
         
@@ -192,10 +297,10 @@ class StatsPanel:
         """Draw a risk level bar."""
         # Label
         label_text = self.small_font.render(f"{label}:", True, self.text_color)
-        screen.blit(label_text, (self.x + 15, y))
+        screen.blit(label_text, (15, y))
         
         # Risk bar
-        bar_x = self.x + 70
+        bar_x = 70
         bar_y = y + 2
         bar_width = self.width - 90
         bar_height = 12
@@ -224,14 +329,13 @@ class StatsPanel:
         value_text = self.small_font.render(f"{risk:.0f}%", True, self.text_color)
         screen.blit(value_text, (bar_x + bar_width + 5, y))
     
-    def _draw_strategy(self, screen, stats, y):
+    def _draw_strategy(self, screen, y, human_strategy, ai_strategy):
         """Draw strategy analysis."""
         header = self.header_font.render("🎯 STRATEGY", True, self.highlight_color)
-        screen.blit(header, (self.x + 10, y))
+        screen.blit(header, (10, y))
         y += 25
         
         # Human strategy
-        human_strategy = stats.get_strategy(True)
         strategy_icons = {
             "Aggressive": "⚔️",
             "Defensive": "🛡️",
@@ -240,55 +344,42 @@ class StatsPanel:
         icon = strategy_icons.get(human_strategy, "")
         
         human_text = self.text_font.render(f"Human: {icon} {human_strategy}", True, self.human_color)
-        screen.blit(human_text, (self.x + 15, y))
+        screen.blit(human_text, (15, y))
         y += 20
         
         # AI strategy
-        ai_strategy = stats.get_strategy(False)
         icon = strategy_icons.get(ai_strategy, "")
         
         ai_text = self.text_font.render(f"AI: {icon} {ai_strategy}", True, self.ai_color)
-        screen.blit(ai_text, (self.x + 15, y))
+        screen.blit(ai_text, (15, y))
         y += 25
         
         return y
     
-    def _draw_performance(self, screen, stats, y):
+    def _draw_performance(self, screen, y, human_perf, ai_perf):
         """Draw performance scores."""
         header = self.header_font.render("⭐ PERFORMANCE", True, self.highlight_color)
-        screen.blit(header, (self.x + 10, y))
+        screen.blit(header, (10, y))
         y += 25
         
         # Human performance
-        human_perf = stats.get_performance_score(True)
         self._draw_performance_bar(screen, "Human", human_perf, self.human_color, y)
         y += 30
         
         # AI performance
-        ai_perf = stats.get_performance_score(False)
         self._draw_performance_bar(screen, "AI", ai_perf, self.ai_color, y)
         y += 35
         
-        # Update history for graph
-        if len(self.human_perf_history) == 0 or self.human_perf_history[-1] != human_perf:
-            self.human_perf_history.append(human_perf)
-            self.ai_perf_history.append(ai_perf)
-            
-            # Keep last 20 points
-            if len(self.human_perf_history) > 20:
-                self.human_perf_history.pop(0)
-                self.ai_perf_history.pop(0)
-        
         return y
     
     def _draw_performance_bar(self, screen, label, score, color, y):
         """Draw a performance score bar."""
         # Label
         label_text = self.small_font.render(f"{label}:", True, self.text_color)
-        screen.blit(label_text, (self.x + 15, y))
+        screen.blit(label_text, (15, y))
         
         # Score bar
-        bar_x = self.x + 70
+        bar_x = 70
         bar_y = y + 2
         bar_width = self.width - 90
         bar_height = 12
@@ -317,61 +408,51 @@ class StatsPanel:
         value_text = self.small_font.render(f"{score:.0f}", True, self.text_color)
         screen.blit(value_text, (bar_x + bar_width + 5, y))
     
-    def _draw_history(self, screen, stats, y):
+    def _draw_history(self, screen, y, total_games, human_wr, ai_wr,
+                      human_streak, ai_streak, human_trend):
         """Draw historical statistics."""
         header = self.header_font.render("📜 HISTORY", True, self.highlight_color)
-        screen.blit(header, (self.x + 10, y))
+        screen.blit(header, (10, y))
         y += 25
         
-        total_games = stats.history['total_games']
-        human_wins = stats.history['human_wins']
-        ai_wins = stats.history['ai_wins']
-        
         # Total games
         total_text = self.text_font.render(f"Total Games: {total_games}", True, self.text_color)
-        screen.blit(total_text, (self.x + 15, y))
+        screen.blit(total_text, (15, y))
         y += 20
         
         # Win rates
-        human_wr = stats.get_win_rate(True)
-        ai_wr = stats.get_win_rate(False)
-        
         wr_text = self.text_font.render(f"Human: {human_wr:.1f}% | AI: {ai_wr:.1f}%", True, self.text_color)
-        screen.blit(wr_text, (self.x + 15, y))
+        screen.blit(wr_text, (15, y))
         y += 20
         
         # Win streaks
-        human_streak = stats.history['human_stats']['current_win_streak']
-        ai_streak = stats.history['ai_stats']['current_win_streak']
-        
         if human_streak > 0:
             streak_text = self.text_font.render(f"🔥 Human Streak: {human_streak}", True, self.human_color)
-            screen.blit(streak_text, (self.x + 15, y))
+            screen.blit(streak_text, (15, y))
             y += 20
         elif ai_streak > 0:
             streak_text = self.text_font.render(f"🔥 AI Streak: {ai_streak}", True, self.ai_color)
-            screen.blit(streak_text, (self.x + 15, y))
+            screen.blit(streak_text, (15, y))
             y += 20
         
         # Trend
-        human_trend = stats.get_recent_trend(True)
         trend_text = self.small_font.render(f"Trend: {human_trend}", True, self.text_color)
-        screen.blit(trend_text, (self.x + 15, y))
+        screen.blit(trend_text, (15, y))
         y += 25
         
         return y
     
-    def _draw_performance_graph(self, screen, stats, y):
+    def _draw_performance_graph(self, screen, y, human_history, ai_history):
         """Draw performance graph over time."""
-        if len(self.human_perf_history) < 2:
+        if len(human_history) < 2:
             return y
         
         header = self.header_font.render("📊 PERFORMANCE", True, self.highlight_color)
-        screen.blit(header, (self.x + 10, y))
+        screen.blit(header, (10, y))
         y += 25
         
         # Graph area
-        graph_x = self.x + 15
+        graph_x = 15
         graph_y = y
         graph_width = self.width - 30
         graph_height = 60
@@ -388,14 +469,14 @@ class StatsPanel:
                            (graph_x + graph_width, grid_y), 1)
         
         # Draw data
-        if len(self.human_perf_history) > 1:
+        if len(human_history) > 1:
             # Human line
-            self._draw_graph_line(screen, self.human_perf_history, 
+            self._draw_graph_line(screen, human_history, 
                                  graph_x, graph_y, graph_width, graph_height, 
                                  self.human_color)
             
             # AI line
-            self._draw_graph_line(screen, self.ai_perf_history, 
+            self._draw_graph_line(screen, ai_history, 
                                  graph_x, graph_y, graph_width, graph_height, 
                                  self.ai_color)
         
@@ -416,16 +497,14 @@ class StatsPanel:
         if len(points) > 1:
             pygame.draw.lines(screen, color, False, points, 2)
     
-    def _draw_recommendations(self, screen, stats, y):
+    def _draw_recommendations(self, screen, y, recommendations):
         """Draw gameplay recommendations."""
         header = self.header_font.render("💡 TIPS", True, self.highlight_color)
-        screen.blit(header, (self.x + 10, y))
+        screen.blit(header, (10, y))
         y += 25
         
-        recommendations = stats.get_recommendations()
-        
         # Show top 3 recommendations
-        for i, rec in enumerate(recommendations[:3]):
+        for i, rec in enumerate(recommendations):
             # Wrap text if too long
             if len(rec) > 25:
                 words = rec.split()
@@ -442,11 +521,11 @@ class StatsPanel:
                 
                 for line in lines:
                     text = self.small_font.render(line, True, self.text_color)
-                    screen.blit(text, (self.x + 15, y))
+                    screen.blit(text, (15, y))
                     y += 16
             else:
                 text = self.small_font.render(rec, True, self.text_color)
-                screen.blit(text, (self.x + 15, y))
+                screen.blit(text, (15, y))
                 y += 18
             
             y += 5
@@ -0,0 +1,370 @@
+"""
+Sweep - PPO hyperparameter search with asynchronous successive halving.
+
+A sweep samples num_trials configurations of the PPO hyperparameters
+overnight_training.py otherwise hard-codes (update interval, batch size,
+epochs, learning rate schedule, clip range, gamma, GAE lambda) and
+trains them on a process pool, one trial per core. Training is split
+into rungs of growing length (min_episodes, min_episodes * eta, ...,
+max_episodes). After each rung a trial plays a seeded evaluation against
+the evaluation opponents, and its score is the evaluation win rate per
+CPU minute the trial has used so far. Ties, which are common while
+every trial still loses, are broken by the evaluation reward.
+
+Scheduling is ASHA: whenever a worker is free it continues the best
+trial that is in the top 1/eta of its rung and not yet promoted, and
+otherwise starts a new trial. Weak trials are never continued, so most
+CPU time goes to the configurations that learn fastest per CPU minute.
+Promoted trials resume from their own checkpoint instead of starting
+over.
+
+Everything is kept in sweep.json in the sweep folder and the ranked
+table (trials that got furthest first, then by score) is written to
+results.csv; best_config.json holds the winner in the format
+overnight_training.py --hyperparameters reads.
+"""
+
+import csv
+import json
+import math
+import multiprocessing
+import os
+import queue
+import random
+import time
+from collections import OrderedDict
+from functools import partial
+
+from . import FPS
+from .checkpoint_writer import write_atomic
+from .evaluator import evaluate_checkpoint
+from .league import make_heuristic
+from .trainer import Trainer, TrainerSink, PPOLearner, SingleBackend
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+if TORCH_AVAILABLE:
+    from .agents.ppo_agent import PPOAgent
+
+
+SWEEP_NAME = "sweep.json"
+RESULTS_NAME = "results.csv"
+BEST_CONFIG_NAME = "best_config.json"
+
+# Hyperparameter -> ('choice', values) | ('uniform', low, high) | ('log', low, high)
+SEARCH_SPACE = OrderedDict([
+    ('update_interval', ('choice', (1024, 2048, 4096, 8192))),
+    ('batch_size', ('choice', (32, 64, 128, 256))),
+    ('epochs_per_update', ('choice', (3, 5, 10, 15))),
+    ('learning_rate_start', ('log', 5e-5, 1e-3)),
+    ('learning_rate_end', ('log', 1e-6, 1e-4)),
+    ('clip_epsilon', ('uniform', 0.1, 0.3)),
+    ('gamma', ('uniform', 0.95, 0.999)),
+    ('gae_lambda', ('uniform', 0.9, 0.99)),
+])
+
+
+def sample_config(space, rng):
+    """
+    Draw one configuration.
+
+    Args:
+        space: Search space (see SEARCH_SPACE)
+        rng: random.Random used for the draw
+
+    Returns:
+        Dictionary of hyperparameter values
+    """
+    config = {}
+    for name, spec in space.items():
+        kind = spec[0]
+        if kind == 'choice':
+            config[name] = rng.choice(spec[1])
+        elif kind == 'uniform':
+            config[name] = rng.uniform(spec[1], spec[2])
+        elif kind == 'log':
+            config[name] = math.exp(rng.uniform(math.log(spec[1]), math.log(spec[2])))
+        else:
+            raise ValueError(f"Unknown search space kind {kind!r} for {name}")
+    return config
+
+
+def configure_agent(agent, config):
+    """Apply a configuration's PPO hyperparameters to a PPOAgent."""
+    agent.batch_size = config['batch_size']
+    agent.epochs = config['epochs_per_update']
+    agent.clip_epsilon = config['clip_epsilon']
+    agent.gamma = config['gamma']
+    agent.gae_lambda = config['gae_lambda']
+
+
+def learning_rate(config, episode, total_episodes):
+    """Learning rate of the linear decay schedule at an episode."""
+    progress = min(episode / total_episodes, 1.0)
+    return config['learning_rate_start'] + (config['learning_rate_end'] - config['learning_rate_start']) * progress
+
+
+def rung_budgets(min_episodes, max_episodes, eta):
+    """Cumulative training episodes at the end of each rung."""
+    budgets = []
+    episodes = min_episodes
+    while episodes < max_episodes:
+        budgets.append(episodes)
+        episodes *= eta
+    budgets.append(max_episodes)
+    return budgets
+
+
+class SuccessiveHalving:
+    """
+    Asynchronous successive halving (ASHA) scheduler.
+
+    Trial ids are 0, 1, ... in the order trials are started; rung r of a
+    trial ends after budgets[r] training episodes.
+    """
+
+    def __init__(self, num_trials, budgets, eta=3):
+        """
+        Initialize scheduler.
+
+        Args:
+            num_trials: Trials started in total
+            budgets: Cumulative episodes at the end of each rung
+            eta: Only the top 1/eta of a rung is promoted to the next
+        """
+        self.num_trials = num_trials
+        self.budgets = list(budgets)
+        self.eta = eta
+        self.scores = [{} for _ in self.budgets]  # rung -> {trial id: score}
+        self.promoted = [set() for _ in self.budgets]
+        self.started = 0
+
+    def next_job(self):
+        """
+        Pick the next rung to run.
+
+        Returns:
+            (trial id, rung), or None when nothing can run until more
+            results are reported
+        """
+        for rung in reversed(range(len(self.budgets) - 1)):
+            scores = self.scores[rung]
+            ranked = sorted(scores, key=lambda trial: scores[trial], reverse=True)
+            for trial in ranked[:len(ranked) // self.eta]:
+                if trial not in self.promoted[rung]:
+                    self.promoted[rung].add(trial)
+                    return trial, rung + 1
+        if self.started < self.num_trials:
+            self.started += 1
+            return self.started - 1, 0
+        return None
+
+    def report(self, trial, rung, score):
+        """Record the score a trial reached at the end of a rung."""
+        self.scores[rung][trial] = score
+
+
+def trial_score(trial):
+    """Ranking key of a trial: (rungs finished, win rate per CPU minute, evaluation reward)."""
+    if not trial['rungs']:
+        return (0, float('-inf'), float('-inf'))
+    last = trial['rungs'][-1]
+    return (len(trial['rungs']), last['win_rate_per_cpu_minute'], last['avg_reward'])
+
+
+class TrialSink(TrainerSink):
+    """Decays a trial's learning rate over the sweep's full episode budget."""
+
+    def __init__(self, agent, config, total_episodes):
+        self.agent = agent
+        self.config = config
+        self.total_episodes = total_episodes
+
+    def on_episode(self, trainer, result):
+        self.agent.set_learning_rate(learning_rate(self.config, result.episode, self.total_episodes))
+
+
+def _run_trial(task):
+    """Pool worker: train one trial through one rung and evaluate it."""
+    if TORCH_AVAILABLE:
+        torch.set_num_threads(1)  # One core per trial keeps CPU minutes comparable
+    start = time.process_time()
+    config, checkpoint = task['config'], task['checkpoint']
+
+    agent = PPOAgent(None, model_path=checkpoint if task['start_episode'] > 0 else None, training=True)
+    configure_agent(agent, config)
+    agent.set_learning_rate(learning_rate(config, task['start_episode'], task['total_episodes']))
+    trainer = Trainer(PPOLearner(agent, update_interval=config['update_interval']),
+                      partial(make_heuristic, task['opponent']), backend=SingleBackend(),
+                      sinks=[TrialSink(agent, config, task['total_episodes'])],
+                      max_steps=task['max_steps'], dt=1/FPS, names=("PPO Agent", task['opponent']),
+                      start_episode=task['start_episode'])
+    try:
+        results = trainer.run(task['episodes'] - task['start_episode'])
+    finally:
+        trainer.close()
+    write_atomic(checkpoint, agent.checkpoint_state())
+
+    suite = [(name, partial(make_heuristic, name)) for name in task['eval_opponents']]
+    evaluation = evaluate_checkpoint(checkpoint, PPOAgent, suite, task['eval_episodes'], SingleBackend(),
+                                     task['max_steps'], task['seed'])
+    return {
+        'trial': task['trial'],
+        'rung': task['rung'],
+        'episodes': task['episodes'],
+        'train_win_rate': sum(result.won for result in results) / max(len(results), 1) * 100,
+        'win_rate': evaluation['win_rate'],
+        'avg_reward': evaluation['avg_reward'],
+        'cpu_seconds': time.process_time() - start,
+    }
+
+
+class HyperparameterSweep:
+    """Samples PPO configurations and trains them with successive halving."""
+
+    def __init__(self, directory, num_trials=27, min_episodes=50, max_episodes=450, eta=3,
+                 num_workers=None, space=SEARCH_SPACE, opponent='improved',
+                 eval_opponents=('improved',), eval_episodes=10, max_steps=500, seed=0):
+        """
+        Initialize sweep.
+
+        Args:
+            directory: Sweep folder (sweep.json, results, trial checkpoints)
+            num_trials: Configurations sampled
+            min_episodes: Training episodes of the first rung
+            max_episodes: Training episodes of a trial that is never pruned
+            eta: Reduction factor; each rung is eta times longer and only
+                 the top 1/eta of it continues
+            num_workers: Trials trained at once (default: CPU count; 0
+                         trains in this process)
+            space: Search space (see SEARCH_SPACE)
+            opponent: League name of the heuristic trials train against
+            eval_opponents: League names of the evaluation opponents
+            eval_episodes: Evaluation games against each of them per rung
+            max_steps: Step limit per game
+            seed: Seed of the sampled configurations and of the
+                  evaluation maps (every trial is evaluated on the same maps)
+        """
+        self.directory = directory
+        self.num_trials = num_trials
+        self.budgets = rung_budgets(min_episodes, max_episodes, eta)
+        self.eta = eta
+        self.num_workers = num_workers
+        self.space = space
+        self.opponent = opponent
+        self.eval_opponents = tuple(eval_opponents)
+        self.eval_episodes = eval_episodes
+        self.max_steps = max_steps
+        self.seed = seed
+        self.trials = []
+        os.makedirs(directory, exist_ok=True)
+
+    def _checkpoint_path(self, trial):
+        return os.path.join(self.directory, f"trial_{trial:03d}.pth")
+
+    def _task(self, trial, rung):
+        """Build the worker task of a trial's rung (sampling new trials)."""
+        if trial == len(self.trials):
+            rng = random.Random(f"{self.seed}-{trial}")
+            self.trials.append({'trial': trial, 'config': sample_config(self.space, rng),
+                                'rungs': [], 'cpu_seconds': 0.0})
+        return {
+            'trial': trial, 'rung': rung, 'config': self.trials[trial]['config'],
+            'checkpoint': self._checkpoint_path(trial),
+            'start_episode': self.budgets[rung - 1] if rung > 0 else 0,
+            'episodes': self.budgets[rung], 'total_episodes': self.budgets[-1],
+            'opponent': self.opponent, 'eval_opponents': self.eval_opponents,
+            'eval_episodes': self.eval_episodes, 'max_steps': self.max_steps, 'seed': self.seed,
+        }
+
+    def _add_result(self, result):
+        """Store a finished rung; returns its score."""
+        trial = self.trials[result['trial']]
+        trial['cpu_seconds'] += result['cpu_seconds']
+        cpu_minutes = trial['cpu_seconds'] / 60
+        result['cpu_minutes'] = cpu_minutes
+        result['win_rate_per_cpu_minute'] = result['win_rate'] / max(cpu_minutes, 1e-6)
+        trial['rungs'].append(result)
+        self.save()
+        return result['win_rate_per_cpu_minute'], result['avg_reward']
+
+    def run(self, log=print):
+        """
+        Run the whole sweep.
+
+        Args:
+            log: Function used for progress messages
+
+        Returns:
+            Trials ranked best first (see ranked())
+        """
+        scheduler = SuccessiveHalving(self.num_trials, self.budgets, self.eta)
+        num_workers = multiprocessing.cpu_count() if self.num_workers is None else self.num_workers
+        done = queue.Queue()
+        pool = multiprocessing.get_context('spawn').Pool(num_workers) if num_workers > 0 else None
+        running = 0
+        try:
+            while True:
+                # Keep every worker busy
+                while running < max(num_workers, 1):
+                    job = scheduler.next_job()
+                    if job is None:
+                        break
+                    task = self._task(*job)
+                    if pool is None:
+                        done.put(_run_trial(task))
+                    else:
+                        pool.apply_async(_run_trial, (task,), callback=done.put, error_callback=done.put)
+                    running += 1
+                if running == 0:
+                    break
+
+                result = done.get()
+                running -= 1
+                if isinstance(result, BaseException):
+                    raise result
+                score = self._add_result(result)
+                scheduler.report(result['trial'], result['rung'], score)
+                log(f"  trial {result['trial']:3d} rung {result['rung']} "
+                    f"({result['episodes']} episodes): {result['win_rate']:5.1f}% won, "
+                    f"{score[0]:6.2f} %/CPU min, reward {result['avg_reward']:7.2f}")
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+        self.write_results()
+        return self.ranked()
+
+    def ranked(self):
+        """Get the trials, best first: furthest rung, then score at that rung."""
+        return sorted(self.trials, key=trial_score, reverse=True)
+
+    def save(self):
+        """Write sweep.json through a temporary file."""
+        path = os.path.join(self.directory, SWEEP_NAME)
+        with open(path + ".tmp", 'w') as f:
+            json.dump({'budgets': self.budgets, 'eta': self.eta, 'trials': self.trials}, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def write_results(self):
+        """Write the ranked results table and the best configuration."""
+        ranked = [trial for trial in self.ranked() if trial['rungs']]
+        with open(os.path.join(self.directory, RESULTS_NAME), 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['rank', 'trial', 'rungs', 'episodes', 'win_rate', 'cpu_minutes',
+                             'win_rate_per_cpu_minute', 'avg_reward', 'train_win_rate']
+                            + list(self.space))
+            for rank, trial in enumerate(ranked, 1):
+                last = trial['rungs'][-1]
+                writer.writerow([rank, trial['trial'], len(trial['rungs']), last['episodes'],
+                                 round(last['win_rate'], 2), round(last['cpu_minutes'], 3),
+                                 round(last['win_rate_per_cpu_minute'], 3), round(last['avg_reward'], 3),
+                                 round(last['train_win_rate'], 2)]
+                                + [trial['config'][name] for name in self.space])
+        if ranked:
+            with open(os.path.join(self.directory, BEST_CONFIG_NAME), 'w') as f:
+                json.dump(ranked[0]['config'], f, indent=2)
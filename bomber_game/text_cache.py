@@ -0,0 +1,156 @@
+"""
+Shared text rendering cache.
+
+HUD, stats panel and door labels render mostly the same strings every
+frame. The TextCache keeps one pygame Font per (name, size) and an LRU of
+rendered text surfaces keyed by (font, size, text, color), so unchanged
+text costs a single blit.
+
+Rendered surfaces are shared between callers: blit them, don't draw on
+them.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+# Font sizes used by the HUD, stats panel, overlays and entities
+PRELOAD_SIZES = (16, 18, 20, 22, 24, 28, 36, 48, 56)
+
+
+class CachedFont:
+    """Drop-in replacement for pygame.font.Font whose render() is cached."""
+
+    def __init__(self, cache, name, size):
+        self.cache = cache
+        self.name = name
+        self.size_px = size
+        self.font = cache.get_font(size, name)
+
+    def render(self, text, antialias, color, background=None):
+        """Render text like pygame.font.Font.render, served from the cache."""
+        return self.cache.render(text, self.size_px, color, name=self.name,
+                                 antialias=antialias, background=background)
+
+    def size(self, text):
+        """Get the (width, height) text would take when rendered."""
+        return self.font.size(text)
+
+    def get_height(self):
+        """Get the height of the font."""
+        return self.font.get_height()
+
+    def get_linesize(self):
+        """Get the recommended line spacing of the font."""
+        return self.font.get_linesize()
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces."""
+
+    def __init__(self, max_size=512):
+        """
+        Initialize text cache.
+
+        Args:
+            max_size: Maximum number of rendered surfaces to keep
+        """
+        self.max_size = max_size
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_font(self, size, name=None):
+        """Get (loading once) the pygame font for name and size."""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+    def preload(self, sizes=PRELOAD_SIZES, name=None):
+        """Load fonts up front so the first frames don't pay for it."""
+        for size in sizes:
+            self.get_font(size, name)
+
+    def font(self, size, name=None):
+        """Get a CachedFont usable wherever a pygame Font is expected."""
+        return CachedFont(self, name, size)
+
+    def render(self, text, size, color, name=None, antialias=True, background=None):
+        """
+        Get the rendered surface for text.
+
+        Args:
+            text: String to render
+            size: Font size
+            color: Text color
+            name: Font file (None for the pygame default font)
+            antialias: Smooth edges
+            background: Optional background color
+
+        Returns:
+            pygame.Surface shared with other callers
+        """
+        key = (name, size, text, tuple(color), antialias,
+               tuple(background) if background is not None else None)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(size, name).render(text, antialias, color, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        """Forget rendered surfaces (fonts stay loaded)."""
+        self.surfaces.clear()
+
+    def get_hit_rate(self):
+        """Get fraction of renders served from the cache."""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def get_stats(self):
+        """Get cache statistics."""
+        return {
+            'fonts': len(self.fonts),
+            'size': len(self.surfaces),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.get_hit_rate(),
+        }
+
+
+# Global text cache instance
+_text_cache = None
+
+def get_text_cache():
+    """Get the global text cache instance."""
+    global _text_cache
+    if _text_cache is None:
+        _text_cache = TextCache()
+    return _text_cache
+
+
+def get_font(size, name=None):
+    """Get a cached-rendering font from the global text cache."""
+    return get_text_cache().font(size, name)
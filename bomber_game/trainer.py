@@ -0,0 +1,1034 @@
+"""
+Trainer - the episode loop shared by all training scripts.
+
+A Trainer plays games between the trained agent and an opponent, rewards
+every tick with a RewardShaper and feeds the rewards back to a learner.
+Each part is pluggable:
+
+- learner: wraps the trained agent and decides when to update it
+  (PPOLearner, OptimizedPPOLearner, DQNLearner)
+- opponent: factory building the opponent agent for its player, e.g.
+  SimpleAgent or ImprovedHeuristicAgent; with a matchmaker (e.g. a
+  League) each game's opponent is picked by name when the game is
+  scheduled
+- backend: how games are run - SingleBackend (one game at a time),
+  VectorBackend (several games stepped in lockstep, rewarded in one
+  batch), ProcessBackend (games played in worker processes, synchronous
+  rounds) or AsyncBackend (actor processes that never wait for the
+  learner, for AsyncPPOLearner)
+- reward_shaper: RewardShaper (weights from REWARD_CONFIG)
+- sinks: TrainerSink objects told about every finished episode; the
+  training scripts put their progress output, stats files and
+  checkpoints there
+
+Learners collect each game's transitions separately and hand whole
+episodes to the agent, so games running side by side never interleave
+inside a rollout.
+"""
+
+import itertools
+import multiprocessing
+import queue
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from . import GRID_SIZE, TILE_SIZE
+from .game_state import GameState
+from .rewards import RewardShaper
+from .checkpoint_writer import snapshot_state
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+
+# One finished game, as passed to the sinks (opponent: name picked by the matchmaker)
+EpisodeResult = namedtuple('EpisodeResult', ['episode', 'reward', 'steps', 'won', 'lost', 'opponent'],
+                           defaults=(None,))
+
+# A scheduled game: map seed and the name of the opponent to play
+Match = namedtuple('Match', ['seed', 'opponent'])
+
+# Everything needed to play a game (sent to worker processes, so every
+# member must be picklable: classes and module-level functions, no lambdas)
+GameSettings = namedtuple('GameSettings', [
+    'opponent', 'max_steps', 'dt', 'grid_size', 'names', 'action_override'])
+
+
+def apply_action(game_state, player, action):
+    """
+    Move a player and place its bomb.
+
+    Args:
+        game_state: Current game state
+        player: Player to move
+        action: (dx, dy, place_bomb) tuple, or None to stand still
+    """
+    if not action:
+        return
+    dx, dy, place_bomb = action
+    player.move(dx, dy, game_state.grid, TILE_SIZE, game_state)
+    if place_bomb:
+        game_state.place_bomb(player)
+
+
+def new_game(settings, seed=None):
+    """
+    Create a game with the trained player top-left and the opponent bottom-right.
+
+    Args:
+        settings: GameSettings
+        seed: Map seed, or a Match (the opponent factory is then also
+              given the opponent's name)
+
+    Returns:
+        (game_state, agent_player, enemy_player, opponent_agent)
+    """
+    size = settings.grid_size
+    match = seed if isinstance(seed, Match) else None
+    game_state = GameState(size, seed=match.seed if match else seed)
+    agent_player = game_state.add_player(1, 1, (255, 0, 0), settings.names[0])
+    enemy_player = game_state.add_player(size - 2, size - 2, (0, 255, 0), settings.names[1])
+    if match:
+        return game_state, agent_player, enemy_player, settings.opponent(enemy_player, match.opponent)
+    return game_state, agent_player, enemy_player, settings.opponent(enemy_player)
+
+
+def opponent_actions(opponents, game_states):
+    """
+    Choose the actions of the opponents of several games for one tick.
+
+    Opponents with a batch_policy attribute are grouped by it, and each
+    group is decided by one batch_policy.choose_actions(opponents,
+    game_states) call (one forward pass for all games against the same
+    frozen network); the others call choose_action(game_state).
+
+    Returns:
+        List of actions, in the order of opponents
+    """
+    actions = [None] * len(opponents)
+    groups = {}
+    for i, (opponent, game_state) in enumerate(zip(opponents, game_states)):
+        policy = getattr(opponent, 'batch_policy', None)
+        if policy is None:
+            actions[i] = opponent.choose_action(game_state)
+        else:
+            groups.setdefault(id(policy), (policy, []))[1].append(i)
+    for policy, rows in groups.values():
+        chosen = policy.choose_actions([opponents[i] for i in rows], [game_states[i] for i in rows])
+        for i, action in zip(rows, chosen):
+            actions[i] = action
+    return actions
+
+
+# ============================================================================
+# LEARNERS
+# ============================================================================
+
+class Learner:
+    """
+    Base class for learners.
+
+    The trainer calls act() for each game before the tick and observe()
+    after it; finish_episode() hands a finished game to the agent.
+    Episodes are plain dictionaries of lists so worker processes can send
+    them back (take_episode() there, add_episode() in the trainer).
+    """
+
+    def __init__(self, agent, update_interval=None):
+        """
+        Initialize learner.
+
+        Args:
+            agent: Agent being trained
+            update_interval: Update once this many steps are collected
+                             (None: after every episode)
+        """
+        self.agent = agent
+        self.update_interval = update_interval
+        self.episodes = {}  # env -> transitions of its running episode
+        self.collected = 0  # Steps added since the last update
+        self.updates = 0
+        self.steps_learned = 0  # Steps the agent has been updated on
+        self.update_seconds = 0.0  # Time spent updating
+
+    def act(self, env, game_state, player):
+        """Choose the agent's action in game env."""
+        raise NotImplementedError
+
+    def observe(self, env, reward, done, game_state, player):
+        """Record the reward of the tick game env has just run."""
+        raise NotImplementedError
+
+    def take_episode(self, env):
+        """Remove and return the transitions of game env (None if empty)."""
+        return self.episodes.pop(env, None)
+
+    def add_episode(self, episode):
+        """Give a finished episode to the agent and update when due."""
+        raise NotImplementedError
+
+    def finish_episode(self, env):
+        """Move the episode of game env into the agent's training data."""
+        episode = self.take_episode(env)
+        if episode is not None:
+            self.add_episode(episode)
+
+    def update(self):
+        """Update the policy on the collected steps."""
+        start = time.perf_counter()
+        self._train()
+        self.update_seconds += time.perf_counter() - start
+        self.steps_learned += self.collected
+        self.collected = 0
+        self.updates += 1
+
+    def _train(self):
+        """Run the agent's update."""
+        self.agent.update_policy()
+
+    def flush(self):
+        """Update on whatever is still collected (end of training)."""
+        if self.collected:
+            self.update()
+
+    def _maybe_update(self, steps):
+        """Count added steps and update when due."""
+        self.collected += steps
+        if self.update_interval is None or self.collected >= self.update_interval:
+            self.update()
+
+    def policy_state(self):
+        """Get the weights worker processes act with."""
+        return snapshot_state(self.agent.policy.state_dict())
+
+    def load_policy_state(self, state):
+        """Act with weights received from the trainer."""
+        self.agent.policy.load_state_dict(state)
+
+    def replica_spec(self):
+        """Get (learner class, agent class, options) to rebuild this learner in a worker."""
+        return type(self), type(self.agent), {'update_interval': self.update_interval}
+
+
+class PPOLearner(Learner):
+    """Learner for PPOAgent (rollouts kept in agent.memory)."""
+
+    KEYS = ('states', 'actions', 'log_probs', 'rewards', 'is_terminals')
+
+    def __init__(self, agent, update_interval=None):
+        super().__init__(agent, update_interval)
+        self.memory = agent.memory  # Steps waiting for the next update
+
+    def _recording(self, env):
+        """Point agent.memory at game env's episode."""
+        if env not in self.episodes:
+            self.episodes[env] = type(self.memory)()
+        self.agent.memory = self.episodes[env]
+
+    def act(self, env, game_state, player):
+        self.agent.player = player
+        self._recording(env)
+        try:
+            return self.agent.choose_action(game_state)
+        finally:
+            self.agent.memory = self.memory
+
+    def observe(self, env, reward, done, game_state, player):
+        self._recording(env)
+        try:
+            self.agent.store_reward(reward, done)
+        finally:
+            self.agent.memory = self.memory
+
+    def take_episode(self, env):
+        memory = self.episodes.pop(env, None)
+        if memory is None or not memory.rewards:
+            return None
+        return {key: list(getattr(memory, key)) for key in self.KEYS}
+
+    def add_episode(self, episode):
+        # Episode ends are terminal so GAE never bootstraps into the next episode
+        episode['is_terminals'][-1] = True
+        for key in self.KEYS:
+            getattr(self.memory, key).extend(episode[key])
+        self._maybe_update(len(episode['rewards']))
+
+
+class AsyncPPOLearner(PPOLearner):
+    """
+    Learner for PPOAgent fed by asynchronous actors (AsyncBackend).
+
+    Episodes are cut into segments of at most unroll_length steps, so the
+    learner gets a steady stream of data instead of waiting for long
+    episodes. Each segment keeps the state after its last step (None when
+    it ends the episode) and the policy version it was cut with. Updates
+    use the V-trace corrected loss (PPOAgent.update_policy_vtrace), so
+    segments played with older weights still count.
+    """
+
+    def __init__(self, agent, update_interval=2048, unroll_length=128, rho_clip=1.0, c_clip=1.0):
+        """
+        Initialize asynchronous PPO learner.
+
+        Args:
+            agent: PPOAgent being trained
+            update_interval: Update once this many steps are collected
+            unroll_length: Longest segment an episode is cut into
+            rho_clip: V-trace truncation of the importance weights
+            c_clip: V-trace truncation of the trace coefficients
+        """
+        super().__init__(agent, update_interval)
+        self.unroll_length = unroll_length
+        self.rho_clip = rho_clip
+        self.c_clip = c_clip
+        self.segments = []  # Segments waiting for the next update
+        self.policy_version = 0  # Updates done (learner) / weights acted with (actor)
+        self.segment_sink = self.add_episode  # Actors send segments to the learner instead
+        self.lag_total = 0
+        self.lag_count = 0
+
+    def act(self, env, game_state, player):
+        memory = self.episodes.get(env)
+        if memory is not None and len(memory.rewards) >= self.unroll_length:
+            segment = self.take_episode(env)
+            self.agent.player = player
+            segment['bootstrap_state'] = self.agent._get_state(game_state)
+            self.segment_sink(segment)
+        return super().act(env, game_state, player)
+
+    def take_episode(self, env):
+        segment = super().take_episode(env)
+        if segment is not None:
+            segment['bootstrap_state'] = None
+            segment['version'] = self.policy_version
+        return segment
+
+    def add_episode(self, segment):
+        if segment['bootstrap_state'] is None:
+            # Episode ends are terminal so V-trace never bootstraps into the next episode
+            segment['is_terminals'][-1] = True
+        self.segments.append(segment)
+        self.lag_total += self.policy_version - segment['version']
+        self.lag_count += 1
+        self._maybe_update(len(segment['rewards']))
+
+    def _train(self):
+        self.agent.update_policy_vtrace(self.segments, self.rho_clip, self.c_clip)
+        self.segments = []
+        self.policy_version += 1
+
+    def mean_policy_lag(self):
+        """Get the average number of updates segments were behind when used."""
+        return self.lag_total / self.lag_count if self.lag_count else 0.0
+
+    def replica_spec(self):
+        return type(self), type(self.agent), {
+            'update_interval': self.update_interval, 'unroll_length': self.unroll_length,
+            'rho_clip': self.rho_clip, 'c_clip': self.c_clip}
+
+
+class OptimizedPPOLearner(Learner):
+    """Learner for OptimizedPPOAgent (rollouts kept in agent.buffer)."""
+
+    def __init__(self, agent, update_interval=None):
+        super().__init__(agent, update_interval)
+        self.pending = {}  # env -> (state, action, log_prob, value) awaiting its reward
+
+    def act(self, env, game_state, player):
+        self.agent.player = player
+        self.agent.current_state = None
+        action = self.agent.choose_action(game_state)
+        if self.agent.current_state is not None:
+            self.pending[env] = (self.agent.current_state, self.agent.current_action,
+                                 self.agent.current_log_prob, self.agent.current_value)
+        return action
+
+    def observe(self, env, reward, done, game_state, player):
+        if env not in self.pending:
+            return
+        state, action, log_prob, value = self.pending.pop(env)
+        self.episodes.setdefault(env, []).append((state, action, log_prob, reward, value, done))
+
+    def take_episode(self, env):
+        self.pending.pop(env, None)
+        return self.episodes.pop(env, None)
+
+    def add_episode(self, episode):
+        buffer = self.agent.buffer
+        for state, action, log_prob, reward, value, done in episode[:-1]:
+            buffer.store(state, action, log_prob, reward, value, done)
+        state, action, log_prob, reward, value, _ = episode[-1]
+        buffer.store(state, action, log_prob, reward, value, True)
+        self._maybe_update(len(episode))
+
+
+class DQNLearner(Learner):
+    """
+    Learner for RLAgent (DQN with experience replay).
+
+    Transitions are remembered and replayed when their episode finishes;
+    the target network is refreshed every target_update episodes.
+    """
+
+    def __init__(self, agent, target_update=10):
+        super().__init__(agent, update_interval=None)
+        self.target_update = target_update
+        self.pending = {}  # env -> (state, action index) awaiting its reward
+        self.finished_episodes = 0
+
+    def act(self, env, game_state, player):
+        self.agent.player = player
+        self.agent.last_state = None
+        action = self.agent.choose_action(game_state)
+        if self.agent.last_state is not None:
+            self.pending[env] = (self.agent.last_state, self.agent.last_action)
+        return action
+
+    def observe(self, env, reward, done, game_state, player):
+        if env not in self.pending:
+            return
+        state, action = self.pending.pop(env)
+        self.agent.player = player
+        next_state = self.agent._get_state(game_state)
+        self.episodes.setdefault(env, []).append((state, action, reward, next_state, done))
+
+    def take_episode(self, env):
+        self.pending.pop(env, None)
+        return self.episodes.pop(env, None)
+
+    def add_episode(self, episode):
+        start = time.perf_counter()
+        for transition in episode:
+            self.agent.remember(*transition)
+            self.agent.replay()
+        if self.finished_episodes % self.target_update == 0:
+            self.agent.update_target_model()
+        self.finished_episodes += 1
+        self.update_seconds += time.perf_counter() - start
+        self.steps_learned += len(episode)
+
+    def flush(self):
+        pass
+
+    def policy_state(self):
+        return {'model': snapshot_state(self.agent.model.state_dict()),
+                'epsilon': self.agent.epsilon}
+
+    def load_policy_state(self, state):
+        self.agent.model.load_state_dict(state['model'])
+        self.agent.epsilon = state['epsilon']
+
+    def replica_spec(self):
+        return type(self), type(self.agent), {'target_update': self.target_update}
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class GameBatch:
+    """Games stepped in lockstep; each slot starts a new game when its game ends."""
+
+    def __init__(self, settings, learner, reward_shaper, num_envs):
+        """
+        Initialize game batch.
+
+        Args:
+            settings: GameSettings
+            learner: Learner choosing the trained agent's actions
+            reward_shaper: RewardShaper with at least num_envs games
+            num_envs: Number of games played at the same time
+        """
+        self.settings = settings
+        self.learner = learner
+        self.reward_shaper = reward_shaper
+        self.num_envs = num_envs
+
+    def play(self, seeds):
+        """
+        Play one episode per seed.
+
+        Args:
+            seeds: Iterable of map seeds (None for random maps) or Matches;
+                   it is read lazily, so it can stop early to end the run
+
+        Yields:
+            (env, EpisodeResult without its episode number) as games end;
+            the learner still holds the episode of env at that point
+        """
+        settings = self.settings
+        seeds = iter(seeds)
+        games = [None] * self.num_envs
+        running = []
+
+        def start(env):
+            for seed in seeds:
+                opponent_name = seed.opponent if isinstance(seed, Match) else None
+                games[env] = new_game(settings, seed) + ([0.0, 0], opponent_name)
+                self.reward_shaper.reset(env)
+                return True
+            games[env] = None
+            return False
+
+        try:
+            running = [env for env in range(self.num_envs) if start(env)]
+            while running:
+                for env in running:
+                    game_state, agent_player = games[env][:2]
+                    action = self.learner.act(env, game_state, agent_player)
+                    if settings.action_override is not None:
+                        action = settings.action_override(agent_player, game_state, action)
+                    apply_action(game_state, agent_player, action)
+
+                # Opponents are decided together so frozen networks run batched
+                moving = [games[env] for env in running if games[env][2].alive]
+                actions = opponent_actions([g[3] for g in moving], [g[0] for g in moving])
+                for (game_state, _, enemy_player, _, _, _), action in zip(moving, actions):
+                    apply_action(game_state, enemy_player, action)
+
+                batch = [games[env] for env in running]
+                for game in batch:
+                    game[0].update(settings.dt)
+                rewards = self.reward_shaper.compute([g[0] for g in batch], [g[1] for g in batch],
+                                                     [g[2] for g in batch], envs=running)
+
+                still_running = []
+                for env, reward in zip(running, rewards):
+                    game_state, agent_player, enemy_player, _, totals, opponent_name = games[env]
+                    done = not agent_player.alive or not enemy_player.alive
+                    self.learner.observe(env, reward, done, game_state, agent_player)
+                    totals[0] += reward
+                    totals[1] += 1
+                    if done or totals[1] >= settings.max_steps:
+                        won = agent_player.alive and not enemy_player.alive
+                        yield env, EpisodeResult(None, totals[0], totals[1], won, not agent_player.alive,
+                                                 opponent_name)
+                        if not start(env):
+                            continue
+                    still_running.append(env)
+                running = still_running
+        finally:
+            # Stopped early: drop the unfinished episodes
+            for env in running:
+                self.learner.take_episode(env)
+
+
+class VectorBackend:
+    """Plays num_envs games in lockstep in this process, rewarded as one batch."""
+
+    def __init__(self, num_envs=8):
+        self.num_envs = num_envs
+
+    def episodes(self, trainer, seeds):
+        """Yield EpisodeResults (without numbers), learning from each."""
+        batch = GameBatch(trainer.settings, trainer.learner, trainer.reward_shaper, self.num_envs)
+        games = batch.play(seeds)
+        try:
+            for env, result in games:
+                if trainer.learn:
+                    trainer.learner.finish_episode(env)
+                else:
+                    trainer.learner.take_episode(env)
+                yield result
+        finally:
+            games.close()
+
+    def close(self):
+        pass
+
+
+class SingleBackend(VectorBackend):
+    """Plays one game at a time."""
+
+    def __init__(self):
+        super().__init__(num_envs=1)
+
+
+def _worker_main(conn, settings, replica_spec, reward_weights, num_envs):
+    """Worker process: play the episodes it is sent with the weights it is sent."""
+    learner_cls, agent_cls, options = replica_spec
+    learner = learner_cls(agent_cls(None, training=True), **options)
+    reward_shaper = RewardShaper(num_envs, reward_weights)
+    batch = GameBatch(settings, learner, reward_shaper, num_envs)
+
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        policy_state, seeds = message
+        learner.load_policy_state(policy_state)
+        reward_shaper.seconds, reward_shaper.env_steps = 0.0, 0
+
+        finished = [(result, learner.take_episode(env)) for env, result in batch.play(seeds)]
+        conn.send((finished, reward_shaper.seconds, reward_shaper.env_steps))
+    conn.close()
+
+
+class ProcessBackend:
+    """
+    Plays games in worker processes.
+
+    Rounds are synchronous: every worker gets the current weights and
+    envs_per_worker episodes, and the learner trains on the returned
+    episodes before the next round, so PPO stays on-policy.
+    """
+
+    def __init__(self, num_workers=None, envs_per_worker=1):
+        """
+        Initialize process backend (workers start on first use).
+
+        Args:
+            num_workers: Worker processes (default: CPU count - 1)
+            envs_per_worker: Games each worker plays in lockstep per round
+        """
+        self.num_workers = num_workers or max(1, multiprocessing.cpu_count() - 1)
+        self.envs_per_worker = envs_per_worker
+        self.workers = []
+
+    def _start(self, trainer):
+        """Start the worker processes."""
+        context = multiprocessing.get_context('spawn')
+        for _ in range(self.num_workers):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_worker_main,
+                args=(child_conn, trainer.settings, trainer.learner.replica_spec(),
+                      trainer.reward_shaper.weights, self.envs_per_worker),
+                daemon=True)
+            process.start()
+            child_conn.close()
+            self.workers.append((process, parent_conn))
+
+    def episodes(self, trainer, seeds):
+        """Yield EpisodeResults (without numbers), learning from each."""
+        if not self.workers:
+            self._start(trainer)
+        seeds = iter(seeds)
+        busy = []
+        try:
+            while True:
+                policy_state = trainer.learner.policy_state()
+                for process, conn in self.workers:
+                    round_seeds = [seed for _, seed in zip(range(self.envs_per_worker), seeds)]
+                    if round_seeds:
+                        conn.send((policy_state, round_seeds))
+                        busy.append(conn)
+                if not busy:
+                    return
+
+                while busy:
+                    finished, seconds, env_steps = busy.pop(0).recv()
+                    trainer.reward_shaper.seconds += seconds
+                    trainer.reward_shaper.env_steps += env_steps
+                    for result, episode in finished:
+                        if trainer.learn and episode is not None:
+                            trainer.learner.add_episode(episode)
+                        yield result
+        finally:
+            # Stopped early: wait for the round in flight and drop it
+            for conn in busy:
+                conn.recv()
+
+    def close(self):
+        """Stop the worker processes."""
+        for process, conn in self.workers:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process, conn in self.workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.workers = []
+
+
+PAUSE = 'pause'  # Tells an actor to finish its running games and wait
+
+
+class SharedWeights:
+    """
+    Latest policy weights in shared memory.
+
+    The learner overwrites them after each update and actors copy them out
+    when the version has changed, so neither side waits for the other.
+    The state must be a flat dictionary of float tensors (a state_dict).
+    """
+
+    def __init__(self, context, state):
+        """
+        Allocate the shared buffer and publish version 0.
+
+        Args:
+            context: multiprocessing context the actors are started from
+            state: Initial weights
+        """
+        self.shapes = [(key, tuple(np.shape(value))) for key, value in state.items()]
+        size = sum(int(np.prod(shape)) for _, shape in self.shapes)
+        self.array = context.RawArray('f', size)
+        self.version = context.RawValue('q', 0)
+        self.lock = context.Lock()
+        self.publish(state, 0)
+
+    def publish(self, state, version):
+        """Overwrite the weights."""
+        flat = np.concatenate([np.asarray(value, dtype=np.float32).ravel() for value in state.values()])
+        with self.lock:
+            np.frombuffer(self.array, dtype=np.float32)[:] = flat
+            self.version.value = version
+
+    def fetch(self, known_version):
+        """
+        Copy the weights out if they changed.
+
+        Args:
+            known_version: Version the caller already has
+
+        Returns:
+            (version, state), or None if known_version is still the latest
+        """
+        if self.version.value == known_version:
+            return None
+        with self.lock:
+            version = self.version.value
+            flat = np.frombuffer(self.array, dtype=np.float32).copy()
+        state = {}
+        offset = 0
+        for key, shape in self.shapes:
+            size = int(np.prod(shape))
+            value = flat[offset:offset + size].reshape(shape)
+            state[key] = torch.from_numpy(value) if TORCH_AVAILABLE else value
+            offset += size
+        return version, state
+
+
+def _queued_seeds(seed_queue):
+    """Yield seeds from an actor's queue until told to pause."""
+    while True:
+        item = seed_queue.get()
+        if item is None:
+            seed_queue.put(None)  # Leave the stop for the actor's main loop
+            return
+        if item == PAUSE:
+            return
+        yield item[0]
+
+
+def _actor_main(actor, seed_queue, trajectories, weights, settings, replica_spec,
+                reward_weights, num_envs):
+    """Actor process: play the seeds it is given, sending segments as they fill up."""
+    learner_cls, agent_cls, options = replica_spec
+    learner = learner_cls(agent_cls(None, training=True), **options)
+    learner.policy_version = -1  # Load version 0 on the first refresh
+    reward_shaper = RewardShaper(num_envs, reward_weights)
+    batch = GameBatch(settings, learner, reward_shaper, num_envs)
+
+    def refresh():
+        latest = weights.fetch(learner.policy_version)
+        if latest is not None:
+            learner.policy_version, state = latest
+            learner.load_policy_state(state)
+
+    def send_segment(segment):
+        trajectories.put(('segment', actor, segment))
+        refresh()
+
+    learner.segment_sink = send_segment
+    while True:
+        item = seed_queue.get()
+        if item is None:
+            break
+        if item == PAUSE:
+            continue
+        refresh()
+        for env, result in batch.play(itertools.chain([item[0]], _queued_seeds(seed_queue))):
+            trajectories.put(('episode', actor, result, learner.take_episode(env),
+                              reward_shaper.seconds, reward_shaper.env_steps))
+            reward_shaper.seconds, reward_shaper.env_steps = 0.0, 0
+            refresh()
+
+
+class AsyncBackend:
+    """
+    Plays games in actor processes that never wait for the learner.
+
+    Actors keep playing with the latest weights they have seen and send
+    segments of at most unroll_length steps through a queue; the learner
+    trains whenever enough steps have arrived and publishes new weights
+    to shared memory. Neither side waits for the slowest episode; the
+    V-trace correction of AsyncPPOLearner accounts for the weights lag.
+    """
+
+    def __init__(self, num_actors=None, envs_per_actor=1, max_queued=64):
+        """
+        Initialize asynchronous backend (actors start on first use).
+
+        Args:
+            num_actors: Actor processes (default: CPU count - 1)
+            envs_per_actor: Games each actor plays in lockstep
+            max_queued: Segments waiting for the learner before actors
+                        block (bounds how stale the data can get)
+        """
+        self.num_actors = num_actors or max(1, multiprocessing.cpu_count() - 1)
+        self.envs_per_actor = envs_per_actor
+        self.max_queued = max_queued
+        self.actors = []
+        self.seed_queues = []
+        self.trajectories = None
+        self.weights = None
+        self.published_version = 0
+
+    def _start(self, trainer):
+        """Start the actor processes."""
+        context = multiprocessing.get_context('spawn')
+        self.trajectories = context.Queue(self.max_queued)
+        self.weights = SharedWeights(context, trainer.learner.policy_state())
+        self.published_version = 0
+        for actor in range(self.num_actors):
+            seed_queue = context.Queue()
+            process = context.Process(
+                target=_actor_main,
+                args=(actor, seed_queue, self.trajectories, self.weights, trainer.settings,
+                      trainer.learner.replica_spec(), trainer.reward_shaper.weights,
+                      self.envs_per_actor),
+                daemon=True)
+            process.start()
+            self.actors.append(process)
+            self.seed_queues.append(seed_queue)
+
+    def _publish(self, learner):
+        """Share the learner's weights if it has updated since the last time."""
+        if learner.policy_version != self.published_version:
+            self.weights.publish(learner.policy_state(), learner.policy_version)
+            self.published_version = learner.policy_version
+
+    def episodes(self, trainer, seeds):
+        """Yield EpisodeResults (without numbers), learning from every segment."""
+        if not self.actors:
+            self._start(trainer)
+        learner = trainer.learner
+        seeds = iter(seeds)
+        outstanding = [0] * self.num_actors  # Seeds given minus episodes returned
+        paused = set()
+
+        def give(actor):
+            for seed in seeds:
+                self.seed_queues[actor].put((seed,))
+                outstanding[actor] += 1
+                return
+            if actor not in paused:
+                # No seeds left: the actor finishes its running games
+                self.seed_queues[actor].put(PAUSE)
+                paused.add(actor)
+
+        # One seed per game plus one in reserve, so actors never wait for the learner
+        for actor in range(self.num_actors):
+            for _ in range(self.envs_per_actor + 1):
+                give(actor)
+
+        try:
+            while sum(outstanding):
+                message = self.trajectories.get()
+                if message[0] == 'segment':
+                    if trainer.learn:
+                        learner.add_episode(message[2])
+                    self._publish(learner)
+                    continue
+
+                _, actor, result, segment, seconds, env_steps = message
+                outstanding[actor] -= 1
+                trainer.reward_shaper.seconds += seconds
+                trainer.reward_shaper.env_steps += env_steps
+                if trainer.learn and segment is not None:
+                    learner.add_episode(segment)
+                self._publish(learner)
+                give(actor)
+                yield result
+        finally:
+            # Take back unplayed seeds, let running games finish and drop them
+            for actor, seed_queue in enumerate(self.seed_queues):
+                try:
+                    while True:
+                        if seed_queue.get_nowait() != PAUSE:
+                            outstanding[actor] -= 1
+                except queue.Empty:
+                    pass
+                seed_queue.put(PAUSE)
+            while sum(outstanding):
+                message = self.trajectories.get()
+                if message[0] == 'episode':
+                    outstanding[message[1]] -= 1
+
+    def close(self):
+        """Stop the actor processes."""
+        for seed_queue in self.seed_queues:
+            seed_queue.put(None)
+        for process in self.actors:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.actors = []
+        self.seed_queues = []
+
+
+def make_backend(num_envs=1, num_workers=0):
+    """
+    Pick a backend from the usual script settings.
+
+    Args:
+        num_envs: Games played at the same time (per worker)
+        num_workers: Worker processes (0: play in this process)
+    """
+    if num_workers:
+        return ProcessBackend(num_workers, envs_per_worker=num_envs)
+    if num_envs > 1:
+        return VectorBackend(num_envs)
+    return SingleBackend()
+
+
+# ============================================================================
+# TRAINER
+# ============================================================================
+
+class TrainerSink:
+    """Receives training events; override the ones needed."""
+
+    def on_episode(self, trainer, result):
+        """Called after every finished episode."""
+
+    def on_finish(self, trainer):
+        """Called once when run() ends (also after a stop or time limit)."""
+
+
+class Trainer:
+    """Runs training episodes for a learner against an opponent."""
+
+    def __init__(self, learner, opponent, backend=None, reward_shaper=None, sinks=(),
+                 max_steps=500, dt=1/30, grid_size=GRID_SIZE, names=("PPO Agent", "Enemy"),
+                 action_override=None, start_episode=0, seed=None, learn=True, matchmaker=None):
+        """
+        Initialize trainer.
+
+        Args:
+            learner: Learner wrapping the trained agent
+            opponent: Factory called with the enemy Player (and the
+                      opponent name when there is a matchmaker), returns
+                      an agent with choose_action(game_state)
+            backend: SingleBackend (default), VectorBackend, ProcessBackend
+                     or AsyncBackend
+            reward_shaper: RewardShaper (default: REWARD_CONFIG weights)
+            sinks: TrainerSink objects
+            max_steps: Steps before an episode is cut off
+            dt: Seconds per game tick
+            grid_size: Map size
+            names: (trained player name, opponent name)
+            action_override: Optional function (player, game_state, action)
+                             returning the action actually played
+            start_episode: Episodes already done (numbering continues from it)
+            seed: Map seed of the first episode (then +1 per episode),
+                  None for random maps
+            learn: False to only play (evaluation)
+            matchmaker: Optional object whose next_opponent() names the
+                        opponent of each game as it is scheduled, e.g. a
+                        League (usually also passed as a sink)
+        """
+        self.learner = learner
+        self.backend = backend or SingleBackend()
+        num_envs = getattr(self.backend, 'num_envs', 1)
+        self.reward_shaper = reward_shaper or RewardShaper(num_envs)
+        if len(self.reward_shaper.prev_dist) < num_envs:
+            self.reward_shaper = RewardShaper(num_envs, self.reward_shaper.weights)
+        self.sinks = list(sinks)
+        self.settings = GameSettings(opponent, max_steps, dt, grid_size, tuple(names), action_override)
+        self.episode = start_episode
+        self.seed = seed
+        self.learn = learn
+        self.matchmaker = matchmaker
+        self.stopping = False
+        self.start_time = None
+        self.learner_start = (0, 0.0)
+
+    def stop(self):
+        """Stop after the current episode (safe to call from a signal handler)."""
+        self.stopping = True
+
+    def elapsed(self):
+        """Get seconds since run() started."""
+        return time.time() - self.start_time if self.start_time else 0.0
+
+    def _seeds(self, episodes):
+        """Map seeds (Matches with a matchmaker) for the episodes to start, until done or stopped."""
+        started = 0
+        while (episodes is None or started < episodes) and not self.stopping:
+            seed = None if self.seed is None else self.seed + self.episode + started
+            if self.matchmaker is not None:
+                seed = Match(seed, self.matchmaker.next_opponent())
+            yield seed
+            started += 1
+
+    def run(self, episodes=None, max_seconds=None):
+        """
+        Play and learn until the episode count or time limit is reached.
+
+        Args:
+            episodes: Episodes to play (None: until stopped)
+            max_seconds: Wall-clock limit
+
+        Returns:
+            List of EpisodeResult
+        """
+        self.stopping = False
+        self.start_time = time.time()
+        self.learner_start = (self.learner.steps_learned, self.learner.update_seconds)
+        results = []
+        episode_stream = self.backend.episodes(self, self._seeds(episodes))
+        try:
+            for result in episode_stream:
+                self.episode += 1
+                result = result._replace(episode=self.episode)
+                results.append(result)
+                for sink in self.sinks:
+                    sink.on_episode(self, result)
+                if max_seconds is not None and self.elapsed() >= max_seconds:
+                    self.stop()
+                if self.stopping or (episodes is not None and len(results) >= episodes):
+                    break
+        finally:
+            episode_stream.close()
+            if self.learn:
+                self.learner.flush()
+            for sink in self.sinks:
+                sink.on_finish(self)
+        return results
+
+    def close(self):
+        """Release the backend (worker processes)."""
+        self.backend.close()
+
+    def mean_reward_time(self):
+        """Get the average reward time per game step in microseconds."""
+        return self.reward_shaper.microseconds_per_step()
+
+    def learner_stats(self):
+        """
+        Get learner throughput since run() started.
+
+        Returns:
+            Dictionary with samples_per_second (steps trained on),
+            utilisation (fraction of the time spent updating) and
+            policy_lag (updates the data was behind, asynchronous mode)
+        """
+        elapsed = self.elapsed()
+        steps = self.learner.steps_learned - self.learner_start[0]
+        seconds = self.learner.update_seconds - self.learner_start[1]
+        lag = getattr(self.learner, 'mean_policy_lag', None)
+        return {
+            'samples_per_second': steps / elapsed if elapsed else 0.0,
+            'utilisation': seconds / elapsed if elapsed else 0.0,
+            'policy_lag': lag() if lag else 0.0,
+        }
@@ -8,16 +8,198 @@ Features:
 - Automatic GIF generation for previews
 - Metadata tracking (duration, FPS, resolution)
 - GitHub Pages compatible output
+
+Frames are streamed while recording: capture_frame() pushes raw RGB bytes
+into a bounded queue, and a background thread feeds them to a single
+ffmpeg process over stdin. Memory stays constant however long the
+recording, and stopping only waits for the encoder to flush.
 """
 
 import pygame
 import os
 import json
+import atexit
+import queue
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 import subprocess
 import tempfile
-from typing import Optional, List
+from typing import Callable, Dict, Optional
+
+
+class FFmpegStreamEncoder:
+    """
+    Encodes raw RGB frames written to a long-lived ffmpeg process.
+    All output files are produced by the same process in one pass.
+    """
+    
+    def __init__(self, width: int, height: int, fps: int, outputs: Dict[str, Path]):
+        """
+        Start the ffmpeg process.
+        
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+            fps: Frames per second
+            outputs: Output paths by format ('webm', 'mp4', 'gif')
+        """
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.outputs = outputs
+        self.frames_written = 0
+        self.failed = False
+        
+        self.log = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            self.build_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=self.log,
+        )
+    
+    def build_command(self) -> list:
+        """
+        Build the ffmpeg command line.
+        
+        Raw frames come in once on stdin; a filter graph converts them to
+        yuv420p once and splits the stream into one branch per requested
+        output, so every format is written in the same pass.
+        """
+        cmd = [
+            'ffmpeg',
+            '-loglevel', 'error',
+            '-y',  # Overwrite outputs
+            '-f', 'rawvideo',
+            '-pix_fmt', 'rgb24',
+            '-s', f'{self.width}x{self.height}',
+            '-framerate', str(self.fps),
+            '-i', '-',
+        ]
+        
+        videos = [fmt for fmt in ('webm', 'mp4') if fmt in self.outputs]
+        gif = 'gif' in self.outputs
+        
+        branches = []
+        if videos:
+            branches.append('[video]')
+        if gif:
+            branches.append('[preview]')
+        
+        graph = [f"[0:v]split={len(branches)}{''.join(branches)}"]
+        if videos:
+            labels = ''.join(f'[{fmt}]' for fmt in videos)
+            graph.append(f"[video]format=yuv420p,split={len(videos)}{labels}")
+        if gif:
+            # GIF preview (first 5 seconds, half FPS, 640px width)
+            graph.append(f"[preview]trim=duration=5,fps={self.fps // 2},"
+                         f"scale=640:-1:flags=lanczos[gif]")
+        cmd += ['-filter_complex', ';'.join(graph)]
+        
+        if 'webm' in self.outputs:
+            # VP9 (web-optimized), tuned to keep up with live capture
+            cmd += [
+                '-map', '[webm]',
+                '-c:v', 'libvpx-vp9',
+                '-deadline', 'realtime',
+                '-cpu-used', '8',
+                '-crf', '30',  # Quality (0-63, lower = better)
+                '-b:v', '0',  # Variable bitrate
+                str(self.outputs['webm']),
+            ]
+        
+        if 'mp4' in self.outputs:
+            # H.264 (compatibility)
+            cmd += [
+                '-map', '[mp4]',
+                '-c:v', 'libx264',
+                '-preset', 'veryfast',
+                '-crf', '23',  # Quality (0-51, lower = better)
+                str(self.outputs['mp4']),
+            ]
+        
+        if gif:
+            cmd += ['-map', '[gif]', str(self.outputs['gif'])]
+        
+        return cmd
+    
+    def write(self, frame: bytes) -> bool:
+        """
+        Write one raw RGB frame.
+        
+        Returns:
+            False if the encoder is gone (frame not written)
+        """
+        if self.failed:
+            return False
+        try:
+            self.process.stdin.write(frame)
+            self.frames_written += 1
+            return True
+        except (BrokenPipeError, OSError):
+            self.failed = True
+            return False
+    
+    def close(self) -> bool:
+        """
+        Finish encoding and wait for ffmpeg to exit.
+        
+        Returns:
+            True if ffmpeg exited cleanly
+        """
+        try:
+            self.process.stdin.close()
+        except (BrokenPipeError, OSError):
+            self.failed = True
+        returncode = self.process.wait()
+        
+        if returncode != 0:
+            self.log.seek(0)
+            error = self.log.read().decode(errors='replace').strip()
+            print(f"   ⚠️  FFmpeg exited with code {returncode}")
+            if error:
+                print(f"   {error.splitlines()[-1]}")
+        self.log.close()
+        return returncode == 0 and not self.failed
+
+
+class NullEncoder:
+    """
+    Encoder stand-in that only counts frames.
+    Lets the capture pipeline run (and be tested) without ffmpeg.
+    """
+    
+    def __init__(self, width: int, height: int, fps: int, outputs: Dict[str, Path]):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.outputs = outputs
+        self.frames_written = 0
+        self.bytes_written = 0
+        self.closed = False
+    
+    def write(self, frame: bytes) -> bool:
+        """Count one frame."""
+        self.frames_written += 1
+        self.bytes_written += len(frame)
+        return True
+    
+    def close(self) -> bool:
+        """Nothing to flush."""
+        self.closed = True
+        return True
+
+
+# Output formats a recording can be exported to
+SUPPORTED_FORMATS = ('webm', 'mp4', 'gif')
+
+# Queue marker telling the encoder thread the recording is over
+_STOP = object()
+
+# pygame < 2.1.3 only has tostring
+_surface_to_bytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
 
 
 class VideoRecorder:
@@ -26,30 +208,57 @@ class VideoRecorder:
     Supports WebM (for web) and MP4 (for compatibility).
     """
     
-    def __init__(self, output_dir: str = "recordings", fps: int = 60):
+    def __init__(self, output_dir: str = "recordings", fps: int = 60,
+                 max_queued_frames: Optional[int] = None,
+                 encoder_factory: Optional[Callable] = None,
+                 formats=SUPPORTED_FORMATS):
         """
         Initialize video recorder.
         
         Args:
             output_dir: Directory to save recordings
             fps: Frames per second for recording
+            max_queued_frames: Frames buffered for the encoder before new
+                ones are dropped (default: one second of video)
+            encoder_factory: Callable (width, height, fps, outputs) returning
+                an encoder with write(bytes) and close(); defaults to ffmpeg
+            formats: Output formats to export ('webm', 'mp4', 'gif')
         """
+        unknown = set(formats) - set(SUPPORTED_FORMATS)
+        if unknown or not formats:
+            raise ValueError(f"Unsupported video formats: {sorted(unknown) or 'none given'}")
+        
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         self.fps = fps
+        self.formats = tuple(fmt for fmt in SUPPORTED_FORMATS if fmt in formats)
         self.is_recording = False
-        self.frames: List[pygame.Surface] = []
         self.start_time: Optional[datetime] = None
         self.recording_name: Optional[str] = None
+        self.max_queued_frames = max_queued_frames or fps
+        
+        # Check for ffmpeg (required for video encoding) unless an encoder is given
+        if encoder_factory is None:
+            self.ffmpeg_available = self._check_ffmpeg()
+            self.encoder_factory = FFmpegStreamEncoder
+        else:
+            self.ffmpeg_available = True
+            self.encoder_factory = encoder_factory
         
-        # Check for ffmpeg (required for video encoding)
-        self.ffmpeg_available = self._check_ffmpeg()
+        # Streaming pipeline (one per recording)
+        self.frame_queue: Optional[queue.Queue] = None
+        self.encoder_thread: Optional[threading.Thread] = None
+        self.frame_size = None
+        self.last_metadata: Optional[dict] = None
         
         # Recording stats
         self.frame_count = 0
         self.dropped_frames = 0
         
+        # Finish an active recording if the game exits mid-way
+        atexit.register(self._finish_on_exit)
+        
     def _check_ffmpeg(self) -> bool:
         """Check if ffmpeg is available."""
         try:
@@ -80,11 +289,15 @@ class VideoRecorder:
             print("   Windows: Download from https://ffmpeg.org/")
             return
         
+        # Let the previous recording finish writing its files
+        self.wait_until_saved()
+        
         self.is_recording = True
-        self.frames = []
         self.start_time = datetime.now()
         self.frame_count = 0
         self.dropped_frames = 0
+        self.frame_size = None
+        self.last_metadata = None
         
         # Generate recording name
         if session_name:
@@ -93,44 +306,73 @@ class VideoRecorder:
         else:
             self.recording_name = self.start_time.strftime("proutman_%Y%m%d_%H%M%S")
         
+        self.frame_queue = queue.Queue(maxsize=self.max_queued_frames)
+        self.encoder_thread = threading.Thread(
+            target=self._encode_stream,
+            args=(self.frame_queue, self.recording_name, self.start_time),
+            name=f"video-encoder-{self.recording_name}",
+            daemon=True,
+        )
+        self.encoder_thread.start()
+        
         print(f"🎬 Recording started: {self.recording_name}")
         print(f"   Press 'R' again to stop recording")
     
-    def capture_frame(self, screen: pygame.Surface):
+    def capture_frame(self, screen: pygame.Surface, block: bool = False):
         """
         Capture a single frame from the pygame screen.
         
+        The frame is queued for the encoder thread; if the encoder falls
+        more than max_queued_frames behind, the frame is dropped instead
+        of stalling the game.
+        
         Args:
             screen: Pygame surface to capture
+            block: Wait for the encoder instead of dropping the frame
+                   (offline rendering, where nothing has to keep up)
         """
         if not self.is_recording:
             return
         
         try:
-            # Create a copy of the screen surface
-            frame = screen.copy()
-            self.frames.append(frame)
-            self.frame_count += 1
+            size = screen.get_size()
+            if self.frame_size is None:
+                self.frame_size = size
+            elif size != self.frame_size:
+                raise ValueError(f"frame size changed to {size}")
             
-            # Memory management: warn if too many frames
-            if len(self.frames) > 3600:  # ~1 minute at 60 FPS
-                print(f"⚠️  Recording {len(self.frames)} frames ({len(self.frames)/self.fps:.1f}s)")
-                print(f"   Memory usage may be high. Consider stopping recording.")
-        
-        except Exception as e:
-            self.dropped_frames += 1
-            if self.dropped_frames % 100 == 0:
-                print(f"⚠️  Dropped {self.dropped_frames} frames due to errors")
+            frame = _surface_to_bytes(screen, 'RGB')
+            if block:
+                self.frame_queue.put(frame)
+            else:
+                self.frame_queue.put_nowait(frame)
+            self.frame_count += 1
+        
+        except queue.Full:
+            self._drop_frame()
+        except Exception:
+            self._drop_frame()
+    
+    def _drop_frame(self):
+        """Count a frame that could not be recorded."""
+        self.dropped_frames += 1
+        if self.dropped_frames % 100 == 0:
+            print(f"⚠️  Dropped {self.dropped_frames} frames (encoder too slow or errors)")
     
-    def stop_recording(self, game_stats: Optional[dict] = None) -> Optional[dict]:
+    def stop_recording(self, game_stats: Optional[dict] = None,
+                       wait: bool = False) -> Optional[dict]:
         """
         Stop recording and save video file with optional game statistics.
         
+        The encoder thread finishes the files in the background; use
+        wait=True (or wait_until_saved()) to block until they are written.
+        
         Args:
             game_stats: Optional dictionary with game performance data
+            wait: Block until the files and metadata are written
         
         Returns:
-            Dictionary with recording metadata, or None if failed
+            Dictionary with recording metadata when wait=True, else None
         """
         if not self.is_recording:
             print("⚠️  Not currently recording!")
@@ -138,135 +380,126 @@ class VideoRecorder:
         
         self.is_recording = False
         
-        if len(self.frames) == 0:
-            print("❌ No frames captured!")
-            return None
-        
         print(f"\n🎬 Stopping recording...")
         print(f"   Captured {self.frame_count} frames")
-        print(f"   Duration: {len(self.frames)/self.fps:.2f} seconds")
+        print(f"   Duration: {self.frame_count/self.fps:.2f} seconds")
         print(f"   Dropped frames: {self.dropped_frames}")
         
-        # Store game stats for later use
-        self._game_stats = game_stats
-        
-        # Save frames to temporary directory
-        temp_dir = Path(tempfile.mkdtemp())
-        
-        try:
-            print(f"💾 Saving frames to temporary directory...")
-            for i, frame in enumerate(self.frames):
-                frame_path = temp_dir / f"frame_{i:06d}.png"
-                pygame.image.save(frame, str(frame_path))
-                
-                if (i + 1) % 100 == 0:
-                    print(f"   Saved {i + 1}/{len(self.frames)} frames...")
-            
-            # Encode video
-            metadata = self._encode_video(temp_dir)
-            
-            # Clean up temporary files
-            self._cleanup_temp_files(temp_dir)
-            
-            # Clear frames from memory
-            self.frames.clear()
-            
-            return metadata
+        # Everything the encoder thread needs to write the metadata
+        summary = {
+            'stopped_at': time.perf_counter(),
+            'frame_count': self.frame_count,
+            'dropped_frames': self.dropped_frames,
+            'frame_size': self.frame_size,
+            'game_stats': game_stats,
+        }
+        self.frame_queue.put((_STOP, summary))
         
-        except Exception as e:
-            print(f"❌ Error saving recording: {e}")
-            self._cleanup_temp_files(temp_dir)
-            return None
+        if wait:
+            return self.wait_until_saved()
+        return None
     
-    def _encode_video(self, frames_dir: Path) -> dict:
+    def wait_until_saved(self, timeout: Optional[float] = None) -> Optional[dict]:
         """
-        Encode frames to video files using ffmpeg.
+        Wait for the last recording's files to be written.
         
-        Args:
-            frames_dir: Directory containing frame images
-            
         Returns:
-            Metadata dictionary
+            Metadata of the last recording, or None if it failed
         """
-        print(f"\n🎞️  Encoding video...")
-        
-        # Output paths
-        webm_path = self.output_dir / f"{self.recording_name}.webm"
-        mp4_path = self.output_dir / f"{self.recording_name}.mp4"
-        gif_path = self.output_dir / f"{self.recording_name}_preview.gif"
-        metadata_path = self.output_dir / f"{self.recording_name}_metadata.json"
-        
-        # Get frame dimensions from first frame
-        first_frame = pygame.image.load(str(frames_dir / "frame_000000.png"))
-        width, height = first_frame.get_size()
+        if self.encoder_thread is not None and not self.is_recording:
+            self.encoder_thread.join(timeout)
+        return self.last_metadata
+    
+    def _finish_on_exit(self):
+        """Stop and flush an active recording at interpreter exit."""
+        if self.is_recording:
+            self.stop_recording(wait=True)
+        else:
+            self.wait_until_saved()
+    
+    def _encode_stream(self, frame_queue: queue.Queue, recording_name: str,
+                       start_time: datetime):
+        """
+        Encoder thread: drain the frame queue into one encoder process.
         
-        # 1. Create WebM (best for web, smaller file size)
-        print(f"   Creating WebM (web-optimized)...")
-        webm_cmd = [
-            'ffmpeg',
-            '-framerate', str(self.fps),
-            '-i', str(frames_dir / 'frame_%06d.png'),
-            '-c:v', 'libvpx-vp9',  # VP9 codec (better quality)
-            '-crf', '30',  # Quality (0-63, lower = better)
-            '-b:v', '0',  # Variable bitrate
-            '-pix_fmt', 'yuv420p',
-            '-y',  # Overwrite output
-            str(webm_path)
-        ]
+        Args:
+            frame_queue: Queue of raw RGB frames, ending with (_STOP, summary)
+            recording_name: Base name of the output files
+            start_time: When the recording started
+        """
+        paths = {
+            'webm': self.output_dir / f"{recording_name}.webm",
+            'mp4': self.output_dir / f"{recording_name}.mp4",
+            'gif': self.output_dir / f"{recording_name}_preview.gif",
+        }
+        outputs = {fmt: paths[fmt] for fmt in self.formats}
+        encoder = None
+        encode_started = None
+        failed = False
+        
+        while True:
+            item = frame_queue.get()
+            if isinstance(item, tuple) and item[0] is _STOP:
+                summary = item[1]
+                break
+            if failed:
+                continue
+            try:
+                if encoder is None:
+                    width, height = self.frame_size
+                    encode_started = time.perf_counter()
+                    encoder = self.encoder_factory(width, height, self.fps, outputs)
+                if not encoder.write(item):
+                    failed = True
+            except Exception as e:
+                print(f"❌ Error encoding recording: {e}")
+                failed = True
+        
+        if encoder is None:
+            print("❌ No frames captured!")
+            self.last_metadata = None
+            return
         
-        try:
-            subprocess.run(webm_cmd, check=True, capture_output=True)
-            print(f"   ✅ WebM created: {webm_path.name}")
-        except subprocess.CalledProcessError as e:
-            print(f"   ⚠️  WebM encoding failed: {e}")
-        
-        # 2. Create MP4 (better compatibility)
-        print(f"   Creating MP4 (compatibility)...")
-        mp4_cmd = [
-            'ffmpeg',
-            '-framerate', str(self.fps),
-            '-i', str(frames_dir / 'frame_%06d.png'),
-            '-c:v', 'libx264',  # H.264 codec
-            '-preset', 'medium',
-            '-crf', '23',  # Quality (0-51, lower = better)
-            '-pix_fmt', 'yuv420p',
-            '-y',
-            str(mp4_path)
-        ]
+        print(f"\n🎞️  Finishing video...")
+        ok = encoder.close() and not failed
+        if not ok:
+            print(f"❌ Error saving recording: encoder failed")
+        
+        finished = time.perf_counter()
+        summary['export'] = {
+            'formats': list(outputs),
+            # Time from stop_recording() until every output was written
+            'wall_clock_seconds': finished - summary['stopped_at'],
+            # Lifetime of the encoder process (encoding ran during play)
+            'encoder_seconds': finished - encode_started,
+        }
         
-        try:
-            subprocess.run(mp4_cmd, check=True, capture_output=True)
-            print(f"   ✅ MP4 created: {mp4_path.name}")
-        except subprocess.CalledProcessError as e:
-            print(f"   ⚠️  MP4 encoding failed: {e}")
-        
-        # 3. Create GIF preview (first 5 seconds, lower quality)
-        print(f"   Creating GIF preview...")
-        max_frames = min(len(self.frames), self.fps * 5)  # Max 5 seconds
-        gif_cmd = [
-            'ffmpeg',
-            '-framerate', str(self.fps),
-            '-i', str(frames_dir / 'frame_%06d.png'),
-            '-vf', f'fps={self.fps//2},scale=640:-1:flags=lanczos',  # Half FPS, 640px width
-            '-frames:v', str(max_frames),
-            '-y',
-            str(gif_path)
-        ]
+        self.last_metadata = self._write_metadata(recording_name, start_time,
+                                                  paths, summary)
+    
+    def _write_metadata(self, recording_name: str, start_time: datetime,
+                        outputs: Dict[str, Path], summary: dict) -> dict:
+        """
+        Write metadata, stats text and HTML embed for a finished recording.
         
-        try:
-            subprocess.run(gif_cmd, check=True, capture_output=True)
-            print(f"   ✅ GIF preview created: {gif_path.name}")
-        except subprocess.CalledProcessError as e:
-            print(f"   ⚠️  GIF encoding failed: {e}")
+        Returns:
+            Metadata dictionary
+        """
+        webm_path = outputs['webm']
+        mp4_path = outputs['mp4']
+        gif_path = outputs['gif']
+        metadata_path = self.output_dir / f"{recording_name}_metadata.json"
+        width, height = summary['frame_size']
+        game_stats = summary['game_stats']
         
         # Create metadata
         metadata = {
-            'recording_name': self.recording_name,
-            'timestamp': self.start_time.isoformat(),
-            'duration_seconds': len(self.frames) / self.fps,
+            'recording_name': recording_name,
+            'timestamp': start_time.isoformat(),
+            'duration_seconds': summary['frame_count'] / self.fps,
             'fps': self.fps,
-            'frame_count': len(self.frames),
-            'dropped_frames': self.dropped_frames,
+            'frame_count': summary['frame_count'],
+            'dropped_frames': summary['dropped_frames'],
             'resolution': {
                 'width': width,
                 'height': height
@@ -280,19 +513,20 @@ class VideoRecorder:
                 'webm_mb': webm_path.stat().st_size / (1024*1024) if webm_path.exists() else 0,
                 'mp4_mb': mp4_path.stat().st_size / (1024*1024) if mp4_path.exists() else 0,
                 'gif_mb': gif_path.stat().st_size / (1024*1024) if gif_path.exists() else 0
-            }
+            },
+            'export': summary['export'],
         }
         
         # Add game statistics if provided
-        if hasattr(self, '_game_stats') and self._game_stats:
-            metadata['game_statistics'] = self._game_stats
+        if game_stats:
+            metadata['game_statistics'] = game_stats
         
         # Save metadata
         with open(metadata_path, 'w') as f:
             json.dump(metadata, f, indent=2)
         
         # Save game statistics as separate text file
-        if hasattr(self, '_game_stats') and self._game_stats:
+        if game_stats:
             self._save_game_stats_txt(metadata)
         
         print(f"\n✅ Recording saved successfully!")
@@ -301,8 +535,9 @@ class VideoRecorder:
         print(f"   🎬 MP4: {metadata['file_sizes']['mp4_mb']:.2f} MB")
         print(f"   🖼️  GIF: {metadata['file_sizes']['gif_mb']:.2f} MB")
         print(f"   ⏱️  Duration: {metadata['duration_seconds']:.2f}s")
-        if hasattr(self, '_game_stats') and self._game_stats:
-            print(f"   📊 Game stats: {self.recording_name}_stats.txt")
+        print(f"   ⏱️  Export time: {metadata['export']['wall_clock_seconds']:.2f}s")
+        if game_stats:
+            print(f"   📊 Game stats: {recording_name}_stats.txt")
         
         # Generate HTML embed code
         self._generate_html_embed(metadata)
@@ -311,7 +546,8 @@ class VideoRecorder:
     
     def _save_game_stats_txt(self, metadata: dict):
         """Save game statistics as a formatted text file."""
-        stats_path = self.output_dir / f"{self.recording_name}_stats.txt"
+        recording_name = metadata['recording_name']
+        stats_path = self.output_dir / f"{recording_name}_stats.txt"
         game_stats = metadata.get('game_statistics', {})
         
         with open(stats_path, 'w') as f:
@@ -322,7 +558,7 @@ class VideoRecorder:
             # Recording Information
             f.write("📹 RECORDING INFORMATION\n")
             f.write("-" * 80 + "\n")
-            f.write(f"Recording Name:  {self.recording_name}\n")
+            f.write(f"Recording Name:  {recording_name}\n")
             f.write(f"Date/Time:       {metadata.get('timestamp', 'N/A')}\n")
             f.write(f"Duration:        {metadata.get('duration_seconds', 0):.2f} seconds\n")
             f.write(f"FPS:             {metadata.get('fps', 0)}\n")
@@ -418,12 +654,13 @@ class VideoRecorder:
             # Footer
             f.write("=" * 80 + "\n")
             f.write("Generated by Proutman Video Recorder\n")
-            f.write(f"Video files: {self.recording_name}.webm, .mp4, .gif\n")
+            files = [name for name in metadata.get('files', {}).values() if name]
+            f.write(f"Video files: {', '.join(files) or 'none'}\n")
             f.write("=" * 80 + "\n")
     
     def _generate_html_embed(self, metadata: dict):
         """Generate HTML code for embedding video on GitHub Pages."""
-        html_path = self.output_dir / f"{self.recording_name}_embed.html"
+        html_path = self.output_dir / f"{metadata['recording_name']}_embed.html"
         
         webm_file = metadata['files']['webm']
         mp4_file = metadata['files']['mp4']
@@ -520,21 +757,13 @@ Or use GIF:
         
         print(f"   📄 HTML embed: {html_path.name}")
     
-    def _cleanup_temp_files(self, temp_dir: Path):
-        """Clean up temporary frame files."""
-        try:
-            import shutil
-            shutil.rmtree(temp_dir)
-        except Exception as e:
-            print(f"⚠️  Could not clean up temp files: {e}")
-    
     def get_status_text(self) -> str:
         """Get current recording status for display."""
         if not self.is_recording:
             return ""
         
-        duration = len(self.frames) / self.fps
-        return f"🔴 REC {duration:.1f}s ({len(self.frames)} frames)"
+        duration = self.frame_count / self.fps
+        return f"🔴 REC {duration:.1f}s ({self.frame_count} frames)"
     
     def toggle_recording(self, session_name: Optional[str] = None) -> bool:
         """
@@ -21,16 +21,17 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 os.chdir(script_dir)
 sys.path.insert(0, script_dir)
 
-from bomber_game import GRID_SIZE, TILE_SIZE
-from bomber_game.game_state import GameState
-from bomber_game.entities import Player
-from bomber_game.agents import PPOAgent, SimpleAgent
+from bomber_game.agents import PPOAgent
 from bomber_game.heuristics import HeuristicAgent, GameHeuristics
+from bomber_game.trainer import Trainer, TrainerSink, PPOLearner, make_backend
 
 # Configuration
 BOOTSTRAP_EPISODES = 500  # Number of heuristic demonstrations
 MODEL_PATH = "bomber_game/models/ppo_agent.pth"
 BOOTSTRAP_STATS_FILE = "bomber_game/models/bootstrap_stats.json"
+DEMONSTRATION_RATE = 0.7  # Share of steps played by the heuristic instead of the agent
+NUM_ENVS = 1     # Games stepped together (see bomber_game/trainer.py)
+NUM_WORKERS = 0  # Worker processes playing games (0: play in this process)
 
 
 def print_banner():
@@ -51,50 +52,36 @@ def print_banner():
     print()
 
 
-def save_state(game_state, player, enemy):
-    """Save game state for PPO."""
-    return {
-        'player_pos': (int(player.x), int(player.y)),
-        'enemy_pos': (int(enemy.x), int(enemy.y)),
-        'player_alive': player.alive,
-        'enemy_alive': enemy.alive,
-        'bombs': [(b.grid_x, b.grid_y, b.timer) for b in game_state.bombs],
-        'explosions': [(e.grid_x, e.grid_y) for e in game_state.explosions],
-    }
+def demonstrate(player, game_state, agent_action):
+    """Play the heuristic action most of the time (the agent learns to mimic it)."""
+    if np.random.random() < DEMONSTRATION_RATE:
+        return GameHeuristics.get_heuristic_action(player, game_state)
+    return agent_action
 
 
-def calculate_reward(prev_state, curr_state, action, player, enemy, game_state):
-    """Calculate reward for heuristic action."""
-    reward = 0
-    
-    # Survival reward
-    if player.alive:
-        reward += 0.1
-    else:
-        reward -= 10.0
-        return reward
-    
-    # Enemy defeat reward
-    if not enemy.alive and prev_state['enemy_alive']:
-        reward += 20.0
-    
-    # Movement rewards
-    px, py = curr_state['player_pos']
-    prev_px, prev_py = prev_state['player_pos']
-    
-    # Reward for moving to safer positions
-    if GameHeuristics.is_safe_position(px, py, game_state):
-        reward += 0.2
-    
-    # Reward for placing bombs strategically
-    if action and len(action) > 2 and action[2]:  # Placed bomb
-        reward += 0.5
-    
-    # Small penalty for staying still
-    if px == prev_px and py == prev_py:
-        reward -= 0.05
-    
-    return reward
+class ProgressSink(TrainerSink):
+    """Prints progress every 50 episodes."""
+    
+    def __init__(self):
+        self.total_rewards = []
+        self.wins = 0
+        self.start_time = time.time()
+    
+    def on_episode(self, trainer, result):
+        self.total_rewards.append(result.reward)
+        self.wins += result.won
+        episode = result.episode
+        
+        if episode % 50 == 0:
+            avg_reward = np.mean(self.total_rewards[-50:])
+            win_rate = (self.wins / episode) * 100
+            elapsed = time.time() - self.start_time
+            
+            print(f"Episode {episode}/{BOOTSTRAP_EPISODES} | "
+                  f"Avg Reward: {avg_reward:.2f} | "
+                  f"Win Rate: {win_rate:.1f}% | "
+                  f"Time: {elapsed:.0f}s | "
+                  f"Reward calc: {trainer.mean_reward_time():.1f} µs/step")
 
 
 def bootstrap_training():
@@ -115,8 +102,7 @@ def bootstrap_training():
     print("🤖 Initializing PPO Agent...")
     
     # Create agent
-    agent_player = Player(1, 1, (255, 0, 0), "PPO Agent")
-    agent = PPOAgent(agent_player)
+    agent = PPOAgent(None)
     agent.training = True
     
     print("✅ PPO Agent initialized")
@@ -128,94 +114,19 @@ def bootstrap_training():
     print()
     print("🎮 Starting bootstrap training...\n")
     
-    # Statistics
-    total_rewards = []
-    wins = 0
-    losses = 0
-    start_time = time.time()
+    progress = ProgressSink()
+    trainer = Trainer(PPOLearner(agent), HeuristicAgent,
+                      backend=make_backend(NUM_ENVS, NUM_WORKERS), sinks=[progress],
+                      max_steps=500, dt=0.1, names=("PPO Agent", "Heuristic Teacher"),
+                      action_override=demonstrate)
+    try:
+        results = trainer.run(BOOTSTRAP_EPISODES)
+    finally:
+        trainer.close()
     
-    for episode in range(BOOTSTRAP_EPISODES):
-        # Initialize game
-        game_state = GameState(GRID_SIZE)
-        agent_player = Player(1, 1, (255, 0, 0), "PPO Agent")
-        enemy_player = Player(11, 11, (0, 255, 0), "Heuristic Teacher")
-        game_state.players = [agent_player, enemy_player]
-        agent.player = agent_player
-        
-        # Create heuristic teacher
-        teacher = HeuristicAgent(enemy_player)
-        
-        # Episode loop
-        steps = 0
-        max_steps = 500
-        total_reward = 0
-        prev_state = save_state(game_state, agent_player, enemy_player)
-        
-        while steps < max_steps and agent_player.alive and enemy_player.alive:
-            # Get heuristic action for agent (learning from heuristics)
-            heuristic_action = GameHeuristics.get_heuristic_action(agent_player, game_state)
-            
-            # Agent chooses action (will learn to mimic heuristics)
-            agent_action = agent.choose_action(game_state)
-            
-            # Use heuristic action 70% of the time for demonstration
-            if np.random.random() < 0.7:
-                action = heuristic_action
-            else:
-                action = agent_action
-            
-            # Execute agent action
-            if action:
-                dx, dy, place_bomb = action
-                agent_player.move(dx, dy, game_state.grid, TILE_SIZE, game_state)
-                
-                if place_bomb and agent_player.active_bombs < agent_player.max_bombs:
-                    bomb = game_state.place_bomb(agent_player)
-            
-            # Teacher action
-            teacher_action = teacher.update(0.1, game_state)
-            if teacher_action:
-                t_dx, t_dy, t_bomb = teacher_action
-                enemy_player.move(t_dx, t_dy, game_state.grid, TILE_SIZE, game_state)
-                
-                if t_bomb and enemy_player.active_bombs < enemy_player.max_bombs:
-                    game_state.place_bomb(enemy_player)
-            
-            # Update game state
-            game_state.update(0.1)
-            
-            # Calculate reward
-            curr_state = save_state(game_state, agent_player, enemy_player)
-            reward = calculate_reward(prev_state, curr_state, action, agent_player, enemy_player, game_state)
-            total_reward += reward
-            
-            # Store experience
-            done = not agent_player.alive or not enemy_player.alive
-            agent.store_reward(reward, done)
-            
-            prev_state = curr_state
-            steps += 1
-        
-        # Update policy
-        agent.update_policy()
-        
-        # Statistics
-        total_rewards.append(total_reward)
-        if agent_player.alive and not enemy_player.alive:
-            wins += 1
-        elif not agent_player.alive:
-            losses += 1
-        
-        # Progress
-        if (episode + 1) % 50 == 0:
-            avg_reward = np.mean(total_rewards[-50:])
-            win_rate = (wins / (episode + 1)) * 100
-            elapsed = time.time() - start_time
-            
-            print(f"Episode {episode + 1}/{BOOTSTRAP_EPISODES} | "
-                  f"Avg Reward: {avg_reward:.2f} | "
-                  f"Win Rate: {win_rate:.1f}% | "
-                  f"Time: {elapsed:.0f}s")
+    total_rewards = [result.reward for result in results]
+    wins = sum(result.won for result in results)
+    losses = sum(result.lost for result in results)
     
     # Save model
     print()
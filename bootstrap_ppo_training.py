@@ -4,6 +4,7 @@ Bootstrap PPO Training with Heuristic Agent.
 Pre-trains PPO agent by imitating the improved heuristic agent.
 """
 
+import argparse
 import torch
 import torch.nn as nn
 import torch.optim as optim
@@ -12,118 +13,71 @@ from pathlib import Path
 import json
 from datetime import datetime
 
-from bomber_game.game_state import GameState
-from bomber_game.heuristics_improved import ImprovedHeuristicAgent
-from bomber_game.agents.ppo_agent_optimized import OptimizedPPOAgent, OptimizedActorCritic
-from bomber_game import GRID_SIZE, GREEN, RED
+from bomber_game.agents.ppo_agent_optimized import OptimizedActorCritic
+from bomber_game.demonstrations import DemoDataset, collect_demonstrations, count_episodes
 
 
-def collect_heuristic_demonstrations(num_episodes=100):
+DATASET_DIR = "bomber_game/models/demonstrations"
+
+
+def collect_heuristic_demonstrations(num_episodes=100, num_workers=None):
     """
     Collect demonstration data from heuristic agent.
-    Returns: list of (state, action) pairs
+    
+    Games are played by worker processes that append fixed-width records to
+    the memory-mapped dataset in DATASET_DIR. The dataset is kept between
+    runs; only the episodes it is missing are played.
+    
+    Returns: DemoDataset of (state, action) records
     """
     print(f"🎓 Collecting {num_episodes} demonstrations from heuristic agent...")
     
-    demonstrations = []
-    
-    for episode in range(num_episodes):
-        # Create game state
-        game_state = GameState(GRID_SIZE)
-        player1 = game_state.add_player(1, 1, GREEN, "Player")
-        player2 = game_state.add_player(GRID_SIZE - 2, GRID_SIZE - 2, RED, "AI")
-        
-        # Create heuristic agent
-        heuristic_agent = ImprovedHeuristicAgent(player2)
-        
-        # Run episode
-        steps = 0
-        max_steps = 500
-        
-        while not game_state.game_over and steps < max_steps:
-            # Get heuristic action
-            action = heuristic_agent.update(0.016, game_state)  # 60 FPS
-            
-            if action and player2.alive:
-                dx, dy, place_bomb = action
-                
-                # Get state before action
-                state = heuristic_agent._get_state_representation(game_state)
-                
-                # Convert action to discrete action index
-                # 0-3: move directions, 4: place bomb
-                if place_bomb:
-                    action_idx = 4
-                elif dx == -1:
-                    action_idx = 0  # Left
-                elif dx == 1:
-                    action_idx = 1  # Right
-                elif dy == -1:
-                    action_idx = 2  # Up
-                elif dy == 1:
-                    action_idx = 3  # Down
-                else:
-                    action_idx = 5  # No action
-                
-                demonstrations.append((state, action_idx))
-                
-                # Execute action
-                player2.move(dx, dy, game_state.grid, 32, game_state)
-                if place_bomb:
-                    game_state.place_bomb(player2)
-            
-            # Update game state
-            game_state.update(0.016)
-            steps += 1
-        
-        if (episode + 1) % 10 == 0:
-            print(f"  Collected {episode + 1}/{num_episodes} episodes ({len(demonstrations)} samples)")
+    missing = num_episodes - count_episodes(DATASET_DIR)
+    if missing <= 0:
+        dataset = DemoDataset(DATASET_DIR)
+    else:
+        dataset = collect_demonstrations(DATASET_DIR, missing, num_workers=num_workers,
+                                         max_steps=500, dt=0.016)  # 60 FPS
     
-    print(f"✅ Collected {len(demonstrations)} demonstration samples")
-    return demonstrations
+    print(f"✅ Collected {len(dataset)} demonstration samples")
+    return dataset
 
 
-def train_with_behavioral_cloning(demonstrations, epochs=50, batch_size=64):
+def train_with_behavioral_cloning(dataset, epochs=50, batch_size=64):
     """
     Train PPO agent using behavioral cloning on heuristic demonstrations.
+    
+    Shuffled minibatches are streamed from the memory-mapped dataset, so
+    it does not need to fit in memory.
     """
     print(f"\n🎯 Training PPO agent with behavioral cloning...")
     print(f"  Epochs: {epochs}")
     print(f"  Batch size: {batch_size}")
-    print(f"  Samples: {len(demonstrations)}")
+    print(f"  Samples: {len(dataset)}")
     
     # Create PPO agent
-    state_size = len(demonstrations[0][0])
-    action_size = 6  # 4 directions + bomb + no action
+    state_size = dataset.state_size
+    action_size = dataset.action_size  # 4 directions + bomb + no action
     
     model = OptimizedActorCritic(state_size, action_size)
     optimizer = optim.Adam(model.parameters(), lr=3e-4)
     criterion = nn.CrossEntropyLoss()
     
-    # Convert demonstrations to tensors
-    states = torch.FloatTensor([d[0] for d in demonstrations])
-    actions = torch.LongTensor([d[1] for d in demonstrations])
-    
     # Training loop
     best_loss = float('inf')
+    rng = np.random.default_rng()
     
     for epoch in range(epochs):
         total_loss = 0
         num_batches = 0
         
-        # Shuffle data
-        indices = torch.randperm(len(demonstrations))
-        
-        for i in range(0, len(demonstrations), batch_size):
-            batch_indices = indices[i:i+batch_size]
-            batch_states = states[batch_indices]
-            batch_actions = actions[batch_indices]
-            
+        # Shuffled minibatches straight from disk
+        for batch_states, batch_actions in dataset.batches(batch_size, rng=rng):
             # Forward pass
-            action_probs, _ = model(batch_states)
+            action_probs, _ = model(torch.from_numpy(batch_states))
             
             # Compute loss
-            loss = criterion(action_probs, batch_actions)
+            loss = criterion(action_probs, torch.from_numpy(batch_actions))
             
             # Backward pass
             optimizer.zero_grad()
@@ -184,20 +138,33 @@ def create_bootstrap_metadata(output_path="bomber_game/models/bootstrap_metadata
 
 def main():
     """Main bootstrap training pipeline."""
+    parser = argparse.ArgumentParser(description='Bootstrap PPO with heuristic demonstrations')
+    parser.add_argument('--episodes', type=int, default=100,
+                        help='Demonstration episodes in the dataset (default: 100)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processes collecting demonstrations, 0 for none (default: CPU count)')
+    parser.add_argument('--epochs', type=int, default=50,
+                        help='Behavioral cloning epochs (default: 50)')
+    parser.add_argument('--batch-size', type=int, default=64,
+                        help='Minibatch size (default: 64)')
+    args = parser.parse_args()
+    
     print("=" * 70)
     print("🚀 PPO BOOTSTRAP TRAINING WITH HEURISTIC AGENT")
     print("=" * 70)
     print()
     
     # Step 1: Collect demonstrations
-    demonstrations = collect_heuristic_demonstrations(num_episodes=100)
+    demonstrations = collect_heuristic_demonstrations(num_episodes=args.episodes,
+                                                      num_workers=args.workers)
     
     if len(demonstrations) == 0:
         print("❌ No demonstrations collected. Exiting.")
         return
     
     # Step 2: Train with behavioral cloning
-    model = train_with_behavioral_cloning(demonstrations, epochs=50, batch_size=64)
+    model = train_with_behavioral_cloning(demonstrations, epochs=args.epochs,
+                                          batch_size=args.batch_size)
     
     # Step 3: Save model
     save_bootstrapped_model(model)
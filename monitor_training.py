@@ -19,11 +19,19 @@ except ImportError:
     MATPLOTLIB_AVAILABLE = False
     print("⚠️  Matplotlib not available. Install with: pip install matplotlib")
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bomber_game.metrics_store import TrainingMetricsStore, COLUMNS, load_summary
+
 MODELS_DIR = "bomber_game/models"
 STATS_FILE = os.path.join(MODELS_DIR, "training_stats.json")
 PROGRESS_FILE = os.path.join(MODELS_DIR, "overnight_progress.json")
 PLOTS_DIR = os.path.join(MODELS_DIR, "plots")
 
+# Metric rows read so far; each refresh only reads the rows added since
+metrics = TrainingMetricsStore(STATS_FILE)
+series = {column: [] for column in COLUMNS}
+
 
 def ensure_directories():
     """Create necessary directories."""
@@ -31,15 +39,20 @@ def ensure_directories():
 
 
 def load_stats():
-    """Load training statistics."""
-    if not os.path.exists(STATS_FILE):
-        return None
-    
+    """Load the training summary plus metric rows added since the last call."""
     try:
-        with open(STATS_FILE, 'r') as f:
-            return json.load(f)
+        stats = load_summary(STATS_FILE)
     except:
         return None
+    if stats is None:
+        return None
+    
+    for column in COLUMNS:
+        if metrics.row_count(column) < len(series[column]):
+            series[column] = []  # Columns were reset (new training run)
+        series[column].extend(metrics.read(column, len(series[column])).tolist())
+        stats[column] = series[column]
+    return stats
 
 
 def load_progress():
@@ -233,12 +246,12 @@ def print_summary():
         overall_win_rate = (stats['total_wins'] / stats['total_episodes']) * 100
         print(f"📈 Overall Win Rate: {overall_win_rate:.2f}%")
     
-    if stats.get('win_rates'):
-        print(f"🌟 Final Win Rate: {stats['win_rates'][-1]:.2f}%")
-        print(f"🎯 Best Win Rate: {max(stats['win_rates']):.2f}%")
+    if 'recent_win_rate' in stats:
+        print(f"🌟 Final Win Rate: {stats['recent_win_rate']:.2f}%")
+        print(f"🎯 Best Win Rate: {stats.get('best_win_rate', stats['recent_win_rate']):.2f}%")
     
-    if stats.get('avg_rewards'):
-        print(f"💎 Final Avg Reward: {stats['avg_rewards'][-1]:.2f}")
+    if 'recent_avg_reward' in stats:
+        print(f"💎 Final Avg Reward: {stats['recent_avg_reward']:.2f}")
     
     print("\n" + "=" * 80 + "\n")
     
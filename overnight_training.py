@@ -27,10 +27,15 @@ import signal
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from bomber_game import GRID_SIZE, TILE_SIZE, FPS
-from bomber_game.game_state import GameState
+from bomber_game import FPS
 from bomber_game.agents import PPOAgent
 from bomber_game.heuristics_improved import ImprovedHeuristicAgent
+from bomber_game.metrics_store import TrainingMetricsStore
+from bomber_game.checkpoint_writer import CheckpointWriter, LATEST_NAME
+from bomber_game.trainer import (Trainer, TrainerSink, PPOLearner, AsyncPPOLearner,
+                                 AsyncBackend, make_backend)
+from bomber_game.demonstrations import DemoDataset, collect_demonstrations, count_episodes
+from bomber_game.league import League
 
 # ============================================================================
 # TRAINING CONFIGURATION
@@ -41,12 +46,24 @@ TOTAL_EPISODES = 10000
 MAX_STEPS_PER_EPISODE = 500
 TRAINING_HOURS = 8
 
+# Game backend (see bomber_game/trainer.py)
+NUM_ENVS = 1     # Games stepped together (per worker)
+NUM_WORKERS = 0  # Worker processes playing games (0: play in this process)
+ASYNC_ACTORS = 0  # Asynchronous actor processes with V-trace learning (0: synchronous)
+UNROLL_LENGTH = 128  # Longest trajectory segment actors send in asynchronous mode
+
+# Self-play league (see bomber_game/league.py)
+LEAGUE = False  # Train against frozen past policies and all heuristics instead of one heuristic
+LEAGUE_SNAPSHOT_INTERVAL = 500  # Freeze the policy into the league every N episodes
+LEAGUE_MAX_SNAPSHOTS = 10  # Frozen policies kept in the league
+
 # Bootstrap settings
 BOOTSTRAP_EPISODES = 100  # Number of heuristic demonstrations to collect
 BOOTSTRAP_EPOCHS = 50     # Epochs for behavioral cloning
 BOOTSTRAP_BATCH_SIZE = 64 # Batch size for bootstrap training
+BOOTSTRAP_WORKERS = None  # Processes collecting demonstrations (None: CPU count)
 
-# PPO Hyperparameters (optimized for overnight training)
+# PPO Hyperparameters (optimized for overnight training; sweep_hyperparameters.py searches them)
 UPDATE_INTERVAL = 4096  # Update every N steps (larger for stability)
 BATCH_SIZE = 128
 EPOCHS_PER_UPDATE = 10
@@ -61,6 +78,10 @@ CHECKPOINT_INTERVAL = 100  # Save every N episodes
 AUTOSAVE_INTERVAL = 30 * 60  # Save every 30 minutes (in seconds)
 MODELS_DIR = "bomber_game/models"
 CHECKPOINT_DIR = os.path.join(MODELS_DIR, "checkpoints")
+KEEP_LAST_CHECKPOINTS = 5  # Most recent checkpoints kept on disk
+KEEP_BEST_CHECKPOINTS = 3  # Best win-rate checkpoints kept on disk
+BOOTSTRAP_DATASET_DIR = os.path.join(MODELS_DIR, "demonstrations")  # Reused between runs
+LEAGUE_DIR = os.path.join(MODELS_DIR, "league")
 
 # Logging
 LOG_INTERVAL = 10  # Log every N episodes
@@ -81,14 +102,17 @@ training_start_time = None
 last_autosave_time = None
 best_win_rate = 0.0
 episodes_without_improvement = 0
-should_stop = False
+metrics = TrainingMetricsStore(STATS_FILE)
+checkpoint_writer = None  # CheckpointWriter, created by train_overnight
+active_trainer = None  # Trainer, created by train_overnight
+league = None  # League, created by train_overnight in league mode
 
 
 def signal_handler(sig, frame):
     """Handle Ctrl+C gracefully."""
-    global should_stop
     print("\n\n🛑 Training interrupted by user. Saving checkpoint...")
-    should_stop = True
+    if active_trainer is not None:
+        active_trainer.stop()
 
 
 signal.signal(signal.SIGINT, signal_handler)
@@ -128,33 +152,22 @@ def load_or_create_stats():
         'total_episodes': 0,
         'total_wins': 0,
         'total_rewards': 0,
-        'episode_rewards': [],
-        'win_rates': [],
-        'avg_rewards': [],
+        'recent_win_rate': 0,
+        'recent_avg_reward': 0,
         'training_start': datetime.now().isoformat(),
         'total_training_time': 0
     }
     
-    if os.path.exists(STATS_FILE):
-        try:
-            with open(STATS_FILE, 'r') as f:
-                stats = json.load(f)
-                # Ensure all keys exist (merge with defaults)
-                for key, value in default_stats.items():
-                    if key not in stats:
-                        stats[key] = value
-                log_message(f"📊 Loaded existing stats: {stats.get('total_episodes', 0)} episodes")
-                return stats
-        except:
-            pass
-    
-    return default_stats
+    # Per-episode series are appended to metric columns, not kept in stats
+    stats = metrics.load(default_stats)
+    if stats['total_episodes'] > 0:
+        log_message(f"📊 Loaded existing stats: {stats['total_episodes']} episodes")
+    return stats
 
 
 def save_stats(stats):
-    """Save training statistics."""
-    with open(STATS_FILE, 'w') as f:
-        json.dump(stats, f, indent=2)
+    """Save training statistics (new metric rows plus the summary)."""
+    metrics.save(stats)
 
 
 def save_progress(episode, stats, elapsed_time):
@@ -162,8 +175,8 @@ def save_progress(episode, stats, elapsed_time):
     progress = {
         'episode': episode,
         'total_episodes': stats['total_episodes'],
-        'win_rate': stats['win_rates'][-1] if stats['win_rates'] else 0,
-        'avg_reward': stats['avg_rewards'][-1] if stats['avg_rewards'] else 0,
+        'win_rate': stats['recent_win_rate'],
+        'avg_reward': stats['recent_avg_reward'],
         'elapsed_hours': elapsed_time / 3600,
         'episodes_per_hour': episode / (elapsed_time / 3600) if elapsed_time > 0 else 0,
         'timestamp': datetime.now().isoformat(),
@@ -175,148 +188,21 @@ def save_progress(episode, stats, elapsed_time):
 
 
 def save_checkpoint(agent, episode, stats, checkpoint_type="auto"):
-    """Save training checkpoint."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    checkpoint_name = f"checkpoint_ep{episode}_{checkpoint_type}_{timestamp}.pth"
-    checkpoint_path = os.path.join(CHECKPOINT_DIR, checkpoint_name)
-    
-    agent.save_model(checkpoint_path)
-    
-    # Also save as latest
-    latest_path = os.path.join(CHECKPOINT_DIR, "latest_checkpoint.pth")
-    agent.save_model(latest_path)
-    
-    # Save checkpoint metadata
-    metadata = {
-        'episode': episode,
-        'stats': stats,
-        'timestamp': timestamp,
-        'checkpoint_type': checkpoint_type
-    }
-    metadata_path = checkpoint_path.replace('.pth', '_metadata.json')
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
-    
-    log_message(f"💾 Checkpoint saved: {checkpoint_name}")
+    """Queue a training checkpoint (written in the background, also as latest)."""
+    checkpoint_writer.save_checkpoint(agent.checkpoint_state(), episode, checkpoint_type,
+                                      score=stats.get('recent_win_rate'),
+                                      metadata={'stats': stats})
+    log_message(f"💾 Checkpoint queued: episode {episode} ({checkpoint_type})")
 
 
 def find_latest_checkpoint():
     """Find the most recent checkpoint to resume from."""
-    latest_path = os.path.join(CHECKPOINT_DIR, "latest_checkpoint.pth")
+    latest_path = os.path.join(CHECKPOINT_DIR, LATEST_NAME)
     if os.path.exists(latest_path):
         return latest_path
     return None
 
 
-def calculate_reward(game_state, agent_player, enemy_player, prev_state, action):
-    """
-    Enhanced reward function for overnight training.
-    Balanced to encourage both aggressive and defensive play.
-    """
-    reward = 0
-    
-    # Terminal rewards
-    if not agent_player.alive:
-        return -200  # Lost
-    if not enemy_player.alive:
-        return +200  # Won
-    
-    # Step penalty (encourage efficiency)
-    reward -= 0.5
-    
-    # Reward for destroying walls
-    if prev_state:
-        prev_walls = sum(row.count(2) for row in prev_state['grid'])
-        curr_walls = sum(row.count(2) for row in game_state.grid)
-        if curr_walls < prev_walls:
-            reward += 20 * (prev_walls - curr_walls)
-    
-    # Reward for collecting power-ups
-    if prev_state and len(game_state.powerups) < prev_state['powerups']:
-        reward += 15
-    
-    # Strategic positioning reward
-    if prev_state:
-        prev_dist = abs(prev_state['player_x'] - prev_state['enemy_x']) + \
-                   abs(prev_state['player_y'] - prev_state['enemy_y'])
-        curr_dist = abs(agent_player.grid_x - enemy_player.grid_x) + \
-                   abs(agent_player.grid_y - enemy_player.grid_y)
-        
-        # Reward for optimal distance (not too close, not too far)
-        if 3 <= curr_dist <= 5:
-            reward += 3
-        elif curr_dist < prev_dist and curr_dist > 2:
-            reward += 5
-        elif curr_dist > prev_dist and curr_dist > 6:
-            reward -= 3
-    
-    # Bomb placement rewards
-    dx, dy, place_bomb = action
-    if place_bomb:
-        dist_to_enemy = abs(agent_player.grid_x - enemy_player.grid_x) + \
-                       abs(agent_player.grid_y - enemy_player.grid_y)
-        
-        # Reward for strategic bomb placement
-        if 2 <= dist_to_enemy <= 4:
-            reward += 20
-        elif dist_to_enemy <= 1:
-            reward -= 15  # Too close, dangerous
-        
-        # Check if bomb placement is safe
-        if has_escape_route(game_state, agent_player):
-            reward += 10
-        else:
-            reward -= 25  # Dangerous placement
-    
-    # Survival bonus
-    if prev_state and prev_state.get('in_danger', False):
-        if not is_in_danger(game_state, agent_player):
-            reward += 30
-    
-    return reward
-
-
-def has_escape_route(game_state, player):
-    """Check if player has a safe escape route."""
-    px, py = player.grid_x, player.grid_y
-    
-    # Check adjacent cells
-    for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-        nx, ny = px + dx, py + dy
-        if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
-            if game_state.grid[ny][nx] == 0:  # Empty cell
-                return True
-    return False
-
-
-def is_in_danger(game_state, player):
-    """Check if player is in danger from explosions."""
-    px, py = player.grid_x, player.grid_y
-    
-    # Check for nearby bombs
-    for bomb in game_state.bombs:
-        bx, by = bomb.grid_x, bomb.grid_y
-        if px == bx and abs(py - by) <= bomb.bomb_range:
-            return True
-        if py == by and abs(px - bx) <= bomb.bomb_range:
-            return True
-    
-    return False
-
-
-def get_state_dict(game_state, player, enemy):
-    """Get state dictionary for tracking."""
-    return {
-        'grid': [row[:] for row in game_state.grid],
-        'player_x': player.grid_x,
-        'player_y': player.grid_y,
-        'enemy_x': enemy.grid_x,
-        'enemy_y': enemy.grid_y,
-        'powerups': len(game_state.powerups),
-        'in_danger': is_in_danger(game_state, player)
-    }
-
-
 def print_training_header():
     """Print training session header."""
     print("\n" + "=" * 80)
@@ -333,8 +219,8 @@ def print_training_header():
 
 def print_progress(episode, stats, elapsed_time, eta):
     """Print training progress."""
-    win_rate = stats['win_rates'][-1] if stats['win_rates'] else 0
-    avg_reward = stats['avg_rewards'][-1] if stats['avg_rewards'] else 0
+    win_rate = stats['recent_win_rate']
+    avg_reward = stats['recent_avg_reward']
     episodes_per_hour = episode / (elapsed_time / 3600) if elapsed_time > 0 else 0
     
     print(f"\n{'=' * 80}")
@@ -345,21 +231,134 @@ def print_progress(episode, stats, elapsed_time, eta):
     print(f"⏱️  Elapsed: {timedelta(seconds=int(elapsed_time))}")
     print(f"⏳ ETA: {timedelta(seconds=int(eta))}")
     print(f"⚡ Speed: {episodes_per_hour:.1f} episodes/hour")
+    print(f"⏱️  Reward: {active_trainer.mean_reward_time():.1f} µs/step")
+    learner_stats = active_trainer.learner_stats()
+    print(f"🧠 Learner: {learner_stats['utilisation'] * 100:.0f}% busy, "
+          f"{learner_stats['samples_per_second']:.0f} samples/s, "
+          f"policy lag {learner_stats['policy_lag']:.2f} updates")
+    if league is not None:
+        print(f"🏟️  League ({len(league.opponents)} opponents):")
+        for name, games, opponent_win_rate, probability in league.summary():
+            print(f"   {name:<20} {games:>6} games  {opponent_win_rate * 100:5.1f}% won  "
+                  f"picked {probability * 100:4.1f}%")
     print(f"🌟 Best Win Rate: {best_win_rate:.2f}%")
     print(f"{'=' * 80}\n")
 
 
+def configure_agent(agent):
+    """Apply this script's PPO hyperparameters to the agent."""
+    agent.batch_size = BATCH_SIZE
+    agent.epochs = EPOCHS_PER_UPDATE
+    agent.clip_epsilon = CLIP_EPSILON
+    agent.gamma = GAMMA
+    agent.gae_lambda = GAE_LAMBDA
+
+
+def load_hyperparameters(path):
+    """Replace the PPO hyperparameters with a configuration file (a sweep's best_config.json)."""
+    global UPDATE_INTERVAL, BATCH_SIZE, EPOCHS_PER_UPDATE, LEARNING_RATE_START, LEARNING_RATE_END
+    global CLIP_EPSILON, GAMMA, GAE_LAMBDA
+    with open(path, 'r') as f:
+        config = json.load(f)
+    UPDATE_INTERVAL = config['update_interval']
+    BATCH_SIZE = config['batch_size']
+    EPOCHS_PER_UPDATE = config['epochs_per_update']
+    LEARNING_RATE_START = config['learning_rate_start']
+    LEARNING_RATE_END = config['learning_rate_end']
+    CLIP_EPSILON = config['clip_epsilon']
+    GAMMA = config['gamma']
+    GAE_LAMBDA = config['gae_lambda']
+
+
+class OvernightSink(TrainerSink):
+    """Stats, learning rate, logging, checkpoints and early stopping per episode."""
+    
+    def __init__(self, agent, stats):
+        self.agent = agent
+        self.stats = stats
+        self.recent_wins = deque(maxlen=PERFORMANCE_WINDOW)
+        self.recent_rewards = deque(maxlen=PERFORMANCE_WINDOW)
+    
+    def on_episode(self, trainer, result):
+        global last_autosave_time, best_win_rate, episodes_without_improvement
+        agent, stats, episode = self.agent, self.stats, result.episode
+        
+        # Record results
+        self.recent_wins.append(1 if result.won else 0)
+        self.recent_rewards.append(result.reward)
+        
+        # Update stats
+        stats['total_episodes'] = episode
+        stats['total_wins'] += 1 if result.won else 0
+        stats['total_rewards'] += result.reward
+        metrics.append('episode_rewards', result.reward)
+        
+        # Calculate metrics
+        if len(self.recent_wins) >= PERFORMANCE_WINDOW:
+            win_rate = sum(self.recent_wins) / len(self.recent_wins) * 100
+            avg_reward = sum(self.recent_rewards) / len(self.recent_rewards)
+            metrics.append('win_rates', win_rate)
+            metrics.append('avg_rewards', avg_reward)
+            stats['recent_win_rate'] = win_rate
+            stats['recent_avg_reward'] = avg_reward
+            stats['best_win_rate'] = max(stats.get('best_win_rate', 0), win_rate)
+            
+            # Check for improvement
+            if win_rate > best_win_rate + MIN_WIN_RATE_IMPROVEMENT:
+                best_win_rate = win_rate
+                episodes_without_improvement = 0
+                save_checkpoint(agent, episode, stats, "best")
+            else:
+                episodes_without_improvement += 1
+        
+        # Update learning rate
+        if hasattr(agent, 'set_learning_rate'):
+            lr = get_learning_rate(episode, TOTAL_EPISODES)
+            agent.set_learning_rate(lr)
+        
+        # Periodic logging
+        if episode % LOG_INTERVAL == 0:
+            elapsed = time.time() - training_start_time
+            remaining_episodes = TOTAL_EPISODES - episode
+            eta = (elapsed / episode) * remaining_episodes if episode > 0 else 0
+            print_progress(episode, stats, elapsed, eta)
+            save_progress(episode, stats, elapsed)
+        
+        # Checkpointing
+        if episode % CHECKPOINT_INTERVAL == 0:
+            save_checkpoint(agent, episode, stats, "periodic")
+            save_stats(stats)
+        
+        # Autosave (time-based)
+        current_time = time.time()
+        if current_time - last_autosave_time > AUTOSAVE_INTERVAL:
+            save_checkpoint(agent, episode, stats, "autosave")
+            save_stats(stats)
+            last_autosave_time = current_time
+        
+        # Early stopping check
+        if episodes_without_improvement >= PLATEAU_THRESHOLD:
+            log_message(f"⚠️  Performance plateau detected ({PLATEAU_THRESHOLD} episodes without improvement)")
+            log_message(f"   Best win rate: {best_win_rate:.2f}%")
+            trainer.stop()
+
+
 # ============================================================================
 # MAIN TRAINING LOOP
 # ============================================================================
 
-def bootstrap_with_heuristics(num_episodes=BOOTSTRAP_EPISODES, epochs=BOOTSTRAP_EPOCHS, batch_size=BOOTSTRAP_BATCH_SIZE):
+def bootstrap_with_heuristics(num_episodes=None, epochs=None, batch_size=None):
     """
     Bootstrap PPO agent with heuristic demonstrations.
     Uses behavioral cloning to pre-train the agent.
     
+    Demonstrations are recorded by worker processes into the memory-mapped
+    dataset in BOOTSTRAP_DATASET_DIR and kept between runs: only the
+    episodes it is missing are played, and minibatches are streamed from
+    disk.
+    
     Args:
-        num_episodes: Number of demonstration episodes to collect
+        num_episodes: Number of demonstration episodes in the dataset
         epochs: Training epochs for behavioral cloning
         batch_size: Batch size for training
     
@@ -370,79 +369,38 @@ def bootstrap_with_heuristics(num_episodes=BOOTSTRAP_EPISODES, epochs=BOOTSTRAP_
     import torch.nn as nn
     import torch.optim as optim
     
+    num_episodes = num_episodes or BOOTSTRAP_EPISODES
+    epochs = epochs or BOOTSTRAP_EPOCHS
+    batch_size = batch_size or BOOTSTRAP_BATCH_SIZE
+    
     log_message("\n" + "="*80)
     log_message("🎓 BOOTSTRAP TRAINING WITH HEURISTIC DEMONSTRATIONS")
     log_message("="*80)
-    log_message(f"Collecting {num_episodes} demonstration episodes...")
-    
-    demonstrations = []
     
     try:
-        # Collect demonstrations from heuristic agent
-        for episode in range(num_episodes):
-            game_state = GameState(GRID_SIZE)
-            player1 = game_state.add_player(1, 1, (0, 255, 0), "Player")
-            player2 = game_state.add_player(GRID_SIZE - 2, GRID_SIZE - 2, (255, 0, 0), "Heuristic")
-            
-            heuristic_agent = ImprovedHeuristicAgent(player2)
-            
-            steps = 0
-            while not game_state.game_over and steps < MAX_STEPS_PER_EPISODE:
-                if player2.alive:
-                    # Get heuristic action
-                    action = heuristic_agent.choose_action(game_state)
-                    
-                    if action:
-                        dx, dy, place_bomb = action
-                        
-                        # Get state representation (simplified for demo)
-                        state = [
-                            player2.grid_x / GRID_SIZE,
-                            player2.grid_y / GRID_SIZE,
-                            player1.grid_x / GRID_SIZE,
-                            player1.grid_y / GRID_SIZE,
-                            len(game_state.bombs) / 10.0,
-                            len(game_state.powerups) / 10.0,
-                        ]
-                        
-                        # Convert action to index
-                        if place_bomb:
-                            action_idx = 4
-                        elif dx == -1:
-                            action_idx = 0  # Left
-                        elif dx == 1:
-                            action_idx = 1  # Right
-                        elif dy == -1:
-                            action_idx = 2  # Up
-                        elif dy == 1:
-                            action_idx = 3  # Down
-                        else:
-                            action_idx = 5  # No action
-                        
-                        demonstrations.append((state, action_idx))
-                        
-                        # Execute action
-                        player2.move(dx, dy, game_state.grid, TILE_SIZE, game_state)
-                        if place_bomb:
-                            game_state.place_bomb(player2)
-                
-                game_state.update(1/FPS)
-                steps += 1
-            
-            if (episode + 1) % 10 == 0:
-                log_message(f"  Collected {episode + 1}/{num_episodes} episodes ({len(demonstrations)} samples)")
+        # Collect the missing demonstrations from heuristic agents
+        missing = num_episodes - count_episodes(BOOTSTRAP_DATASET_DIR)
+        if missing > 0:
+            log_message(f"Collecting {missing} demonstration episodes...")
+            dataset = collect_demonstrations(BOOTSTRAP_DATASET_DIR, missing,
+                                             num_workers=BOOTSTRAP_WORKERS,
+                                             max_steps=MAX_STEPS_PER_EPISODE, dt=1/FPS,
+                                             log=log_message)
+        else:
+            dataset = DemoDataset(BOOTSTRAP_DATASET_DIR)
         
-        if len(demonstrations) == 0:
+        if len(dataset) == 0:
             log_message("❌ No demonstrations collected. Skipping bootstrap.")
             return None
         
-        log_message(f"✅ Collected {len(demonstrations)} demonstration samples")
+        log_message(f"✅ Dataset has {len(dataset)} demonstration samples "
+                    f"from {dataset.episodes} episodes")
         log_message(f"\n🎯 Training with behavioral cloning...")
         log_message(f"  Epochs: {epochs}, Batch size: {batch_size}")
         
         # Create simple network for behavioral cloning
-        state_size = len(demonstrations[0][0])
-        action_size = 6
+        state_size = dataset.state_size
+        action_size = dataset.action_size
         
         # Simple actor network
         class SimpleActor(nn.Module):
@@ -463,25 +421,16 @@ def bootstrap_with_heuristics(num_episodes=BOOTSTRAP_EPISODES, epochs=BOOTSTRAP_
         optimizer = optim.Adam(model.parameters(), lr=3e-4)
         criterion = nn.CrossEntropyLoss()
         
-        # Convert to tensors
-        states = torch.FloatTensor([d[0] for d in demonstrations])
-        actions = torch.LongTensor([d[1] for d in demonstrations])
-        
-        # Training loop
+        # Training loop (shuffled minibatches streamed from the memmap)
         best_loss = float('inf')
+        rng = np.random.default_rng()
         for epoch in range(epochs):
             total_loss = 0
             num_batches = 0
             
-            indices = torch.randperm(len(demonstrations))
-            
-            for i in range(0, len(demonstrations), batch_size):
-                batch_indices = indices[i:i+batch_size]
-                batch_states = states[batch_indices]
-                batch_actions = actions[batch_indices]
-                
-                action_logits = model(batch_states)
-                loss = criterion(action_logits, batch_actions)
+            for batch_states, batch_actions in dataset.batches(batch_size, rng=rng):
+                action_logits = model(torch.from_numpy(batch_states))
+                loss = criterion(action_logits, torch.from_numpy(batch_actions))
                 
                 optimizer.zero_grad()
                 loss.backward()
@@ -506,7 +455,7 @@ def bootstrap_with_heuristics(num_episodes=BOOTSTRAP_EPISODES, epochs=BOOTSTRAP_
             'bootstrap_method': 'behavioral_cloning',
             'source': 'improved_heuristic',
             'timestamp': datetime.now().isoformat(),
-            'demonstrations': len(demonstrations),
+            'demonstrations': len(dataset),
             'best_loss': best_loss,
         }, bootstrap_path)
         log_message(f"💾 Saved bootstrapped model to {bootstrap_path}")
@@ -527,7 +476,7 @@ def train_overnight(use_bootstrap=False):
         use_bootstrap: If True, pre-train agent with heuristic demonstrations
     """
     global training_start_time, last_autosave_time, best_win_rate
-    global episodes_without_improvement, should_stop
+    global episodes_without_improvement, checkpoint_writer, active_trainer, league
     
     ensure_directories()
     print_training_header()
@@ -547,157 +496,77 @@ def train_overnight(use_bootstrap=False):
     training_start_time = time.time()
     last_autosave_time = training_start_time
     
+    # Checkpoints are written on a background thread with bounded retention
+    checkpoint_writer = CheckpointWriter(CHECKPOINT_DIR, keep_last=KEEP_LAST_CHECKPOINTS,
+                                         keep_best=KEEP_BEST_CHECKPOINTS)
+    
     # Load or create stats
     stats = load_or_create_stats()
     start_episode = stats['total_episodes']
     
-    # Create game state
-    game_state = GameState(GRID_SIZE)
-    agent_player = game_state.add_player(1, 1, (0, 255, 0), "PPO Agent")
-    enemy_player = game_state.add_player(GRID_SIZE - 2, GRID_SIZE - 2, (255, 0, 0), "Heuristic")
-    
-    # Create agents
+    # Create agent
     checkpoint_path = find_latest_checkpoint()
     if checkpoint_path and start_episode > 0:
         log_message(f"📂 Resuming from checkpoint: {checkpoint_path}")
-        agent = PPOAgent(agent_player, model_path=checkpoint_path, training=True)
+        agent = PPOAgent(None, model_path=checkpoint_path, training=True)
     elif bootstrap_model_path:
         log_message(f"🎓 Starting with bootstrapped model: {bootstrap_model_path}")
-        agent = PPOAgent(agent_player, model_path=bootstrap_model_path, training=True)
+        agent = PPOAgent(None, model_path=bootstrap_model_path, training=True)
     else:
         log_message("🆕 Starting fresh training")
-        agent = PPOAgent(agent_player, training=True)
-    
-    enemy_agent = ImprovedHeuristicAgent(enemy_player)
+        agent = PPOAgent(None, training=True)
+    configure_agent(agent)
     
-    # Training metrics
-    recent_wins = deque(maxlen=PERFORMANCE_WINDOW)
-    recent_rewards = deque(maxlen=PERFORMANCE_WINDOW)
-    
-    # Main training loop
-    episode = start_episode  # Initialize episode variable
-    for episode in range(start_episode + 1, TOTAL_EPISODES + 1):
-        # Check time limit
-        elapsed_time = time.time() - training_start_time
-        if elapsed_time > TRAINING_HOURS * 3600:
+    # Episodes run on the shared trainer; this script only adds its bookkeeping
+    if ASYNC_ACTORS:
+        learner = AsyncPPOLearner(agent, update_interval=UPDATE_INTERVAL, unroll_length=UNROLL_LENGTH)
+        backend = AsyncBackend(ASYNC_ACTORS, envs_per_actor=NUM_ENVS)
+    else:
+        learner = PPOLearner(agent, update_interval=UPDATE_INTERVAL)
+        backend = make_backend(NUM_ENVS, NUM_WORKERS)
+    sinks = [OvernightSink(agent, stats)]
+    if LEAGUE:
+        # Opponents are picked per game by prioritized fictitious self-play
+        league = League(LEAGUE_DIR, snapshot_interval=LEAGUE_SNAPSHOT_INTERVAL,
+                        max_snapshots=LEAGUE_MAX_SNAPSHOTS)
+        log_message(f"🏟️  League: {len(league.opponents)} opponents "
+                    f"({len(league.snapshots())} frozen policies)")
+        opponent, names = league.opponent_factory(), ("PPO Agent", "League")
+        sinks.append(league)
+    else:
+        opponent, names = ImprovedHeuristicAgent, ("PPO Agent", "Heuristic")
+    trainer = Trainer(
+        learner,
+        opponent,
+        backend=backend,
+        sinks=sinks,
+        max_steps=MAX_STEPS_PER_EPISODE,
+        dt=1/FPS,
+        names=names,
+        start_episode=start_episode,
+        matchmaker=league,
+    )
+    active_trainer = trainer
+    try:
+        try:
+            trainer.run(TOTAL_EPISODES - start_episode, max_seconds=TRAINING_HOURS * 3600)
+        finally:
+            trainer.close()
+        episode = trainer.episode
+        if trainer.elapsed() >= TRAINING_HOURS * 3600:
             log_message(f"⏰ Time limit reached ({TRAINING_HOURS} hours)")
-            break
-        
-        if should_stop:
-            break
-        
-        # Reset game - recreate game state for fresh episode
-        game_state = GameState(GRID_SIZE)
-        agent_player = game_state.add_player(1, 1, (0, 255, 0), "PPO Agent")
-        enemy_player = game_state.add_player(GRID_SIZE - 2, GRID_SIZE - 2, (255, 0, 0), "Heuristic")
-        
-        # Reset agent references
-        agent.player = agent_player
-        enemy_agent.player = enemy_player
-        
-        episode_reward = 0
-        prev_state = None
-        
-        # Episode loop
-        for step in range(MAX_STEPS_PER_EPISODE):
-            # Get current state
-            curr_state = get_state_dict(game_state, agent_player, enemy_player)
-            
-            # Agent actions
-            agent_action = agent.choose_action(game_state)
-            enemy_action = enemy_agent.choose_action(game_state)
-            
-            # Execute actions
-            agent_player.move(*agent_action[:2], game_state.grid, TILE_SIZE, game_state)
-            if agent_action[2]:
-                game_state.place_bomb(agent_player)
-            
-            enemy_player.move(*enemy_action[:2], game_state.grid, TILE_SIZE, game_state)
-            if enemy_action[2]:
-                game_state.place_bomb(enemy_player)
-            
-            # Update game
-            game_state.update(1/FPS)  # dt = 1/FPS for consistent timing
-            
-            # Calculate reward
-            reward = calculate_reward(game_state, agent_player, enemy_player, prev_state, agent_action)
-            episode_reward += reward
-            
-            # Store experience (if agent supports it)
-            if hasattr(agent, 'store_experience'):
-                agent.store_experience(curr_state, agent_action, reward, not agent_player.alive or not enemy_player.alive)
-            
-            prev_state = curr_state
-            
-            # Check if episode ended
-            if not agent_player.alive or not enemy_player.alive:
-                break
-        
-        # Record results
-        won = not enemy_player.alive and agent_player.alive
-        recent_wins.append(1 if won else 0)
-        recent_rewards.append(episode_reward)
-        
-        # Update stats
-        stats['total_episodes'] = episode
-        stats['total_wins'] += 1 if won else 0
-        stats['total_rewards'] += episode_reward
-        stats['episode_rewards'].append(episode_reward)
-        
-        # Calculate metrics
-        if len(recent_wins) >= PERFORMANCE_WINDOW:
-            win_rate = sum(recent_wins) / len(recent_wins) * 100
-            avg_reward = sum(recent_rewards) / len(recent_rewards)
-            stats['win_rates'].append(win_rate)
-            stats['avg_rewards'].append(avg_reward)
-            
-            # Check for improvement
-            if win_rate > best_win_rate + MIN_WIN_RATE_IMPROVEMENT:
-                best_win_rate = win_rate
-                episodes_without_improvement = 0
-                save_checkpoint(agent, episode, stats, "best")
-            else:
-                episodes_without_improvement += 1
         
-        # Update learning rate
-        if hasattr(agent, 'set_learning_rate'):
-            lr = get_learning_rate(episode, TOTAL_EPISODES)
-            agent.set_learning_rate(lr)
+        # Final save
+        log_message("\n🏁 Training completed!")
+        save_checkpoint(agent, episode, stats, "final")
+        save_stats(stats)
         
-        # Periodic logging
-        if episode % LOG_INTERVAL == 0:
-            elapsed = time.time() - training_start_time
-            remaining_episodes = TOTAL_EPISODES - episode
-            eta = (elapsed / episode) * remaining_episodes if episode > 0 else 0
-            print_progress(episode, stats, elapsed, eta)
-            save_progress(episode, stats, elapsed)
-        
-        # Checkpointing
-        if episode % CHECKPOINT_INTERVAL == 0:
-            save_checkpoint(agent, episode, stats, "periodic")
-            save_stats(stats)
-        
-        # Autosave (time-based)
-        current_time = time.time()
-        if current_time - last_autosave_time > AUTOSAVE_INTERVAL:
-            save_checkpoint(agent, episode, stats, "autosave")
-            save_stats(stats)
-            last_autosave_time = current_time
-        
-        # Early stopping check
-        if episodes_without_improvement >= PLATEAU_THRESHOLD:
-            log_message(f"⚠️  Performance plateau detected ({PLATEAU_THRESHOLD} episodes without improvement)")
-            log_message(f"   Best win rate: {best_win_rate:.2f}%")
-            break
-    
-    # Final save
-    log_message("\n🏁 Training completed!")
-    save_checkpoint(agent, episode, stats, "final")
-    save_stats(stats)
-    
-    # Save final model
-    final_model_path = os.path.join(MODELS_DIR, "ppo_agent.pth")
-    agent.save_model(final_model_path)
+        # Save final model
+        final_model_path = os.path.join(MODELS_DIR, "ppo_agent.pth")
+        checkpoint_writer.save_file(agent.checkpoint_state(), final_model_path)
+    finally:
+        # Also on errors: the writer thread is a daemon, queued checkpoints would be lost
+        checkpoint_writer.close()
     log_message(f"💾 Final model saved: {final_model_path}")
     
     # Print summary
@@ -707,9 +576,9 @@ def train_overnight(use_bootstrap=False):
     print("=" * 80)
     print(f"✅ Episodes Completed: {episode:,}")
     print(f"⏱️  Total Time: {timedelta(seconds=int(total_time))}")
-    print(f"🏆 Final Win Rate: {stats['win_rates'][-1] if stats['win_rates'] else 0:.2f}%")
+    print(f"🏆 Final Win Rate: {stats['recent_win_rate']:.2f}%")
     print(f"🌟 Best Win Rate: {best_win_rate:.2f}%")
-    print(f"💰 Avg Reward: {stats['avg_rewards'][-1] if stats['avg_rewards'] else 0:.2f}")
+    print(f"💰 Avg Reward: {stats['recent_avg_reward']:.2f}")
     print(f"📈 Total Wins: {stats['total_wins']:,}")
     print("=" * 80 + "\n")
 
@@ -723,13 +592,36 @@ if __name__ == "__main__":
                        help=f'Number of demonstration episodes (default: {BOOTSTRAP_EPISODES})')
     parser.add_argument('--bootstrap-epochs', type=int, default=BOOTSTRAP_EPOCHS,
                        help=f'Training epochs for behavioral cloning (default: {BOOTSTRAP_EPOCHS})')
+    parser.add_argument('--bootstrap-workers', type=int, default=BOOTSTRAP_WORKERS,
+                       help='Processes collecting demonstrations, 0 for none (default: CPU count)')
+    parser.add_argument('--envs', type=int, default=NUM_ENVS,
+                       help=f'Games stepped together per process (default: {NUM_ENVS})')
+    parser.add_argument('--workers', type=int, default=NUM_WORKERS,
+                       help=f'Worker processes playing games, 0 for none (default: {NUM_WORKERS})')
+    parser.add_argument('--async-actors', type=int, default=ASYNC_ACTORS,
+                       help='Asynchronous actor processes with V-trace learning, 0 for none '
+                            f'(default: {ASYNC_ACTORS})')
+    parser.add_argument('--league', action='store_true',
+                       help='Self-play league: frozen past policies and all heuristics as opponents')
+    parser.add_argument('--league-snapshot-interval', type=int, default=LEAGUE_SNAPSHOT_INTERVAL,
+                       help=f'Episodes between league snapshots (default: {LEAGUE_SNAPSHOT_INTERVAL})')
+    parser.add_argument('--hyperparameters', default=None,
+                       help='PPO hyperparameters file, e.g. a sweep\'s best_config.json')
     
     args = parser.parse_args()
+    NUM_ENVS = args.envs
+    NUM_WORKERS = args.workers
+    ASYNC_ACTORS = args.async_actors
+    LEAGUE = args.league
+    LEAGUE_SNAPSHOT_INTERVAL = args.league_snapshot_interval
+    if args.hyperparameters:
+        load_hyperparameters(args.hyperparameters)
     
     # Update bootstrap settings if provided
     if args.bootstrap:
         BOOTSTRAP_EPISODES = args.bootstrap_episodes
         BOOTSTRAP_EPOCHS = args.bootstrap_epochs
+        BOOTSTRAP_WORKERS = args.bootstrap_workers
     
     try:
         train_overnight(use_bootstrap=args.bootstrap)
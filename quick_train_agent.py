@@ -7,7 +7,6 @@ Trains AI agent with automatic checkpointing and level progression.
 import sys
 import os
 import time
-import json
 import numpy as np
 from datetime import datetime, timedelta
 import signal
@@ -19,16 +18,18 @@ warnings.filterwarnings('ignore')
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from bomber_game import GRID_SIZE, TILE_SIZE
-from bomber_game.game_state import GameState
-from bomber_game.entities import Player
-from bomber_game.agents import PPOAgent, SimpleAgent
+from bomber_game.agents import PPOAgent
+from bomber_game.agents.simple_agent import SimpleAgent
+from bomber_game.trainer import Trainer, TrainerSink, PPOLearner, make_backend
+from bomber_game.metrics_store import TrainingMetricsStore
 
 # Training configuration
 TRAINING_DURATION = 5 * 60  # 5 minutes in seconds
 CHECKPOINT_INTERVAL = 30  # Save every 30 seconds
 STATS_FILE = "bomber_game/models/training_stats.json"
 MODEL_PATH = "bomber_game/models/ppo_agent.pth"
+NUM_ENVS = 1     # Games stepped together (see bomber_game/trainer.py)
+NUM_WORKERS = 0  # Worker processes playing games (0: play in this process)
 
 # Level thresholds
 LEVELS = [
@@ -82,6 +83,7 @@ PROGRESS_MESSAGES = {
 
 # Global flag for graceful shutdown
 training_interrupted = False
+active_trainer = None  # Trainer of the running session
 
 def signal_handler(sig, frame):
     """Handle Ctrl+C gracefully."""
@@ -89,10 +91,12 @@ def signal_handler(sig, frame):
     training_interrupted = True
     print("\n\n⚠️  Training interruption requested...")
     print("💾 Saving progress before exit...")
+    if active_trainer is not None:
+        active_trainer.stop()
 
 
 class TrainingStats:
-    """Track and persist training statistics."""
+    """Track and persist training statistics (shared training_stats.json summary)."""
     
     def __init__(self):
         self.total_episodes = 0
@@ -100,55 +104,62 @@ class TrainingStats:
         self.total_wins = 0
         self.total_losses = 0
         self.episode_rewards = []
-        self.win_rates = []
+        self.win_rates = []  # Percent, like overnight_training.py
         self.training_sessions = []
         self.current_level = "Beginner"
         self.last_updated = None
         
+        # Same store as overnight_training.py: its totals and metric columns are kept
+        self.metrics = TrainingMetricsStore(STATS_FILE)
+        self.summary = {}
+        
         self.load()
     
     def load(self):
         """Load existing stats."""
-        if os.path.exists(STATS_FILE):
-            try:
-                with open(STATS_FILE, 'r') as f:
-                    data = json.load(f)
-                    self.total_episodes = data.get('total_episodes', 0)
-                    self.total_training_time = data.get('total_training_time', 0)
-                    self.total_wins = data.get('total_wins', 0)
-                    self.total_losses = data.get('total_losses', 0)
-                    self.episode_rewards = data.get('episode_rewards', [])
-                    self.win_rates = data.get('win_rates', [])
-                    self.training_sessions = data.get('training_sessions', [])
-                    self.current_level = data.get('current_level', 'Beginner')
-                    self.last_updated = data.get('last_updated')
-                    print(f"✅ Loaded existing training stats: {self.total_episodes} episodes")
-            except Exception as e:
-                print(f"⚠️  Could not load stats: {e}")
+        try:
+            self.summary = self.metrics.load()
+        except Exception as e:
+            print(f"⚠️  Could not load stats: {e}")
+            return
+        if not self.summary:
+            return
+        self.total_episodes = self.summary.get('total_episodes', 0)
+        self.total_training_time = self.summary.get('total_training_time', 0)
+        self.total_wins = self.summary.get('total_wins', 0)
+        self.total_losses = self.summary.get('total_losses', 0)
+        self.episode_rewards = self.metrics.tail('episode_rewards', 1000).tolist()
+        self.win_rates = self.metrics.tail('win_rates', 100).tolist()
+        self.training_sessions = self.summary.get('training_sessions', [])
+        self.current_level = self.summary.get('current_level', 'Beginner')
+        self.last_updated = self.summary.get('last_updated')
+        print(f"✅ Loaded existing training stats: {self.total_episodes} episodes")
     
     def save(self):
-        """Save current stats."""
+        """Save current stats (new metric values are appended to the columns)."""
         os.makedirs(os.path.dirname(STATS_FILE), exist_ok=True)
-        data = {
+        self.summary.update({
             'total_episodes': self.total_episodes,
             'total_training_time': self.total_training_time,
             'total_wins': self.total_wins,
             'total_losses': self.total_losses,
-            'episode_rewards': self.episode_rewards[-1000:],  # Keep last 1000
-            'win_rates': self.win_rates[-100:],  # Keep last 100
             'training_sessions': self.training_sessions,
             'current_level': self.current_level,
             'last_updated': datetime.now().isoformat(),
-        }
-        with open(STATS_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        })
+        if self.win_rates:
+            self.summary['recent_win_rate'] = self.win_rates[-1]
+            self.summary['best_win_rate'] = max(self.summary.get('best_win_rate', 0), self.win_rates[-1])
+        if self.episode_rewards:
+            self.summary['recent_avg_reward'] = float(np.mean(self.episode_rewards[-20:]))
+        self.metrics.save(self.summary)
     
     def update_level(self):
         """Update AI level based on win rate."""
         if not self.win_rates:
             return
         
-        recent_win_rate = np.mean(self.win_rates[-20:]) * 100
+        recent_win_rate = np.mean(self.win_rates[-20:])
         
         for level in reversed(LEVELS):
             if recent_win_rate >= level['min_win_rate']:
@@ -165,102 +176,24 @@ class TrainingStats:
         """Add episode result."""
         self.total_episodes += 1
         self.episode_rewards.append(reward)
+        self.summary['total_rewards'] = self.summary.get('total_rewards', 0) + reward
         if won:
             self.total_wins += 1
         else:
             self.total_losses += 1
         
         # Calculate win rate for last 20 episodes
-        recent_episodes = min(20, self.total_episodes)
+        recent_episodes = min(20, len(self.episode_rewards))
         recent_wins = sum(1 for i in range(-recent_episodes, 0) 
                          if i < 0 and self.episode_rewards[i] > 100)
-        win_rate = recent_wins / recent_episodes
+        win_rate = recent_wins / recent_episodes * 100
         self.win_rates.append(win_rate)
         
-        self.update_level()
-
-
-def calculate_reward(game_state, agent_player, enemy_player, prev_state, action):
-    """Calculate reward with curriculum learning."""
-    reward = 0
-    
-    # Win/Loss
-    if not agent_player.alive:
-        return -200
-    if not enemy_player.alive:
-        return +200
-    
-    # Step penalty
-    reward -= 0.5
-    
-    # Destroy walls
-    if prev_state:
-        prev_walls = sum(row.count(2) for row in prev_state['grid'])
-        curr_walls = sum(row.count(2) for row in game_state.grid)
-        if curr_walls < prev_walls:
-            reward += 20 * (prev_walls - curr_walls)
-    
-    # Power-ups
-    if prev_state and len(game_state.powerups) < prev_state['powerups']:
-        reward += 10
-    
-    # Distance to enemy
-    if prev_state:
-        prev_dist = abs(prev_state['player_x'] - prev_state['enemy_x']) + \
-                   abs(prev_state['player_y'] - prev_state['enemy_y'])
-        curr_dist = abs(agent_player.grid_x - enemy_player.grid_x) + \
-                   abs(agent_player.grid_y - enemy_player.grid_y)
+        self.metrics.append('episode_rewards', reward)
+        self.metrics.append('win_rates', win_rate)
+        self.metrics.append('avg_rewards', float(np.mean(self.episode_rewards[-20:])))
         
-        if curr_dist < prev_dist:
-            reward += 5
-        elif curr_dist > prev_dist:
-            reward -= 5
-    
-    # Strategic bomb placement
-    dx, dy, place_bomb = action
-    if place_bomb:
-        dist_to_enemy = abs(agent_player.grid_x - enemy_player.grid_x) + \
-                       abs(agent_player.grid_y - enemy_player.grid_y)
-        if dist_to_enemy <= 3:
-            reward += 15
-    
-    # Survival bonus
-    if prev_state and prev_state.get('in_danger', False):
-        if not _in_danger(game_state, agent_player):
-            reward += 30
-    
-    return reward
-
-
-def _in_danger(game_state, player):
-    """Check if player is in danger."""
-    px, py = player.grid_x, player.grid_y
-    
-    for explosion in game_state.explosions:
-        if explosion.grid_x == px and explosion.grid_y == py:
-            return True
-    
-    for bomb in game_state.bombs:
-        if bomb.timer < 1.5:
-            bx, by = bomb.grid_x, bomb.grid_y
-            if (px == bx and abs(py - by) <= bomb.bomb_range) or \
-               (py == by and abs(px - bx) <= bomb.bomb_range):
-                return True
-    
-    return False
-
-
-def save_state(game_state, agent_player, enemy_player):
-    """Save game state."""
-    return {
-        'grid': [row[:] for row in game_state.grid],
-        'powerups': len(game_state.powerups),
-        'player_x': agent_player.grid_x,
-        'player_y': agent_player.grid_y,
-        'enemy_x': enemy_player.grid_x,
-        'enemy_y': enemy_player.grid_y,
-        'in_danger': _in_danger(game_state, agent_player),
-    }
+        self.update_level()
 
 
 def format_time(seconds):
@@ -308,9 +241,74 @@ def print_banner():
     print()
 
 
+class QuickTrainSink(TrainerSink):
+    """Session stats, progress bar, encouragement messages and timed checkpoints."""
+    
+    def __init__(self, agent, stats):
+        self.agent = agent
+        self.stats = stats
+        self.session_start = time.time()
+        self.session_episodes = 0
+        self.session_wins = 0
+        self.last_checkpoint = self.session_start
+        self.last_message_time = self.session_start
+        self.message_interval = 30  # Show message every 30 seconds
+    
+    def on_episode(self, trainer, result):
+        stats = self.stats
+        
+        # Update stats
+        stats.add_episode(result.reward, result.won)
+        self.session_episodes += 1
+        if result.won:
+            self.session_wins += 1
+        elapsed = time.time() - self.session_start
+        
+        # Print progress every 10 episodes
+        if self.session_episodes % 10 == 0:
+            progress = print_progress_bar(elapsed, TRAINING_DURATION)
+            session_win_rate = (self.session_wins / self.session_episodes) * 100
+            
+            # Get level emoji
+            level_emoji = next((l["emoji"] for l in LEVELS if l["name"] == stats.current_level), "🤖")
+            
+            print(f"\r{progress} | "
+                  f"⏱️  {format_time(elapsed)}/{format_time(TRAINING_DURATION)} | "
+                  f"🎮 {self.session_episodes} games | "
+                  f"🏆 {session_win_rate:.1f}% | "
+                  f"{level_emoji} {stats.current_level} | "
+                  f"🎁 {trainer.mean_reward_time():.1f} µs/step", end="", flush=True)
+        
+        # Show progress message periodically
+        current_time = time.time()
+        if current_time - self.last_message_time >= self.message_interval:
+            message = get_progress_message(stats.current_level, self.session_episodes)
+            print(f"\n   {message}")
+            self.last_message_time = current_time
+        
+        # Checkpoint
+        if current_time - self.last_checkpoint >= CHECKPOINT_INTERVAL:
+            print()  # New line after progress
+            level_emoji = next((l["emoji"] for l in LEVELS if l["name"] == stats.current_level), "🤖")
+            print(f"💾 Checkpoint at {format_time(elapsed)}...")
+            self.agent.save_model(MODEL_PATH)
+            stats.total_training_time += current_time - self.last_checkpoint
+            stats.save()
+            self.last_checkpoint = current_time
+            print(f"   ✅ Progress saved! {level_emoji} {stats.current_level} | 🏆 {stats.get_win_rate():.1f}% win rate")
+            
+            # Show improvement message
+            if stats.total_episodes > 100 and stats.total_episodes > self.session_episodes:
+                previous_win_rate = ((stats.total_wins - self.session_wins)
+                                     / (stats.total_episodes - self.session_episodes) * 100)
+                improvement = stats.get_win_rate() - previous_win_rate
+                if improvement > 0:
+                    print(f"   📈 Improved by {improvement:.1f}% this session!")
+
+
 def quick_train():
     """Quick 5-minute training session."""
-    global training_interrupted
+    global active_trainer
     
     # Register signal handler for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
@@ -346,16 +344,9 @@ def quick_train():
     
     # Initialize agent
     print("🤖 Initializing PPO Agent...")
-    agent_player = Player(1, 1, (255, 0, 0), "PPO Agent")
-    agent = PPOAgent(agent_player, model_path=MODEL_PATH if os.path.exists(MODEL_PATH) else None, training=True)
+    agent = PPOAgent(None, model_path=MODEL_PATH if os.path.exists(MODEL_PATH) else None, training=True)
     print()
     
-    # Training session info
-    session_start = time.time()
-    session_episodes = 0
-    session_wins = 0
-    last_checkpoint = time.time()
-    
     print(f"⏱️  Training Duration: {TRAINING_DURATION // 60} minutes")
     print(f"💾 Checkpoint Interval: {CHECKPOINT_INTERVAL} seconds")
     
@@ -366,124 +357,21 @@ def quick_train():
     print("🎮 Training in progress... (Press Ctrl+C to stop gracefully)")
     print()
     
-    last_message_time = time.time()
-    message_interval = 30  # Show message every 30 seconds
-    
+    # Training session
+    session = QuickTrainSink(agent, stats)
+    active_trainer = Trainer(PPOLearner(agent), SimpleAgent,
+                             backend=make_backend(NUM_ENVS, NUM_WORKERS),
+                             sinks=[session], max_steps=500)
     try:
-        while True:
-            elapsed = time.time() - session_start
-            
-            # Check if training interrupted
-            if training_interrupted:
-                print("\n⚠️  Training interrupted by user!")
-                break
-            
-            # Check if training time is up
-            if elapsed >= TRAINING_DURATION:
-                break
-            
-            # Initialize game
-            game_state = GameState(GRID_SIZE)
-            agent_player = Player(1, 1, (255, 0, 0), "PPO Agent")
-            enemy_player = Player(11, 11, (0, 255, 0), "Enemy")
-            game_state.players = [agent_player, enemy_player]
-            agent.player = agent_player
-            
-            # Enemy AI
-            enemy_ai = SimpleAgent(enemy_player)
-            
-            # Episode variables
-            total_reward = 0
-            steps = 0
-            max_steps = 500
-            prev_state = None
-            done = False
-            
-            # Run episode
-            while not done and steps < max_steps:
-                # Agent action
-                action = agent.choose_action(game_state)
-                dx, dy, place_bomb = action
-                
-                agent_player.move(dx, dy, game_state.grid, TILE_SIZE, game_state)
-                if place_bomb and agent_player.can_place_bomb():
-                    game_state.place_bomb(agent_player)
-                
-                # Enemy action
-                if enemy_player.alive:
-                    enemy_action = enemy_ai.choose_action(game_state)
-                    enemy_dx, enemy_dy, enemy_bomb = enemy_action
-                    enemy_player.move(enemy_dx, enemy_dy, game_state.grid, TILE_SIZE, game_state)
-                    if enemy_bomb and enemy_player.can_place_bomb():
-                        game_state.place_bomb(enemy_player)
-                
-                # Update game
-                game_state.update(1/30)
-                
-                # Calculate reward
-                reward = calculate_reward(game_state, agent_player, enemy_player, prev_state, action)
-                total_reward += reward
-                
-                # Store experience
-                done = not agent_player.alive or not enemy_player.alive
-                agent.store_reward(reward, done)
-                
-                prev_state = save_state(game_state, agent_player, enemy_player)
-                steps += 1
-            
-            # Update policy
-            agent.update_policy()
-            
-            # Update stats
-            won = agent_player.alive and not enemy_player.alive
-            stats.add_episode(total_reward, won)
-            session_episodes += 1
-            if won:
-                session_wins += 1
-            
-            # Print progress every 10 episodes
-            if session_episodes % 10 == 0:
-                elapsed = time.time() - session_start
-                remaining = TRAINING_DURATION - elapsed
-                progress = print_progress_bar(elapsed, TRAINING_DURATION)
-                session_win_rate = (session_wins / session_episodes) * 100
-                
-                # Get level emoji
-                level_emoji = next((l["emoji"] for l in LEVELS if l["name"] == stats.current_level), "🤖")
-                
-                print(f"\r{progress} | "
-                      f"⏱️  {format_time(elapsed)}/{format_time(TRAINING_DURATION)} | "
-                      f"🎮 {session_episodes} games | "
-                      f"🏆 {session_win_rate:.1f}% | "
-                      f"{level_emoji} {stats.current_level}", end="", flush=True)
-            
-            # Show progress message periodically
-            current_time = time.time()
-            if current_time - last_message_time >= message_interval:
-                message = get_progress_message(stats.current_level, session_episodes)
-                print(f"\n   {message}")
-                last_message_time = current_time
-            
-            # Checkpoint
-            current_time = time.time()
-            if current_time - last_checkpoint >= CHECKPOINT_INTERVAL:
-                print()  # New line after progress
-                level_emoji = next((l["emoji"] for l in LEVELS if l["name"] == stats.current_level), "🤖")
-                print(f"💾 Checkpoint at {format_time(elapsed)}...")
-                agent.save_model(MODEL_PATH)
-                stats.total_training_time += elapsed
-                stats.save()
-                last_checkpoint = current_time
-                print(f"   ✅ Progress saved! {level_emoji} {stats.current_level} | 🏆 {stats.get_win_rate():.1f}% win rate")
-                
-                # Show improvement message
-                if stats.total_episodes > 100:
-                    improvement = stats.get_win_rate() - (stats.total_wins - session_wins) / (stats.total_episodes - session_episodes) * 100 if stats.total_episodes > session_episodes else 0
-                    if improvement > 0:
-                        print(f"   📈 Improved by {improvement:.1f}% this session!")
-    
+        active_trainer.run(max_seconds=TRAINING_DURATION)
     except KeyboardInterrupt:
         print("\n\n⚠️  Training interrupted by user")
+    finally:
+        active_trainer.close()
+    if training_interrupted:
+        print("\n⚠️  Training interrupted by user!")
+    session_episodes = session.session_episodes
+    session_wins = session.session_wins
     
     # Final save
     print("\n")
@@ -491,8 +379,8 @@ def quick_train():
     print("💾 Saving final checkpoint...")
     agent.save_model(MODEL_PATH)
     
-    session_duration = time.time() - session_start
-    stats.total_training_time += session_duration
+    session_duration = time.time() - session.session_start
+    stats.total_training_time += time.time() - session.last_checkpoint  # Checkpoints added the rest
     stats.training_sessions.append({
         'date': datetime.now().isoformat(),
         'duration': session_duration,
@@ -513,7 +401,7 @@ def quick_train():
     print(f"📊 Session Summary:")
     print(f"   ⏱️  Duration: {format_time(session_duration)}")
     print(f"   🎮 Episodes: {session_episodes}")
-    print(f"   🏆 Wins: {session_wins} ({(session_wins/session_episodes*100):.1f}%)")
+    print(f"   🏆 Wins: {session_wins} ({(session_wins/max(session_episodes, 1)*100):.1f}%)")
     print()
     print(f"📈 AI Intelligence Report:")
     print(f"   🧠 Total Training: {format_time(stats.total_training_time)}")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Rate the saved models and the heuristics with evaluation matches.
+Registers every ModelHistory version, the current PPO models and the
+heuristic agents, plays the pairings that are not in the rating cache yet
+on a process pool and prints the Elo leaderboard ModelSelector uses.
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bomber_game.model_history import ModelHistory
+from bomber_game.ratings import RatingService, RATINGS_NAME
+
+
+# Current models rated next to the history versions
+MODEL_FILES = ('ppo_agent.pth', 'ppo_pretrained.pth', 'best_model.pth')
+
+
+def main():
+    """Main rating script."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Rate models and heuristics with evaluation matches')
+    parser.add_argument('--models-dir', default='bomber_game/models',
+                       help='Models folder (default: bomber_game/models)')
+    parser.add_argument('--games', type=int, default=20,
+                       help='Games per pairing (default: 20)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Processes playing pairings, 0 for none (default: CPU count)')
+    parser.add_argument('--max-steps', type=int, default=1500,
+                       help='Step limit per game (default: 1500)')
+    parser.add_argument('--list', action='store_true',
+                       help='Only print the leaderboard, play nothing')
+
+    args = parser.parse_args()
+    history = ModelHistory(args.models_dir)
+
+    with RatingService(os.path.join(args.models_dir, RATINGS_NAME), games_per_pairing=args.games,
+                       max_steps=args.max_steps, num_workers=args.workers) as ratings:
+        if not args.list:
+            ratings.register_heuristics()
+            for version in history.get_all_versions():
+                path = os.path.join(args.models_dir, version['model_file'])
+                if os.path.exists(path):
+                    ratings.register_model(f"v{version['version_id']}", path)
+            for model_file in MODEL_FILES:
+                path = os.path.join(args.models_dir, model_file)
+                if os.path.exists(path):
+                    ratings.register_model(os.path.splitext(model_file)[0], path)
+
+            pending = len(ratings.pending_pairings())
+            print(f"⚔️  {len(ratings.players())} players, {pending} new pairings "
+                  f"({args.games} games each)")
+            start = time.perf_counter()
+            played = ratings.run()
+            print(f"✅ Played {played} pairings in {time.perf_counter() - start:.1f}s")
+
+        print(f"\n🏆 Leaderboard:")
+        for rank, row in enumerate(ratings.leaderboard(), 1):
+            print(f"   {rank:>2}. {row['name']:<20} {row['rating']:7.1f} Elo  "
+                  f"{row['games']:>5} games  ({row['kind']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Rebuild the SQLite replay catalog of a replay folder.
+Use after copying replays in from elsewhere or when the catalog is lost;
+games exported by the game itself are catalogued automatically.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bomber_game.replay_catalog import ReplayCatalog, CATALOG_NAME
+
+
+def main():
+    """Main catalog rebuild script."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Rebuild the replay catalog')
+    parser.add_argument('replay_dir', nargs='?', default='bomber_game/replays',
+                       help='Replay folder (default: bomber_game/replays)')
+    parser.add_argument('--player', default=None,
+                       help='Show statistics for this player afterwards')
+
+    args = parser.parse_args()
+    if not os.path.isdir(args.replay_dir):
+        print(f"❌ Replay folder not found: {args.replay_dir}")
+        return
+
+    print(f"🗂️  Rebuilding {os.path.join(args.replay_dir, CATALOG_NAME)}...")
+    start = time.perf_counter()
+    with ReplayCatalog(os.path.join(args.replay_dir, CATALOG_NAME)) as catalog:
+        games = catalog.rebuild(args.replay_dir)
+        print(f"✅ Catalogued {games} games in {time.perf_counter() - start:.2f}s")
+
+        events = catalog.event_counts()
+        if events:
+            print("\n📊 Events:")
+            for event_type, count in sorted(events.items()):
+                print(f"   {event_type:<20} {count:>8}")
+
+        if args.player:
+            stats = catalog.player_statistics(args.player, num_games=games)
+            print(f"\n🎮 {args.player}: {stats['wins']}/{stats['total_games']} wins "
+                  f"({stats['win_rate']:.1f}%), {stats['bombs_placed']} bombs, "
+                  f"avg {stats['avg_game_duration']:.1f}s per game")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Render saved replays to video, headless and in parallel.
+Replays are written by the game when BOMBERMAN_SAVE_REPLAYS=1 is set
+(bomber_game/replays/game_*.replay).
+"""
+
+import os
+import sys
+import glob
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bomber_game import FPS
+from bomber_game.replay_renderer import render_replays
+from bomber_game.video_recorder import SUPPORTED_FORMATS
+
+
+def main():
+    """Main replay rendering script."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Render saved replays to video')
+    parser.add_argument('replays', nargs='*',
+                       help='Replay files (default: all in bomber_game/replays)')
+    parser.add_argument('--output', default='recordings',
+                       help='Output directory (default: recordings)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Parallel render processes (default: CPU count)')
+    parser.add_argument('--formats', nargs='+', choices=SUPPORTED_FORMATS,
+                       default=list(SUPPORTED_FORMATS),
+                       help='Video formats to export (default: all)')
+    parser.add_argument('--fps', type=int, default=FPS,
+                       help=f'Video frame rate (default: {FPS})')
+
+    args = parser.parse_args()
+    paths = args.replays or sorted(glob.glob('bomber_game/replays/game_*.replay'))
+    if not paths:
+        print("❌ No replays found. Play with BOMBERMAN_SAVE_REPLAYS=1 to save some.")
+        return
+
+    print("=" * 70)
+    print(f"🎞️  RENDERING {len(paths)} REPLAY(S)")
+    print("=" * 70)
+
+    results = render_replays(paths, output_dir=args.output, workers=args.workers,
+                             fps=args.fps, formats=args.formats)
+
+    print("\n" + "=" * 70)
+    print(f"{'Replay':<40} {'Game s':>8} {'Render s':>9} {'Speed':>8}")
+    print("-" * 70)
+    for result in results:
+        name = os.path.basename(result['path'])
+        if 'error' in result:
+            print(f"{name:<40} ❌ {result['error']}")
+            continue
+        sync = "" if result['in_sync'] else "  ⚠️ desync"
+        print(f"{name:<40} {result['game_seconds']:>8.1f} {result['render_seconds']:>9.1f} "
+              f"{result['realtime_factor']:>7.1f}x{sync}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+PPO hyperparameter sweep with successive halving.
+Samples configurations of the hyperparameters overnight_training.py uses,
+trains short trials of them on every core, prunes the ones with the
+lowest evaluation win rate per CPU minute and writes a ranked table.
+Train with the winner: overnight_training.py --hyperparameters <best_config.json>
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bomber_game.sweep import HyperparameterSweep, SEARCH_SPACE, RESULTS_NAME, BEST_CONFIG_NAME
+
+
+def main():
+    """Main sweep script."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Search PPO hyperparameters with successive halving')
+    parser.add_argument('--output', default='bomber_game/models/sweep',
+                       help='Sweep folder (default: bomber_game/models/sweep)')
+    parser.add_argument('--trials', type=int, default=27,
+                       help='Configurations sampled (default: 27)')
+    parser.add_argument('--min-episodes', type=int, default=50,
+                       help='Training episodes of the first rung (default: 50)')
+    parser.add_argument('--max-episodes', type=int, default=450,
+                       help='Training episodes of a trial that is never pruned (default: 450)')
+    parser.add_argument('--eta', type=int, default=3,
+                       help='Rung growth and pruning factor; the top 1/eta continue (default: 3)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Trials trained at once, 0 for none (default: CPU count)')
+    parser.add_argument('--eval-episodes', type=int, default=10,
+                       help='Evaluation games after each rung (default: 10)')
+    parser.add_argument('--max-steps', type=int, default=500,
+                       help='Step limit per game (default: 500)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Seed of the sampled configurations and evaluation maps (default: 0)')
+    parser.add_argument('--top', type=int, default=10,
+                       help='Trials printed at the end (default: 10)')
+
+    args = parser.parse_args()
+    sweep = HyperparameterSweep(args.output, num_trials=args.trials, min_episodes=args.min_episodes,
+                                max_episodes=args.max_episodes, eta=args.eta, num_workers=args.workers,
+                                eval_episodes=args.eval_episodes, max_steps=args.max_steps,
+                                seed=args.seed)
+
+    print(f"🔬 {args.trials} trials, rungs of {', '.join(map(str, sweep.budgets))} episodes "
+          f"(top 1/{args.eta} continue)")
+    start = time.perf_counter()
+    ranked = sweep.run()
+    print(f"✅ Sweep finished in {(time.perf_counter() - start) / 60:.1f} minutes")
+
+    print(f"\n🏆 Best trials (win rate per CPU minute at their last rung):")
+    for rank, trial in enumerate(ranked[:args.top], 1):
+        last = trial['rungs'][-1]
+        config = ", ".join(f"{name}={trial['config'][name]:.3g}" for name in SEARCH_SPACE)
+        print(f"   {rank:>2}. trial {trial['trial']:3d}  {last['episodes']:>5} ep  "
+              f"{last['win_rate']:5.1f}% won  {last['win_rate_per_cpu_minute']:6.2f} %/CPU min  {config}")
+    print(f"\n📄 Table: {os.path.join(args.output, RESULTS_NAME)}")
+    print(f"⚙️  Best configuration: {os.path.join(args.output, BEST_CONFIG_NAME)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ Improvements for faster CPU training:
 - Better progress tracking
 - Automatic checkpointing
 - Early stopping based on performance
+- Evaluation in a background process (training never pauses for it)
 """
 
 import sys
@@ -18,10 +19,11 @@ from collections import deque
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from bomber_game import GRID_SIZE, TILE_SIZE
-from bomber_game.game_state import GameState
-from bomber_game.entities import Player
-from bomber_game.agents import SimpleAgent
+from bomber_game.agents.simple_agent import SimpleAgent
+from bomber_game.heuristics_improved import ImprovedHeuristicAgent
+from bomber_game.trainer import Trainer, TrainerSink, OptimizedPPOLearner, make_backend
+from bomber_game.checkpoint_writer import CheckpointWriter
+from bomber_game.evaluator import BackgroundEvaluator
 
 # Import optimized agent
 from bomber_game.agents.ppo_agent_optimized import OptimizedPPOAgent
@@ -31,193 +33,24 @@ EPISODES = 5000
 MAX_STEPS = 300  # Reduced for faster episodes
 BUFFER_SIZE = 2048  # Collect this many steps before update
 SAVE_INTERVAL = 100
-EVAL_INTERVAL = 50  # Evaluate performance every N episodes
+EVAL_INTERVAL = 50  # Hand a checkpoint to the evaluator every N episodes
 MODEL_PATH = "bomber_game/models/ppo_agent_optimized.pth"
 STATS_PATH = "bomber_game/models/training_stats_optimized.json"
 
+# Background evaluation (see bomber_game/evaluator.py)
+EVAL_EPISODES = 20  # Games against each suite opponent per evaluation
+EVAL_WORKERS = 2    # Processes playing evaluation games (0: in the evaluator process)
+EVAL_SUITE = (('simple', SimpleAgent), ('heuristic', ImprovedHeuristicAgent))
+EVAL_CHECKPOINT_DIR = "bomber_game/models/checkpoints_optimized"
+EVAL_STATS_PATH = "bomber_game/models/eval_stats_optimized.json"
+
 # Early stopping
 EARLY_STOP_WIN_RATE = 70.0  # Stop if win rate exceeds this
 EARLY_STOP_PATIENCE = 500  # Episodes without improvement
 
-
-def calculate_reward_vectorized(game_state, agent_player, enemy_player, prev_state, action):
-    """
-    Optimized reward calculation.
-    
-    Rewards:
-    +200: Win
-    -200: Loss
-    +20: Destroy soft wall
-    +10: Collect power-up
-    +5: Move closer to enemy
-    -5: Move away from enemy
-    +15: Place bomb near enemy
-    -20: Place bomb in dangerous position
-    +30: Survive dangerous situation
-    -0.5: Each step (encourage efficiency)
-    """
-    reward = 0
-    
-    # Check win/loss (terminal rewards)
-    if not agent_player.alive:
-        return -200
-    if not enemy_player.alive:
-        return +200
-    
-    # Step penalty
-    reward -= 0.5
-    
-    # Reward for destroying walls
-    if prev_state:
-        prev_walls = prev_state['walls']
-        curr_walls = sum(row.count(2) for row in game_state.grid)
-        if curr_walls < prev_walls:
-            reward += 20 * (prev_walls - curr_walls)
-    
-    # Reward for collecting power-ups
-    if prev_state and len(game_state.powerups) < prev_state['powerups']:
-        reward += 10
-    
-    # Reward for moving toward enemy
-    if prev_state:
-        prev_dist = prev_state['enemy_dist']
-        curr_dist = abs(agent_player.grid_x - enemy_player.grid_x) + \
-                   abs(agent_player.grid_y - enemy_player.grid_y)
-        
-        if curr_dist < prev_dist:
-            reward += 5
-        elif curr_dist > prev_dist:
-            reward -= 5
-    
-    # Reward for placing bomb near enemy
-    dx, dy, place_bomb = action
-    if place_bomb:
-        dist_to_enemy = abs(agent_player.grid_x - enemy_player.grid_x) + \
-                       abs(agent_player.grid_y - enemy_player.grid_y)
-        if dist_to_enemy <= 3:
-            reward += 15
-        
-        # Penalty for dangerous bomb placement
-        if _is_dangerous_bomb_placement(game_state, agent_player):
-            reward -= 20
-    
-    # Reward for surviving danger
-    if prev_state and prev_state.get('in_danger', False):
-        if not _in_danger(game_state, agent_player):
-            reward += 30
-    
-    return reward
-
-
-def _is_dangerous_bomb_placement(game_state, player):
-    """Check if placing bomb here is dangerous."""
-    px, py = player.grid_x, player.grid_y
-    escape_routes = sum(1 for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]
-                       if game_state.is_walkable(px + dx, py + dy))
-    return escape_routes < 2
-
-
-def _in_danger(game_state, player):
-    """Check if player is in danger."""
-    px, py = player.grid_x, player.grid_y
-    
-    for explosion in game_state.explosions:
-        if explosion.grid_x == px and explosion.grid_y == py:
-            return True
-    
-    for bomb in game_state.bombs:
-        if bomb.timer < 1.5:
-            bx, by = bomb.grid_x, bomb.grid_y
-            if (px == bx and abs(py - by) <= bomb.bomb_range) or \
-               (py == by and abs(px - bx) <= bomb.bomb_range):
-                return True
-    
-    return False
-
-
-def save_state(game_state, agent_player, enemy_player):
-    """Save current state for reward calculation."""
-    return {
-        'walls': sum(row.count(2) for row in game_state.grid),
-        'powerups': len(game_state.powerups),
-        'enemy_dist': abs(agent_player.grid_x - enemy_player.grid_x) + \
-                     abs(agent_player.grid_y - enemy_player.grid_y),
-        'in_danger': _in_danger(game_state, agent_player),
-    }
-
-
-def evaluate_agent(agent, num_episodes=10):
-    """
-    Evaluate agent performance.
-    
-    Returns:
-        Dictionary with evaluation metrics
-    """
-    wins = 0
-    total_rewards = []
-    episode_lengths = []
-    
-    # Temporarily disable training
-    was_training = agent.training
-    agent.training = False
-    agent.policy.eval()
-    
-    for _ in range(num_episodes):
-        # Initialize game
-        game_state = GameState(GRID_SIZE)
-        agent_player = Player(1, 1, (255, 0, 0), "PPO Agent")
-        enemy_player = Player(11, 11, (0, 255, 0), "Enemy")
-        game_state.players = [agent_player, enemy_player]
-        agent.player = agent_player
-        enemy_ai = SimpleAgent(enemy_player)
-        
-        total_reward = 0
-        steps = 0
-        prev_state = None
-        
-        while steps < MAX_STEPS:
-            # Agent action
-            action = agent.choose_action(game_state)
-            dx, dy, place_bomb = action
-            
-            agent_player.move(dx, dy, game_state.grid, TILE_SIZE, game_state)
-            if place_bomb and agent_player.can_place_bomb():
-                game_state.place_bomb(agent_player)
-            
-            # Enemy action
-            if enemy_player.alive:
-                enemy_action = enemy_ai.choose_action(game_state)
-                enemy_dx, enemy_dy, enemy_bomb = enemy_action
-                enemy_player.move(enemy_dx, enemy_dy, game_state.grid, TILE_SIZE, game_state)
-                if enemy_bomb and enemy_player.can_place_bomb():
-                    game_state.place_bomb(enemy_player)
-            
-            game_state.update(1/30)
-            
-            reward = calculate_reward_vectorized(game_state, agent_player, enemy_player, prev_state, action)
-            total_reward += reward
-            prev_state = save_state(game_state, agent_player, enemy_player)
-            steps += 1
-            
-            if not agent_player.alive or not enemy_player.alive:
-                break
-        
-        if agent_player.alive and not enemy_player.alive:
-            wins += 1
-        
-        total_rewards.append(total_reward)
-        episode_lengths.append(steps)
-    
-    # Restore training mode
-    agent.training = was_training
-    if was_training:
-        agent.policy.train()
-    
-    return {
-        'win_rate': wins / num_episodes * 100,
-        'avg_reward': np.mean(total_rewards),
-        'avg_length': np.mean(episode_lengths),
-    }
+# Game backend (see bomber_game/trainer.py)
+NUM_ENVS = 1     # Games stepped together (per worker)
+NUM_WORKERS = 0  # Worker processes playing games (0: play in this process)
 
 
 def save_training_stats(stats, path):
@@ -248,6 +81,106 @@ def load_training_stats(path):
     }
 
 
+class OptimizedTrainingSink(TrainerSink):
+    """Progress, periodic evaluation with early stopping, and checkpoints."""
+    
+    def __init__(self, agent, stats, start_episode, checkpoint_writer, evaluator):
+        self.agent = agent
+        self.stats = stats
+        self.checkpoint_writer = checkpoint_writer
+        self.evaluator = evaluator
+        self.start_episode = start_episode
+        self.start_time = time.time()
+        self.previous_training_time = stats.get('total_training_time', 0)
+        self.recent_rewards = deque(maxlen=100)
+        self.recent_lengths = deque(maxlen=100)
+        self.recent_wins = deque(maxlen=100)
+        self.wins = 0
+        self.losses = 0
+        self.best_win_rate = stats.get('best_win_rate', 0)
+    
+    def on_episode(self, trainer, result):
+        episode = result.episode
+        
+        # Statistics
+        self.recent_rewards.append(result.reward)
+        self.recent_lengths.append(result.steps)
+        self.recent_wins.append(1 if result.won else 0)
+        if result.won:
+            self.wins += 1
+        elif result.lost:
+            self.losses += 1
+        
+        # Print progress
+        if episode % 10 == 0:
+            avg_reward = np.mean(self.recent_rewards)
+            avg_length = np.mean(self.recent_lengths)
+            win_rate = np.mean(self.recent_wins) * 100
+            elapsed = time.time() - self.start_time
+            eps_per_sec = (episode - self.start_episode) / elapsed
+            
+            print(f"Ep {episode:5d}/{self.start_episode + EPISODES} | "
+                  f"Reward: {avg_reward:7.2f} | "
+                  f"Len: {avg_length:5.1f} | "
+                  f"Win%: {win_rate:5.1f} | "
+                  f"Speed: {eps_per_sec:.2f} ep/s | "
+                  f"Reward calc: {trainer.mean_reward_time():.1f} µs/step")
+        
+        # Evaluation runs in the background evaluator; the learner only hands over checkpoints
+        if episode % EVAL_INTERVAL == 0:
+            self.checkpoint_writer.save_checkpoint(self.agent.checkpoint_state(), episode, kind="eval")
+        try:
+            summary = self.evaluator.poll()
+        except RuntimeError as e:
+            # No more evaluations means no best model and no early stopping: stop cleanly
+            print(f"\n❌ {e}. Stopping training.")
+            trainer.stop()
+            return
+        if summary:
+            self.report_evaluation(trainer, summary)
+        
+        # Save model
+        if episode % SAVE_INTERVAL == 0:
+            self.agent.save_model(MODEL_PATH)
+            self.save_stats(episode)
+            print(f"  💾 Checkpoint saved at episode {episode}")
+    
+    def report_evaluation(self, trainer, summary):
+        """Print a finished evaluation and stop early when it says so."""
+        latest = summary['latest']
+        print(f"\n📊 Evaluation of episode {latest['episode']} "
+              f"({latest['games']} games in {latest['seconds']:.0f}s, training kept running):")
+        print(f"   Eval Win Rate: {latest['win_rate']:.1f}%")
+        for name, results in latest['opponents'].items():
+            print(f"     vs {name}: {results['win_rate']:.1f}% "
+                  f"(reward {results['avg_reward']:.2f}, length {results['avg_length']:.1f})")
+        print(f"   Eval Avg Reward: {latest['avg_reward']:.2f}")
+        print(f"   Eval Avg Length: {latest['avg_length']:.1f}")
+        
+        # The evaluator copies the best checkpoint to the best model file
+        if summary['best_episode'] == latest['episode']:
+            print(f"   🏆 New best win rate! Saved as {MODEL_PATH.replace('.pth', '_best.pth')}")
+        self.best_win_rate = max(self.best_win_rate, summary['best_win_rate'])
+        
+        # Early stopping
+        if latest['win_rate'] >= EARLY_STOP_WIN_RATE:
+            print(f"\n🎉 Target win rate achieved! Stopping early.")
+            trainer.stop()
+        elif latest['episode'] - summary['best_episode'] >= EARLY_STOP_PATIENCE:
+            print(f"\n⏹️  No improvement for {EARLY_STOP_PATIENCE} episodes. Stopping.")
+            trainer.stop()
+        else:
+            print()
+    
+    def save_stats(self, episode):
+        """Write the totals to STATS_PATH."""
+        self.stats['total_episodes'] = episode
+        self.stats['total_wins'] = self.wins
+        self.stats['total_training_time'] = self.previous_training_time + time.time() - self.start_time
+        self.stats['best_win_rate'] = self.best_win_rate
+        save_training_stats(self.stats, STATS_PATH)
+
+
 def train():
     """Train optimized PPO agent."""
     print("=" * 70)
@@ -274,6 +207,8 @@ def train():
     print(f"   Buffer size: {BUFFER_SIZE}")
     print(f"   Mini-batch size: 64")
     print(f"   Network size: 128 hidden units (optimized)")
+    print(f"   Evaluation: every {EVAL_INTERVAL} episodes, {EVAL_EPISODES} games vs "
+          f"{', '.join(name for name, _ in EVAL_SUITE)} in the background")
     print(f"   Model: {MODEL_PATH}")
     print()
     
@@ -284,178 +219,61 @@ def train():
     stats = load_training_stats(STATS_PATH)
     start_episode = stats['total_episodes']
     
-    # Statistics
-    recent_rewards = deque(maxlen=100)
-    recent_lengths = deque(maxlen=100)
-    recent_wins = deque(maxlen=100)
-    
-    wins = 0
-    losses = 0
-    total_steps = 0
-    start_time = time.time()
-    best_win_rate = stats.get('best_win_rate', 0)
-    episodes_without_improvement = 0
-    
     # Create agent
-    agent_player = Player(1, 1, (255, 0, 0), "PPO Agent")
     agent = OptimizedPPOAgent(
-        agent_player, 
+        None,
         model_path=MODEL_PATH if os.path.exists(MODEL_PATH) else None,
         training=True
     )
     
     print("🎮 Starting training...\n")
     
-    try:
-        for episode in range(start_episode, start_episode + EPISODES):
-            # Initialize game
-            game_state = GameState(GRID_SIZE)
-            agent_player = Player(1, 1, (255, 0, 0), "PPO Agent")
-            enemy_player = Player(11, 11, (0, 255, 0), "Enemy")
-            game_state.players = [agent_player, enemy_player]
-            agent.player = agent_player
-            enemy_ai = SimpleAgent(enemy_player)
-            
-            # Episode variables
-            total_reward = 0
-            steps = 0
-            prev_state = None
-            
-            while steps < MAX_STEPS:
-                # Agent action
-                action = agent.choose_action(game_state)
-                dx, dy, place_bomb = action
-                
-                agent_player.move(dx, dy, game_state.grid, TILE_SIZE, game_state)
-                if place_bomb and agent_player.can_place_bomb():
-                    game_state.place_bomb(agent_player)
-                
-                # Enemy action
-                if enemy_player.alive:
-                    enemy_action = enemy_ai.choose_action(game_state)
-                    enemy_dx, enemy_dy, enemy_bomb = enemy_action
-                    enemy_player.move(enemy_dx, enemy_dy, game_state.grid, TILE_SIZE, game_state)
-                    if enemy_bomb and enemy_player.can_place_bomb():
-                        game_state.place_bomb(enemy_player)
-                
-                game_state.update(1/30)
-                
-                # Calculate reward
-                reward = calculate_reward_vectorized(game_state, agent_player, enemy_player, prev_state, action)
-                total_reward += reward
-                
-                # Store experience
-                done = not agent_player.alive or not enemy_player.alive
-                agent.store_reward(reward, done)
-                
-                prev_state = save_state(game_state, agent_player, enemy_player)
-                steps += 1
-                total_steps += 1
-                
-                # Update policy when buffer is full
-                if agent.buffer.is_full():
-                    agent.update_policy()
-                
-                if done:
-                    break
-            
-            # Final update for episode
-            if agent.buffer.size() > 0:
-                agent.update_policy()
-            
-            # Statistics
-            recent_rewards.append(total_reward)
-            recent_lengths.append(steps)
-            
-            won = agent_player.alive and not enemy_player.alive
-            recent_wins.append(1 if won else 0)
-            
-            if won:
-                wins += 1
-            elif not agent_player.alive:
-                losses += 1
-            
-            # Print progress
-            if (episode + 1) % 10 == 0:
-                avg_reward = np.mean(recent_rewards)
-                avg_length = np.mean(recent_lengths)
-                win_rate = np.mean(recent_wins) * 100
-                elapsed = time.time() - start_time
-                eps_per_sec = (episode - start_episode + 1) / elapsed
-                
-                print(f"Ep {episode + 1:5d}/{start_episode + EPISODES} | "
-                      f"Reward: {avg_reward:7.2f} | "
-                      f"Len: {avg_length:5.1f} | "
-                      f"Win%: {win_rate:5.1f} | "
-                      f"Speed: {eps_per_sec:.2f} ep/s")
-            
-            # Evaluation
-            if (episode + 1) % EVAL_INTERVAL == 0:
-                print(f"\n📊 Evaluating at episode {episode + 1}...")
-                eval_results = evaluate_agent(agent, num_episodes=20)
-                eval_win_rate = eval_results['win_rate']
-                
-                print(f"   Eval Win Rate: {eval_win_rate:.1f}%")
-                print(f"   Eval Avg Reward: {eval_results['avg_reward']:.2f}")
-                print(f"   Eval Avg Length: {eval_results['avg_length']:.1f}")
-                
-                # Track best model
-                if eval_win_rate > best_win_rate:
-                    best_win_rate = eval_win_rate
-                    episodes_without_improvement = 0
-                    print(f"   🏆 New best win rate! Saving model...")
-                    agent.save_model(MODEL_PATH.replace('.pth', '_best.pth'))
-                else:
-                    episodes_without_improvement += EVAL_INTERVAL
-                
-                # Early stopping
-                if eval_win_rate >= EARLY_STOP_WIN_RATE:
-                    print(f"\n🎉 Target win rate achieved! Stopping early.")
-                    break
-                
-                if episodes_without_improvement >= EARLY_STOP_PATIENCE:
-                    print(f"\n⏹️  No improvement for {EARLY_STOP_PATIENCE} episodes. Stopping.")
-                    break
-                
-                print()
-            
-            # Save model
-            if (episode + 1) % SAVE_INTERVAL == 0:
-                agent.save_model(MODEL_PATH)
-                
-                # Update stats
-                stats['total_episodes'] = episode + 1
-                stats['total_wins'] = wins
-                stats['total_training_time'] = time.time() - start_time + stats.get('total_training_time', 0)
-                stats['best_win_rate'] = best_win_rate
-                save_training_stats(stats, STATS_PATH)
-                
-                print(f"  💾 Checkpoint saved at episode {episode + 1}")
+    # Checkpoints tagged 'eval' are picked up by the evaluator process
+    checkpoint_writer = CheckpointWriter(EVAL_CHECKPOINT_DIR)
+    evaluator = BackgroundEvaluator(EVAL_CHECKPOINT_DIR, EVAL_STATS_PATH, OptimizedPPOAgent, EVAL_SUITE,
+                                    episodes=EVAL_EPISODES, num_workers=EVAL_WORKERS,
+                                    max_steps=MAX_STEPS,
+                                    best_model_path=MODEL_PATH.replace('.pth', '_best.pth'))
+    evaluator.start()
     
+    sink = OptimizedTrainingSink(agent, stats, start_episode, checkpoint_writer, evaluator)
+    trainer = Trainer(OptimizedPPOLearner(agent, update_interval=BUFFER_SIZE), SimpleAgent,
+                      backend=make_backend(NUM_ENVS, NUM_WORKERS), sinks=[sink],
+                      max_steps=MAX_STEPS, start_episode=start_episode)
+    try:
+        trainer.run(EPISODES)
     except KeyboardInterrupt:
         print("\n\n⚠️  Training interrupted by user")
+    finally:
+        trainer.close()
+        checkpoint_writer.close()
+        # Let the evaluator finish the last checkpoint it was handed
+        print("⏳ Waiting for the last evaluation...")
+        evaluator.stop()
+    summary = evaluator.poll()
+    if summary:
+        sink.best_win_rate = max(sink.best_win_rate, summary['best_win_rate'])
+        print(f"📊 Last evaluation (episode {summary['latest']['episode']}): "
+              f"{summary['latest']['win_rate']:.1f}% win rate")
     
     # Final save
     agent.save_model(MODEL_PATH)
     
     # Final stats
-    total_time = time.time() - start_time
-    stats['total_episodes'] = episode + 1
-    stats['total_wins'] = wins
-    stats['total_training_time'] = total_time + stats.get('total_training_time', 0)
-    stats['best_win_rate'] = best_win_rate
-    save_training_stats(stats, STATS_PATH)
+    total_time = time.time() - sink.start_time
+    episodes = max(trainer.episode - start_episode, 1)
+    sink.save_stats(trainer.episode)
     
     print()
     print("=" * 70)
     print("✅ TRAINING COMPLETE!")
     print("=" * 70)
-    print(f"Total episodes: {episode - start_episode + 1}")
-    print(f"Total wins: {wins} ({wins/(episode - start_episode + 1)*100:.1f}%)")
-    print(f"Total losses: {losses} ({losses/(episode - start_episode + 1)*100:.1f}%)")
-    print(f"Best win rate: {best_win_rate:.1f}%")
+    print(f"Total episodes: {trainer.episode - start_episode}")
+    print(f"Total wins: {sink.wins} ({sink.wins/episodes*100:.1f}%)")
+    print(f"Total losses: {sink.losses} ({sink.losses/episodes*100:.1f}%)")
+    print(f"Best win rate: {sink.best_win_rate:.1f}%")
     print(f"Training time: {total_time/3600:.2f} hours")
-    print(f"Speed: {(episode - start_episode + 1)/total_time:.2f} episodes/sec")
+    print(f"Speed: {episodes/total_time:.2f} episodes/sec")
     print(f"Model saved: {MODEL_PATH}")
     print()
     print("🎮 Test your agent with: ./launch_bomberman.sh")
@@ -6,86 +6,76 @@ This script trains a DQN agent to play Bomberman.
 
 import sys
 import os
-import pygame
+import random
 
 # Add project to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from bomber_game import GRID_SIZE, TILE_SIZE, FPS
-from bomber_game.game_state import GameState
-from bomber_game.entities import Player
-from bomber_game.agents import RLAgent
+from bomber_game.agents.rl_agent import RLAgent
+from bomber_game.rewards import RewardShaper
+from bomber_game.trainer import Trainer, TrainerSink, DQNLearner, make_backend
 
 # Training parameters
 EPISODES = 1000
 MAX_STEPS = 500
 SAVE_INTERVAL = 100
 MODEL_PATH = "bomber_game/models/rl_agent.pth"
+NUM_ENVS = 1     # Games stepped together (see bomber_game/trainer.py)
+NUM_WORKERS = 0  # Worker processes playing games (0: play in this process)
 
+# The DQN keeps its smaller reward scale; other REWARD_CONFIG terms apply as is
+REWARD_WEIGHTS = {
+    'enemy_hit': 100,
+    'death': -100,
+    'survival': -0.1,
+    'wall_destroyed': 10,
+    'powerup_collected': 5,
+    'move_toward_enemy': 1,
+    'move_away_from_enemy': -1,
+}
 
-def calculate_reward(game_state, agent_player, prev_state):
-    """
-    Calculate reward for the agent.
-    
-    Rewards:
-    +100: Win (enemy defeated)
-    -100: Loss (agent defeated)
-    +10: Destroy soft wall
-    +5: Collect power-up
-    +1: Move closer to enemy
-    -1: Move away from enemy
-    -5: Get hit by explosion
-    -10: Place bomb in dangerous position
-    """
-    reward = 0
-    
-    # Check win/loss
-    enemy_alive = any(p.alive for p in game_state.players if p != agent_player)
-    if not agent_player.alive:
-        return -100  # Lost
-    if not enemy_alive:
-        return +100  # Won
-    
-    # Small penalty for each step (encourage faster wins)
-    reward -= 0.1
-    
-    # Reward for destroying walls
-    if prev_state:
-        prev_walls = sum(row.count(2) for row in prev_state['grid'])
-        curr_walls = sum(row.count(2) for row in game_state.grid)
-        if curr_walls < prev_walls:
-            reward += 10 * (prev_walls - curr_walls)
-    
-    # Reward for collecting power-ups
-    if prev_state and len(game_state.powerups) < prev_state['powerups']:
-        reward += 5
+
+class RandomOpponent:
+    """Simple enemy AI (random moves, occasional bombs)."""
     
-    # Reward for moving toward enemy
-    enemy = next((p for p in game_state.players if p != agent_player and p.alive), None)
-    if enemy and prev_state:
-        prev_dist = abs(prev_state['player_x'] - prev_state['enemy_x']) + \
-                   abs(prev_state['player_y'] - prev_state['enemy_y'])
-        curr_dist = abs(agent_player.grid_x - enemy.grid_x) + \
-                   abs(agent_player.grid_y - enemy.grid_y)
-        if curr_dist < prev_dist:
-            reward += 1
-        elif curr_dist > prev_dist:
-            reward -= 1
+    def __init__(self, player):
+        self.player = player
     
-    return reward
+    def choose_action(self, game_state):
+        return (random.choice([-1, 0, 1]), random.choice([-1, 0, 1]), random.random() < 0.1)
 
 
-def save_state(game_state, agent_player):
-    """Save current state for reward calculation."""
-    enemy = next((p for p in game_state.players if p != agent_player and p.alive), None)
-    return {
-        'grid': [row[:] for row in game_state.grid],
-        'powerups': len(game_state.powerups),
-        'player_x': agent_player.grid_x,
-        'player_y': agent_player.grid_y,
-        'enemy_x': enemy.grid_x if enemy else 0,
-        'enemy_y': enemy.grid_y if enemy else 0,
-    }
+class ProgressSink(TrainerSink):
+    """Prints progress every 10 episodes and saves the model periodically."""
+    
+    def __init__(self, agent):
+        self.agent = agent
+        self.episode_rewards = []
+        self.episode_lengths = []
+        self.wins = 0
+    
+    def on_episode(self, trainer, result):
+        self.episode_rewards.append(result.reward)
+        self.episode_lengths.append(result.steps)
+        self.wins += result.won
+        episode = result.episode
+        
+        # Print progress
+        if episode % 10 == 0:
+            avg_reward = sum(self.episode_rewards[-10:]) / 10
+            avg_length = sum(self.episode_lengths[-10:]) / 10
+            win_rate = self.wins / episode * 100
+            print(f"Episode {episode}/{EPISODES} | "
+                  f"Avg Reward: {avg_reward:.2f} | "
+                  f"Avg Length: {avg_length:.1f} | "
+                  f"Win Rate: {win_rate:.1f}% | "
+                  f"Epsilon: {self.agent.epsilon:.3f} | "
+                  f"Reward calc: {trainer.mean_reward_time():.1f} µs/step")
+        
+        # Save model periodically
+        if episode % SAVE_INTERVAL == 0:
+            self.agent.save_model(MODEL_PATH)
+            print(f"💾 Model saved at episode {episode}")
 
 
 def train():
@@ -116,104 +106,22 @@ def train():
     # Create model directory
     os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
     
-    # Training statistics
-    episode_rewards = []
-    episode_lengths = []
-    wins = 0
-    losses = 0
+    # Create RL agent (continue from the saved model if there is one)
+    agent = RLAgent(None, model_path=MODEL_PATH if os.path.exists(MODEL_PATH) else None, training=True)
     
-    for episode in range(EPISODES):
-        # Initialize game
-        game_state = GameState(GRID_SIZE)
-        
-        # Create players
-        agent_player = Player(1, 1, (255, 0, 0), "RL Agent")
-        enemy_player = Player(11, 11, (0, 255, 0), "Enemy")
-        
-        game_state.players = [agent_player, enemy_player]
-        
-        # Create RL agent
-        agent = RLAgent(agent_player, model_path=MODEL_PATH if episode > 0 else None, training=True)
-        
-        # Episode variables
-        total_reward = 0
-        steps = 0
-        prev_state = None
-        done = False
-        
-        while not done and steps < MAX_STEPS:
-            # Get current state
-            state = agent._get_state(game_state)
-            
-            # Choose action
-            action = agent.choose_action(game_state)
-            dx, dy, place_bomb = action
-            
-            # Execute action
-            agent_player.move(dx, dy, game_state.grid, TILE_SIZE, game_state)
-            if place_bomb and agent_player.can_place_bomb():
-                game_state.place_bomb(agent_player)
-            
-            # Simple enemy AI (random moves)
-            if enemy_player.alive:
-                import random
-                enemy_dx = random.choice([-1, 0, 1])
-                enemy_dy = random.choice([-1, 0, 1])
-                enemy_player.move(enemy_dx, enemy_dy, game_state.grid, TILE_SIZE, game_state)
-                if random.random() < 0.1 and enemy_player.can_place_bomb():
-                    game_state.place_bomb(enemy_player)
-            
-            # Update game
-            game_state.update(1/30)  # 30 FPS
-            
-            # Calculate reward
-            reward = calculate_reward(game_state, agent_player, prev_state)
-            total_reward += reward
-            
-            # Get next state
-            next_state = agent._get_state(game_state)
-            
-            # Check if done
-            done = not agent_player.alive or not enemy_player.alive
-            
-            # Store experience
-            action_idx = agent.actions.index(action)
-            agent.remember(state, action_idx, reward, next_state, done)
-            
-            # Train
-            agent.replay()
-            
-            # Save state for next iteration
-            prev_state = save_state(game_state, agent_player)
-            steps += 1
-        
-        # Update target network periodically
-        if episode % 10 == 0:
-            agent.update_target_model()
-        
-        # Statistics
-        episode_rewards.append(total_reward)
-        episode_lengths.append(steps)
-        if agent_player.alive and not enemy_player.alive:
-            wins += 1
-        elif not agent_player.alive:
-            losses += 1
-        
-        # Print progress
-        if (episode + 1) % 10 == 0:
-            avg_reward = sum(episode_rewards[-10:]) / 10
-            avg_length = sum(episode_lengths[-10:]) / 10
-            win_rate = wins / (episode + 1) * 100
-            print(f"Episode {episode + 1}/{EPISODES} | "
-                  f"Avg Reward: {avg_reward:.2f} | "
-                  f"Avg Length: {avg_length:.1f} | "
-                  f"Win Rate: {win_rate:.1f}% | "
-                  f"Epsilon: {agent.epsilon:.3f}")
-        
-        # Save model periodically
-        if (episode + 1) % SAVE_INTERVAL == 0:
-            agent.save_model(MODEL_PATH)
-            print(f"💾 Model saved at episode {episode + 1}")
+    trainer = Trainer(DQNLearner(agent, target_update=10), RandomOpponent,
+                      backend=make_backend(NUM_ENVS, NUM_WORKERS),
+                      reward_shaper=RewardShaper(weights=REWARD_WEIGHTS),
+                      sinks=[ProgressSink(agent)], max_steps=MAX_STEPS,
+                      names=("RL Agent", "Enemy"))
+    try:
+        results = trainer.run(EPISODES)
+    finally:
+        trainer.close()
+    
+    episode_rewards = [result.reward for result in results]
+    wins = sum(result.won for result in results)
+    losses = sum(result.lost for result in results)
     
     # Final save
     agent.save_model(MODEL_PATH)